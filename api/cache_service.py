@@ -3,13 +3,21 @@
 Global cache service for the Weave API server.
 This service preloads catalog data when the server starts and provides
 access to cached data for all requests.
+
+The in-process snapshot is the first cache tier; the chunked catalog in
+Redis is the second. Workers stay in step through ``CatalogSync``: one
+worker reloads from MongoDB and publishes, the others pull the new chunks
+from Redis and swap their snapshot.
 """
 
+import asyncio
 import time
 from typing import Dict, Any, Optional
 from core.catalog import DatabaseCatalogService
 from core.catalog.redis_client import RedisClientFactory
 from core.catalog.cache import RedisCacheStore
+from core.catalog.snapshot import CatalogSnapshot
+from core.catalog.sync import CatalogSync
 from core.config import settings
 from core.logging_config import get_logger
 
@@ -19,13 +27,16 @@ class GlobalCacheService:
     """Global cache service that preloads catalog data on server startup"""
     
     def __init__(self):
-        self._catalog_cache: Dict[str, Any] = {}
+        self._catalog_snapshot: CatalogSnapshot = CatalogSnapshot.empty()
         self._catalog_cache_timestamp: Optional[float] = None
         self._catalog_cache_ttl: int = 3600  # 1 hour cache TTL
         self._redis_cache: Optional[RedisCacheStore] = None
         self._catalog_service: Optional[DatabaseCatalogService] = None
         self._initialized: bool = False
         self._initialization_error: Optional[str] = None
+        self._catalog_sync: Optional[CatalogSync] = None
+        self._catalog_generation: int = 0
+        self._sync_task: Optional[asyncio.Task] = None
     
     async def initialize(self):
         """Initialize the global cache service and preload catalog data"""
@@ -36,11 +47,14 @@ class GlobalCacheService:
             try:
                 redis_client = await RedisClientFactory.get_client()
                 self._redis_cache = RedisCacheStore(redis_client)
+                if settings.catalog_sync_enabled:
+                    self._catalog_sync = CatalogSync(redis_client, lock_ttl=settings.catalog_refresh_lock_ttl)
                 logger.info("✅ Redis cache initialized successfully")
             except Exception as e:
                 logger.warning(f"⚠️  Redis cache initialization failed: {e}")
                 logger.info("Continuing without Redis cache (limited functionality)")
                 self._redis_cache = None
+                self._catalog_sync = None
             
             # Initialize catalog service
             try:
@@ -49,6 +63,7 @@ class GlobalCacheService:
                     database_url=get_database_url(),
                     redis_cache=self._redis_cache or None
                 )
+                self._catalog_service.add_refresh_listener(self._on_background_refresh)
                 logger.info("✅ Database catalog service initialized successfully")
             except Exception as e:
                 logger.warning(f"⚠️  Database catalog service initialization failed: {e}")
@@ -68,24 +83,34 @@ class GlobalCacheService:
             # Don't raise - allow service to continue in limited mode
     
     async def _preload_catalog_cache(self):
-        """Preload catalog cache during initialization for immediate use"""
+        """
+        Preload catalog cache during initialization for immediate use.
+        
+        When another worker already published a catalog it is read from
+        Redis. Otherwise one starting worker loads MongoDB and publishes
+        while the others wait for it.
+        """
+        token = None
         try:
             logger.info("📚 Preloading catalog cache...")
-            catalog_data = await self._catalog_service.get_catalog()
-            providers = catalog_data.get('providers', {})
-            
-            # Handle case where providers might be a list or dict
-            if isinstance(providers, list):
-                providers_dict = {p.get('slug', f'provider_{i}'): p for i, p in enumerate(providers)}
-                providers = providers_dict
-            elif not isinstance(providers, dict):
-                providers = {}
+            generation = 0
+            if self._catalog_sync is not None:
+                generation = await self._catalog_sync.get_generation()
+                if not generation:
+                    token = await self._catalog_sync.acquire_refresh_lock()
+                    if token is None:
+                        logger.info("⏳ Another worker is loading the catalog; waiting for it")
+                        generation = await self._catalog_sync.wait_for_generation(
+                            above=0, timeout=settings.catalog_sync_startup_wait
+                        )
             
-            # Cache the data
-            self._catalog_cache = providers
-            self._catalog_cache_timestamp = time.time()
+            catalog_data = await self._catalog_service.get_catalog()
+            snapshot = self._install_snapshot(catalog_data, generation)
+            providers = snapshot.providers
+            if token is not None or catalog_data.get('source') == 'mongodb':
+                await self._publish(snapshot)
             
-            logger.info(f"✅ Catalog cache preloaded with {len(providers)} providers")
+            logger.info(f"✅ Catalog cache preloaded with {len(providers)} providers (version {snapshot.version})")
             
             # Log some sample providers for debugging
             if providers:
@@ -102,12 +127,121 @@ class GlobalCacheService:
         except Exception as e:
             logger.error(f"❌ Failed to preload catalog cache: {e}")
             # Don't fail initialization, just log the error
-            self._catalog_cache = {}
+            self._catalog_snapshot = CatalogSnapshot.empty()
             self._catalog_cache_timestamp = None
+        finally:
+            if token is not None:
+                await self._catalog_sync.release_refresh_lock(token)
+    
+    def _install_snapshot(self, catalog_data: Dict[str, Any], generation: int) -> CatalogSnapshot:
+        """Build the new snapshot fully, then swap the reference so readers
+        always see either the old or the new catalog"""
+        snapshot = CatalogSnapshot.build(catalog_data.get('providers', {}))
+        self._catalog_snapshot = snapshot
+        self._catalog_cache_timestamp = time.time()
+        self._catalog_generation = max(self._catalog_generation, generation)
+        self._build_catalog_indexes(snapshot)
+        return snapshot
+    
+    def _build_catalog_indexes(self, snapshot: CatalogSnapshot):
+        """Rebuild the generator's catalog-derived indexes (prompt cards, template fast path) for a new snapshot"""
+        try:
+            from services.dsl_generator.catalog_manager import schedule_catalog_index_build
+            schedule_catalog_index_build(snapshot)
+        except Exception as e:
+            logger.warning(f"⚠️  Catalog indexes not rebuilt: {e}")
+    
+    async def _publish(self, snapshot: CatalogSnapshot):
+        """Tell the other workers a new catalog is in Redis"""
+        if self._catalog_sync is None:
+            return
+        try:
+            generation = await self._catalog_sync.publish(snapshot.version)
+            self._catalog_generation = max(self._catalog_generation, generation)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to publish catalog update: {e}")
+    
+    async def _on_background_refresh(self, providers: Dict[str, Any]):
+        """The catalog service refreshed in the background: adopt the result and tell the other workers"""
+        snapshot = self._install_snapshot({'providers': providers}, self._catalog_generation)
+        await self._publish(snapshot)
+    
+    async def _refresh_from_database(self) -> bool:
+        """Reload from MongoDB on one worker and publish the result; False if another worker holds the lock"""
+        token = None
+        if self._catalog_sync is not None:
+            token = await self._catalog_sync.acquire_refresh_lock()
+            if token is None:
+                logger.info("🔒 Another worker is refreshing the catalog; waiting for its update")
+                return False
+        try:
+            catalog_data = await self._catalog_service.get_catalog(force_refresh=True)
+            snapshot = self._install_snapshot(catalog_data, self._catalog_generation)
+            await self._publish(snapshot)
+            logger.info(f"✅ Catalog refreshed from database: {len(snapshot.providers)} providers (version {snapshot.version})")
+            return True
+        finally:
+            if token is not None:
+                await self._catalog_sync.release_refresh_lock(token)
+    
+    async def _pull_catalog(self, generation: int, version: Optional[str] = None):
+        """Adopt a catalog another worker published, reading it from Redis"""
+        if version and version == self._catalog_snapshot.version:
+            self._catalog_generation = generation
+            self._catalog_cache_timestamp = time.time()
+            return
+        
+        catalog_data = await self._catalog_service.get_catalog()
+        snapshot = self._install_snapshot(catalog_data, generation)
+        logger.info(f"🔄 Catalog updated to generation {generation} from {catalog_data.get('source')}: "
+                    f"{len(snapshot.providers)} providers (version {snapshot.version})")
+    
+    def _is_expired(self) -> bool:
+        if not self._catalog_cache_timestamp:
+            return True
+        return time.time() - self._catalog_cache_timestamp >= self._catalog_cache_ttl
+    
+    async def _sync_loop(self):
+        """Follow published catalog updates; refresh from MongoDB when the catalog expires"""
+        while True:
+            try:
+                async for update in self._catalog_sync.listen(poll_interval=settings.catalog_sync_poll_interval):
+                    generation = update.get('generation') or 0
+                    if generation > self._catalog_generation:
+                        await self._pull_catalog(generation, update.get('version'))
+                    elif self._is_expired():
+                        await self._refresh_from_database()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Catalog sync error, reconnecting in 5s: {e}")
+                await asyncio.sleep(5)
+    
+    def start_catalog_sync(self):
+        """Start following catalog updates from other workers (needs Redis and a running event loop)"""
+        if self._catalog_sync is None or self._catalog_service is None:
+            logger.info("Catalog sync disabled (no Redis or catalog service); workers refresh independently")
+            return
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+            logger.info(f"📡 Following catalog updates on {self._catalog_sync.channel}")
+    
+    async def shutdown(self):
+        """Stop following catalog updates and any background catalog refresh"""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+        if self._catalog_service is not None:
+            await self._catalog_service.stop_background_refresh()
     
     def get_catalog_cache(self) -> Dict[str, Any]:
-        """Get the cached catalog data"""
-        return self._catalog_cache.copy()
+        """Get the cached catalog data (shared, read-only {slug: provider} view)"""
+        return self._catalog_snapshot.providers
+    
+    def get_catalog_snapshot(self) -> CatalogSnapshot:
+        """Get the current catalog snapshot (shared by reference, never copied)"""
+        return self._catalog_snapshot
     
     def get_catalog_service(self) -> Optional[DatabaseCatalogService]:
         """Get the catalog service instance"""
@@ -139,14 +273,17 @@ class GlobalCacheService:
         
         return {
             "initialized": self._initialized,
-            "has_cached_data": bool(self._catalog_cache),
+            "has_cached_data": bool(self._catalog_snapshot.providers),
             "cache_age_seconds": age_seconds,
             "ttl_remaining_seconds": ttl_remaining,
             "is_valid": is_valid,
-            "provider_count": len(self._catalog_cache) if self._catalog_cache else 0,
+            "provider_count": len(self._catalog_snapshot.providers) if self._catalog_snapshot.providers else 0,
+            "catalog_version": self._catalog_snapshot.version,
+            "catalog_generation": self._catalog_generation,
+            "catalog_sync_running": self._sync_task is not None and not self._sync_task.done(),
             "catalog_service_available": self._catalog_service is not None,
             "redis_cache_available": self._redis_cache is not None,
-            "cache_preloaded": bool(self._catalog_cache and self._catalog_cache_timestamp),
+            "cache_preloaded": bool(self._catalog_snapshot.providers and self._catalog_cache_timestamp),
             "initialization_error": self._initialization_error
         }
     
@@ -173,26 +310,30 @@ class GlobalCacheService:
             logger.warning("Cannot refresh cache: catalog service not available")
             return
         
-        if force or not self._catalog_cache:
+        if force or not self._catalog_snapshot.providers:
             logger.info("🔄 Refreshing catalog cache data")
-            await self._preload_catalog_cache()
+            try:
+                await self._refresh_from_database()
+            except Exception as e:
+                logger.error(f"❌ Failed to refresh catalog cache: {e}")
         else:
             logger.info("Cache is still valid, no refresh needed")
     
     def clear_cache(self):
         """Clear the in-memory catalog cache"""
-        self._catalog_cache = {}
+        self._catalog_snapshot = CatalogSnapshot.empty()
         self._catalog_cache_timestamp = None
+        self._catalog_generation = 0
         logger.info("🗑️  In-memory catalog cache cleared")
     
     def get_catalog_statistics(self) -> Dict[str, Any]:
         """Get detailed catalog statistics"""
-        if not self._catalog_cache:
+        if not self._catalog_snapshot.providers:
             return {"error": "No catalog data available"}
         
         # Count providers by category
         categories = {}
-        for provider in self._catalog_cache.values():
+        for provider in self._catalog_snapshot.providers.values():
             category = provider.get('category', 'Unknown')
             if category not in categories:
                 categories[category] = 0
@@ -205,7 +346,7 @@ class GlobalCacheService:
         providers_with_actions = 0
         valid_providers = 0
         
-        for provider in self._catalog_cache.values():
+        for provider in self._catalog_snapshot.providers.values():
             triggers = provider.get('triggers', [])
             actions = provider.get('actions', [])
             
@@ -221,7 +362,7 @@ class GlobalCacheService:
         
         # Get top providers by tool count
         provider_stats = []
-        for slug, provider in self._catalog_cache.items():
+        for slug, provider in self._catalog_snapshot.providers.items():
             provider_stats.append({
                 "slug": slug,
                 "name": provider.get('name', slug),
@@ -236,7 +377,7 @@ class GlobalCacheService:
         top_providers = provider_stats[:20]
         
         return {
-            "total_providers": len(self._catalog_cache),
+            "total_providers": len(self._catalog_snapshot.providers),
             "total_triggers": total_triggers,
             "total_actions": total_actions,
             "providers_with_triggers": providers_with_triggers,
@@ -244,8 +385,8 @@ class GlobalCacheService:
             "valid_providers": valid_providers,
             "categories": categories,
             "top_providers": top_providers,
-            "average_tools_per_provider": (total_triggers + total_actions) / len(self._catalog_cache) if self._catalog_cache else 0,
-            "catalog_quality": "good" if valid_providers > len(self._catalog_cache) * 0.5 else "poor"
+            "average_tools_per_provider": (total_triggers + total_actions) / len(self._catalog_snapshot.providers) if self._catalog_snapshot.providers else 0,
+            "catalog_quality": "good" if valid_providers > len(self._catalog_snapshot.providers) * 0.5 else "poor"
         }
 
 # Global instance
@@ -0,0 +1,159 @@
+"""
+Pre-serialized, ETag-aware catalog responses.
+
+Catalog data only changes when the snapshot is refreshed, but the frontend
+polls the catalog endpoints constantly. Responses are serialized once per
+(endpoint, normalized params, snapshot version) and the bytes are reused
+until the snapshot changes.
+
+Every response carries a strong ETag derived from the same key. Because the
+snapshot version is a content hash, all API workers issue the same ETag for
+the same page, so ``If-None-Match`` is answered with 304 before the page is
+built or looked up.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from core import json_codec
+from core.catalog.snapshot import CatalogSnapshot
+from core.config import settings
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class CatalogResponseCache:
+    """LRU of serialized catalog responses for the current snapshot version, bounded by count and bytes"""
+
+    def __init__(self, max_entries: int = 256, max_age: int = 30, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._version: Optional[str] = None
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0, "too_large": 0}
+
+    @staticmethod
+    def make_key(version: str, endpoint: str, params: Dict[str, Any]) -> CacheKey:
+        """Cache key with params sorted and unset (None) params dropped"""
+        normalized = tuple(sorted((k, v) for k, v in params.items() if v is not None))
+        return version, endpoint, normalized
+
+    @staticmethod
+    def make_etag(key: CacheKey) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:32]
+        return f'"{digest}"'
+
+    def _headers(self, etag: str) -> Dict[str, str]:
+        return {"ETag": etag, "Cache-Control": f"public, max-age={self.max_age}"}
+
+    def _get(self, key: CacheKey) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def _put(self, key: CacheKey, body: bytes) -> None:
+        if key[0] != self._version:
+            # A new snapshot makes every older page stale
+            self.clear()
+            self._version = key[0]
+        if len(body) > self.max_bytes:
+            # Would evict everything else; serve it uncached
+            self.stats["too_large"] += 1
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = body
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def respond(self, request: Optional[Request], snapshot: CatalogSnapshot, endpoint: str,
+                params: Dict[str, Any], build: Callable[[], Any]) -> Response:
+        """
+        Serve a catalog response from cache, building it only on a miss.
+
+        Args:
+            request: Incoming request, checked for If-None-Match
+            snapshot: Catalog snapshot the response is built from
+            endpoint: Stable name of the endpoint
+            params: Query/path parameters that select the response
+            build: Returns the response body; exceptions propagate to the route
+        """
+        key = self.make_key(snapshot.version, endpoint, params)
+        etag = self.make_etag(key)
+        headers = self._headers(etag)
+
+        if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        body = self._get(key)
+        if body is None:
+            self.stats["misses"] += 1
+            body = json_codec.dumps(build())
+            self._put(key, body)
+        else:
+            self.stats["hits"] += 1
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._version = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            **self.stats
+        }
+
+
+# Global response cache instance
+_catalog_response_cache: Optional[CatalogResponseCache] = None
+
+
+def get_catalog_response_cache() -> CatalogResponseCache:
+    """Get the global catalog response cache, configured from settings"""
+    global _catalog_response_cache
+
+    if _catalog_response_cache is None:
+        _catalog_response_cache = CatalogResponseCache(
+            max_entries=settings.catalog_response_cache_size,
+            max_age=settings.catalog_response_max_age,
+            max_bytes=settings.catalog_response_cache_max_bytes
+        )
+        logger.info(f"🗂️ Catalog response cache initialized ({settings.catalog_response_cache_size} entries, "
+                    f"{settings.catalog_response_cache_max_bytes:,} bytes)")
+
+    return _catalog_response_cache
@@ -0,0 +1,355 @@
+"""
+Asynchronous workflow generation jobs.
+
+``POST /suggestions/jobs`` returns a job id immediately and a bounded pool of
+workers runs the generation pipeline in the background. Job records (status,
+stage progress and each suggestion as it finishes) are stored in Redis with
+a TTL so any API worker can answer ``GET /suggestions/jobs/{id}`` and the SSE
+stream. When Redis is unavailable records are kept in process memory.
+
+Workers still go through admission control, so background jobs and
+synchronous requests share the same Claude capacity.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core import json_codec
+from core.config import settings
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue cannot accept more work"""
+
+
+class GenerationJobStore:
+    """
+    Job records in Redis (with TTL), falling back to process memory.
+
+    The memory copy holds at most ``max_memory_records`` records, oldest
+    write evicted first, and drops records once their TTL has passed.
+    """
+
+    def __init__(self, ttl: int = 3600, key_prefix: str = "suggestions:job", redis_retry_interval: float = 30.0,
+                 max_memory_records: int = 1000):
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.redis_retry_interval = redis_retry_interval
+        self.max_memory_records = max_memory_records
+        # Ordered by last write, which is also expiry order
+        self._memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._redis_down_until = 0.0
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:{job_id}"
+
+    async def _client(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            from core.catalog.redis_client import RedisClientFactory
+            return await RedisClientFactory.get_client()
+        except Exception as e:
+            self._mark_redis_down(e)
+            return None
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(f"⚠️ Job store falling back to memory (Redis unavailable): {error}")
+        self._redis_down_until = time.monotonic() + self.redis_retry_interval
+
+    def _prune_memory(self) -> None:
+        now = time.monotonic()
+        while self._memory:
+            job_id, (expires, _) = next(iter(self._memory.items()))
+            if expires > now and len(self._memory) <= self.max_memory_records:
+                break
+            del self._memory[job_id]
+
+    async def save(self, record: Dict[str, Any]) -> None:
+        """Write a job record, refreshing its TTL"""
+        self._memory.pop(record["job_id"], None)
+        self._memory[record["job_id"]] = (time.monotonic() + self.ttl, record)
+        self._prune_memory()
+        client = await self._client()
+        if client is None:
+            return
+        try:
+            await client.set(self._key(record["job_id"]), json_codec.dumps(record), ex=self.ttl)
+        except Exception as e:
+            self._mark_redis_down(e)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Read a job record written by any API worker"""
+        client = await self._client()
+        if client is not None:
+            try:
+                raw = await client.get(self._key(job_id))
+                if raw:
+                    return json_codec.loads(raw)
+            except Exception as e:
+                self._mark_redis_down(e)
+
+        self._prune_memory()
+        entry = self._memory.get(job_id)
+        return entry[1] if entry else None
+
+
+class GenerationJob:
+    """Handle a running job uses to report progress"""
+
+    def __init__(self, record: Dict[str, Any], store: GenerationJobStore):
+        self.record = record
+        self._store = store
+        self._changed = asyncio.Event()
+
+    @property
+    def job_id(self) -> str:
+        return self.record["job_id"]
+
+    @property
+    def changed(self) -> asyncio.Event:
+        """Event set by the next update (each update gets a fresh one)"""
+        return self._changed
+
+    async def _update(self, **fields: Any) -> None:
+        self.record.update(fields)
+        self.record["updated_at"] = time.time()
+        self.record["version"] += 1
+        await self._store.save(self.record)
+        # Wake local SSE streams; the set event stays set for streams that
+        # have not started waiting yet, and the next change gets a new one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def stage(self, stage: str, detail: Optional[Dict[str, Any]] = None, **fields: Any) -> None:
+        """Record a pipeline stage (usable as the generator's on_stage callback)"""
+        stages = self.record["stages"] + [{"stage": stage, "at": time.time(), "detail": detail or {}}]
+        await self._update(stage=stage, stages=stages, **fields)
+
+    async def add_suggestion(self, suggestion: Dict[str, Any]) -> None:
+        """Publish a finished suggestion"""
+        await self._update(suggestions=self.record["suggestions"] + [suggestion])
+
+
+JobRunner = Callable[[GenerationJob, Any], Awaitable[None]]
+
+
+class GenerationJobManager:
+    """Bounded queue plus worker pool for generation jobs"""
+
+    def __init__(self, store: GenerationJobStore, workers: int = 4, max_queue: int = 100,
+                 max_admission_wait: float = 300.0, poll_interval: float = 0.5):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.num_workers = max(1, workers)
+        self.max_admission_wait = max_admission_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._max_queue = max_queue
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, GenerationJob] = {}
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.num_workers:
+            self._workers.append(asyncio.create_task(self._worker(len(self._workers))))
+
+    async def submit(self, payload: Any, runner: JobRunner, user_id: str = "",
+                     priority: str = "interactive", total_suggestions: int = 1) -> Dict[str, Any]:
+        """
+        Queue a job and return its initial record.
+
+        Raises:
+            JobQueueFull: If the queue is at capacity
+        """
+        self._ensure_workers()
+        if self._queue.full():
+            self.stats["rejected"] += 1
+            raise JobQueueFull(f"Generation job queue is full ({self._max_queue} jobs)")
+
+        now = time.time()
+        record = {
+            "job_id": str(uuid.uuid4()),
+            "status": JOB_QUEUED,
+            "stage": JOB_QUEUED,
+            "stages": [{"stage": JOB_QUEUED, "at": now, "detail": {}}],
+            "user_id": user_id,
+            "priority": priority,
+            "total_suggestions": total_suggestions,
+            "suggestions": [],
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "version": 0
+        }
+        job = GenerationJob(record, self.store)
+        self._jobs[job.job_id] = job
+        await self.store.save(record)
+        self._queue.put_nowait((job, payload, runner))
+        self.stats["submitted"] += 1
+        logger.info(f"📬 Queued generation job {job.job_id} (queue depth {self._queue.qsize()})")
+        return record
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job, payload, runner = await self._queue.get()
+            try:
+                await self._run(job, payload, runner)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Generation job {job.job_id} failed: {e}")
+                self.stats["failed"] += 1
+                await job.stage(JOB_FAILED, status=JOB_FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+                self._jobs.pop(job.job_id, None)
+
+    async def _run(self, job: GenerationJob, payload: Any, runner: JobRunner) -> None:
+        admission = None
+        try:
+            from services.dsl_generator.admission import AdmissionRejected, get_admission_controller
+            admission = get_admission_controller()
+        except Exception as e:
+            logger.warning(f"Admission control not available for jobs: {e}")
+
+        if admission is not None:
+            # Jobs wait out admission rejections instead of failing
+            deadline = time.monotonic() + self.max_admission_wait
+            while True:
+                try:
+                    await admission.acquire(job.record["user_id"], job.record["priority"])
+                    break
+                except AdmissionRejected as e:
+                    if time.monotonic() + e.retry_after > deadline:
+                        raise RuntimeError(f"Generation capacity unavailable ({e.reason})")
+                    await job.stage("waiting_for_capacity", {"retry_after": e.retry_after})
+                    await asyncio.sleep(e.retry_after)
+
+        start = time.monotonic()
+        try:
+            await job.stage(JOB_RUNNING, status=JOB_RUNNING)
+            await runner(job, payload)
+            await job.stage(JOB_COMPLETED, status=JOB_COMPLETED)
+            self.stats["completed"] += 1
+            logger.info(f"✅ Generation job {job.job_id} completed in {time.monotonic() - start:.2f}s")
+        finally:
+            if admission is not None:
+                admission.release(time.monotonic() - start)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(job_id)
+
+    async def events(self, job_id: str, heartbeat_interval: float = 15.0) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (event, data) pairs for a job until it finishes.
+
+        Events are 'stage', 'suggestion', 'completed' and 'failed', plus
+        'heartbeat' while nothing changes. Jobs running in this process wake
+        the stream immediately; jobs on other workers are polled from the store.
+        """
+        sent_stages = 0
+        sent_suggestions = 0
+        last_event = time.monotonic()
+
+        while True:
+            # Take the event before reading, so an update during the read is not waited out
+            job = self._jobs.get(job_id)
+            changed = job.changed if job is not None else None
+            record = await self.store.get(job_id)
+            if record is None:
+                yield "failed", {"job_id": job_id, "error": "Job not found or expired"}
+                return
+
+            for stage in record["stages"][sent_stages:]:
+                yield "stage", {"job_id": job_id, **stage}
+                last_event = time.monotonic()
+            sent_stages = len(record["stages"])
+
+            for suggestion in record["suggestions"][sent_suggestions:]:
+                yield "suggestion", {"job_id": job_id, "suggestion": suggestion}
+                last_event = time.monotonic()
+            sent_suggestions = len(record["suggestions"])
+
+            if record["status"] in TERMINAL_STATUSES:
+                yield record["status"], {
+                    "job_id": job_id,
+                    "status": record["status"],
+                    "error": record.get("error"),
+                    "suggestion_count": len(record["suggestions"])
+                }
+                return
+
+            if time.monotonic() - last_event >= heartbeat_interval:
+                yield "heartbeat", {"job_id": job_id}
+                last_event = time.monotonic()
+
+            if changed is not None:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=heartbeat_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, worker count and job counters"""
+        return {
+            "workers": self.num_workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self._max_queue,
+            "counters": dict(self.stats)
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel the worker pool"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json_codec.dumps_str(data)}\n\n"
+
+
+# Global job manager instance
+_generation_job_manager: Optional[GenerationJobManager] = None
+
+
+def get_generation_job_manager() -> GenerationJobManager:
+    """Get the global generation job manager, configured from settings"""
+    global _generation_job_manager
+
+    if _generation_job_manager is None:
+        store = GenerationJobStore(ttl=settings.generation_job_ttl)
+        _generation_job_manager = GenerationJobManager(
+            store,
+            workers=settings.generation_job_workers,
+            max_queue=settings.generation_job_max_queue,
+            poll_interval=settings.generation_job_poll_interval
+        )
+        logger.info(f"📬 Generation job manager initialized ({settings.generation_job_workers} workers)")
+
+    return _generation_job_manager
+
+
+async def shutdown_generation_jobs() -> None:
+    """Stop job workers if the manager was ever used"""
+    if _generation_job_manager is not None:
+        await _generation_job_manager.shutdown()
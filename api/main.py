@@ -6,6 +6,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 
+# Serialize responses with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponseClass
+
 # Import route modules
 from api.routes import (
     api_router,
@@ -27,6 +34,7 @@ app = FastAPI(
     title="Workflow Orchestration API 2.0",
     description="Backend APIs for planning, creating, testing, activating, and observing AI-planned workflows that execute via Composio (MCP/SDK). Workflows are represented as DSL JSON.",
     version="1.0.0",
+    default_response_class=DefaultResponseClass,
     openapi_tags=[
         {
             "name": "Auth",
@@ -62,6 +70,9 @@ async def startup_event():
     logger.info("📚 Initializing global cache service...")
     await global_cache_service.initialize()
     
+    # Follow catalog updates published by other workers
+    global_cache_service.start_catalog_sync()
+    
     # Log cache status
     cache_status = global_cache_service.get_cache_status()
     health_status = global_cache_service.get_health_status()
@@ -79,7 +90,15 @@ async def shutdown_event():
     """Cleanup services when the server shuts down"""
     logger.info("🛑 Shutting down Weave API server...")
     
-    # Clear cache
+    # Stop background generation job workers
+    try:
+        from api.generation_jobs import shutdown_generation_jobs
+        await shutdown_generation_jobs()
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to stop generation job workers: {e}")
+    
+    # Stop following catalog updates and clear cache
+    await global_cache_service.shutdown()
     global_cache_service.clear_cache()
     logger.info("🗑️  Cache cleared")
     
@@ -35,6 +35,7 @@ class PlanRequest(BaseModel):
     user_request: Optional[str] = None
     selected_apps: Optional[List[str]] = []
     num_suggestions: Optional[int] = Field(default=1, ge=1, le=5, description="Number of suggestions to generate (1-5)")
+    priority: Optional[str] = Field(default="interactive", enum=["interactive", "batch"], description="Admission priority; evals and bulk jobs should use 'batch'")
 
 class Suggestion(BaseModel):
     suggestion_id: str
@@ -56,7 +56,9 @@ async def configure_rate_limiting(config: Dict[str, Any]) -> Dict[str, Any]:
             burst_limit=config.get("burst_limit", 5),
             base_delay=config.get("base_delay", 2.0),
             max_delay=config.get("max_delay", 30.0),
-            jitter_factor=config.get("jitter_factor", 0.25)
+            jitter_factor=config.get("jitter_factor", 0.25),
+            input_tokens_per_minute=config.get("input_tokens_per_minute", settings.claude_input_tokens_per_minute),
+            output_tokens_per_minute=config.get("output_tokens_per_minute", settings.claude_output_tokens_per_minute)
         )
         
         set_global_rate_limiter_config(rate_limit_config)
@@ -69,7 +71,9 @@ async def configure_rate_limiting(config: Dict[str, Any]) -> Dict[str, Any]:
                 "burst_limit": rate_limit_config.burst_limit,
                 "base_delay": rate_limit_config.base_delay,
                 "max_delay": rate_limit_config.max_delay,
-                "jitter_factor": rate_limit_config.jitter_factor
+                "jitter_factor": rate_limit_config.jitter_factor,
+                "input_tokens_per_minute": rate_limit_config.input_tokens_per_minute,
+                "output_tokens_per_minute": rate_limit_config.output_tokens_per_minute
             },
             "timestamp": "2025-01-28T00:00:00Z"
         }
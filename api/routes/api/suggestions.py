@@ -2,12 +2,15 @@
 API suggestions routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import uuid
 import logging
 import time
 
+from core import json_codec
 from api.models import (
     PlanRequest, MissingField, DSLParametric, 
     Suggestion, PlanResponse
@@ -46,9 +49,48 @@ except ImportError as e:
     logging.warning(f"Suggestions service not available: {e}")
     SUGGESTIONS_SERVICE_AVAILABLE = False
 
+# Import admission control
+try:
+    from services.dsl_generator.admission import AdmissionRejected, get_admission_controller
+    ADMISSION_CONTROL_AVAILABLE = True
+except Exception as e:
+    logging.warning(f"Admission control not available: {e}")
+    ADMISSION_CONTROL_AVAILABLE = False
+
+# Import background generation jobs
+try:
+    from api.generation_jobs import JobQueueFull, format_sse, get_generation_job_manager
+    GENERATION_JOBS_AVAILABLE = True
+except Exception as e:
+    logging.warning(f"Generation jobs not available: {e}")
+    GENERATION_JOBS_AVAILABLE = False
+
 router = APIRouter(prefix="/suggestions", tags=["Suggestions"])
 
 
+async def admit_generation_request(request: PlanRequest):
+    """
+    Hold an admission-control slot for the duration of a generation request.
+
+    Declared as the first dependency so requests are queued (or shed with
+    429 + Retry-After) before any generator or database setup happens.
+    """
+    if not ADMISSION_CONTROL_AVAILABLE:
+        yield
+        return
+
+    admission = get_admission_controller()
+    try:
+        async with admission.admit(request.user_id, request.priority or "interactive"):
+            yield
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Workflow generation is busy ({e.reason}). Please retry later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
 async def get_dsl_generator():
     """Get DSL generator service instance or None if not available"""
     # Lazy import fallback in case initial import failed
@@ -81,9 +123,9 @@ async def get_dsl_generator():
         generator = DSLGeneratorService()
         await generator.initialize()
         
-        # Load the catalog cache from global service
+        # Share the global catalog snapshot with the generator (no copy)
         try:
-            catalog_cache = cache_service.get_catalog_cache()
+            catalog_cache = cache_service.get_catalog_snapshot()
         except Exception as e:
             logging.warning(f"Failed to retrieve catalog cache: {e}")
             catalog_cache = {}
@@ -133,24 +175,219 @@ async def get_integration_names(integration_ids: List[str], database_service) ->
     if not database_service or not integration_ids:
         return {}
     
-    integration_names = {}
-    for integration_id in integration_ids:
+    async def lookup(integration_id: str) -> str:
         try:
             provider = await database_service._get_provider_from_database(integration_id)
-            if provider:
-                integration_names[integration_id] = provider.get("name", integration_id)
-            else:
-                integration_names[integration_id] = integration_id
+            return provider.get("name", integration_id) if provider else integration_id
         except Exception as e:
             logging.warning(f"Failed to get integration name for {integration_id}: {e}")
-            integration_names[integration_id] = integration_id
+            return integration_id
+    
+    # Look up all providers concurrently rather than one round trip at a time
+    unique_ids = list(dict.fromkeys(integration_ids))
+    names = await asyncio.gather(*(lookup(integration_id) for integration_id in unique_ids))
+    return dict(zip(unique_ids, names))
+
+
+def to_generation_request(request: PlanRequest):
+    """Convert a PlanRequest to a generator GenerationRequest"""
+    # Ensure GenerationRequest is available (lazy import fallback) without rebinding global
+    GenReq = GenerationRequest
+    if GenReq is None:
+        logging.warning(f"[LINE 173] GenerationRequest is None, attempting lazy import...")
+        try:
+            from services.dsl_generator.models import GenerationRequest as _GenReq
+            GenReq = _GenReq
+        except Exception as e:
+            logging.error(f"[LINE 178] Failed to import GenerationRequest: {e}")
+            raise Exception(f"Generator models unavailable: {e}")
+
+    return GenReq(
+        user_prompt=request.user_request,
+        selected_apps=request.selected_apps,
+        user_id=request.user_id,
+        workflow_type="template",  # Default to template for suggestions
+        complexity="medium"        # Default to medium complexity
+    )
+
+
+def _failed_suggestion(response, index: int, request: PlanRequest) -> Suggestion:
+    """Placeholder suggestion for a failed generation"""
+    logging.warning(f"[LINE 209] Response {index+1} failed: {response.error_message}")
+    return Suggestion(
+        suggestion_id=str(uuid.uuid4()),
+        title=f"Failed Generation {index+1}",
+        description=f"Workflow generation failed: {response.error_message}",
+        dsl_parametric=DSLParametric(
+            version=1,
+            name=f"failed_workflow_{index+1}",
+            connections={},
+            trigger={"type": "manual"},
+            actions=[{"type": "notification"}]
+        ),
+        missing_fields=[],
+        confidence=0.0,
+        apps=request.selected_apps or [],
+        source="generator",
+        full_workflow_json={}
+    )
+
+
+async def build_suggestion(
+    response,
+    index: int,
+    request: PlanRequest,
+    generation_time: float,
+    num_suggestions: int,
+    database_service,
+    name_cache: Optional[Dict[str, str]] = None
+) -> Tuple[Suggestion, Dict[str, Any]]:
+    """
+    Convert a GenerationResponse into an API Suggestion.
+
+    ``name_cache`` (integration id -> display name) is shared across the
+    suggestions of one request so names are only looked up once.
+
+    Returns:
+        Tuple of (suggestion, generation metadata to store alongside it)
+    """
+    if not response.success:
+        return _failed_suggestion(response, index, request), {}
+
+    full_workflow_json = response.dsl_template or getattr(response, 'workflow_json', None) or {}
+
+    # Convert GenerationResponse to Suggestion
+    if response.dsl_template:
+        # Extract workflow information from the DSL template
+        workflow = response.dsl_template.get("workflow", {})
+        
+        # Get workflow name and description (prefer AI-written description from DSL)
+        workflow_name = workflow.get("name", f"generated_workflow_{index+1}")
+        workflow_description = workflow.get("description") or response.reasoning or f"Automated workflow for: {request.user_request}"
+        
+        # Extract triggers and actions
+        triggers = workflow.get("triggers", [])
+        actions = workflow.get("actions", [])
+        
+        # Create DSL parametric structure
+        dsl_parametric = DSLParametric(
+            version=1,
+            name=workflow_name,
+            connections=response.dsl_template.get("connections", {}),
+            trigger=triggers[0] if triggers else {"type": "manual"},
+            actions=actions if actions else [{"type": "notification"}]
+        )
+    else:
+        logging.warning(f"[LINE 250] No dsl_template found for response {index+1}, using fallback...")
+        # Fallback if no DSL template
+        workflow_name = f"generated_workflow_{index+1}"
+        workflow_description = response.reasoning or f"Automated workflow for: {request.user_request}"
+        dsl_parametric = DSLParametric(
+            version=1,
+            name=workflow_name,
+            connections={},
+            trigger={"type": "manual"},
+            actions=[{"type": "notification"}]
+        )
     
-    return integration_names
+    # Convert DSL generator MissingField objects to API MissingField format
+    api_missing_fields = [
+        {
+            "path": missing_field.field,
+            "prompt": missing_field.prompt,
+            "type_hint": missing_field.type
+        }
+        for missing_field in response.missing_fields or []
+    ]
+    
+    # Get integration names for better display
+    app_ids = response.suggested_apps or request.selected_apps or []
+    if name_cache is None:
+        integration_names = await get_integration_names(app_ids, database_service)
+    else:
+        missing = [app_id for app_id in app_ids if app_id not in name_cache]
+        if missing:
+            name_cache.update(await get_integration_names(missing, database_service))
+        integration_names = name_cache
+    
+    # Use integration names instead of IDs for display
+    display_apps = [
+        integration_names.get(app_id, app_id) 
+        for app_id in (response.suggested_apps or request.selected_apps or [])
+    ]
+    
+    # Create generation metadata for benchmarking
+    generation_metadata = {
+        "generation_time_seconds": round(generation_time, 3),
+        "model_version": getattr(response, 'model_version', 'unknown'),
+        "prompt_tokens": getattr(response, 'prompt_tokens', 0),
+        "completion_tokens": getattr(response, 'completion_tokens', 0),
+        "total_tokens": getattr(response, 'total_tokens', 0),
+        "generation_timestamp": time.time(),
+        "dsl_generator_version": "1.0.0",  # You can make this dynamic
+        "suggestion_number": index + 1,
+        "total_suggestions": num_suggestions
+    }
+    
+    suggestion = Suggestion(
+        suggestion_id=str(uuid.uuid4()),
+        title=workflow_name,
+        description=workflow_description,
+        dsl_parametric=dsl_parametric,
+        missing_fields=api_missing_fields,
+        confidence=response.confidence,
+        apps=display_apps,
+        source="generator",
+        # Store the full workflow JSON for preview
+        full_workflow_json=full_workflow_json
+    )
+    logging.info(f"[LINE 309] Created suggestion {suggestion.suggestion_id} for response {index+1}: {workflow_name}")
+    return suggestion, generation_metadata
+
+
+async def save_suggestion(
+    suggestions_service,
+    request: PlanRequest,
+    suggestion: Suggestion,
+    generation_metadata: Dict[str, Any]
+) -> bool:
+    """Persist a suggestion; failures are logged and never fail the request"""
+    if not suggestions_service:
+        logging.warning(f"[LINE 337] Suggestions service not available - suggestion {suggestion.suggestion_id} not saved to database")
+        return False
+    
+    try:
+        save_success = await suggestions_service.save_suggestion(
+            user_id=request.user_id,
+            user_request=request.user_request or "",
+            selected_apps=request.selected_apps or [],
+            suggestion_id=suggestion.suggestion_id,
+            title=suggestion.title,
+            description=suggestion.description,
+            dsl_parametric=suggestion.dsl_parametric.dict(),
+            missing_fields=[field.dict() for field in suggestion.missing_fields],
+            confidence=suggestion.confidence,
+            apps=suggestion.apps,
+            source="generator",
+            full_workflow_json=suggestion.full_workflow_json or {},
+            generation_metadata=generation_metadata
+        )
+        
+        if save_success:
+            logging.info(f"[LINE 329] Successfully saved suggestion {suggestion.suggestion_id} to database")
+        else:
+            logging.warning(f"[LINE 331] Failed to save suggestion {suggestion.suggestion_id} to database")
+        return bool(save_success)
+    except Exception as e:
+        logging.error(f"[LINE 334] Error saving suggestion {suggestion.suggestion_id} to database: {e}")
+        # Don't fail the request if saving fails
+        return False
 
 
 @router.post(":generate")
 async def generate_suggestions(
     request: PlanRequest,
+    _admission = Depends(admit_generation_request),
     generator = Depends(get_dsl_generator),
     database_service = Depends(get_database_service),
     suggestions_service = Depends(get_suggestions_db_service)
@@ -174,30 +411,8 @@ async def generate_suggestions(
         
         # Use real DSL generator service
         try:
-            logging.info(f"[LINE 169] Ensuring GenerationRequest is available...")
-            # Ensure GenerationRequest is available (lazy import fallback) without rebinding global
-            GenReq = GenerationRequest
-            if GenReq is None:
-                logging.warning(f"[LINE 173] GenerationRequest is None, attempting lazy import...")
-                try:
-                    from services.dsl_generator.models import GenerationRequest as _GenReq
-                    GenReq = _GenReq
-                    logging.info(f"[LINE 176] Successfully imported GenerationRequest")
-                except Exception as e:
-                    logging.error(f"[LINE 178] Failed to import GenerationRequest: {e}")
-                    raise Exception(f"Generator models unavailable: {e}")
-            else:
-                logging.info(f"[LINE 181] GenerationRequest is already available")
-
             logging.info(f"[LINE 184] Converting PlanRequest to GenerationRequest...")
-            # Convert PlanRequest to GenerationRequest
-            generation_request = GenReq(
-                user_prompt=request.user_request,
-                selected_apps=request.selected_apps,
-                user_id=request.user_id,
-                workflow_type="template",  # Default to template for suggestions
-                complexity="medium"        # Default to medium complexity
-            )
+            generation_request = to_generation_request(request)
             logging.info(f"[LINE 192] Created GenerationRequest: {generation_request}")
             logging.info(f"[LINE 193] GenerationRequest.user_prompt: '{generation_request.user_prompt}'")
             logging.info(f"[LINE 194] GenerationRequest.selected_apps: {generation_request.selected_apps}")
@@ -218,169 +433,11 @@ async def generate_suggestions(
             suggestions = []
             for i, response in enumerate(responses):
                 logging.info(f"[LINE 207] Processing response {i+1}: success={response.success}, error={getattr(response, 'error_message', 'N/A')}")
-                
-                if not response.success:
-                    logging.warning(f"[LINE 209] Response {i+1} failed: {response.error_message}")
-                    # Create a fallback suggestion for failed generations
-                    fallback_suggestion = Suggestion(
-                        suggestion_id=str(uuid.uuid4()),
-                        title=f"Failed Generation {i+1}",
-                        description=f"Workflow generation failed: {response.error_message}",
-                        dsl_parametric=DSLParametric(
-                            version=1,
-                            name=f"failed_workflow_{i+1}",
-                            connections={},
-                            trigger={"type": "manual"},
-                            actions=[{"type": "notification"}]
-                        ),
-                        missing_fields=[],
-                        confidence=0.0,
-                        apps=request.selected_apps or [],
-                        source="generator",
-                        full_workflow_json={}
-                    )
-                    suggestions.append(fallback_suggestion)
-                    continue
-                
-                logging.info(f"[LINE 225] Response {i+1} successful, processing dsl_template...")
-                
-                # Convert GenerationResponse to Suggestion
-                if response.dsl_template:
-                    logging.info(f"[LINE 228] Processing dsl_template for response {i+1}...")
-                    # Extract workflow information from the DSL template
-                    workflow = response.dsl_template.get("workflow", {})
-                    toolkit = response.dsl_template.get("toolkit", {})
-                    logging.info(f"[LINE 231] Extracted workflow: {workflow}")
-                    logging.info(f"[LINE 232] Extracted toolkit: {toolkit}")
-                    
-                    # Get workflow name and description (prefer AI-written description from DSL)
-                    workflow_name = workflow.get("name", f"generated_workflow_{i+1}")
-                    workflow_description = workflow.get("description") or response.reasoning or f"Automated workflow for: {request.user_request}"
-                    logging.info(f"[LINE 236] Workflow name: {workflow_name}")
-                    logging.info(f"[LINE 237] Workflow description: {workflow_description}")
-                    
-                    # Extract triggers and actions
-                    triggers = workflow.get("triggers", [])
-                    actions = workflow.get("actions", [])
-                    logging.info(f"[LINE 240] Extracted triggers: {triggers}")
-                    logging.info(f"[LINE 241] Extracted actions: {actions}")
-                    
-                    # Create DSL parametric structure
-                    dsl_parametric = DSLParametric(
-                        version=1,
-                        name=workflow_name,
-                        connections=response.dsl_template.get("connections", {}),
-                        trigger=triggers[0] if triggers else {"type": "manual"},
-                        actions=actions if actions else [{"type": "notification"}]
-                    )
-                    logging.info(f"[LINE 248] Created DSLParametric for response {i+1}: {dsl_parametric}")
-                else:
-                    logging.warning(f"[LINE 250] No dsl_template found for response {i+1}, using fallback...")
-                    # Fallback if no DSL template
-                    workflow_name = f"generated_workflow_{i+1}"
-                    workflow_description = response.reasoning or f"Automated workflow for: {request.user_request}"
-                    dsl_parametric = DSLParametric(
-                        version=1,
-                        name=workflow_name,
-                        connections={},
-                        trigger={"type": "manual"},
-                        actions=[{"type": "notification"}]
-                    )
-                    logging.info(f"[LINE 259] Created fallback DSLParametric for response {i+1}: {dsl_parametric}")
-                
-                # Convert DSL generator MissingField objects to API MissingField format
-                api_missing_fields = []
-                if response.missing_fields:
-                    logging.info(f"[LINE 263] Processing missing_fields for response {i+1}: {response.missing_fields}")
-                    for missing_field in response.missing_fields:
-                        api_missing_field = {
-                            "path": missing_field.field,
-                            "prompt": missing_field.prompt,
-                            "type_hint": missing_field.type
-                        }
-                        api_missing_fields.append(api_missing_field)
-                        logging.info(f"[LINE 269] Converted missing field: {api_missing_field}")
-                else:
-                    logging.info(f"[LINE 271] No missing fields found for response {i+1}")
-                
-                logging.info(f"[LINE 273] Getting integration names for response {i+1}...")
-                # Get integration names for better display
-                integration_names = await get_integration_names(
-                    response.suggested_apps or request.selected_apps or [], 
-                    database_service
-                )
-                logging.info(f"[LINE 277] Integration names for response {i+1}: {integration_names}")
-                
-                # Use integration names instead of IDs for display
-                display_apps = [
-                    integration_names.get(app_id, app_id) 
-                    for app_id in (response.suggested_apps or request.selected_apps or [])
-                ]
-                logging.info(f"[LINE 282] Display apps for response {i+1}: {display_apps}")
-                
-                # Generate unique suggestion ID
-                suggestion_id = str(uuid.uuid4())
-                logging.info(f"[LINE 285] Generated suggestion ID for response {i+1}: {suggestion_id}")
-                
-                # Create generation metadata for benchmarking
-                generation_metadata = {
-                    "generation_time_seconds": round(generation_time, 3),
-                    "model_version": getattr(response, 'model_version', 'unknown'),
-                    "prompt_tokens": getattr(response, 'prompt_tokens', 0),
-                    "completion_tokens": getattr(response, 'completion_tokens', 0),
-                    "total_tokens": getattr(response, 'total_tokens', 0),
-                    "generation_timestamp": time.time(),
-                    "dsl_generator_version": "1.0.0",  # You can make this dynamic
-                    "suggestion_number": i + 1,
-                    "total_suggestions": num_suggestions
-                }
-                logging.info(f"[LINE 297] Created generation metadata for response {i+1}: {generation_metadata}")
-                
-                suggestion = Suggestion(
-                    suggestion_id=suggestion_id,
-                    title=workflow_name,
-                    description=workflow_description,
-                    dsl_parametric=dsl_parametric,
-                    missing_fields=api_missing_fields,
-                    confidence=response.confidence,
-                    apps=display_apps,
-                    source="generator",
-                    # Store the full workflow JSON for preview
-                    full_workflow_json=response.dsl_template or response.workflow_json or {}
+                suggestion, generation_metadata = await build_suggestion(
+                    response, i, request, generation_time, num_suggestions, database_service
                 )
-                logging.info(f"[LINE 309] Created Suggestion object for response {i+1}: {suggestion}")
-                
-                # Save suggestion to database if service is available
-                if suggestions_service:
-                    logging.info(f"[LINE 312] Suggestions service available, saving response {i+1} to database...")
-                    try:
-                        save_success = await suggestions_service.save_suggestion(
-                            user_id=request.user_id,
-                            user_request=request.user_request or "",
-                            selected_apps=request.selected_apps or [],
-                            suggestion_id=suggestion_id,
-                            title=workflow_name,
-                            description=workflow_description,
-                            dsl_parametric=dsl_parametric.dict(),
-                            missing_fields=api_missing_fields,
-                            confidence=response.confidence,
-                            apps=display_apps,
-                            source="generator",
-                            full_workflow_json=response.dsl_template or response.workflow_json or {},
-                            generation_metadata=generation_metadata
-                        )
-                        
-                        if save_success:
-                            logging.info(f"[LINE 329] Successfully saved suggestion {suggestion_id} to database")
-                        else:
-                            logging.warning(f"[LINE 331] Failed to save suggestion {suggestion_id} to database")
-                            
-                    except Exception as e:
-                        logging.error(f"[LINE 334] Error saving suggestion {i+1} to database: {e}")
-                        # Don't fail the request if saving fails
-                else:
-                    logging.warning(f"[LINE 337] Suggestions service not available - suggestion {i+1} not saved to database")
-                
+                if response.success:
+                    await save_suggestion(suggestions_service, request, suggestion, generation_metadata)
                 suggestions.append(suggestion)
             
             logging.info(f"[LINE 340] Returning PlanResponse with {len(suggestions)} suggestions...")
@@ -409,6 +466,204 @@ async def generate_suggestions(
         )
 
 
+# Suggestion saves running off the response path (kept referenced until done)
+_background_saves = set()
+
+
+def save_suggestion_in_background(
+    suggestions_service,
+    request: PlanRequest,
+    suggestion: Suggestion,
+    generation_metadata: Dict[str, Any]
+) -> None:
+    """Persist a suggestion without delaying the response"""
+    task = asyncio.create_task(save_suggestion(suggestions_service, request, suggestion, generation_metadata))
+    _background_saves.add(task)
+    task.add_done_callback(_background_saves.discard)
+
+
+def _encode_stream_event(stream_format: str, event: str, data: Dict[str, Any]) -> str:
+    """Encode one streamed event as an SSE message or an NDJSON line"""
+    if stream_format == "sse":
+        return format_sse(event, data)
+    return json_codec.dumps_str({"event": event, **data}) + "\n"
+
+
+@router.post(":stream")
+async def stream_suggestions(
+    request: PlanRequest,
+    stream_format: str = Query("ndjson", alias="format"),
+    _admission = Depends(admit_generation_request),
+    generator = Depends(get_dsl_generator),
+    database_service = Depends(get_database_service),
+    suggestions_service = Depends(get_suggestions_db_service)
+):
+    """
+    Generate workflow suggestions, streaming each one as soon as it finishes.
+    
+    Emits ``suggestion`` events in completion order, then a ``done`` event
+    (or ``error`` if generation fails mid-stream). ``format`` is ``ndjson``
+    (one JSON object per line, default) or ``sse`` (Server-Sent Events).
+    Suggestions are saved to the database in the background.
+    """
+    if stream_format not in ("ndjson", "sse"):
+        raise HTTPException(
+            status_code=400,
+            detail="format must be 'ndjson' or 'sse'"
+        )
+    if not generator:
+        raise HTTPException(
+            status_code=503, 
+            detail="DSL Generator service is not available. Please ensure the service is properly configured."
+        )
+    
+    generation_request = to_generation_request(request)
+    num_suggestions = request.num_suggestions or 1
+    
+    async def event_stream():
+        start_time = time.time()
+        name_cache: Dict[str, str] = {}
+        # Resolve display names while generation runs
+        names_task = asyncio.create_task(get_integration_names(request.selected_apps or [], database_service))
+        
+        count = 0
+        variations = generator.iter_multiple_workflows(generation_request, num_suggestions)
+        try:
+            async for index, response in variations:
+                elapsed = time.time() - start_time
+                if names_task is not None:
+                    name_cache.update(await names_task)
+                    names_task = None
+                suggestion, generation_metadata = await build_suggestion(
+                    response, index, request, elapsed, num_suggestions, database_service, name_cache
+                )
+                if response.success:
+                    save_suggestion_in_background(suggestions_service, request, suggestion, generation_metadata)
+                if count == 0:
+                    logging.info(f"⏱️ First streamed suggestion after {elapsed:.3f}s")
+                count += 1
+                yield _encode_stream_event(stream_format, "suggestion", {
+                    "index": index,
+                    "elapsed_seconds": round(elapsed, 3),
+                    "suggestion": suggestion.dict()
+                })
+        except Exception as e:
+            logging.error(f"❌ Suggestion stream failed: {e}")
+            yield _encode_stream_event(stream_format, "error", {"detail": f"Failed to generate workflow suggestions: {str(e)}"})
+            return
+        finally:
+            # On client disconnect, cancel the generations still running
+            await variations.aclose()
+            if names_task is not None:
+                names_task.cancel()
+        
+        yield _encode_stream_event(stream_format, "done", {
+            "count": count,
+            "elapsed_seconds": round(time.time() - start_time, 3)
+        })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_suggestions_job(job, request: PlanRequest) -> None:
+    """Job runner: generate suggestions and publish each one as it finishes"""
+    generator = await get_dsl_generator()
+    if not generator:
+        raise RuntimeError("DSL Generator service is not available")
+    database_service = await get_database_service()
+    suggestions_service = await get_suggestions_db_service()
+    
+    generation_request = to_generation_request(request)
+    num_suggestions = request.num_suggestions or 1
+    start_time = time.time()
+    name_cache: Dict[str, str] = {}
+    async for index, response in generator.iter_multiple_workflows(
+        generation_request, num_suggestions, on_stage=job.stage
+    ):
+        suggestion, generation_metadata = await build_suggestion(
+            response, index, request, time.time() - start_time, num_suggestions, database_service, name_cache
+        )
+        if response.success:
+            await save_suggestion(suggestions_service, request, suggestion, generation_metadata)
+        await job.add_suggestion(suggestion.dict())
+
+
+def _require_generation_jobs():
+    if not GENERATION_JOBS_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Generation jobs not available"
+        )
+    return get_generation_job_manager()
+
+
+@router.post("/jobs", status_code=202)
+async def create_suggestions_job(request: PlanRequest, http_request: Request):
+    """Start generating suggestions in the background and return a job id immediately"""
+    manager = _require_generation_jobs()
+    try:
+        record = await manager.submit(
+            request,
+            run_suggestions_job,
+            user_id=request.user_id,
+            priority=request.priority or "interactive",
+            total_suggestions=request.num_suggestions or 1
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    
+    job_id = record["job_id"]
+    return {
+        "job_id": job_id,
+        "status": record["status"],
+        # Resolved from the routes, so the URLs include the /api mount prefix
+        "status_url": str(http_request.url_for("get_suggestions_job", job_id=job_id)),
+        "events_url": str(http_request.url_for("stream_suggestions_job", job_id=job_id))
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_suggestions_job(job_id: str):
+    """Get job status, stage progress and the suggestions finished so far"""
+    manager = _require_generation_jobs()
+    record = await manager.get(job_id)
+    if not record:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found or expired"
+        )
+    return record
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_suggestions_job(job_id: str):
+    """Server-Sent Events stream of stage progress and suggestions for a job"""
+    manager = _require_generation_jobs()
+    if not await manager.get(job_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found or expired"
+        )
+    
+    async def event_stream():
+        async for event, data in manager.events(job_id):
+            yield format_sse(event, data)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{suggestion_id}/preview")
 async def preview_workflow(
     suggestion_id: str,
@@ -494,6 +749,23 @@ async def update_suggestion_actions(
         )
 
 
+@router.get("/admission")
+async def get_admission_stats():
+    """Get admission control queue metrics for workflow generation"""
+    if not ADMISSION_CONTROL_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Admission control not available"
+        )
+    return get_admission_controller().get_stats()
+
+
+@router.get("/jobs")
+async def get_jobs_stats():
+    """Get background generation job queue metrics"""
+    return _require_generation_jobs().get_stats()
+
+
 @router.get("/analytics")
 async def get_suggestions_analytics(
     days: int = 30,
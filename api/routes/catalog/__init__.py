@@ -6,10 +6,12 @@ from api.routes.catalog.providers import router as providers_router
 from api.routes.catalog.tools import router as tools_router
 
 # Create a combined catalog router
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request
 from typing import Optional, List, Dict, Any
 import logging
 
+from api.catalog_response_cache import get_catalog_response_cache
+
 logger = logging.getLogger(__name__)
 
 catalog_router = APIRouter(prefix="/catalog", tags=["Catalog"])
@@ -19,8 +21,81 @@ catalog_router.include_router(providers_router)
 catalog_router.include_router(tools_router)
 
 
+def _toolkit_item(toolkit_record) -> Dict[str, Any]:
+    """Catalog listing entry for a snapshot toolkit"""
+    provider_data = toolkit_record.data
+    actions = provider_data.get('actions', [])
+    triggers = provider_data.get('triggers', [])
+    return {
+        "id": provider_data.get('id'),
+        "slug": toolkit_record.slug,
+        "name": provider_data.get('name', toolkit_record.slug),
+        "description": provider_data.get('description'),
+        "icon_url": provider_data.get('logo_url'),
+        "website_url": provider_data.get('website_url'),
+        "category": provider_data.get('category'),
+        "version": provider_data.get('version'),
+        "created_at": provider_data.get('created_at'),
+        "updated_at": provider_data.get('updated_at'),
+        "stats": {
+            "total_tools": len(actions) + len(triggers),
+            "actions": len(actions),
+            "triggers": len(triggers)
+        },
+        "tools": {
+            "actions": actions,
+            "triggers": triggers
+        }
+    }
+
+
+def _catalog_page_from_snapshot(
+    snapshot,
+    search: Optional[str],
+    category: Optional[str],
+    has_actions: Optional[bool],
+    has_triggers: Optional[bool],
+    limit: Optional[int],
+    offset: Optional[int]
+) -> Dict[str, Any]:
+    """Build a GET /catalog page from the catalog snapshot"""
+    # Filtered, name-sorted toolkits come precomputed with the snapshot
+    toolkits = snapshot.views.toolkits(category, has_actions, has_triggers, search)
+    
+    # Apply pagination, then build entries for this page only
+    total_count = len(toolkits)
+    page = toolkits[offset:offset + limit] if limit else toolkits[offset:]
+    paginated_items = [_toolkit_item(toolkit_record) for toolkit_record in page]
+    
+    return {
+        "items": paginated_items,
+        "pagination": {
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": limit and (offset + limit) < total_count,
+            "page": (offset // limit) + 1 if limit else 1,
+            "total_pages": (total_count + limit - 1) // limit if limit else 1
+        },
+        "filters": {
+            "search": search,
+            "category": category,
+            "has_actions": has_actions,
+            "has_triggers": has_triggers
+        },
+        "summary": {
+            "total_toolkits": len(paginated_items),
+            "total_tools": sum(item["stats"]["total_tools"] for item in paginated_items),
+            "total_actions": sum(item["stats"]["actions"] for item in paginated_items),
+            "total_triggers": sum(item["stats"]["triggers"] for item in paginated_items)
+        },
+        "source": "cache"
+    }
+
+
 @catalog_router.get("")
 async def get_catalog(
+    request: Request,
     search: Optional[str] = Query(None, description="Search term for toolkit names and descriptions"),
     category: Optional[str] = Query(None, description="Filter by toolkit category"),
     has_actions: Optional[bool] = Query(None, description="Filter toolkits that have actions"),
@@ -43,97 +118,21 @@ async def get_catalog(
             logger.warning("Cache service not initialized, attempting to initialize")
             await cache_service.initialize()
         
-        # Get cached catalog data
-        catalog_cache = cache_service.get_catalog_cache()
+        # Get the shared catalog snapshot
+        snapshot = cache_service.get_catalog_snapshot()
         
-        if not catalog_cache:
+        if not snapshot:
             logger.warning("No catalog cache available, falling back to direct database query")
             return await _fallback_get_catalog_database(search, category, has_actions, has_triggers, limit, offset)
         
-        # Convert cached data to catalog items
-        catalog_items = []
-        for provider_slug, provider_data in catalog_cache.items():
-            actions = provider_data.get('actions', [])
-            triggers = provider_data.get('triggers', [])
-            
-            # Apply filters
-            if category and provider_data.get('category') != category:
-                continue
-            
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in provider_data.get('name', '').lower() and
-                    search_lower not in provider_data.get('description', '').lower()):
-                    continue
-            
-            if has_actions is not None:
-                if has_actions and not actions:
-                    continue
-                if not has_actions and actions:
-                    continue
-            
-            if has_triggers is not None:
-                if has_triggers and not triggers:
-                    continue
-                if not has_triggers and triggers:
-                    continue
-            
-            # Create toolkit entry
-            toolkit = {
-                "id": provider_data.get('id'),
-                "slug": provider_slug,
-                "name": provider_data.get('name', provider_slug),
-                "description": provider_data.get('description'),
-                "icon_url": provider_data.get('logo_url'),
-                "website_url": provider_data.get('website_url'),
-                "category": provider_data.get('category'),
-                "version": provider_data.get('version'),
-                "created_at": provider_data.get('created_at'),
-                "updated_at": provider_data.get('updated_at'),
-                "stats": {
-                    "total_tools": len(actions) + len(triggers),
-                    "actions": len(actions),
-                    "triggers": len(triggers)
-                },
-                "tools": {
-                    "actions": actions,
-                    "triggers": triggers
-                }
-            }
-            
-            catalog_items.append(toolkit)
-        
-        # Sort by name
-        catalog_items.sort(key=lambda x: x['name'])
-        
-        # Apply pagination
-        total_count = len(catalog_items)
-        paginated_items = catalog_items[offset:offset + limit] if limit else catalog_items[offset:]
-        
-        return {
-            "items": paginated_items,
-            "pagination": {
-                "total": total_count,
-                "limit": limit,
-                "offset": offset,
-                "has_more": limit and (offset + limit) < total_count,
-                "page": (offset // limit) + 1 if limit else 1,
-                "total_pages": (total_count + limit - 1) // limit if limit else 1
-            },
-            "filters": {
-                "search": search,
-                "category": category,
-                "has_actions": has_actions,
-                "has_triggers": has_triggers
-            },
-            "summary": {
-                "total_toolkits": len(paginated_items),
-                "total_tools": sum(item["stats"]["total_tools"] for item in paginated_items),
-                "total_actions": sum(item["stats"]["actions"] for item in paginated_items),
-                "total_triggers": sum(item["stats"]["triggers"] for item in paginated_items)
-            },
-            "source": "cache"
+        params = {
+            "search": search, "category": category, "has_actions": has_actions,
+            "has_triggers": has_triggers, "limit": limit, "offset": offset
         }
+        return get_catalog_response_cache().respond(
+            request, snapshot, "catalog", params,
+            lambda: _catalog_page_from_snapshot(snapshot, **params)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching catalog from cache: {e}")
@@ -331,8 +330,28 @@ async def _fallback_get_catalog_database(
             detail=f"Failed to fetch catalog: {str(e)}"
         )
 
+def _categories_from_snapshot(snapshot) -> Dict[str, Any]:
+    """Build a GET /catalog/categories response from the catalog snapshot"""
+    # Categories come straight from the snapshot's category index
+    categories = [
+        {
+            "slug": category,
+            "name": category,
+            "toolkit_count": len(toolkits)
+        }
+        for category, toolkits in snapshot.toolkits_by_category.items()
+        if category
+    ]
+    categories.sort(key=lambda x: x['toolkit_count'], reverse=True)
+    
+    return {
+        "categories": categories,
+        "total": len(categories),
+        "source": "cache"
+    }
+
 @catalog_router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """Get all available toolkit categories using cached data"""
     try:
         # Get the global cache service
@@ -343,38 +362,17 @@ async def get_categories():
             logger.warning("Cache service not initialized, attempting to initialize")
             await cache_service.initialize()
         
-        # Get cached catalog data
-        catalog_cache = cache_service.get_catalog_cache()
+        # Get the shared catalog snapshot
+        snapshot = cache_service.get_catalog_snapshot()
         
-        if not catalog_cache:
+        if not snapshot:
             logger.warning("No catalog cache available, falling back to direct database query")
             return await _fallback_get_categories_database()
         
-        # Extract categories from cached data
-        categories_dict = {}
-        for provider_slug, provider_data in catalog_cache.items():
-            category = provider_data.get('category')
-            if category:
-                if category not in categories_dict:
-                    categories_dict[category] = 0
-                categories_dict[category] += 1
-        
-        # Convert to list and sort by count
-        categories = [
-            {
-                "slug": category,
-                "name": category,
-                "toolkit_count": count
-            }
-            for category, count in categories_dict.items()
-        ]
-        categories.sort(key=lambda x: x['toolkit_count'], reverse=True)
-        
-        return {
-            "categories": categories,
-            "total": len(categories),
-            "source": "cache"
-        }
+        return get_catalog_response_cache().respond(
+            request, snapshot, "catalog.categories", {},
+            lambda: _categories_from_snapshot(snapshot)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching categories from cache: {e}")
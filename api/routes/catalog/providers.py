@@ -2,17 +2,55 @@
 Catalog providers routes.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Dict, Any, Optional
 import logging
 
+from api.catalog_response_cache import get_catalog_response_cache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/providers", tags=["Catalog"])
 
 
+def _provider_from_snapshot(snapshot, provider_slug: str) -> Dict[str, Any]:
+    """Build a GET /catalog/providers/{provider_slug} response from the catalog snapshot"""
+    provider_data = snapshot.providers[provider_slug]
+    
+    # Get actions and triggers
+    actions = provider_data.get('actions', [])
+    triggers = provider_data.get('triggers', [])
+    
+    # Build provider response
+    provider = {
+        "id": provider_data.get('id'),
+        "slug": provider_slug,
+        "name": provider_data.get('name', provider_slug),
+        "description": provider_data.get('description'),
+        "logo_url": provider_data.get('logo_url'),
+        "website_url": provider_data.get('website_url'),
+        "category": provider_data.get('category'),
+        "version": provider_data.get('version'),
+        "created_at": provider_data.get('created_at'),
+        "updated_at": provider_data.get('updated_at'),
+        "last_synced_at": provider_data.get('last_synced_at'),
+        "stats": {
+            "total_tools": len(actions) + len(triggers),
+            "actions": len(actions),
+            "triggers": len(triggers)
+        },
+        "tools": {
+            "actions": actions,
+            "triggers": triggers
+        },
+        "source": "cache"
+    }
+    
+    return provider
+
+
 @router.get("/{provider_slug}")
-async def get_provider(provider_slug: str):
+async def get_provider(provider_slug: str, request: Request):
     """Get toolkit information by slug with all associated tools using cached data"""
     try:
         # Get the global cache service
@@ -23,52 +61,24 @@ async def get_provider(provider_slug: str):
             logger.warning("Cache service not initialized, attempting to initialize")
             await cache_service.initialize()
         
-        # Get cached catalog data
-        catalog_cache = cache_service.get_catalog_cache()
+        # Get the shared catalog snapshot
+        snapshot = cache_service.get_catalog_snapshot()
         
-        if not catalog_cache:
+        if not snapshot:
             logger.warning("No catalog cache available, falling back to direct database query")
             return await _fallback_get_provider_database(provider_slug)
         
         # Look for provider in cached data
-        if provider_slug not in catalog_cache:
+        if provider_slug not in snapshot:
             raise HTTPException(
                 status_code=404,
                 detail=f"Provider '{provider_slug}' not found"
             )
         
-        provider_data = catalog_cache[provider_slug]
-        
-        # Get actions and triggers
-        actions = provider_data.get('actions', [])
-        triggers = provider_data.get('triggers', [])
-        
-        # Build provider response
-        provider = {
-            "id": provider_data.get('id'),
-            "slug": provider_slug,
-            "name": provider_data.get('name', provider_slug),
-            "description": provider_data.get('description'),
-            "logo_url": provider_data.get('logo_url'),
-            "website_url": provider_data.get('website_url'),
-            "category": provider_data.get('category'),
-            "version": provider_data.get('version'),
-            "created_at": provider_data.get('created_at'),
-            "updated_at": provider_data.get('updated_at'),
-            "last_synced_at": provider_data.get('last_synced_at'),
-            "stats": {
-                "total_tools": len(actions) + len(triggers),
-                "actions": len(actions),
-                "triggers": len(triggers)
-            },
-            "tools": {
-                "actions": actions,
-                "triggers": triggers
-            },
-            "source": "cache"
-        }
-        
-        return provider
+        return get_catalog_response_cache().respond(
+            request, snapshot, "catalog.provider", {"provider_slug": provider_slug},
+            lambda: _provider_from_snapshot(snapshot, provider_slug)
+        )
             
     except HTTPException:
         raise
@@ -2,10 +2,12 @@
 Catalog tools routes.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import List, Dict, Any, Optional
 import logging
 
+from api.catalog_response_cache import get_catalog_response_cache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tools", tags=["Catalog"])
@@ -20,6 +22,7 @@ async def _fallback_database_query(
 ):
     """Fallback to direct database query when cache is not available"""
     try:
+        from bson import ObjectId
         from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
         from database.config import get_database_url
         
@@ -86,12 +89,20 @@ async def _fallback_database_query(
         
         tools_data = await cursor.to_list(length=None)
         
-        # Get toolkit information for each tool
+        # Get toolkit information for all tools with one query. toolkit_id
+        # holds the toolkit's _id, stored either as an ObjectId or as a string.
+        toolkit_ids = {tool["toolkit_id"] for tool in tools_data if tool.get("toolkit_id")}
+        lookup_ids = list(toolkit_ids) + [
+            ObjectId(tid) for tid in toolkit_ids if isinstance(tid, str) and ObjectId.is_valid(tid)
+        ]
+        toolkits_by_id = {}
+        if lookup_ids:
+            toolkit_cursor = database.toolkits.find({"_id": {"$in": lookup_ids}}, {"slug": 1, "name": 1, "category": 1})
+            toolkits_by_id = {str(doc["_id"]): doc async for doc in toolkit_cursor}
+        
         tools = []
         for tool in tools_data:
-            toolkit = await database.toolkits.find_one({
-                "_id": tool["toolkit_id"]
-            })
+            toolkit = toolkits_by_id.get(str(tool.get("toolkit_id")))
             
             tool_info = {
                 "id": str(tool["_id"]),
@@ -140,8 +151,56 @@ async def _fallback_database_query(
             detail=f"Failed to fetch tools: {str(e)}"
         )
 
+def _list_tools_from_snapshot(
+    snapshot,
+    provider: Optional[str],
+    search: Optional[str],
+    tool_type: Optional[str],
+    limit: Optional[int],
+    offset: Optional[int]
+) -> Dict[str, Any]:
+    """Build a GET /catalog/tools page from the catalog snapshot"""
+    # Filtered, sorted tools come precomputed with the snapshot
+    tools = snapshot.views.tools(provider, tool_type, search)
+    
+    # Apply pagination
+    total_count = len(tools)
+    page = tools[offset:offset + limit] if limit else tools[offset:]
+    
+    # Add provider info to a per-response copy of each tool on the page
+    paginated_tools = []
+    for tool in page:
+        toolkit = snapshot.get_toolkit(tool.toolkit_slug)
+        paginated_tools.append({
+            **tool.data,
+            'toolkit': {
+                'slug': toolkit.slug,
+                'name': toolkit.name,
+                'category': toolkit.category
+            }
+        })
+    
+    return {
+        "tools": paginated_tools,
+        "pagination": {
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": limit and (offset + limit) < total_count,
+            "page": (offset // limit) + 1 if limit else 1,
+            "total_pages": (total_count + limit - 1) // limit if limit else 1
+        },
+        "filters": {
+            "provider": provider,
+            "search": search,
+            "tool_type": tool_type
+        },
+        "source": "cache"
+    }
+
 @router.get("")
 async def list_tools(
+    request: Request,
     provider: Optional[str] = Query(None, description="Filter by toolkit slug"),
     search: Optional[str] = Query(None, description="Search term for tool names and descriptions"),
     tool_type: Optional[str] = Query(None, description="Filter by tool type: 'action' or 'trigger'"),
@@ -158,94 +217,43 @@ async def list_tools(
             logger.warning("Cache service not initialized, attempting to initialize")
             await cache_service.initialize()
         
-        # Get cached catalog data
-        catalog_cache = cache_service.get_catalog_cache()
+        # Get the shared catalog snapshot
+        snapshot = cache_service.get_catalog_snapshot()
         
-        if not catalog_cache:
+        if not snapshot:
             logger.warning("No catalog cache available, falling back to direct database query")
             # Fallback to direct database query if cache is not available
             return await _fallback_database_query(provider, search, tool_type, limit, offset)
         
-        # Extract all tools from cached providers
-        all_tools = []
-        for provider_slug, provider_data in catalog_cache.items():
-            # Skip if provider filter is specified and doesn't match
-            if provider and provider_slug != provider:
-                continue
-                
-            # Get actions and triggers from this provider
-            actions = provider_data.get('actions', [])
-            triggers = provider_data.get('triggers', [])
-            
-            # Add provider info to each tool
-            for action in actions:
-                action['toolkit'] = {
-                    'slug': provider_slug,
-                    'name': provider_data.get('name', provider_slug),
-                    'category': provider_data.get('category')
-                }
-                all_tools.append(action)
-            
-            for trigger in triggers:
-                trigger['toolkit'] = {
-                    'slug': provider_slug,
-                    'name': provider_data.get('name', provider_slug),
-                    'category': provider_data.get('category')
-                }
-                all_tools.append(trigger)
-        
-        # Apply filters
-        filtered_tools = all_tools
-        
-        # Apply tool type filter
-        if tool_type:
-            filtered_tools = [tool for tool in filtered_tools if tool.get('type') == tool_type]
-        
-        # Apply search filter
-        if search:
-            search_lower = search.lower()
-            filtered_tools = [
-                tool for tool in filtered_tools
-                if (search_lower in tool.get('name', '').lower() or
-                    search_lower in tool.get('description', '').lower())
-            ]
-        
-        # Sort tools
-        filtered_tools.sort(key=lambda x: (
-            x.get('toolkit', {}).get('slug', ''),
-            x.get('type', ''),
-            x.get('name', '')
-        ))
-        
-        # Apply pagination
-        total_count = len(filtered_tools)
-        paginated_tools = filtered_tools[offset:offset + limit] if limit else filtered_tools[offset:]
-        
-        return {
-            "tools": paginated_tools,
-            "pagination": {
-                "total": total_count,
-                "limit": limit,
-                "offset": offset,
-                "has_more": limit and (offset + limit) < total_count,
-                "page": (offset // limit) + 1 if limit else 1,
-                "total_pages": (total_count + limit - 1) // limit if limit else 1
-            },
-            "filters": {
-                "provider": provider,
-                "search": search,
-                "tool_type": tool_type
-            },
-            "source": "cache"
-        }
+        params = {"provider": provider, "search": search, "tool_type": tool_type, "limit": limit, "offset": offset}
+        return get_catalog_response_cache().respond(
+            request, snapshot, "catalog.tools", params,
+            lambda: _list_tools_from_snapshot(snapshot, **params)
+        )
         
     except Exception as e:
         logger.error(f"Error fetching tools from cache: {e}")
         # Fallback to database query
         return await _fallback_database_query(provider, search, tool_type, limit, offset)
 
+def _tool_detail(snapshot, tool) -> Dict[str, Any]:
+    """Build a GET /catalog/tools/{tool_name} response for a snapshot tool"""
+    toolkit = snapshot.get_toolkit(tool.toolkit_slug)
+    return {
+        **tool.data,
+        'toolkit': {
+            'slug': toolkit.slug,
+            'name': toolkit.name,
+            'category': toolkit.category,
+            'description': toolkit.data.get('description'),
+            'logo_url': toolkit.data.get('logo_url'),
+            'website_url': toolkit.data.get('website_url')
+        },
+        "source": "cache"
+    }
+
 @router.get("/{tool_name}")
-async def get_tool(tool_name: str):
+async def get_tool(tool_name: str, request: Request):
     """Get tool information by name using cached data"""
     try:
         # Get the global cache service
@@ -256,40 +264,21 @@ async def get_tool(tool_name: str):
             logger.warning("Cache service not initialized, attempting to initialize")
             await cache_service.initialize()
         
-        # Get cached catalog data
-        catalog_cache = cache_service.get_catalog_cache()
+        # Get the shared catalog snapshot
+        snapshot = cache_service.get_catalog_snapshot()
         
-        if not catalog_cache:
+        if not snapshot:
             logger.warning("No catalog cache available, falling back to direct database query")
             return await _fallback_get_tool_database(tool_name)
         
-        # Search for tool in cached data
-        for provider_slug, provider_data in catalog_cache.items():
-            # Check actions
-            for action in provider_data.get('actions', []):
-                if action.get('slug') == tool_name or action.get('name') == tool_name:
-                    action['toolkit'] = {
-                        'slug': provider_slug,
-                        'name': provider_data.get('name', provider_slug),
-                        'category': provider_data.get('category'),
-                        'description': provider_data.get('description'),
-                        'logo_url': provider_data.get('logo_url'),
-                        'website_url': provider_data.get('website_url')
-                    }
-                    return {**action, "source": "cache"}
-            
-            # Check triggers
-            for trigger in provider_data.get('triggers', []):
-                if trigger.get('slug') == tool_name or trigger.get('name') == tool_name:
-                    trigger['toolkit'] = {
-                        'slug': provider_slug,
-                        'name': provider_data.get('name', provider_slug),
-                        'category': provider_data.get('category'),
-                        'description': provider_data.get('description'),
-                        'logo_url': provider_data.get('logo_url'),
-                        'website_url': provider_data.get('website_url')
-                    }
-                    return {**trigger, "source": "cache"}
+        # Look the tool up by slug, then by name or alias
+        tool = snapshot.get_tool(tool_name) or snapshot.lookup.find(tool_name)
+        
+        if tool is not None:
+            return get_catalog_response_cache().respond(
+                request, snapshot, "catalog.tool", {"tool_name": tool_name},
+                lambda: _tool_detail(snapshot, tool)
+            )
         
         # Tool not found in cache, try database fallback
         return await _fallback_get_tool_database(tool_name)
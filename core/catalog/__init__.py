@@ -41,6 +41,11 @@ from .service import CatalogService
 from .database_service import DatabaseCatalogService
 from .redis_client import RedisClientFactory
 from .cache import RedisCacheStore
+from .chunked_store import ChunkedCatalogStore
+from .sync import CatalogSync
+from .snapshot import CatalogSnapshot, FrozenDict, ToolRecord, ToolkitRecord
+from .lookup import ToolLookupIndex
+from .views import CatalogViews
 
 __all__ = [
     # Models
@@ -73,6 +78,16 @@ __all__ = [
     # Redis Components
     "RedisClientFactory",
     "RedisCacheStore",
+    "ChunkedCatalogStore",
+    "CatalogSync",
+    
+    # In-memory snapshot
+    "CatalogSnapshot",
+    "FrozenDict",
+    "ToolRecord",
+    "ToolkitRecord",
+    "ToolLookupIndex",
+    "CatalogViews",
 ]
 
 __version__ = "1.0.0"
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
@@ -7,17 +6,9 @@ import hashlib
 
 from redis.asyncio import Redis
 
-logger = logging.getLogger(__name__)
-
+from core import json_codec
 
-class DateTimeEncoder(json.JSONEncoder):
-    """JSON encoder that handles datetime objects"""
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, timedelta):
-            return obj.total_seconds()
-        return super().default(obj)
+logger = logging.getLogger(__name__)
 
 
 class RedisCacheStore:
@@ -34,7 +25,7 @@ class RedisCacheStore:
             cache_key = f"{self.key_prefix}:{key}"
             data = await self.redis.get(cache_key)
             if data:
-                return json.loads(data)
+                return json_codec.loads(data)
             return None
         except Exception as e:
             logger.error(f"Error getting from Redis cache: {e}")
@@ -44,8 +35,8 @@ class RedisCacheStore:
         """Set value in cache with optional TTL"""
         try:
             cache_key = f"{self.key_prefix}:{key}"
-            # Use custom encoder to handle datetime objects
-            data = json.dumps(value, cls=DateTimeEncoder)
+            # Codec handles datetime, timedelta and numpy values
+            data = json_codec.dumps(value)
             ttl = ttl or self.default_ttl
             
             await self.redis.setex(cache_key, ttl, data)
@@ -0,0 +1,283 @@
+"""
+Chunked, compressed Redis storage for the catalog.
+
+Instead of one multi-MB JSON value that every reader transfers and parses
+in full, each provider is stored under its own key in a compact binary
+encoding (msgpack + zstd when installed, JSON + zlib otherwise) next to a
+small JSON manifest:
+
+    {prefix}:manifest              -> {"version", "codec", "saved_at", "providers": {slug: meta}}
+    {prefix}:{version}:p:{slug}    -> one encoded provider
+
+Provider keys include the catalog version and the manifest is written last,
+so a reader always sees one complete version. Older chunks simply expire.
+Reads are pipelined MGETs; filtered reads (providers, categories,
+has_actions/has_triggers) are resolved against the manifest and only fetch
+the providers they need.
+
+Every chunk starts with a two-byte header naming its serializer and
+compressor, so workers with different optional libraries installed can
+still read each other's chunks (or treat them as a miss).
+"""
+
+import hashlib
+import logging
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from core import json_codec
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; chunks fall back to JSON
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; chunks fall back to zlib
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SERIALIZER_MSGPACK = b"m"
+SERIALIZER_JSON = b"j"
+COMPRESSOR_ZSTD = b"z"
+COMPRESSOR_ZLIB = b"d"
+
+_SERIALIZER_NAMES = {SERIALIZER_MSGPACK: "msgpack", SERIALIZER_JSON: "json"}
+_COMPRESSOR_NAMES = {COMPRESSOR_ZSTD: "zstd", COMPRESSOR_ZLIB: "zlib"}
+
+
+class ChunkCodec:
+    """Encodes one provider as header + compressed payload"""
+
+    def __init__(self, compression_level: int = 3, use_msgpack: bool = True, use_zstd: bool = True):
+        self.serializer = SERIALIZER_MSGPACK if use_msgpack and msgpack is not None else SERIALIZER_JSON
+        self.compressor = COMPRESSOR_ZSTD if use_zstd and zstandard is not None else COMPRESSOR_ZLIB
+        self.compression_level = compression_level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard is not None else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    @property
+    def name(self) -> str:
+        return f"{_SERIALIZER_NAMES[self.serializer]}+{_COMPRESSOR_NAMES[self.compressor]}"
+
+    def encode(self, value: Any) -> bytes:
+        if self.serializer == SERIALIZER_MSGPACK:
+            raw = msgpack.packb(value, default=json_codec.to_jsonable, use_bin_type=True)
+        else:
+            raw = json_codec.dumps(value)
+
+        if self.compressor == COMPRESSOR_ZSTD:
+            payload = self._zstd_compressor.compress(raw)
+        else:
+            payload = zlib.compress(raw, self.compression_level)
+        return self.serializer + self.compressor + payload
+
+    def decode(self, blob: bytes) -> Any:
+        """
+        Decode a chunk written by any worker.
+
+        Raises:
+            ValueError: If the chunk needs a library this process lacks
+        """
+        serializer, compressor, payload = blob[:1], blob[1:2], blob[2:]
+
+        if compressor == COMPRESSOR_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("zstd-compressed catalog chunk but zstandard is not installed")
+            raw = self._zstd_decompressor.decompress(payload)
+        elif compressor == COMPRESSOR_ZLIB:
+            raw = zlib.decompress(payload)
+        else:
+            raise ValueError(f"Unknown catalog chunk compressor {compressor!r}")
+
+        if serializer == SERIALIZER_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack catalog chunk but msgpack is not installed")
+            return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        if serializer == SERIALIZER_JSON:
+            return json_codec.loads(raw)
+        raise ValueError(f"Unknown catalog chunk serializer {serializer!r}")
+
+
+def provider_matches(
+    meta: Mapping[str, Any],
+    categories: Optional[Iterable[str]] = None,
+    has_actions: Optional[bool] = None,
+    has_triggers: Optional[bool] = None
+) -> bool:
+    """Filter used by DatabaseCatalogService, on a provider dict or manifest entry"""
+    if categories and meta.get("category") not in categories:
+        return False
+    if has_actions is not None and bool(meta.get("has_actions")) != has_actions:
+        return False
+    if has_triggers is not None and bool(meta.get("has_triggers")) != has_triggers:
+        return False
+    return True
+
+
+def filter_providers(
+    providers_dict: Mapping[str, Dict[str, Any]],
+    providers: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+    has_actions: Optional[bool] = None,
+    has_triggers: Optional[bool] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Apply the catalog filters to a {slug: provider} dict"""
+    wanted = set(providers) if providers else None
+    return {
+        slug: provider for slug, provider in providers_dict.items()
+        if (wanted is None or slug in wanted) and provider_matches(provider, categories, has_actions, has_triggers)
+    }
+
+
+class ChunkedCatalogStore:
+    """Per-provider catalog chunks plus a manifest in Redis"""
+
+    def __init__(self, redis_client, key_prefix: str = "catalog_store", ttl: int = 3600,
+                 batch_size: int = 200, codec: Optional[ChunkCodec] = None):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.codec = codec or ChunkCodec()
+        self.stats = {"reads": 0, "misses": 0, "writes": 0, "chunks_read": 0, "bytes_read": 0, "bytes_written": 0}
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.key_prefix}:manifest"
+
+    def _chunk_key(self, version: str, slug: str) -> str:
+        return f"{self.key_prefix}:{version}:p:{slug}"
+
+    async def get_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self.redis.get(self.manifest_key)
+            return json_codec.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"Error reading catalog manifest from Redis: {e}")
+            return None
+
+    async def save(self, providers_dict: Mapping[str, Dict[str, Any]]) -> Optional[str]:
+        """
+        Store a full catalog ({slug: provider}); returns its version.
+
+        Chunks are written before the manifest that points at them. When
+        the manifest already has this version the chunk TTLs are refreshed
+        and the manifest is rewritten with a new ``saved_at``, so readers
+        see the catalog as freshly reloaded.
+        """
+        try:
+            chunks = {slug: self.codec.encode(provider) for slug, provider in providers_dict.items()}
+            digest = hashlib.sha1()
+            for slug, blob in chunks.items():
+                digest.update(slug.encode("utf-8"))
+                digest.update(blob)
+            version = digest.hexdigest()[:16]
+
+            manifest = await self.get_manifest()
+            pipe = self.redis.pipeline(transaction=False)
+            if manifest and manifest.get("version") == version:
+                for slug in chunks:
+                    pipe.expire(self._chunk_key(version, slug), self.ttl)
+                if all(await pipe.execute()):
+                    manifest["saved_at"] = time.time()
+                    await self.redis.set(self.manifest_key, json_codec.dumps(manifest), ex=self.ttl)
+                    logger.info(f"📦 Catalog chunks already at version {version}; refreshed TTLs")
+                    return version
+                # Some chunks already expired: write the whole version again
+                pipe = self.redis.pipeline(transaction=False)
+
+            for slug, blob in chunks.items():
+                pipe.set(self._chunk_key(version, slug), blob, ex=self.ttl)
+            await pipe.execute()
+
+            manifest = {
+                "version": version,
+                "codec": self.codec.name,
+                "saved_at": time.time(),
+                "providers": {
+                    slug: {
+                        "category": provider.get("category"),
+                        "has_actions": bool(provider.get("has_actions", provider.get("actions"))),
+                        "has_triggers": bool(provider.get("has_triggers", provider.get("triggers"))),
+                        "bytes": len(chunks[slug])
+                    }
+                    for slug, provider in providers_dict.items()
+                }
+            }
+            await self.redis.set(self.manifest_key, json_codec.dumps(manifest), ex=self.ttl)
+
+            size = sum(len(blob) for blob in chunks.values())
+            self.stats["writes"] += 1
+            self.stats["bytes_written"] += size
+            logger.info(f"📦 Stored {len(chunks)} catalog chunks ({size:,} bytes, {self.codec.name}) as version {version}")
+            return version
+        except Exception as e:
+            logger.error(f"Error storing catalog chunks in Redis: {e}")
+            return None
+
+    async def load(
+        self,
+        providers: Optional[List[str]] = None,
+        categories: Optional[List[str]] = None,
+        has_actions: Optional[bool] = None,
+        has_triggers: Optional[bool] = None,
+        manifest: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Read the catalog, or the filtered part of it, from Redis.
+
+        Pass ``manifest`` when the caller already fetched it (e.g. to read
+        ``saved_at``). Returns None on a miss (no manifest, or a chunk has
+        expired) so the caller reloads from the database.
+        """
+        self.stats["reads"] += 1
+        if manifest is None:
+            manifest = await self.get_manifest()
+        if not manifest:
+            self.stats["misses"] += 1
+            return None
+
+        wanted = set(providers) if providers else None
+        slugs = [
+            slug for slug, meta in manifest.get("providers", {}).items()
+            if (wanted is None or slug in wanted) and provider_matches(meta, categories, has_actions, has_triggers)
+        ]
+        if not slugs:
+            return {}
+
+        try:
+            version = manifest["version"]
+            pipe = self.redis.pipeline(transaction=False)
+            for start in range(0, len(slugs), self.batch_size):
+                pipe.mget([self._chunk_key(version, slug) for slug in slugs[start:start + self.batch_size]])
+            blobs = [blob for batch in await pipe.execute() for blob in batch]
+
+            if any(blob is None for blob in blobs):
+                logger.info(f"Catalog chunks for version {version} are incomplete; treating as a cache miss")
+                self.stats["misses"] += 1
+                return None
+
+            result = {slug: self.codec.decode(blob) for slug, blob in zip(slugs, blobs)}
+            self.stats["chunks_read"] += len(blobs)
+            self.stats["bytes_read"] += sum(len(blob) for blob in blobs)
+            return result
+        except Exception as e:
+            logger.error(f"Error reading catalog chunks from Redis: {e}")
+            self.stats["misses"] += 1
+            return None
+
+    async def clear(self) -> bool:
+        """Drop the manifest; chunks of the old version expire on their own"""
+        try:
+            await self.redis.delete(self.manifest_key)
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing catalog manifest: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"codec": self.codec.name, "batch_size": self.batch_size, **self.stats}
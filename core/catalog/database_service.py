@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import time
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import ASCENDING, DESCENDING
@@ -8,10 +10,22 @@ from bson import ObjectId
 
 from .models import Provider, ProviderMetadata, ActionSpec, TriggerSpec, ParamSpec, ParamType
 from .cache import RedisCacheStore
+from .chunked_store import ChunkedCatalogStore, filter_providers
+from .redis_client import RedisClientFactory
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Fields read when building catalog entries; skips everything else stored on the documents
+TOOLKIT_PROJECTION = {
+    "slug": 1, "name": 1, "description": 1, "website_url": 1, "category": 1, "version": 1,
+    "created_at": 1, "updated_at": 1, "last_synced_at": 1
+}
+TOOL_PROJECTION = {
+    "toolkit_id": 1, "slug": 1, "name": 1, "display_name": 1, "description": 1, "tool_type": 1,
+    "version": 1, "input_schema": 1, "output_schema": 1, "tags": 1
+}
+
 class DatabaseCatalogService:
     """
     MongoDB-first catalog service that uses your existing database schema.
@@ -25,6 +39,17 @@ class DatabaseCatalogService:
         self.database: Optional[AsyncIOMotorDatabase] = None
         self.cache_ttl = 3600  # 1 hour cache TTL
         self.stale_threshold = timedelta(hours=24)  # 24 hours stale threshold
+        self.catalog_store: Optional[ChunkedCatalogStore] = None
+        self._catalog_store_retry_at = 0.0
+        
+        # Stale-while-revalidate: callers get the last good catalog at once and
+        # refreshes (including stale toolkit re-syncs) run in a background task
+        self.refresh_after = settings.catalog_refresh_after
+        self.refresh_jitter = settings.catalog_refresh_jitter
+        self._last_good: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_listeners: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+        self.last_stale_toolkits_count = 0
         
     async def _ensure_client(self):
         """Ensure MongoDB client is initialized"""
@@ -81,6 +106,17 @@ class DatabaseCatalogService:
         except Exception as e:
             logger.warning(f"Failed to create some indexes (this is usually fine if they already exist): {e}")
     
+    async def _get_catalog_store(self) -> Optional[ChunkedCatalogStore]:
+        """Chunked Redis catalog store, or None while Redis is unavailable"""
+        if self.catalog_store is None and time.monotonic() >= self._catalog_store_retry_at:
+            try:
+                client = await RedisClientFactory.get_binary_client()
+                self.catalog_store = ChunkedCatalogStore(client, ttl=self.cache_ttl)
+            except Exception as e:
+                logger.warning(f"Chunked catalog cache unavailable, retrying in 30s: {e}")
+                self._catalog_store_retry_at = time.monotonic() + 30
+        return self.catalog_store
+    
     async def get_catalog(
         self,
         providers: Optional[List[str]] = None,
@@ -95,8 +131,13 @@ class DatabaseCatalogService:
         """
         Get catalog data from MongoDB with Redis caching.
         
+        Serves the Redis catalog, or the last good catalog held in memory,
+        without waiting on MongoDB; a catalog older than ``refresh_after``
+        is refreshed in the background. Only a cold start queries MongoDB
+        inline. Results carry ``cached_at``, ``age_seconds`` and ``stale``.
+        
         Args:
-            force_refresh: Force refresh from MCP/SDK and update database
+            force_refresh: Refresh stale toolkits and reload from MongoDB before returning
             use_mcp: Explicitly use MCP fetcher (bypasses cache and database)
             use_sdk: Explicitly use SDK fetcher (bypasses cache and database)
         """
@@ -105,46 +146,128 @@ class DatabaseCatalogService:
             logger.info(f"Bypassing database and cache - using {'MCP' if use_mcp else 'SDK'} fetcher")
             return await self._fetch_from_external_sources(providers, categories, tags, has_actions, has_triggers, use_mcp, use_sdk)
         
-        # Check Redis cache first for performance
-        cache_key = self._generate_cache_key(providers, categories, tags, has_actions, has_triggers)
-        cached_data = await self.redis_cache.get(cache_key)
+        filters = {
+            "providers": providers,
+            "categories": categories,
+            "has_actions": has_actions,
+            "has_triggers": has_triggers
+        }
         
-        if cached_data and not force_refresh:
-            logger.info("Returning data from Redis cache")
-            return {
-                "providers": cached_data,
-                "source": "redis_cache",
-                "cached_at": datetime.now(timezone.utc)
-            }
+        if force_refresh:
+            providers_dict = await self.refresh_catalog()
+            if providers_dict is None and self._last_good is not None:
+                loaded_at, providers_dict = self._last_good
+                return self._catalog_response(filter_providers(providers_dict, **filters), "memory", loaded_at)
+            response = self._catalog_response(filter_providers(providers_dict or {}, **filters), "mongodb", time.time())
+            response["stale_toolkits_count"] = self.last_stale_toolkits_count
+            return response
+        
+        # Check the chunked Redis catalog first; filtered calls only fetch the providers they need
+        catalog_store = await self._get_catalog_store()
+        if catalog_store is not None:
+            manifest = await catalog_store.get_manifest()
+            if manifest:
+                cached_data = await catalog_store.load(manifest=manifest, **filters)
+                if cached_data is not None:
+                    logger.info(f"Returning {len(cached_data)} providers from Redis cache")
+                    return self._catalog_response(cached_data, "redis_cache", manifest.get("saved_at"))
+        
+        # Redis lost the catalog: serve the last good one and rebuild it in the background
+        if self._last_good is not None:
+            loaded_at, providers_dict = self._last_good
+            self._schedule_refresh(check_shared=False)
+            return self._catalog_response(filter_providers(providers_dict, **filters), "memory", loaded_at)
         
-        # Get data from MongoDB (primary source)
+        # Cold start: nothing to serve yet. Load the full catalog once so one
+        # write serves every filter; stale toolkits are handled in the background.
         logger.info("Fetching data from MongoDB")
-        db_providers = await self._get_providers_from_database(
-            providers, categories, tags, has_actions, has_triggers
-        )
+        providers_dict = await self._load_catalog()
+        return self._catalog_response(filter_providers(providers_dict or {}, **filters), "mongodb", time.time())
+    
+    def _catalog_response(self, providers_dict: Dict[str, Any], source: str, produced_at: Optional[float]) -> Dict[str, Any]:
+        """Catalog payload tagged with its age; serving a stale catalog schedules a refresh"""
+        produced_at = produced_at or time.time()
+        age = max(0.0, time.time() - produced_at)
+        stale = age >= self.refresh_after
+        if stale:
+            self._schedule_refresh()
+        return {
+            "providers": providers_dict,
+            "source": source,
+            "cached_at": datetime.fromtimestamp(produced_at, tz=timezone.utc),
+            "age_seconds": round(age, 1),
+            "stale": stale
+        }
+    
+    async def _load_catalog(self) -> Optional[Dict[str, Any]]:
+        """Load the full catalog from MongoDB and store it; None if the load failed"""
+        providers_dict = await self._get_providers_from_database()
+        if not isinstance(providers_dict, dict) or not providers_dict:
+            logger.warning("MongoDB returned no catalog; keeping the last good catalog")
+            return None
         
-        # Check if any tools are stale and need refresh from MCP/SDK
+        self._last_good = (time.time(), providers_dict)
+        catalog_store = await self._get_catalog_store()
+        if catalog_store is not None:
+            await catalog_store.save(providers_dict)
+        return providers_dict
+    
+    async def refresh_catalog(self) -> Optional[Dict[str, Any]]:
+        """Re-sync stale toolkits, then reload and store the full catalog; None if the load failed"""
         stale_toolkits = await self._get_stale_toolkits()
-        
-        if stale_toolkits and (force_refresh or len(stale_toolkits) > 0):
+        self.last_stale_toolkits_count = len(stale_toolkits)
+        if stale_toolkits:
             logger.info(f"Found {len(stale_toolkits)} stale toolkits, refreshing from external sources")
             await self._refresh_stale_toolkits(stale_toolkits)
-            
-            # Fetch updated data from database
-            db_providers = await self._get_providers_from_database(
-                providers, categories, tags, has_actions, has_triggers
-            )
-        
-        # Cache the result in Redis for performance
-        if db_providers:
-            await self.redis_cache.set(cache_key, db_providers, self.cache_ttl)
+        return await self._load_catalog()
+    
+    def add_refresh_listener(self, callback: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Call ``callback(providers)`` after each successful background refresh"""
+        self._refresh_listeners.append(callback)
+    
+    def _schedule_refresh(self, check_shared: bool = True):
+        """
+        Start one background refresh after a random delay.
         
-        return {
-            "providers": db_providers,
-            "source": "mongodb",
-            "cached_at": datetime.now(timezone.utc),
-            "stale_toolkits_count": len(stale_toolkits) if stale_toolkits else 0
-        }
+        The jitter keeps workers that notice the same stale catalog from
+        querying MongoDB at the same moment; with ``check_shared`` the
+        refresh is skipped if another worker already stored a fresh catalog.
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            delay = random.uniform(0, self.refresh_jitter)
+            self._refresh_task = asyncio.create_task(self._background_refresh(delay, check_shared))
+        except RuntimeError:
+            logger.debug("No running event loop; skipping background catalog refresh")
+    
+    async def _background_refresh(self, delay: float, check_shared: bool):
+        await asyncio.sleep(delay)
+        try:
+            if check_shared:
+                catalog_store = await self._get_catalog_store()
+                manifest = await catalog_store.get_manifest() if catalog_store is not None else None
+                if manifest and time.time() - manifest.get("saved_at", 0) < self.refresh_after:
+                    logger.info("Catalog was already refreshed by another worker")
+                    return
+            
+            start = time.perf_counter()
+            providers_dict = await self.refresh_catalog()
+            if providers_dict is None:
+                return
+            logger.info(f"🔄 Background catalog refresh: {len(providers_dict)} providers "
+                        f"in {time.perf_counter() - start:.1f}s")
+            for callback in self._refresh_listeners:
+                await callback(providers_dict)
+        except Exception as e:
+            logger.error(f"Background catalog refresh failed; serving the last good catalog: {e}")
+    
+    async def stop_background_refresh(self):
+        """Cancel a pending background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
     
     async def get_provider(
         self,
@@ -298,18 +421,23 @@ class DatabaseCatalogService:
             if categories:
                 filter_query["category"] = {"$in": categories}
             
-            # Get toolkits
-            cursor = self.database.toolkits.find(filter_query)
+            # Get toolkits, then all of their tools in one query grouped in memory
+            # (one tools query per toolkit cost 600+ round trips on a cold load)
+            cursor = self.database.toolkits.find(filter_query, TOOLKIT_PROJECTION)
             toolkit_docs = await cursor.to_list(length=None)
+            tools_by_toolkit = await self._get_tools_for_providers([str(doc["_id"]) for doc in toolkit_docs])
             
             providers_data = []
             for toolkit_doc in toolkit_docs:
-                # Get tools for this toolkit
-                tools = await self._get_tools_for_provider(str(toolkit_doc["_id"]))
+                tools = tools_by_toolkit.get(str(toolkit_doc["_id"]), [])
                 
-                # Count tools by type
-                action_count = len([t for t in tools if t.get("tool_type") == "action"])
-                trigger_count = len([t for t in tools if t.get("tool_type") == "trigger"])
+                # Split tools by type in one pass
+                actions, triggers = [], []
+                for tool in tools:
+                    if tool["tool_type"] == "action":
+                        actions.append(tool)
+                    elif tool["tool_type"] == "trigger":
+                        triggers.append(tool)
                 
                 provider = {
                     "id": str(toolkit_doc["_id"]),
@@ -323,13 +451,13 @@ class DatabaseCatalogService:
                     "updated_at": toolkit_doc.get("updated_at"),
                     "last_synced_at": toolkit_doc.get("last_synced_at"),
                     "tool_count": len(tools),
-                    "action_count": action_count,
-                    "trigger_count": trigger_count,
-                    "has_actions": action_count > 0,
-                    "has_triggers": trigger_count > 0,
+                    "action_count": len(actions),
+                    "trigger_count": len(triggers),
+                    "has_actions": bool(actions),
+                    "has_triggers": bool(triggers),
                     "tools": tools,
-                    "triggers": [t for t in tools if t.get("tool_type") == "trigger"],
-                    "actions": [t for t in tools if t.get("tool_type") == "action"]
+                    "triggers": triggers,
+                    "actions": actions
                 }
                 
                 # Apply additional filters
@@ -351,6 +479,21 @@ class DatabaseCatalogService:
             logger.error(f"Error getting providers from database: {e}")
             return []
     
+    @staticmethod
+    def _tool_from_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": str(doc["_id"]),
+            "slug": doc["slug"],
+            "name": doc["name"],
+            "display_name": doc.get("display_name", doc["name"]),
+            "description": doc.get("description", ""),
+            "tool_type": doc["tool_type"],
+            "version": doc.get("version", "1.0.0"),
+            "input_schema": doc.get("input_schema", {}),
+            "output_schema": doc.get("output_schema", {}),
+            "tags": doc.get("tags", [])
+        }
+    
     async def _get_tools_for_provider(self, provider_id: str) -> List[Dict[str, Any]]:
         """Get tools for a specific provider"""
         await self._ensure_client()
@@ -359,30 +502,51 @@ class DatabaseCatalogService:
             cursor = self.database.tools.find({
                 "toolkit_id": provider_id,
                 "is_deprecated": False
-            }).sort("name", ASCENDING)
-            
-            tools = []
-            async for doc in cursor:
-                tool = {
-                    "id": str(doc["_id"]),
-                    "slug": doc["slug"],
-                    "name": doc["name"],
-                    "display_name": doc.get("display_name", doc["name"]),
-                    "description": doc.get("description", ""),
-                    "tool_type": doc["tool_type"],
-                    "version": doc.get("version", "1.0.0"),
-                    "input_schema": doc.get("input_schema", {}),
-                    "output_schema": doc.get("output_schema", {}),
-                    "tags": doc.get("tags", [])
-                }
-                tools.append(tool)
+            }, TOOL_PROJECTION).sort("name", ASCENDING)
             
-            return tools
+            return [self._tool_from_doc(doc) async for doc in cursor]
                 
         except Exception as e:
             logger.error(f"Error getting tools for provider {provider_id}: {e}")
             return []
     
+    async def _get_tools_for_providers(self, provider_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get tools for many providers with one query, as {provider_id: tools sorted by name}.
+        
+        Query errors propagate: an empty result would read as a catalog in
+        which no toolkit has tools, and replace the last good catalog.
+        """
+        if not provider_ids:
+            return {}
+        await self._ensure_client()
+        
+        cursor = self.database.tools.find({
+            "toolkit_id": {"$in": provider_ids},
+            "is_deprecated": False
+        }, TOOL_PROJECTION)
+        
+        tools_by_provider: Dict[str, List[Dict[str, Any]]] = {}
+        async for doc in cursor:
+            tools_by_provider.setdefault(doc["toolkit_id"], []).append(self._tool_from_doc(doc))
+        
+        # Sorted here rather than in MongoDB: a server-side sort of every
+        # tool document can exceed the in-memory sort limit
+        for tools in tools_by_provider.values():
+            tools.sort(key=lambda tool: tool["name"])
+        return tools_by_provider
+    
+    async def _get_toolkits_by_ids(self, toolkit_ids) -> Dict[str, Dict[str, Any]]:
+        """Resolve tools' toolkit_ids with one $in query, as {toolkit_id: toolkit doc}"""
+        object_ids = list({ObjectId(tid) for tid in toolkit_ids if tid and ObjectId.is_valid(tid)})
+        if not object_ids:
+            return {}
+        cursor = self.database.toolkits.find(
+            {"_id": {"$in": object_ids}, "is_deprecated": False},
+            {"slug": 1, "name": 1}
+        )
+        return {str(doc["_id"]): doc async for doc in cursor}
+    
     async def _get_provider_from_database(self, provider_id: str) -> Optional[Dict[str, Any]]:
         """Get specific provider from MongoDB"""
         await self._ensure_client()
@@ -533,30 +697,6 @@ class DatabaseCatalogService:
         logger.info(f"Fetching provider {provider_id} from external sources")
         return None
     
-    def _generate_cache_key(
-        self,
-        providers: Optional[List[str]] = None,
-        categories: Optional[List[str]] = None,
-        tags: Optional[List[str]] = None,
-        has_actions: Optional[bool] = None,
-        has_triggers: Optional[bool] = None
-    ) -> str:
-        """Generate cache key for Redis"""
-        parts = ["catalog"]
-        
-        if providers:
-            parts.extend(["providers"] + sorted(providers))
-        if categories:
-            parts.extend(["categories"] + sorted(categories))
-        if tags:
-            parts.extend(["tags"] + sorted(tags))
-        if has_actions is not None:
-            parts.append(f"actions_{has_actions}")
-        if has_triggers is not None:
-            parts.append(f"triggers_{has_triggers}")
-        
-        return ":".join(parts)
-
     async def get_provider_by_slug(self, provider_slug: str, force_refresh: bool = False, use_mcp: bool = False, use_sdk: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get a specific provider by slug.
@@ -692,14 +832,15 @@ class DatabaseCatalogService:
                     "is_deprecated": False
                 })
                 
+                tool_docs = await cursor.to_list(length=None)
+                
+                # Resolve all toolkits with one query
+                toolkits_by_id = await self._get_toolkits_by_ids(doc.get("toolkit_id") for doc in tool_docs)
+                
                 tools_by_provider = {}
                 
-                async for tool_doc in cursor:
-                    # Get toolkit info
-                    toolkit_doc = await self.database.toolkits.find_one({
-                        "_id": ObjectId(tool_doc["toolkit_id"]),
-                        "is_deprecated": False
-                    })
+                for tool_doc in tool_docs:
+                    toolkit_doc = toolkits_by_id.get(str(tool_doc.get("toolkit_id")))
                     
                     if toolkit_doc:
                         provider_slug = toolkit_doc["slug"]
@@ -799,14 +940,15 @@ class DatabaseCatalogService:
                     "is_deprecated": False
                 })
                 
+                tool_docs = await cursor.to_list(length=None)
+                
+                # Resolve all toolkits with one query
+                toolkits_by_id = await self._get_toolkits_by_ids(doc.get("toolkit_id") for doc in tool_docs)
+                
                 tools_by_provider = {}
                 
-                async for tool_doc in cursor:
-                    # Get toolkit info
-                    toolkit_doc = await self.database.toolkits.find_one({
-                        "_id": ObjectId(tool_doc["toolkit_id"]),
-                        "is_deprecated": False
-                    })
+                for tool_doc in tool_docs:
+                    toolkit_doc = toolkits_by_id.get(str(tool_doc.get("toolkit_id")))
                     
                     if toolkit_doc:
                         provider_slug = toolkit_doc["slug"]
@@ -896,15 +1038,12 @@ class DatabaseCatalogService:
             cursor = self.database.tools.find(base_filter).limit(limit)
             tool_docs = await cursor.to_list(length=None)
             
-            # Group tools by provider
+            # Resolve all toolkits with one query, then group tools by provider
+            toolkits_by_id = await self._get_toolkits_by_ids(doc.get("toolkit_id") for doc in tool_docs)
             tools_by_provider = {}
             
             for tool_doc in tool_docs:
-                # Get toolkit info
-                toolkit_doc = await self.database.toolkits.find_one({
-                    "_id": ObjectId(tool_doc["toolkit_id"]),
-                    "is_deprecated": False
-                })
+                toolkit_doc = toolkits_by_id.get(str(tool_doc.get("toolkit_id")))
                 
                 if toolkit_doc:
                     provider_slug = toolkit_doc["slug"]
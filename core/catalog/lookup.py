@@ -0,0 +1,221 @@
+"""
+O(1) tool lookup index.
+
+Hallucination checks, validators and compilers all need the same question
+answered: "does toolkit X have a trigger/action called Y?". Instead of each
+scanning provider lists, they share a ``ToolLookupIndex`` keyed by
+(tool type, toolkit slug, identifier), where the identifier can be the tool's
+slug, name or any alias field (``action_name``, ``trigger_slug``, ``id``, ...).
+A case-insensitive table backs ``resolve()`` for near-exact references.
+
+Indexes for catalog snapshots are built once per refresh. ``for_catalog()``
+accepts any catalog shape used in the codebase and returns the snapshot's
+index when it is given a snapshot (or its read-only providers view).
+"""
+
+import weakref
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from .snapshot import ACTION, TRIGGER, CatalogSnapshot, FrozenDict, ToolRecord
+
+TOOL_TYPES = (ACTION, TRIGGER)
+
+# id(read-only providers view) -> (weak reference, index)
+_registered: Dict[int, Tuple[weakref.ref, "ToolLookupIndex"]] = {}
+
+
+def _fold(value: str) -> str:
+    return value.strip().casefold()
+
+
+def _provider_slug(provider: Mapping[str, Any], default: str = "") -> str:
+    return (
+        provider.get("slug")
+        or provider.get("toolkit_slug")
+        or (provider.get("metadata") or {}).get("slug")
+        or default
+    )
+
+
+class ToolLookupIndex:
+    """(toolkit, tool) lookups by slug, name or alias in constant time"""
+
+    __slots__ = ("_tools", "_folded", "_global", "_toolkits", "_folded_toolkits", "tool_count")
+
+    def __init__(self):
+        self._tools: Dict[Tuple[str, str, str], ToolRecord] = {}
+        self._folded: Dict[Tuple[str, str, str], ToolRecord] = {}
+        self._global: Dict[Tuple[str, str], ToolRecord] = {}
+        self._toolkits: Dict[str, Dict[str, list]] = {}
+        self._folded_toolkits: Dict[str, str] = {}
+        self.tool_count = 0
+
+    def add_toolkit(self, toolkit_slug: str) -> None:
+        """Register a toolkit, even one without tools"""
+        if toolkit_slug and toolkit_slug not in self._toolkits:
+            self._toolkits[toolkit_slug] = {ACTION: [], TRIGGER: []}
+            self._folded_toolkits.setdefault(_fold(toolkit_slug), toolkit_slug)
+
+    def add(self, record: ToolRecord) -> None:
+        """Index a tool under every identifier; the first tool wins on collisions"""
+        self.add_toolkit(record.toolkit_slug)
+        self._toolkits[record.toolkit_slug][record.tool_type].append(record)
+        self.tool_count += 1
+        for identifier in record.identifiers():
+            self._tools.setdefault((record.tool_type, record.toolkit_slug, identifier), record)
+            self._folded.setdefault((record.tool_type, _fold(record.toolkit_slug), _fold(identifier)), record)
+            self._global.setdefault((record.tool_type, identifier), record)
+
+    # Construction
+
+    @classmethod
+    def from_records(cls, records: Iterable[ToolRecord]) -> "ToolLookupIndex":
+        index = cls()
+        for record in records:
+            index.add(record)
+        return index
+
+    @classmethod
+    def from_providers(cls, providers: Any) -> "ToolLookupIndex":
+        """
+        Index catalog providers.
+
+        Accepts {slug: provider} or a list of providers. A provider either
+        carries 'actions'/'triggers' itself or nests them under 'toolkits'
+        (the compiler catalog format), in which case tools remember the
+        provider slug separately from the toolkit slug.
+        """
+        index = cls()
+        if isinstance(providers, Mapping):
+            items = list(providers.items())
+        elif isinstance(providers, (list, tuple)):
+            items = [(_provider_slug(p), p) for p in providers if isinstance(p, Mapping)]
+        else:
+            items = []
+
+        for slug, provider in items:
+            if not isinstance(provider, Mapping):
+                continue
+            provider_slug = str(slug or _provider_slug(provider))
+            toolkits = provider.get("toolkits")
+            if isinstance(toolkits, (list, tuple)):
+                for toolkit in toolkits:
+                    if isinstance(toolkit, Mapping):
+                        index._add_tools(toolkit, toolkit.get("slug") or provider_slug, provider_slug)
+            else:
+                index._add_tools(provider, provider_slug, provider_slug)
+        return index
+
+    @classmethod
+    def from_context(cls, catalog_context: Mapping[str, Any]) -> "ToolLookupIndex":
+        """Index a generation context: 'triggers'/'actions' lists whose items carry 'toolkit_slug'"""
+        index = cls()
+        for tool_type, key in ((TRIGGER, "triggers"), (ACTION, "actions")):
+            for tool in catalog_context.get(key) or ():
+                if isinstance(tool, Mapping) and tool.get("toolkit_slug"):
+                    index.add(ToolRecord(tool, tool_type, tool["toolkit_slug"]))
+        for toolkit_slug in (catalog_context.get("providers") or {}):
+            index.add_toolkit(toolkit_slug)
+        return index
+
+    @classmethod
+    def register(cls, providers: FrozenDict, index: "ToolLookupIndex") -> None:
+        """Remember the index for a read-only providers view until it is garbage collected"""
+        key = id(providers)
+        _registered[key] = (weakref.ref(providers, lambda _, key=key: _registered.pop(key, None)), index)
+
+    @classmethod
+    def for_catalog(cls, catalog: Any) -> "ToolLookupIndex":
+        """
+        Get an index for any catalog shape.
+
+        Snapshots and their providers view reuse the prebuilt index; other
+        mappings (which may change) are indexed on every call.
+        """
+        if isinstance(catalog, CatalogSnapshot):
+            return catalog.lookup
+        if isinstance(catalog, FrozenDict):
+            entry = _registered.get(id(catalog))
+            if entry is not None and entry[0]() is catalog:
+                return entry[1]
+        if isinstance(catalog, Mapping) and isinstance(catalog.get("providers"), (Mapping, list, tuple)):
+            catalog = catalog["providers"]
+            if isinstance(catalog, FrozenDict):
+                return cls.for_catalog(catalog)
+        return cls.from_providers(catalog)
+
+    def _add_tools(self, container: Mapping[str, Any], toolkit_slug: str, provider_slug: str) -> None:
+        if not toolkit_slug:
+            return
+        self.add_toolkit(toolkit_slug)
+        for tool_type, key in ((ACTION, "actions"), (TRIGGER, "triggers")):
+            for tool in container.get(key) or ():
+                if isinstance(tool, Mapping):
+                    self.add(ToolRecord(tool, tool_type, toolkit_slug, provider_slug))
+
+    # Queries
+
+    def _types(self, tool_type: Optional[str]) -> Tuple[str, ...]:
+        return (tool_type,) if tool_type else TOOL_TYPES
+
+    def has_toolkit(self, toolkit_slug: str) -> bool:
+        return toolkit_slug in self._toolkits
+
+    def resolve_toolkit(self, toolkit_slug: str) -> Optional[str]:
+        """Canonical toolkit slug for an exact or case-insensitive reference"""
+        if not toolkit_slug:
+            return None
+        if toolkit_slug in self._toolkits:
+            return toolkit_slug
+        return self._folded_toolkits.get(_fold(toolkit_slug))
+
+    def get(self, toolkit_slug: str, ref: str, tool_type: Optional[str] = None) -> Optional[ToolRecord]:
+        """Exact lookup of a tool in a toolkit by slug, name or alias"""
+        if not toolkit_slug or not ref:
+            return None
+        for kind in self._types(tool_type):
+            record = self._tools.get((kind, toolkit_slug, ref))
+            if record is not None:
+                return record
+        return None
+
+    def contains(self, toolkit_slug: str, ref: str, tool_type: Optional[str] = None) -> bool:
+        return self.get(toolkit_slug, ref, tool_type) is not None
+
+    def resolve(self, toolkit_slug: str, ref: str, tool_type: Optional[str] = None) -> Optional[ToolRecord]:
+        """Like get(), falling back to case-insensitive toolkit and tool matching"""
+        record = self.get(toolkit_slug, ref, tool_type)
+        if record is not None or not toolkit_slug or not ref:
+            return record
+        for kind in self._types(tool_type):
+            record = self._folded.get((kind, _fold(toolkit_slug), _fold(ref)))
+            if record is not None:
+                return record
+        return None
+
+    def find(self, ref: str, tool_type: Optional[str] = None) -> Optional[ToolRecord]:
+        """Look a tool up by slug, name or alias in any toolkit"""
+        if not ref:
+            return None
+        for kind in self._types(tool_type):
+            record = self._global.get((kind, ref))
+            if record is not None:
+                return record
+        return None
+
+    def tools_for(self, toolkit_slug: str, tool_type: Optional[str] = None) -> Tuple[ToolRecord, ...]:
+        """All tools of a toolkit, optionally of one type"""
+        toolkit = self._toolkits.get(toolkit_slug)
+        if toolkit is None:
+            return ()
+        return tuple(record for kind in self._types(tool_type) for record in toolkit[kind])
+
+    @property
+    def toolkit_count(self) -> int:
+        return len(self._toolkits)
+
+    def count(self, tool_type: str) -> int:
+        return sum(len(toolkit[tool_type]) for toolkit in self._toolkits.values())
+
+    def __len__(self) -> int:
+        return self.tool_count
@@ -11,28 +11,40 @@ class RedisClientFactory:
     
     _redis_client: Optional[Redis] = None
     _connection_pool: Optional[ConnectionPool] = None
+    _binary_client: Optional[Redis] = None
+    _binary_connection_pool: Optional[ConnectionPool] = None
     
     @classmethod
     async def get_client(cls) -> Redis:
         """Get or create Redis client singleton"""
         if cls._redis_client is None:
-            cls._redis_client = await cls._create_client()
+            cls._connection_pool = cls._create_pool(decode_responses=True)
+            cls._redis_client = await cls._create_client(cls._connection_pool)
         return cls._redis_client
     
     @classmethod
-    async def _create_client(cls) -> Redis:
+    async def get_binary_client(cls) -> Redis:
+        """Get or create a Redis client singleton that returns raw bytes (for compressed values)"""
+        if cls._binary_client is None:
+            cls._binary_connection_pool = cls._create_pool(decode_responses=False)
+            cls._binary_client = await cls._create_client(cls._binary_connection_pool)
+        return cls._binary_client
+    
+    @classmethod
+    def _create_pool(cls, decode_responses: bool) -> ConnectionPool:
+        return ConnectionPool.from_url(
+            settings.redis_url,
+            decode_responses=decode_responses,
+            max_connections=20,
+            retry_on_timeout=True
+        )
+    
+    @classmethod
+    async def _create_client(cls, connection_pool: ConnectionPool) -> Redis:
         """Create new Redis client"""
         try:
-            # Create connection pool
-            cls._connection_pool = ConnectionPool.from_url(
-                settings.redis_url,
-                decode_responses=True,
-                max_connections=20,
-                retry_on_timeout=True
-            )
-            
             # Create Redis client
-            client = Redis(connection_pool=cls._connection_pool)
+            client = Redis(connection_pool=connection_pool)
             
             # Test connection
             await client.ping()
@@ -55,6 +67,14 @@ class RedisClientFactory:
             await cls._connection_pool.disconnect()
             cls._connection_pool = None
         
+        if cls._binary_client:
+            await cls._binary_client.close()
+            cls._binary_client = None
+        
+        if cls._binary_connection_pool:
+            await cls._binary_connection_pool.disconnect()
+            cls._binary_connection_pool = None
+        
         logger.info("Redis client closed")
     
     @classmethod
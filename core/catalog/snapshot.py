@@ -0,0 +1,275 @@
+"""
+Immutable, indexed in-memory catalog snapshot.
+
+A ``CatalogSnapshot`` is built once per catalog refresh from the provider
+dicts returned by ``DatabaseCatalogService.get_catalog()`` and is then shared
+by reference: the global cache service, the DSL generator's catalog manager
+and the catalog routes all read the same object instead of copying it.
+
+The legacy ``{slug: provider_dict}`` shape is kept as ``snapshot.providers``
+so existing readers keep working, but provider and tool dicts are
+``FrozenDict`` instances and action/trigger/tool lists are tuples, so accidental
+writes raise instead of silently corrupting every other request's view.
+Freezing is shallow: dicts nested inside a tool (e.g. ``input_schema``) are
+not copied and stay writable, so readers must not modify them either.
+Callers that need to decorate a tool (e.g. add a ``toolkit`` key) build a new
+dict from it.
+
+Precomputed indexes:
+- tools_by_slug: tool slug -> ToolRecord
+- tools_by_toolkit: toolkit slug -> tuple of ToolRecord
+- tools_by_type: 'action' / 'trigger' -> tuple of ToolRecord
+- toolkits_by_category: category -> tuple of ToolkitRecord
+- lookup: ToolLookupIndex for (toolkit, tool) references by slug, name or alias
+- views: CatalogViews, sorted listings per filter plus a search token index
+"""
+
+import hashlib
+import sys
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from core import json_codec
+
+ACTION = "action"
+TRIGGER = "trigger"
+
+# String fields interned on every record so repeated slugs, types and
+# categories share one object across the whole catalog
+_INTERNED_FIELDS = ("slug", "name", "type", "tool_type", "category", "toolkit_slug")
+
+
+class FrozenDict(dict):
+    """A dict that rejects mutation; still a real dict for json and isinstance checks"""
+
+    __slots__ = ("__weakref__",)
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Catalog snapshot data is read-only; copy it before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a mutable shallow copy"""
+        return dict(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _freeze_record(data: Mapping[str, Any]) -> FrozenDict:
+    return FrozenDict(
+        (key, _intern(value) if key in _INTERNED_FIELDS else value)
+        for key, value in data.items()
+    )
+
+
+class ToolRecord:
+    """One action or trigger in the snapshot"""
+
+    __slots__ = ("slug", "name", "tool_type", "toolkit_slug", "provider_slug", "description", "data")
+
+    # Fields other documents use to refer to a tool, besides slug and name
+    ALIAS_FIELDS = (
+        "display_name", "id", "action_name", "action_slug", "action_id",
+        "trigger_slug", "trigger_id", "composio_trigger_slug"
+    )
+
+    def __init__(self, data: Mapping[str, Any], tool_type: str, toolkit_slug: str,
+                 provider_slug: Optional[str] = None):
+        set_field = object.__setattr__
+        set_field(self, "slug", _intern(data.get("slug") or data.get("name") or ""))
+        set_field(self, "name", _intern(data.get("name") or data.get("slug") or ""))
+        set_field(self, "tool_type", sys.intern(tool_type))
+        set_field(self, "toolkit_slug", sys.intern(toolkit_slug))
+        set_field(self, "provider_slug", _intern(provider_slug or toolkit_slug))
+        set_field(self, "description", data.get("description") or "")
+        set_field(self, "data", data)
+
+    def identifiers(self) -> Tuple[str, ...]:
+        """Slug, name and every alias this tool can be referenced by"""
+        found = [self.slug, self.name]
+        for field in self.ALIAS_FIELDS:
+            value = self.data.get(field)
+            if isinstance(value, str) and value:
+                found.append(value)
+        aliases = self.data.get("aliases")
+        if isinstance(aliases, (list, tuple)):
+            found.extend(a for a in aliases if isinstance(a, str) and a)
+        return tuple(dict.fromkeys(v for v in found if v))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ToolRecord is immutable")
+
+    def __repr__(self) -> str:
+        return f"ToolRecord({self.toolkit_slug}/{self.slug}, {self.tool_type})"
+
+
+class ToolkitRecord:
+    """One toolkit (provider) and its tools"""
+
+    __slots__ = ("slug", "name", "category", "description", "actions", "triggers", "data")
+
+    def __init__(self, slug: str, data: FrozenDict,
+                 actions: Tuple[ToolRecord, ...], triggers: Tuple[ToolRecord, ...]):
+        set_field = object.__setattr__
+        set_field(self, "slug", sys.intern(slug))
+        set_field(self, "name", _intern(data.get("name") or slug))
+        set_field(self, "category", _intern(data.get("category")))
+        set_field(self, "description", data.get("description") or "")
+        set_field(self, "actions", actions)
+        set_field(self, "triggers", triggers)
+        set_field(self, "data", data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ToolkitRecord is immutable")
+
+    @property
+    def tools(self) -> Tuple[ToolRecord, ...]:
+        return self.actions + self.triggers
+
+    def __repr__(self) -> str:
+        return f"ToolkitRecord({self.slug}, {len(self.actions)} actions, {len(self.triggers)} triggers)"
+
+
+class CatalogSnapshot:
+    """Read-only catalog plus lookup indexes, identified by a content version"""
+
+    __slots__ = (
+        "version", "built_at", "providers", "toolkits", "lookup", "views",
+        "tools_by_slug", "tools_by_toolkit", "tools_by_type", "toolkits_by_category"
+    )
+
+    def __init__(self, providers: FrozenDict, toolkits: Mapping[str, ToolkitRecord], version: str):
+        tools_by_slug: Dict[str, ToolRecord] = {}
+        tools_by_type: Dict[str, list] = {ACTION: [], TRIGGER: []}
+        toolkits_by_category: Dict[Optional[str], list] = {}
+
+        for toolkit in toolkits.values():
+            toolkits_by_category.setdefault(toolkit.category, []).append(toolkit)
+            for tool in toolkit.tools:
+                # Tool slugs are globally unique in practice; keep the first on collision
+                tools_by_slug.setdefault(tool.slug, tool)
+                tools_by_type[tool.tool_type].append(tool)
+
+        set_field = object.__setattr__
+        set_field(self, "version", version)
+        set_field(self, "built_at", time.time())
+        set_field(self, "providers", providers)
+        set_field(self, "toolkits", FrozenDict(toolkits))
+        set_field(self, "tools_by_slug", FrozenDict(tools_by_slug))
+        set_field(self, "tools_by_toolkit", FrozenDict((slug, t.tools) for slug, t in toolkits.items()))
+        set_field(self, "tools_by_type", FrozenDict((k, tuple(v)) for k, v in tools_by_type.items()))
+        set_field(self, "toolkits_by_category", FrozenDict((k, tuple(v)) for k, v in toolkits_by_category.items()))
+
+        from .lookup import ToolLookupIndex
+        set_field(self, "lookup", ToolLookupIndex.from_records(
+            tool for toolkit in toolkits.values() for tool in toolkit.tools
+        ))
+        ToolLookupIndex.register(providers, self.lookup)
+
+        from .views import CatalogViews
+        set_field(self, "views", CatalogViews(toolkits.values()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable")
+
+    @classmethod
+    def build(cls, providers: Any) -> "CatalogSnapshot":
+        """
+        Build a snapshot from catalog providers.
+
+        Args:
+            providers: {slug: provider_dict} or a list of provider dicts
+                (as returned under 'providers' by the catalog service)
+        """
+        if isinstance(providers, list):
+            providers = {p.get("slug", f"provider_{i}"): p for i, p in enumerate(providers) if isinstance(p, dict)}
+        elif not isinstance(providers, Mapping):
+            providers = {}
+
+        frozen_providers: Dict[str, FrozenDict] = {}
+        toolkits: Dict[str, ToolkitRecord] = {}
+        for slug, provider in providers.items():
+            if not isinstance(provider, Mapping):
+                continue
+            slug = sys.intern(str(slug))
+            actions = tuple(_freeze_record(a) for a in provider.get("actions") or () if isinstance(a, Mapping))
+            triggers = tuple(_freeze_record(t) for t in provider.get("triggers") or () if isinstance(t, Mapping))
+
+            data = dict(provider)
+            data["actions"] = actions
+            data["triggers"] = triggers
+            if "tools" in data:
+                # Same records as actions/triggers instead of a second, mutable copy of every tool
+                data["tools"] = actions + triggers
+            frozen = _freeze_record(data)
+            frozen_providers[slug] = frozen
+            toolkits[slug] = ToolkitRecord(
+                slug,
+                frozen,
+                tuple(ToolRecord(a, ACTION, slug) for a in actions),
+                tuple(ToolRecord(t, TRIGGER, slug) for t in triggers)
+            )
+
+        return cls(FrozenDict(frozen_providers), toolkits, cls._fingerprint(frozen_providers))
+
+    @classmethod
+    def empty(cls) -> "CatalogSnapshot":
+        return cls(FrozenDict(), {}, "empty")
+
+    @staticmethod
+    def _fingerprint(providers: Mapping[str, Any]) -> str:
+        """
+        Content hash, so every worker derives the same version for the same catalog.
+
+        Hashes the JSON the catalog is stored as in Redis (datetimes as ISO
+        strings, tuples as lists), so a catalog loaded from MongoDB and the
+        same catalog read back from Redis get the same version.
+        """
+        if not providers:
+            return "empty"
+        return hashlib.sha1(json_codec.dumps(providers, sort_keys=True)).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.providers)
+
+    def __bool__(self) -> bool:
+        return bool(self.providers)
+
+    def __contains__(self, toolkit_slug: object) -> bool:
+        return toolkit_slug in self.providers
+
+    def get_toolkit(self, toolkit_slug: str) -> Optional[ToolkitRecord]:
+        return self.toolkits.get(toolkit_slug)
+
+    def get_tool(self, tool_slug: str) -> Optional[ToolRecord]:
+        return self.tools_by_slug.get(tool_slug)
+
+    def tools_of_type(self, tool_type: str) -> Tuple[ToolRecord, ...]:
+        return self.tools_by_type.get(tool_type, ())
+
+    def toolkits_in_category(self, category: str) -> Tuple[ToolkitRecord, ...]:
+        return self.toolkits_by_category.get(category, ())
+
+    def iter_tools(self) -> Iterable[ToolRecord]:
+        for toolkit in self.toolkits.values():
+            yield from toolkit.tools
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sizes of the snapshot and its indexes"""
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "toolkits": len(self.toolkits),
+            "tools": len(self.tools_by_slug),
+            "actions": len(self.tools_by_type.get(ACTION, ())),
+            "triggers": len(self.tools_by_type.get(TRIGGER, ())),
+            "categories": len(self.toolkits_by_category),
+            **self.views.get_stats()
+        }
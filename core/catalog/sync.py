@@ -0,0 +1,131 @@
+"""
+Cross-worker catalog invalidation over Redis.
+
+Each API worker keeps its own in-process ``CatalogSnapshot`` on top of the
+shared chunked catalog in Redis (see ``chunked_store``). This module keeps
+the workers in step:
+
+    {prefix}:generation      -> counter, INCR'd whenever a worker publishes a catalog
+    {prefix}:refresh_lock    -> SET NX EX lock so only one worker reloads from MongoDB
+    {prefix}:updates         -> pub/sub channel carrying {"generation", "version", "worker"}
+
+The worker holding the lock reloads from MongoDB, writes the chunks, bumps
+the counter and publishes. The other workers pull the chunks from Redis and
+swap their snapshot. Pub/sub delivery is fire-and-forget, so listeners also
+read the counter every poll interval and catch up on missed messages.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional
+
+from core import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if we still own it (it may have expired and been re-acquired)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class CatalogSync:
+    """Generation counter, refresh lock and update channel shared by all workers"""
+
+    def __init__(self, redis_client, key_prefix: str = "catalog_sync", lock_ttl: int = 300,
+                 worker_id: Optional[str] = None):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.lock_ttl = lock_ttl
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats = {"published": 0, "received": 0, "lock_acquired": 0, "lock_busy": 0}
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.key_prefix}:generation"
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key_prefix}:refresh_lock"
+
+    @property
+    def channel(self) -> str:
+        return f"{self.key_prefix}:updates"
+
+    async def get_generation(self) -> int:
+        """Latest published generation (0 when nothing was published yet)"""
+        value = await self.redis.get(self.generation_key)
+        return int(value) if value else 0
+
+    async def acquire_refresh_lock(self) -> Optional[str]:
+        """Try to become the refreshing worker; returns a token to release with, or None"""
+        token = uuid.uuid4().hex
+        if await self.redis.set(self.lock_key, token, nx=True, ex=self.lock_ttl):
+            self.stats["lock_acquired"] += 1
+            return token
+        self.stats["lock_busy"] += 1
+        return None
+
+    async def release_refresh_lock(self, token: str) -> None:
+        try:
+            await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self.lock_key, token)
+        except Exception as e:
+            logger.warning(f"Failed to release catalog refresh lock (it expires in {self.lock_ttl}s): {e}")
+
+    async def publish(self, version: str) -> int:
+        """Announce a new catalog version; returns its generation"""
+        generation = await self.redis.incr(self.generation_key)
+        message = {"generation": generation, "version": version, "worker": self.worker_id}
+        await self.redis.publish(self.channel, json_codec.dumps_str(message))
+        self.stats["published"] += 1
+        logger.info(f"📣 Published catalog version {version} as generation {generation}")
+        return generation
+
+    async def wait_for_generation(self, above: int, timeout: float, interval: float = 0.5) -> int:
+        """Poll until a generation newer than ``above`` is published or ``timeout`` passes"""
+        deadline = time.monotonic() + timeout
+        generation = await self.get_generation()
+        while generation <= above and time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            generation = await self.get_generation()
+        return generation
+
+    async def listen(self, poll_interval: float = 30.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield catalog updates as they are published.
+
+        Between messages, yields ``{"generation": n}`` read from the counter
+        every ``poll_interval`` seconds, so callers notice missed messages
+        and can run periodic checks.
+        """
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=poll_interval)
+                if message and message.get("type") == "message":
+                    try:
+                        update = json_codec.loads(message["data"])
+                    except ValueError as e:
+                        logger.warning(f"Ignoring malformed catalog update: {e}")
+                        continue
+                    self.stats["received"] += 1
+                    yield update
+                else:
+                    yield {"generation": await self.get_generation()}
+        finally:
+            try:
+                await pubsub.unsubscribe(self.channel)
+                await pubsub.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing catalog update subscription: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"worker": self.worker_id, **self.stats}
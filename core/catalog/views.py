@@ -0,0 +1,152 @@
+"""
+Precomputed listing views for catalog snapshots.
+
+``GET /catalog`` and ``GET /catalog/tools`` return one page of a filtered,
+sorted list. ``CatalogViews`` sorts once per snapshot and keeps a tuple per
+common filter combination (toolkit category / has_actions / has_triggers,
+tool toolkit / tool type), so a listing request is a dict lookup plus a
+slice.
+
+``search`` keeps the endpoints' case-insensitive substring semantics on the
+name and description. A token index narrows the candidates first: every
+alphanumeric run of the query must occur inside some token of a matching
+record, so only records whose tokens contain all query words are checked.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+from .snapshot import ACTION, TRIGGER, ToolkitRecord, ToolRecord
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Separates name and description so a query never matches across the two
+_FIELD_SEPARATOR = "\x00"
+
+# Query words whose matching tokens are remembered per snapshot
+SEARCH_MEMO_SIZE = 1024
+
+
+class _SearchIndex:
+    """Case-insensitive substring search over a fixed, ordered list of texts"""
+
+    __slots__ = ("_texts", "_postings", "_memo")
+
+    def __init__(self, texts: Iterable[str]):
+        self._texts: Tuple[str, ...] = tuple(text.lower() for text in texts)
+        postings: Dict[str, list] = {}
+        for ordinal, text in enumerate(self._texts):
+            for token in set(_TOKEN_RE.findall(text)):
+                postings.setdefault(token, []).append(ordinal)
+        self._postings: Dict[str, Tuple[int, ...]] = {token: tuple(o) for token, o in postings.items()}
+        self._memo: Dict[str, FrozenSet[int]] = {}
+
+    def _containing(self, word: str) -> FrozenSet[int]:
+        """Ordinals with a token containing ``word``"""
+        found = self._memo.get(word)
+        if found is None:
+            ordinals = set()
+            for token, token_ordinals in self._postings.items():
+                if word in token:
+                    ordinals.update(token_ordinals)
+            found = frozenset(ordinals)
+            if len(self._memo) >= SEARCH_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = found
+        return found
+
+    def search(self, query: str) -> Tuple[int, ...]:
+        """Ordinals (ascending) whose text contains ``query``"""
+        query = query.lower()
+        words = set(_TOKEN_RE.findall(query))
+        if words:
+            postings = sorted((self._containing(word) for word in words), key=len)
+            candidates = set(postings[0])
+            for ordinals in postings[1:]:
+                candidates &= ordinals
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(self._texts))
+        return tuple(o for o in candidates if query in self._texts[o])
+
+
+class CatalogViews:
+    """Sorted toolkit and tool listings of a snapshot, one tuple per filter"""
+
+    __slots__ = ("_toolkits", "_toolkit_views", "_toolkit_search", "_tools", "_tool_views", "_tool_search")
+
+    def __init__(self, toolkits: Iterable[ToolkitRecord]):
+        # Toolkits: sorted by name, keyed by (category, has_actions, has_triggers)
+        self._toolkits = tuple(sorted(toolkits, key=lambda t: t.name))
+        by_category: Dict[Optional[str], list] = {None: list(self._toolkits)}
+        for toolkit in self._toolkits:
+            if toolkit.category is not None:
+                by_category.setdefault(toolkit.category, []).append(toolkit)
+
+        views: Dict[tuple, Tuple[ToolkitRecord, ...]] = {}
+        for category, members in by_category.items():
+            for has_actions in (None, True, False):
+                for has_triggers in (None, True, False):
+                    views[(category, has_actions, has_triggers)] = tuple(
+                        t for t in members
+                        if self._flag_matches(t.actions, has_actions) and self._flag_matches(t.triggers, has_triggers)
+                    )
+        self._toolkit_views = views
+        self._toolkit_search = _SearchIndex(
+            f"{t.data.get('name') or ''}{_FIELD_SEPARATOR}{t.description}" for t in self._toolkits
+        )
+
+        # Tools: sorted by (toolkit, type, name), keyed by (toolkit slug, tool type)
+        self._tools = tuple(sorted(
+            (tool for toolkit in self._toolkits for tool in toolkit.tools),
+            key=lambda t: (t.toolkit_slug, t.tool_type, t.name)
+        ))
+        tool_views: Dict[tuple, list] = {}
+        for tool in self._tools:
+            for key in ((None, None), (None, tool.tool_type),
+                        (tool.toolkit_slug, None), (tool.toolkit_slug, tool.tool_type)):
+                tool_views.setdefault(key, []).append(tool)
+        self._tool_views = {key: tuple(tools) for key, tools in tool_views.items()}
+        self._tool_views.setdefault((None, None), ())
+        self._tool_search = _SearchIndex(f"{t.name}{_FIELD_SEPARATOR}{t.description}" for t in self._tools)
+
+    @staticmethod
+    def _flag_matches(tools: Sequence[ToolRecord], wanted: Optional[bool]) -> bool:
+        return wanted is None or bool(tools) == wanted
+
+    def toolkits(self, category: Optional[str] = None, has_actions: Optional[bool] = None,
+                 has_triggers: Optional[bool] = None, search: Optional[str] = None) -> Tuple[ToolkitRecord, ...]:
+        """
+        Toolkits matching the filters, sorted by name.
+
+        Without ``search`` this is a precomputed tuple; with it, only the
+        search candidates are filtered.
+        """
+        if not search:
+            return self._toolkit_views.get((category or None, has_actions, has_triggers), ())
+        return tuple(
+            toolkit for toolkit in (self._toolkits[o] for o in self._toolkit_search.search(search))
+            if (not category or toolkit.category == category)
+            and self._flag_matches(toolkit.actions, has_actions)
+            and self._flag_matches(toolkit.triggers, has_triggers)
+        )
+
+    def tools(self, toolkit_slug: Optional[str] = None, tool_type: Optional[str] = None,
+              search: Optional[str] = None) -> Tuple[ToolRecord, ...]:
+        """Tools matching the filters, sorted by toolkit slug, type and name"""
+        if tool_type and tool_type not in (ACTION, TRIGGER):
+            return ()
+        if not search:
+            return self._tool_views.get((toolkit_slug or None, tool_type or None), ())
+        return tuple(
+            tool for tool in (self._tools[o] for o in self._tool_search.search(search))
+            if (not toolkit_slug or tool.toolkit_slug == toolkit_slug)
+            and (not tool_type or tool.tool_type == tool_type)
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "toolkit_views": len(self._toolkit_views),
+            "tool_views": len(self._tool_views),
+            "search_tokens": len(self._toolkit_search._postings) + len(self._tool_search._postings)
+        }
@@ -37,12 +37,20 @@ class Settings(BaseSettings):
         default=None,
         description="Anthropic API key for Claude LLM access"
     )
+    anthropic_base_url: str = Field(
+        default="https://api.anthropic.com/v1/messages",
+        description="Anthropic Messages API endpoint (override to point at a stub server)"
+    )
     
     # Groq API settings
     groq_api_key: Optional[str] = Field(
         default=None,
         description="Groq API key for fast LLM tool retrieval"
     )
+    groq_base_url: str = Field(
+        default="https://api.groq.com/openai/v1",
+        description="Groq OpenAI-compatible API base URL (override to point at a stub server)"
+    )
     
     # Tool selection limits for RAG workflow
     max_triggers: int = Field(
@@ -57,6 +65,10 @@ class Settings(BaseSettings):
         default=8,
         description="Maximum number of providers to include in Claude context"
     )
+    claude_context_token_budget: int = Field(
+        default=6000,
+        description="Estimated input-token budget for the tool list in Claude prompts"
+    )
     
     # Claude API rate limiting
     claude_rate_limit_delay: float = Field(
@@ -67,6 +79,156 @@ class Settings(BaseSettings):
         default=30.0,
         description="Maximum delay in seconds between Claude API retries"
     )
+    claude_rate_limit_backend: str = Field(
+        default="redis",
+        description="Claude rate limiter backend: 'redis' (shared across workers, local fallback) or 'local'"
+    )
+    claude_rate_limit_key_prefix: str = Field(
+        default="ratelimit:claude",
+        description="Redis key prefix for the shared Claude rate limiter"
+    )
+    claude_input_tokens_per_minute: int = Field(
+        default=0,
+        description="Claude input-tokens-per-minute (ITPM) quota to stay under; 0 disables token-aware limiting"
+    )
+    claude_output_tokens_per_minute: int = Field(
+        default=0,
+        description="Claude output-tokens-per-minute (OTPM) quota to stay under; 0 disables token-aware limiting"
+    )
+    
+    # Template fast path
+    template_fast_path_enabled: bool = Field(
+        default=True,
+        description="Serve confidently matched canonical prompts from DSL templates without an LLM call"
+    )
+    template_match_threshold: float = Field(
+        default=0.78,
+        description="Minimum cosine similarity between the prompt and a template example phrasing"
+    )
+    template_match_margin: float = Field(
+        default=0.04,
+        description="Minimum similarity lead of the best template over the runner-up"
+    )
+    
+    # Vagueness detection
+    vagueness_classifier_enabled: bool = Field(
+        default=True,
+        description="Detect vague prompts with the embedding classifier instead of keyword heuristics"
+    )
+    vagueness_threshold: float = Field(
+        default=0.6,
+        description="Probability of vagueness above which exemplar workflows are returned"
+    )
+    vagueness_threshold_with_apps: float = Field(
+        default=0.85,
+        description="Vagueness probability threshold when the user selected apps"
+    )
+    
+    # Hedged generation attempts
+    generation_hedge_mode: str = Field(
+        default="off",
+        description="Hedged Claude generation: 'off' (sequential retries), 'delayed' or 'parallel'"
+    )
+    generation_hedge_delay: float = Field(
+        default=8.0,
+        description="Seconds to wait for the first attempt before starting a hedged one (delayed mode)"
+    )
+    generation_hedge_min_spare_tokens: int = Field(
+        default=2,
+        description="Minimum free Claude rate-limiter tokens required before starting a hedged attempt"
+    )
+    
+    # Admission control for /suggestions:generate
+    admission_max_concurrency: int = Field(
+        default=4,
+        description="Maximum workflow generation requests processed concurrently"
+    )
+    admission_max_queue: int = Field(
+        default=32,
+        description="Maximum generation requests waiting for a slot before new ones are rejected"
+    )
+    admission_max_queue_time: float = Field(
+        default=20.0,
+        description="Seconds a generation request may wait in the queue before being shed with a 429"
+    )
+    admission_max_queued_per_user: int = Field(
+        default=4,
+        description="Maximum waiting generation requests per user"
+    )
+
+    # Background generation jobs (POST /suggestions/jobs)
+    generation_job_workers: int = Field(
+        default=4,
+        description="Worker tasks running background generation jobs per API process"
+    )
+    generation_job_max_queue: int = Field(
+        default=100,
+        description="Maximum queued generation jobs before new ones are rejected"
+    )
+    generation_job_ttl: int = Field(
+        default=3600,
+        description="Seconds generation job records and results are kept in Redis"
+    )
+    generation_job_poll_interval: float = Field(
+        default=0.5,
+        description="Seconds between store polls when streaming a job running on another worker"
+    )
+
+    # Catalog response cache (GET /catalog*)
+    catalog_response_cache_size: int = Field(
+        default=256,
+        description="Serialized catalog responses kept per API process for the current catalog version"
+    )
+    catalog_response_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Total size in bytes of the serialized catalog responses kept per API process"
+    )
+    catalog_response_max_age: int = Field(
+        default=30,
+        description="Cache-Control max-age in seconds for catalog responses (clients revalidate with ETags)"
+    )
+
+    # Catalog stale-while-revalidate (DatabaseCatalogService)
+    catalog_refresh_after: int = Field(
+        default=1800,
+        description="Age in seconds after which a served catalog triggers a background refresh from MongoDB"
+    )
+    catalog_refresh_jitter: float = Field(
+        default=30.0,
+        description="Maximum random delay in seconds before a background catalog refresh (spreads workers out)"
+    )
+
+    # Cross-worker catalog sync (Redis generation counter + pub/sub)
+    catalog_sync_enabled: bool = Field(
+        default=True,
+        description="Keep API workers' in-process catalogs in step through Redis pub/sub"
+    )
+    catalog_sync_poll_interval: float = Field(
+        default=30.0,
+        description="Seconds between generation counter checks (catches missed pub/sub messages and expired catalogs)"
+    )
+    catalog_sync_startup_wait: float = Field(
+        default=60.0,
+        description="Seconds a starting worker waits for another worker's MongoDB load before loading itself"
+    )
+    catalog_refresh_lock_ttl: int = Field(
+        default=300,
+        description="Seconds the catalog refresh lock is held at most, in case the refreshing worker dies"
+    )
+
+    # LLM record/replay cassettes (offline benchmarks)
+    llm_cassette_mode: str = Field(
+        default="off",
+        description="LLM cassette mode: 'off', 'record' (save responses) or 'replay' (serve saved responses, no network)"
+    )
+    llm_cassette_dir: str = Field(
+        default="data/cassettes",
+        description="Directory for LLM cassette files (relative paths are resolved from the project root)"
+    )
+    llm_cassette_latency: float = Field(
+        default=0.0,
+        description="Simulated latency in seconds for replayed LLM calls; negative replays the recorded latency"
+    )
     
     # Application settings
     debug: bool = Field(
@@ -0,0 +1,104 @@
+"""
+JSON codec shared by the Redis caches and API serialization.
+
+Uses orjson when it is installed (several times faster than the stdlib
+encoder on the multi-MB catalog blob) and falls back to ``json`` otherwise.
+Both backends produce compact UTF-8 JSON and handle the same extra types:
+
+- datetime/date/time as ISO 8601 strings, timedelta as total seconds
+- numpy arrays and scalars (embedding scores in generation metadata)
+- sets and tuples as lists, pydantic models as their dict
+- anything else as ``str(value)``
+"""
+
+import dataclasses
+import datetime
+import json
+import uuid
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Convert values neither backend handles natively"""
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict") and callable(value.dict):
+        return value.dict()
+    return str(value)
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert a value JSON cannot encode directly to one it can.
+
+    Also used as the ``default`` hook of the stdlib encoder and of other
+    serializers (e.g. msgpack) that should encode values the same way.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+    return _default(value)
+
+
+def _stdlib_dumps(value: Any, sort_keys: bool = False) -> bytes:
+    return json.dumps(
+        value, default=to_jsonable, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON bytes.
+
+    With ``sort_keys`` the output is canonical: equal values give equal bytes
+    whatever their key order, which content hashes rely on.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(value, default=_default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            pass
+    return _stdlib_dumps(value, sort_keys)
+
+
+def dumps_str(value: Any) -> str:
+    """Serialize to a JSON string"""
+    return dumps(value).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -137,7 +137,8 @@ class SemanticSearchService:
         k: int = 10,
         filter_types: Optional[List[str]] = None,
         filter_categories: Optional[List[str]] = None,
-        filter_providers: Optional[List[str]] = None
+        filter_providers: Optional[List[str]] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar catalog items.
@@ -148,6 +149,7 @@ class SemanticSearchService:
             filter_types: Filter by tool types (e.g., ['action', 'trigger'])
             filter_categories: Filter by categories
             filter_providers: Filter by provider names
+            query_embedding: Precomputed embedding of the query (skips re-encoding)
             
         Returns:
             List of search results with metadata and similarity scores
@@ -156,7 +158,8 @@ class SemanticSearchService:
             return []
         
         # Generate embedding for query
-        query_embedding = self.embedding_service.embed_text(query)
+        if query_embedding is None:
+            query_embedding = self.embedding_service.embed_text(query)
         
         # Search in FAISS index
         distances, indices, metadata = self.faiss_index.search(query_embedding, k * 2)  # Get more results for filtering
@@ -284,8 +287,9 @@ class SemanticSearchService:
                         continue
                     
                     # Use the key as ID if not present in provider data
+                    # (on a copy: catalog snapshots are shared and read-only)
                     if "id" not in provider:
-                        provider["id"] = provider_id
+                        provider = {**provider, "id": provider_id}
                     
                     self._extract_provider_items(provider, items)
             elif isinstance(providers_data, list):
@@ -3,16 +3,43 @@ Catalog validation for workflow documents
 """
 
 import logging
+import time
 from typing import List, Dict, Any, Optional
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import ACTION, TRIGGER
 from .models import LintFinding, LintContext, Stage
 
 logger = logging.getLogger(__name__)
 
+# Triggers assumed valid in development/testing when the catalog lacks them
+COMMON_TRIGGERS = frozenset(t.upper() for t in [
+    'GMAIL_NEW_EMAIL_TRIGGER', 'GMAIL_EMAIL_RECEIVED_TRIGGER',
+    'SLACK_MESSAGE_RECEIVED_TRIGGER', 'SLACK_CHANNEL_CREATED_TRIGGER',
+    'STRIPE_CHECKOUT_SESSION_COMPLETED_TRIGGER', 'STRIPE_PAYMENT_INTENT_SUCCEEDED_TRIGGER',
+    'GOOGLE_SHEETS_ROW_ADDED_TRIGGER', 'GOOGLE_SHEETS_CELL_UPDATED_TRIGGER',
+    'GOOGLE_CALENDAR_EVENT_CREATED_TRIGGER', 'GOOGLE_CALENDAR_EVENT_UPDATED_TRIGGER',
+    'DISCORD_MESSAGE_RECEIVED_TRIGGER', 'DISCORD_CHANNEL_CREATED_TRIGGER',
+    'WHATSAPP_MESSAGE_RECEIVED_TRIGGER', 'TELEGRAM_MESSAGE_RECEIVED_TRIGGER',
+    'TWITTER_TWEET_POSTED_TRIGGER', 'REDDIT_POST_CREATED_TRIGGER',
+    'LINKEDIN_POST_CREATED_TRIGGER', 'FACEBOOK_POST_CREATED_TRIGGER',
+    'INSTAGRAM_POST_CREATED_TRIGGER', 'YOUTUBE_VIDEO_UPLOADED_TRIGGER',
+    'TIKTOK_VIDEO_CREATED_TRIGGER', 'SPOTIFY_PLAYLIST_CREATED_TRIGGER',
+    'NOTION_PAGE_CREATED_TRIGGER', 'NOTION_PAGE_UPDATED_TRIGGER',
+    'TODOIST_TASK_CREATED_TRIGGER', 'TRELLO_CARD_CREATED_TRIGGER',
+    'ASANA_TASK_CREATED_TRIGGER', 'SHOPIFY_ORDER_CREATED_TRIGGER',
+    'GOOGLE_DRIVE_FILE_UPLOADED_TRIGGER', 'DROPBOX_FILE_UPLOADED_TRIGGER',
+    'ONEDRIVE_FILE_UPLOADED_TRIGGER'
+])
+
 
 class CatalogValidator:
     """Validates workflow documents against the actual catalog data"""
     
+    # How long an index built from catalog.get_catalog() is reused
+    LOOKUP_INDEX_TTL = 60.0
+    
     def __init__(self):
+        # (catalog object, ToolLookupIndex, built_at) for catalogs without a prebuilt index
         self.catalog_cache = None
     
     async def validate_toolkit_references(self, doc: Dict[str, Any], context: LintContext) -> List[LintFinding]:
@@ -187,6 +214,38 @@ class CatalogValidator:
         
         return findings
     
+    async def _get_lookup_index(self, context: LintContext) -> Optional[ToolLookupIndex]:
+        """
+        Get a (toolkit, tool) lookup index for the lint context's catalog.
+        
+        Catalog adapters may expose a prebuilt ``lookup_index``; dict catalogs
+        and snapshots reuse theirs. Otherwise the catalog is fetched once and
+        indexed, instead of rescanning it for every reference.
+        """
+        catalog = getattr(context, 'catalog', None)
+        if not catalog:
+            return None
+        
+        index = getattr(catalog, 'lookup_index', None)
+        if isinstance(index, ToolLookupIndex):
+            return index
+        if isinstance(catalog, dict):
+            return ToolLookupIndex.for_catalog(catalog)
+        
+        cached = self.catalog_cache
+        if cached and cached[0] is catalog and time.monotonic() - cached[2] < self.LOOKUP_INDEX_TTL:
+            return cached[1]
+        
+        if hasattr(catalog, 'get_catalog'):
+            try:
+                catalog_data = await catalog.get_catalog()
+                index = ToolLookupIndex.for_catalog(catalog_data or {})
+                self.catalog_cache = (catalog, index, time.monotonic())
+                return index
+            except Exception as e:
+                logger.debug(f"get_catalog failed while building lookup index: {e}")
+        return None
+    
     async def _toolkit_exists(self, toolkit_slug: str, context: LintContext) -> bool:
         """Check if a toolkit exists in the catalog (robust slug detection)."""
         try:
@@ -195,8 +254,12 @@ class CatalogValidator:
                 logger.warning(f"No catalog available, assuming toolkit '{toolkit_slug}' is valid")
                 return True
             
+            index = await self._get_lookup_index(context)
+            if index is not None and index.has_toolkit(toolkit_slug):
+                return True
+            
             # Try different catalog access patterns
-            if hasattr(context.catalog, 'get_provider_by_slug'):
+            if index is None and hasattr(context.catalog, 'get_provider_by_slug'):
                 try:
                     provider = await context.catalog.get_provider_by_slug(toolkit_slug)
                     if provider:
@@ -204,7 +267,7 @@ class CatalogValidator:
                 except Exception as e:
                     logger.debug(f"get_provider_by_slug failed for {toolkit_slug}: {e}")
             
-            if hasattr(context.catalog, 'get_catalog'):
+            if index is None and hasattr(context.catalog, 'get_catalog'):
                 try:
                     catalog_data = await context.catalog.get_catalog()
                     providers = catalog_data.get("providers", []) or []
@@ -253,8 +316,12 @@ class CatalogValidator:
                 logger.warning(f"Action name is None or empty for toolkit '{toolkit_slug}'")
                 return False
             
+            index = await self._get_lookup_index(context)
+            if index is not None and index.contains(toolkit_slug, action_name, ACTION):
+                return True
+            
             # Try different catalog access patterns
-            if hasattr(context.catalog, 'get_tool_by_slug'):
+            if index is None and hasattr(context.catalog, 'get_tool_by_slug'):
                 try:
                     tool = await context.catalog.get_tool_by_slug(action_name, toolkit_slug)
                     if tool:
@@ -263,12 +330,12 @@ class CatalogValidator:
                     logger.debug(f"get_tool_by_slug failed for {action_name} in {toolkit_slug}: {e}")
             
             provider = None
-            if hasattr(context.catalog, 'get_provider_by_slug'):
+            if index is None and hasattr(context.catalog, 'get_provider_by_slug'):
                 try:
                     provider = await context.catalog.get_provider_by_slug(toolkit_slug)
                 except Exception as e:
                     logger.debug(f"get_provider_by_slug failed for {toolkit_slug}: {e}")
-            elif hasattr(context.catalog, 'get_catalog'):
+            elif index is None and hasattr(context.catalog, 'get_catalog'):
                 try:
                     catalog_data = await context.catalog.get_catalog()
                     for p in (catalog_data.get("providers", []) or []):
@@ -335,6 +402,16 @@ class CatalogValidator:
             
             logger.info(f"[LINE 328] Trigger slug is valid: '{trigger_slug}'")
             
+            index = await self._get_lookup_index(context)
+            if index is not None:
+                if index.contains(toolkit_slug, trigger_slug, TRIGGER):
+                    logger.info(f"Found matching trigger '{trigger_slug}' in provider '{toolkit_slug}'")
+                    return True
+                if not index.has_toolkit(toolkit_slug):
+                    logger.warning(f"No provider found for toolkit '{toolkit_slug}'")
+                    return False
+                return self._is_common_trigger(toolkit_slug, trigger_slug)
+            
             provider = None
             logger.info(f"[LINE 330] Attempting to get provider for toolkit '{toolkit_slug}'...")
             
@@ -394,34 +471,11 @@ class CatalogValidator:
             logger.info(f"[LINE 375] No exact match found for trigger '{trigger_slug}' in toolkit '{toolkit_slug}'")
             
             # For development/testing, assume common triggers are valid
-            common_triggers = [
-                'GMAIL_NEW_EMAIL_TRIGGER', 'GMAIL_EMAIL_RECEIVED_TRIGGER',
-                'SLACK_MESSAGE_RECEIVED_TRIGGER', 'SLACK_CHANNEL_CREATED_TRIGGER',
-                'STRIPE_CHECKOUT_SESSION_COMPLETED_TRIGGER', 'STRIPE_PAYMENT_INTENT_SUCCEEDED_TRIGGER',
-                'GOOGLE_SHEETS_ROW_ADDED_TRIGGER', 'GOOGLE_SHEETS_CELL_UPDATED_TRIGGER',
-                'GOOGLE_CALENDAR_EVENT_CREATED_TRIGGER', 'GOOGLE_CALENDAR_EVENT_UPDATED_TRIGGER',
-                'DISCORD_MESSAGE_RECEIVED_TRIGGER', 'DISCORD_CHANNEL_CREATED_TRIGGER',
-                'WHATSAPP_MESSAGE_RECEIVED_TRIGGER', 'TELEGRAM_MESSAGE_RECEIVED_TRIGGER',
-                'TWITTER_TWEET_POSTED_TRIGGER', 'REDDIT_POST_CREATED_TRIGGER',
-                'LINKEDIN_POST_CREATED_TRIGGER', 'FACEBOOK_POST_CREATED_TRIGGER',
-                'INSTAGRAM_POST_CREATED_TRIGGER', 'YOUTUBE_VIDEO_UPLOADED_TRIGGER',
-                'TIKTOK_VIDEO_CREATED_TRIGGER', 'SPOTIFY_PLAYLIST_CREATED_TRIGGER',
-                'NOTION_PAGE_CREATED_TRIGGER', 'NOTION_PAGE_UPDATED_TRIGGER',
-                'TODOIST_TASK_CREATED_TRIGGER', 'TRELLO_CARD_CREATED_TRIGGER',
-                'ASANA_TASK_CREATED_TRIGGER', 'SHOPIFY_ORDER_CREATED_TRIGGER',
-                'GOOGLE_DRIVE_FILE_UPLOADED_TRIGGER', 'DROPBOX_FILE_UPLOADED_TRIGGER',
-                'ONEDRIVE_FILE_UPLOADED_TRIGGER'
-            ]
-            logger.info(f"[LINE 390] Checking against {len(common_triggers)} common triggers...")
-            logger.info(f"[LINE 391] Looking for trigger '{trigger_slug}' in common triggers...")
-            
-            if trigger_slug.upper() in [trigger.upper() for trigger in common_triggers]:
-                logger.info(f"[LINE 393] Assuming common trigger '{trigger_slug}' is valid for toolkit '{toolkit_slug}' (development mode)")
+            if self._is_common_trigger(toolkit_slug, trigger_slug):
                 return True
             
             logger.warning(f"[LINE 396] Trigger '{trigger_slug}' not found in toolkit '{toolkit_slug}'")
             logger.warning(f"[LINE 397] Available triggers in provider: {[t.get('id') or t.get('slug') or t.get('composio_trigger_slug') or t.get('name') for t in provider.get('triggers', [])]}")
-            logger.warning(f"[LINE 398] Common triggers that would be accepted: {[t for t in common_triggers if t.upper() == trigger_slug.upper()]}")
             return False
             
         except Exception as e:
@@ -430,9 +484,27 @@ class CatalogValidator:
             logger.error(f"[LINE 403] Exception details: {str(e)}")
             return False
     
+    def _is_common_trigger(self, toolkit_slug: str, trigger_slug: str) -> bool:
+        """Development fallback: accept well-known trigger slugs missing from the catalog"""
+        if trigger_slug.upper() in COMMON_TRIGGERS:
+            logger.info(f"[LINE 393] Assuming common trigger '{trigger_slug}' is valid for toolkit '{toolkit_slug}' (development mode)")
+            return True
+        return False
+    
     async def _get_action_spec(self, toolkit_slug: str, action_name: str, context: LintContext) -> Optional[Dict[str, Any]]:
         """Get action specification from catalog"""
         try:
+            index = await self._get_lookup_index(context)
+            if index is not None:
+                record = index.get(toolkit_slug, action_name, ACTION)
+                if record is None:
+                    return None
+                return {
+                    "name": record.data.get("name", record.slug),
+                    "required_inputs": record.data.get("parameters", []),
+                    "scopes": record.data.get("permissions", [])
+                }
+            
             # Use the actual catalog service to get action spec
             if hasattr(context.catalog, 'get_tool_by_slug'):
                 tool = await context.catalog.get_tool_by_slug(action_name, toolkit_slug)
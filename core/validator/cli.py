@@ -28,6 +28,8 @@ from core.validator import (
 from core.validator.json_output import (
     validation_to_json, lint_to_json, comprehensive_to_dict
 )
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import ACTION
 
 
 class RealCatalogAdapter:
@@ -35,6 +37,7 @@ class RealCatalogAdapter:
     
     def __init__(self, catalog_cache: Dict[str, Any]):
         self.catalog_cache = catalog_cache
+        self.lookup_index = ToolLookupIndex.for_catalog(catalog_cache)
     
     async def get_provider_by_slug(self, slug: str):
         """Get provider by slug from real catalog cache"""
@@ -42,15 +45,8 @@ class RealCatalogAdapter:
     
     async def get_tool_by_slug(self, action_name: str, toolkit_slug: str):
         """Get tool by slug from real catalog cache"""
-        provider = self.catalog_cache.get(toolkit_slug)
-        if not provider:
-            return None
-        
-        actions = provider.get("actions", [])
-        for action in actions:
-            if action.get("name") == action_name:
-                return action
-        return None
+        record = self.lookup_index.get(toolkit_slug, action_name, ACTION)
+        return record.data if record else None
     
     async def get_catalog(self):
         """Get full catalog data"""
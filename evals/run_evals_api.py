@@ -40,7 +40,8 @@ async def call_workflow_api(prompt: str, selected_apps: List[str] = None) -> Dic
         "user_id": "eval_user",  # Required field
         "user_request": prompt,
         "selected_apps": selected_apps or [],
-        "num_suggestions": 1
+        "num_suggestions": 1,
+        "priority": "batch"
     }
     
     async with httpx.AsyncClient() as client:
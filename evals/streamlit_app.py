@@ -907,7 +907,8 @@ def run_evaluation_with_progress(eval_type: str = "local", selected_cases: List[
                     "user_id": "eval_user",
                     "user_request": test_case["prompt"],
                     "selected_apps": test_case["selected_apps"],
-                    "num_suggestions": 1
+                    "num_suggestions": 1,
+                    "priority": "batch"
                 }
                 
                 try:
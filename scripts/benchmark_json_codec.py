@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON codec against the stdlib encoder on the catalog.
+
+Compares, on the provider dict that ``DatabaseCatalogService`` caches in
+Redis:
+- Redis encode: ``json.dumps(cls=DateTimeEncoder)`` (previous) vs ``json_codec.dumps``
+- Redis decode: ``json.loads`` (previous) vs ``json_codec.loads``
+- API render: FastAPI's ``JSONResponse`` vs ``ORJSONResponse``
+
+The catalog comes from MongoDB (``--source database``) or from a catalog
+export (``catalog_clean.json`` by default). Exports only carry per-toolkit
+tool counts, so tools are generated with the same fields and counts as the
+database rows.
+
+Usage:
+    python scripts/benchmark_json_codec.py
+    python scripts/benchmark_json_codec.py --source database --iterations 20 --out codec.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Ensure project root is on sys.path when running as a script
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import json_codec
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    """The encoder RedisCacheStore used before the codec (baseline)"""
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, timedelta):
+            return obj.total_seconds()
+        return super().default(obj)
+
+
+def _parse_time(value: Any) -> Any:
+    try:
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+    except ValueError:
+        return value
+
+
+def _tool(provider: Dict[str, Any], tool_type: str, index: int) -> Dict[str, Any]:
+    """A tool row shaped like DatabaseCatalogService._get_tools_for_provider output"""
+    slug = f"{provider['slug'].upper()}_{tool_type.upper()}_{index}"
+    return {
+        "id": f"{provider['id']}-{tool_type}-{index}",
+        "slug": slug,
+        "name": slug,
+        "display_name": f"{provider['name']} {tool_type} {index}",
+        "description": f"{tool_type.title()} {index} for {provider['name']}. {provider.get('description', '')}",
+        "tool_type": tool_type,
+        "version": "1.0.0",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                f"field_{i}": {"type": "string", "description": f"Parameter {i} of {slug}"} for i in range(6)
+            },
+            "required": ["field_0"]
+        },
+        "output_schema": {"type": "object", "properties": {"data": {"type": "object"}, "successful": {"type": "boolean"}}},
+        "tags": [provider.get("category", ""), tool_type]
+    }
+
+
+def load_catalog_export(path: Path) -> Dict[str, Any]:
+    """Provider dict from a catalog export, with tools generated from its counts"""
+    export = json.loads(path.read_text())
+    providers = export.get("catalog", export).get("providers", {})
+    if isinstance(providers, list):
+        providers = {p["slug"]: p for p in providers}
+
+    catalog = {}
+    for slug, toolkit in providers.items():
+        stats = toolkit.get("stats", {})
+        provider = {
+            **{k: v for k, v in toolkit.items() if k != "stats"},
+            "created_at": _parse_time(toolkit.get("created_at")),
+            "updated_at": _parse_time(toolkit.get("updated_at")),
+            "last_synced_at": _parse_time(toolkit.get("last_synced_at")),
+        }
+        actions = [_tool(provider, "action", i) for i in range(stats.get("actions", 0))]
+        triggers = [_tool(provider, "trigger", i) for i in range(stats.get("triggers", 0))]
+        provider.update({
+            "tool_count": len(actions) + len(triggers),
+            "action_count": len(actions),
+            "trigger_count": len(triggers),
+            "has_actions": bool(actions),
+            "has_triggers": bool(triggers),
+            "tools": actions + triggers,
+            "triggers": triggers,
+            "actions": actions
+        })
+        catalog[slug] = provider
+    return catalog
+
+
+async def load_catalog_database() -> Dict[str, Any]:
+    """The provider dict DatabaseCatalogService caches in Redis"""
+    from core.catalog.database_service import DatabaseCatalogService
+    from database.config import get_database_url
+
+    service = DatabaseCatalogService(database_url=get_database_url(), redis_cache=None)
+    return await service._get_providers_from_database()
+
+
+def measure(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    fn()  # warm up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(timings), 2), "min_ms": round(min(timings), 2)}
+
+
+def run(catalog: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    from fastapi.responses import JSONResponse, ORJSONResponse
+
+    previous_blob = json.dumps(catalog, cls=DateTimeEncoder)
+    codec_blob = json_codec.dumps(catalog)
+    response_content = json_codec.loads(codec_blob)
+
+    cases = {
+        "redis_encode": (lambda: json.dumps(catalog, cls=DateTimeEncoder), lambda: json_codec.dumps(catalog)),
+        "redis_decode": (lambda: json.loads(previous_blob), lambda: json_codec.loads(codec_blob)),
+        "api_render": (lambda: JSONResponse(response_content), lambda: ORJSONResponse(response_content)),
+    }
+
+    results = {}
+    for name, (previous, codec) in cases.items():
+        before = measure(previous, iterations)
+        after = measure(codec, iterations)
+        results[name] = {
+            "previous": before,
+            "codec": after,
+            "speedup": round(before["median_ms"] / after["median_ms"], 2) if after["median_ms"] else None
+        }
+        print(f"{name:>13}: {before['median_ms']:8.2f} ms -> {after['median_ms']:8.2f} ms "
+              f"({results[name]['speedup']}x)")
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "backend": json_codec.JSON_BACKEND,
+        "providers": len(catalog),
+        "tools": sum(len(p.get("tools", [])) for p in catalog.values()),
+        "blob_bytes": {"previous": len(previous_blob.encode("utf-8")), "codec": len(codec_blob)},
+        "iterations": iterations,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codec on the catalog")
+    parser.add_argument("--source", choices=["file", "database"], default="file")
+    parser.add_argument("--file", type=Path, default=ROOT / "catalog_clean.json", help="Catalog export to load")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if args.source == "database":
+        catalog = asyncio.run(load_catalog_database())
+    else:
+        catalog = load_catalog_export(args.file)
+
+    print(f"📊 JSON codec benchmark ({json_codec.JSON_BACKEND}) on {len(catalog)} providers\n")
+    report = run(catalog, args.iterations)
+    print(f"\nBlob size: {report['blob_bytes']['previous']:,} -> {report['blob_bytes']['codec']:,} bytes "
+          f"({report['tools']:,} tools)")
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"📁 Report saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
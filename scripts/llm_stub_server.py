@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Stub Anthropic and Groq HTTP servers for load testing.
+
+Serves Anthropic-style ``/v1/messages`` and Groq/OpenAI-style
+``/openai/v1/chat/completions`` endpoints with tunable latency and 429
+injection, so the generation pipeline can be exercised under concurrency
+without real LLM calls or spend.
+
+Run standalone:
+    python scripts/llm_stub_server.py --port 8765 --latency 1.5 --jitter 0.5 --rate-429 0.05
+
+Then point the app at it:
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765/v1/messages
+    GROQ_BASE_URL=http://127.0.0.1:8765/openai/v1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class StubConfig:
+    """Latency and error injection knobs (seconds / probabilities)"""
+    claude_latency: float = 1.5
+    groq_latency: float = 0.3
+    jitter: float = 0.3
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    max_concurrency: Optional[int] = None  # 429 once this many requests are in flight
+
+
+@dataclass
+class StubStats:
+    requests: Dict[str, int] = field(default_factory=lambda: {"anthropic": 0, "groq": 0})
+    throttled: Dict[str, int] = field(default_factory=lambda: {"anthropic": 0, "groq": 0})
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+def _first_match(pattern: str, text: str, default: str) -> str:
+    match = re.search(pattern, text)
+    return match.group(1) if match else default
+
+
+def _workflow_for_prompt(text: str) -> Dict[str, Any]:
+    """Build a schema-shaped template DSL using the first tools listed in the prompt"""
+    toolkit = _first_match(r"--- Toolkit: (\S+) ---", text, "system")
+    action_toolkit = toolkit if toolkit != "system" else _first_match(r"--- Toolkit: ((?!system)\S+) ---", text, "slack")
+    action = _first_match(r"action_name: (\S+)", text, "SLACK_SEND_MESSAGE")
+    return {
+        "schema_type": "template",
+        "workflow": {
+            "name": "Load Test Workflow",
+            "description": "Stubbed workflow generated for load testing",
+            "triggers": [{
+                "id": "schedule_trigger",
+                "type": "schedule_based",
+                "toolkit_slug": "system",
+                "composio_trigger_slug": "SCHEDULE_BASED"
+            }],
+            "actions": [{
+                "id": "action_1",
+                "toolkit_slug": action_toolkit,
+                "action_name": action,
+                "required_inputs": [],
+                "depends_on": ["schedule_trigger"]
+            }]
+        },
+        "missing_information": []
+    }
+
+
+class LLMStubServer:
+    """aiohttp application serving both stub APIs from one port"""
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self._runner: Optional[web.AppRunner] = None
+        self.app = web.Application()
+        self.app.router.add_post("/v1/messages", self._anthropic)
+        self.app.router.add_post("/openai/v1/chat/completions", self._groq)
+        self.app.router.add_get("/stats", self._stats)
+
+    async def _delay(self, base: float) -> None:
+        await asyncio.sleep(max(0.0, base + random.uniform(-self.config.jitter, self.config.jitter)))
+
+    def _throttle(self, provider: str) -> Optional[web.Response]:
+        over_capacity = self.config.max_concurrency is not None and self.stats.in_flight > self.config.max_concurrency
+        if over_capacity or random.random() < self.config.rate_429:
+            self.stats.throttled[provider] += 1
+            return web.json_response(
+                {"error": {"type": "rate_limit_error", "message": "Stub rate limit"}},
+                status=429,
+                headers={"Retry-After": str(self.config.retry_after)}
+            )
+        return None
+
+    async def _handle(self, request: web.Request, provider: str, latency: float, build) -> web.Response:
+        self.stats.requests[provider] += 1
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        try:
+            throttled = self._throttle(provider)
+            if throttled is not None:
+                return throttled
+            payload = await request.json()
+            await self._delay(latency)
+            return web.json_response(build(payload))
+        finally:
+            self.stats.in_flight -= 1
+
+    async def _anthropic(self, request: web.Request) -> web.Response:
+        def build(payload):
+            text = json.dumps(payload.get("messages", []))
+            body = json.dumps(_workflow_for_prompt(text.replace("\\n", "\n")))
+            return {
+                "id": "msg_stub",
+                "type": "message",
+                "role": "assistant",
+                "content": [{"type": "text", "text": body}],
+                "usage": {"input_tokens": len(text) // 4, "output_tokens": len(body) // 4}
+            }
+        return await self._handle(request, "anthropic", self.config.claude_latency, build)
+
+    async def _groq(self, request: web.Request) -> web.Response:
+        def build(payload):
+            content = json.dumps({"selected_triggers": [], "selected_actions": []})
+            return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+        return await self._handle(request, "groq", self.config.groq_latency, build)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_stats())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": dict(self.stats.requests),
+            "throttled": dict(self.stats.throttled),
+            "peak_in_flight": self.stats.peak_in_flight
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> str:
+        """Start serving in the current event loop and return the base URL"""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Anthropic/Groq servers for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.5, help="Claude response latency (s)")
+    parser.add_argument("--groq-latency", type=float, default=0.3, help="Groq response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="Uniform latency jitter (s)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a 429 response")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="429 above this many in-flight requests")
+    args = parser.parse_args()
+
+    server = LLMStubServer(StubConfig(
+        claude_latency=args.latency,
+        groq_latency=args.groq_latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        max_concurrency=args.max_concurrency
+    ))
+    web.run_app(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
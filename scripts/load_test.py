@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Weave API.
+
+Drives the suggestion, catalog and semantic search endpoints in either an
+open loop (fixed arrival rate, Poisson inter-arrival times, so latency is
+measured without coordinated omission) or a closed loop (N concurrent
+workers issuing back-to-back requests), records latencies in an
+HdrHistogram-style log-linear histogram and emits a JSON report.
+
+By default the app runs in-process (httpx ASGI transport) with Claude/Groq
+served by the stub servers in ``llm_stub_server.py``. ``--fake-backends``
+swaps Redis and MongoDB for fakeredis / mongomock-motor when installed.
+
+Usage:
+    # Closed loop, 20 workers for 30s against the in-process app
+    python scripts/load_test.py --scenario generate --concurrency 20 --duration 30
+
+    # Open loop at 10 RPS with 5% injected 429s from the stub LLMs
+    python scripts/load_test.py --scenario generate --rps 10 --stub-rate-429 0.05 --out load.json
+
+    # Against a running server instead
+    python scripts/load_test.py --url http://localhost:8001 --scenario catalog --rps 200
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Ensure project root is on sys.path when running as a script
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+SAMPLE_PROMPTS = [
+    "When I get a new email in Gmail, send a summary to Slack",
+    "Every morning at 9am post my Google Calendar events to Slack",
+    "Create a Notion page for every new GitHub issue",
+    "When a new row is added to Google Sheets, send an email",
+    "Save new Gmail attachments to Google Drive",
+]
+
+SAMPLE_QUERIES = ["send email", "post message to channel", "create issue", "new row in spreadsheet", "upload file"]
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HdrHistogram-style).
+
+    Values are bucketed into power-of-two ranges, each split into
+    ``2**precision_bits`` linear sub-buckets, so relative error stays below
+    ``2**-precision_bits`` across the whole range with constant memory.
+    """
+
+    def __init__(self, precision_bits: int = 7, unit_us: float = 1.0):
+        self.sub_buckets = 1 << precision_bits
+        self.unit_us = unit_us
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.min_us: Optional[float] = None
+        self.max_us = 0.0
+
+    def _bucket(self, value_us: float):
+        value = int(value_us / self.unit_us)
+        if value < self.sub_buckets:
+            return 0, value
+        shift = value.bit_length() - self.sub_buckets.bit_length() + 1
+        return shift, value >> shift
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0.0, seconds * 1_000_000)
+        self.counts[self._bucket(value_us)] += 1
+        self.total += 1
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Upper bound (ms) of the bucket holding the given percentile"""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(self.total * percentile / 100.0))
+        seen = 0
+        for shift, sub in sorted(self.counts):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                upper_us = ((sub + 1) << shift) * self.unit_us
+                return round(min(upper_us, self.max_us) / 1000, 3)
+        return round(self.max_us / 1000, 3)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "min_ms": round((self.min_us or 0.0) / 1000, 3),
+            "p50_ms": self.value_at_percentile(50),
+            "p90_ms": self.value_at_percentile(90),
+            "p99_ms": self.value_at_percentile(99),
+            "p99_9_ms": self.value_at_percentile(99.9),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+
+class ScenarioStats:
+    """Latency histogram and outcome counters for one scenario"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.scheduling_lag = LatencyHistogram()
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        count = self.histogram.total
+        ok = sum(n for code, n in self.status_codes.items() if 200 <= int(code) < 300)
+        return {
+            "count": count,
+            "ok": ok,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "success_rate": round(ok / count, 4) if count else 0.0,
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+            "latency": self.histogram.summary(),
+            "scheduling_lag": self.scheduling_lag.summary(),
+        }
+
+
+def build_request(scenario: str, i: int) -> Dict[str, Any]:
+    """Method, path and body for the i-th request of a scenario"""
+    if scenario == "generate":
+        return {
+            "method": "POST",
+            "url": "/api/suggestions:generate",
+            "json": {
+                "user_id": f"load-user-{i % 50}",
+                "user_request": SAMPLE_PROMPTS[i % len(SAMPLE_PROMPTS)],
+                "num_suggestions": 1,
+            },
+        }
+    if scenario == "catalog":
+        return {"method": "GET", "url": "/catalog", "params": {"page": 1 + i % 5, "page_size": 50}}
+    if scenario == "tools":
+        return {"method": "GET", "url": "/catalog/tools", "params": {"page": 1 + i % 5, "page_size": 50}}
+    if scenario == "search":
+        return {"method": "POST", "url": "/api/semantic-search/search",
+                "json": {"query": SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], "k": 10}}
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def _issue(client: httpx.AsyncClient, scenario: str, i: int, stats: ScenarioStats,
+                 intended_start: Optional[float] = None) -> None:
+    request = build_request(scenario, i)
+    actual_start = time.perf_counter()
+    # Open loop measures from the intended send time to avoid coordinated omission
+    start = intended_start if intended_start is not None else actual_start
+    if intended_start is not None:
+        stats.scheduling_lag.record(actual_start - intended_start)
+    try:
+        response = await client.request(**request)
+        stats.status_codes[str(response.status_code)] += 1
+    except Exception as e:
+        stats.errors[type(e).__name__] += 1
+    finally:
+        stats.histogram.record(time.perf_counter() - start)
+
+
+async def run_open_loop(client: httpx.AsyncClient, scenario: str, rps: float, duration: float,
+                        stats: ScenarioStats, max_in_flight: int = 1000) -> None:
+    """Poisson arrivals at ``rps`` regardless of how fast responses come back"""
+    in_flight = set()
+    loop_start = time.perf_counter()
+    next_send = loop_start
+    i = 0
+    while next_send - loop_start < duration:
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            stats.errors["client_overloaded"] += 1
+        else:
+            task = asyncio.create_task(_issue(client, scenario, i, stats, intended_start=next_send))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        i += 1
+        next_send += random.expovariate(rps)
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+async def run_closed_loop(client: httpx.AsyncClient, scenario: str, concurrency: int, duration: float,
+                          stats: ScenarioStats, think_time: float = 0.0) -> None:
+    """``concurrency`` workers each sending the next request when the last returns"""
+    deadline = time.perf_counter() + duration
+    counter = iter(range(10 ** 9))
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await _issue(client, scenario, next(counter), stats)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def install_fake_backends() -> List[str]:
+    """Swap Redis and MongoDB clients for in-memory stand-ins when available"""
+    installed = []
+    try:
+        import fakeredis.aioredis
+        from core.catalog.redis_client import RedisClientFactory
+        RedisClientFactory._redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        installed.append("fakeredis")
+    except ImportError:
+        print("⚠️ fakeredis not installed, using the configured Redis")
+
+    try:
+        import importlib
+        import motor.motor_asyncio
+        from mongomock_motor import AsyncMongoMockClient
+        motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+        for module_name in (
+            "core.catalog.database_service",
+            "api.user_services.suggestions_service",
+            "api.user_services.user_service",
+            "api.routes.api.integrations",
+        ):
+            module = importlib.import_module(module_name)
+            module.AsyncIOMotorClient = AsyncMongoMockClient
+        installed.append("mongomock-motor")
+    except ImportError:
+        print("⚠️ mongomock-motor not installed, using the configured MongoDB")
+    return installed
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    stub = None
+    backends: List[str] = []
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from core.config import settings
+        if not args.real_llm:
+            from scripts.llm_stub_server import LLMStubServer, StubConfig
+            stub = LLMStubServer(StubConfig(
+                claude_latency=args.stub_latency,
+                groq_latency=args.stub_groq_latency,
+                jitter=args.stub_jitter,
+                rate_429=args.stub_rate_429,
+            ))
+            stub_url = await stub.start(port=args.stub_port)
+            settings.anthropic_base_url = f"{stub_url}/v1/messages"
+            settings.groq_base_url = f"{stub_url}/openai/v1"
+            settings.anthropic_api_key = settings.anthropic_api_key or "stub-key"
+            settings.groq_api_key = settings.groq_api_key or "stub-key"
+        if args.fake_backends:
+            backends = install_fake_backends()
+
+        from api.main import app
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                   timeout=args.timeout)
+
+    report_scenarios = {}
+    try:
+        for scenario in args.scenario:
+            stats = ScenarioStats()
+            print(f"🚀 {scenario}: {'open loop @ %.1f rps' % args.rps if args.rps else 'closed loop x%d' % args.concurrency}"
+                  f" for {args.duration:.0f}s")
+            started = time.perf_counter()
+            if args.rps:
+                await run_open_loop(client, scenario, args.rps, args.duration, stats)
+            else:
+                await run_closed_loop(client, scenario, args.concurrency, args.duration, stats, args.think_time)
+            report_scenarios[scenario] = stats.to_dict(time.perf_counter() - started)
+            latency = report_scenarios[scenario]["latency"]
+            print(f"   {report_scenarios[scenario]['count']} requests, p50={latency['p50_ms']}ms "
+                  f"p99={latency['p99_ms']}ms, success={report_scenarios[scenario]['success_rate']:.1%}")
+    finally:
+        await client.aclose()
+        if stub is not None:
+            await stub.stop()
+
+    return {
+        "run": {
+            "timestamp": datetime.now().isoformat(),
+            "target": args.url or "in-process",
+            "mode": "open" if args.rps else "closed",
+            "rps": args.rps,
+            "concurrency": None if args.rps else args.concurrency,
+            "duration_s": args.duration,
+            "fake_backends": backends,
+            "stub_llm": stub.get_stats() if stub else None,
+        },
+        "scenarios": report_scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Weave API")
+    parser.add_argument("--scenario", action="append", choices=["generate", "catalog", "tools", "search"],
+                        help="Scenario to run (repeatable, default: generate)")
+    parser.add_argument("--url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--rps", type=float, default=None, help="Open loop arrival rate (omit for closed loop)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Closed loop worker count")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Closed loop pause between requests (s)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout (s)")
+    parser.add_argument("--fake-backends", action="store_true", help="Use fakeredis/mongomock-motor if installed")
+    parser.add_argument("--real-llm", action="store_true", help="Call the configured LLM APIs instead of stubs")
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--stub-latency", type=float, default=1.5, help="Stub Claude latency (s)")
+    parser.add_argument("--stub-groq-latency", type=float, default=0.3, help="Stub Groq latency (s)")
+    parser.add_argument("--stub-jitter", type=float, default=0.3, help="Stub latency jitter (s)")
+    parser.add_argument("--stub-rate-429", type=float, default=0.0, help="Stub 429 probability")
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+    args.scenario = args.scenario or ["generate"]
+
+    report = asyncio.run(run_load_test(args))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text)
+        print(f"📊 Report written to {args.out}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,8 @@ from .models import (
     GenerationResponse, 
     MissingField,
     CatalogContext, 
-    GenerationContext
+    GenerationContext,
+    PromptParts
 )
 # Template exports are intentionally omitted from package root to avoid tight coupling
 
@@ -33,4 +34,5 @@ __all__ = [
     'MissingField',
     'CatalogContext',
     'GenerationContext',
+    'PromptParts',
 ]
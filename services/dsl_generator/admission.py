@@ -0,0 +1,252 @@
+"""
+Admission Control for Workflow Generation
+
+Bounds how many generation requests run at once and how many may wait.
+Waiting requests are served by priority (interactive before batch/eval) and
+round-robin across users within a priority, so one noisy user cannot starve
+the rest. Requests whose expected queue time exceeds the budget are shed
+up front with a Retry-After hint instead of piling onto the Claude rate
+limiter and holding connections for minutes.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Request rejected by admission control: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionConfig:
+    """Configuration for admission control"""
+    max_concurrency: int = 4  # Generations running at once
+    max_queue: int = 32  # Requests allowed to wait
+    max_queue_time: float = 20.0  # Seconds a request may wait before being shed
+    max_queued_per_user: int = 4  # Waiting requests per user
+    batch_queue_share: float = 0.5  # Fraction of the queue batch requests may occupy
+    initial_service_time: float = 10.0  # Service time estimate before any request completes
+
+
+@dataclass
+class _Waiter:
+    user_id: str
+    priority: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    queued: bool = True
+
+
+class AdmissionController:
+    """
+    Bounded, priority-aware, per-user fair admission queue.
+
+    Slots are handed directly from a finishing request to the next waiter,
+    so ``in_flight`` never exceeds ``max_concurrency`` and woken waiters do
+    not race new arrivals.
+    """
+
+    def __init__(self, config: AdmissionConfig):
+        self.config = config
+        self.in_flight = 0
+        # priority -> user_id -> waiters; OrderedDict order is the round-robin order
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._queued_by_priority: Counter = Counter()
+        self._queued_by_user: Counter = Counter()
+        self._service_time = config.initial_service_time  # EWMA of generation time (s)
+        self._queue_waits: Deque[float] = deque(maxlen=1000)
+        self.stats: Counter = Counter()
+
+    @property
+    def queued(self) -> int:
+        return sum(self._queued_by_priority.values())
+
+    def _ahead_of(self, priority: str) -> int:
+        """Waiters that would be served before a new request of this priority"""
+        if priority == PRIORITY_INTERACTIVE:
+            return self._queued_by_priority[PRIORITY_INTERACTIVE]
+        return self.queued
+
+    def estimated_wait(self, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """Expected queue time (s) for a request arriving now"""
+        if self.in_flight < self.config.max_concurrency:
+            return 0.0
+        return (self._ahead_of(priority) + 1) / self.config.max_concurrency * self._service_time
+
+    def _retry_after(self, priority: str) -> int:
+        return max(1, math.ceil(self.estimated_wait(priority)))
+
+    def _reject(self, reason: str, priority: str) -> AdmissionRejected:
+        self.stats[f"rejected_{reason}"] += 1
+        retry_after = self._retry_after(priority)
+        logger.warning(f"🚦 Shedding {priority} request ({reason}), retry after {retry_after}s")
+        return AdmissionRejected(reason, retry_after)
+
+    async def acquire(self, user_id: str, priority: str = PRIORITY_INTERACTIVE) -> None:
+        """
+        Wait for a generation slot.
+
+        Raises:
+            AdmissionRejected: If the queue is full, the user already has too
+                many waiting requests, or the expected/actual queue time
+                exceeds ``max_queue_time``
+        """
+        if priority not in PRIORITIES:
+            priority = PRIORITY_INTERACTIVE
+        self.stats["requests"] += 1
+
+        if self.in_flight < self.config.max_concurrency and not self.queued:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            self._queue_waits.append(0.0)
+            return
+
+        queue_limit = self.config.max_queue
+        if priority == PRIORITY_BATCH:
+            queue_limit = int(queue_limit * self.config.batch_queue_share)
+        if self.queued >= queue_limit:
+            raise self._reject("queue_full", priority)
+        if self._queued_by_user[user_id] >= self.config.max_queued_per_user:
+            raise self._reject("user_limit", priority)
+        if self.estimated_wait(priority) > self.config.max_queue_time:
+            raise self._reject("queue_time", priority)
+
+        waiter = _Waiter(user_id, priority, asyncio.get_running_loop().create_future())
+        self._queues[priority].setdefault(user_id, deque()).append(waiter)
+        self._queued_by_priority[priority] += 1
+        self._queued_by_user[user_id] += 1
+
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.config.max_queue_time)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            self._dequeue(waiter)
+            if waiter.future.done() and not waiter.future.cancelled():
+                # A slot was handed over just as we gave up: pass it on
+                self._release_slot()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject("queue_timeout", priority)
+
+        self.stats["admitted"] += 1
+        self._queue_waits.append(time.monotonic() - waiter.enqueued_at)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        if not waiter.queued:
+            return
+        waiter.queued = False
+        user_queue = self._queues[waiter.priority].get(waiter.user_id)
+        if user_queue is not None:
+            try:
+                user_queue.remove(waiter)
+            except ValueError:
+                pass
+            if not user_queue:
+                del self._queues[waiter.priority][waiter.user_id]
+        self._queued_by_priority[waiter.priority] -= 1
+        self._queued_by_user[waiter.user_id] -= 1
+        if self._queued_by_user[waiter.user_id] <= 0:
+            del self._queued_by_user[waiter.user_id]
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Highest priority first, round-robin across users within a priority"""
+        for priority in PRIORITIES:
+            users = self._queues[priority]
+            while users:
+                user_id, user_queue = next(iter(users.items()))
+                waiter = user_queue[0]
+                self._dequeue(waiter)
+                if user_id in users:
+                    users.move_to_end(user_id)
+                if not waiter.future.done():
+                    return waiter
+        return None
+
+    def _release_slot(self) -> None:
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.future.set_result(None)  # slot handed over, in_flight unchanged
+        else:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """Free a slot, updating the service time estimate"""
+        if service_time is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * service_time
+        self._release_slot()
+
+    @asynccontextmanager
+    async def admit(self, user_id: str, priority: str = PRIORITY_INTERACTIVE):
+        """Hold a generation slot for the duration of the block"""
+        await self.acquire(user_id, priority)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, shedding counters and queue-time percentiles"""
+        waits = sorted(self._queue_waits)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p / 100.0 * len(waits)))], 3)
+
+        return {
+            "config": {
+                "max_concurrency": self.config.max_concurrency,
+                "max_queue": self.config.max_queue,
+                "max_queue_time": self.config.max_queue_time,
+                "max_queued_per_user": self.config.max_queued_per_user
+            },
+            "current_state": {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "queued_by_priority": {p: self._queued_by_priority[p] for p in PRIORITIES},
+                "queued_users": len(self._queued_by_user),
+                "estimated_wait_seconds": round(self.estimated_wait(), 2),
+                "service_time_ewma_seconds": round(self._service_time, 2)
+            },
+            "counters": dict(self.stats),
+            "queue_wait_seconds": {"p50": pct(50), "p95": pct(95), "p99": pct(99)}
+        }
+
+
+# Global admission controller instance
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the global admission controller, configured from settings"""
+    global _admission_controller
+
+    if _admission_controller is None:
+        from core.config import settings
+        config = AdmissionConfig(
+            max_concurrency=settings.admission_max_concurrency,
+            max_queue=settings.admission_max_queue,
+            max_queue_time=settings.admission_max_queue_time,
+            max_queued_per_user=settings.admission_max_queued_per_user
+        )
+        _admission_controller = AdmissionController(config)
+        logger.info(f"🚦 Admission controller initialized: {config}")
+
+    return _admission_controller
@@ -10,7 +10,7 @@ import random
 import time
 import uuid
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 from tenacity import (
     retry, 
     stop_after_attempt, 
@@ -22,7 +22,16 @@ import httpx
 from httpx import HTTPStatusError
 from core.config import settings
 from core.logging_config import get_logger, get_llm_logger
-from .rate_limiter import wait_for_claude_token, record_claude_rate_limit, record_claude_success
+from .rate_limiter import (
+    wait_for_claude_token,
+    record_claude_rate_limit,
+    record_claude_success,
+    reserve_claude_tokens,
+    reconcile_claude_tokens
+)
+from .prompt_cards import estimate_tokens
+from .models import PromptParts
+from .cassette import llm_cassette
 
 logger = get_logger(__name__)
 llm_logger = get_llm_logger(__name__)
@@ -49,7 +58,7 @@ class AIClient:
         """Initialize the AI client"""
         self.anthropic_api_key = anthropic_api_key or settings.anthropic_api_key
         self.claude_model = "claude-3-5-sonnet-20241022"  # Latest Claude model
-        self.base_url = "https://api.anthropic.com/v1/messages"
+        self.base_url = settings.anthropic_base_url
         
         # Rate limiting configuration
         self.base_delay = getattr(settings, 'claude_rate_limit_delay', 2.0)
@@ -61,6 +70,15 @@ class AIClient:
         self.request_count = 0
         self.rate_limit_window = 60  # 1 minute window
         
+        # Token usage, including prompt cache reads/writes
+        self.last_usage: Dict[str, int] = {}
+        self.usage_totals: Dict[str, int] = {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        
         if not self.anthropic_api_key:
             logger.warning("No Anthropic API key provided - AI client will not function")
     
@@ -85,6 +103,62 @@ class AIClient:
         
         return wait_time
     
+    def _build_messages(self, prompt: Union[str, PromptParts]) -> Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Build the system blocks and messages for a prompt.
+        
+        Plain strings are sent as a single user message. PromptParts get a
+        cache breakpoint after the static system prefix and another after the
+        per-request tool context, so retries only pay for the request part.
+        """
+        if isinstance(prompt, str):
+            return None, [{"role": "user", "content": prompt}]
+        
+        system_blocks = None
+        if prompt.system:
+            system_blocks = [{
+                "type": "text",
+                "text": prompt.system,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        
+        content = []
+        if prompt.context:
+            content.append({
+                "type": "text",
+                "text": prompt.context,
+                "cache_control": {"type": "ephemeral"}
+            })
+        content.append({"type": "text", "text": prompt.request})
+        
+        return system_blocks, [{"role": "user", "content": content}]
+    
+    @staticmethod
+    def _estimate_input_tokens(system_blocks: Optional[List[Dict[str, Any]]], messages: List[Dict[str, Any]]) -> int:
+        """Rough input token count for a request, used to reserve ITPM quota"""
+        texts = [block.get("text", "") for block in system_blocks or []]
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                texts.append(content)
+            else:
+                texts.extend(block.get("text", "") for block in content or [])
+        return sum(estimate_tokens(text) for text in texts)
+    
+    def _record_usage(self, usage: Dict[str, Any]):
+        """Track token usage reported by the API, including prompt cache hits"""
+        self.last_usage = {key: int(usage.get(key) or 0) for key in self.usage_totals}
+        for key, value in self.last_usage.items():
+            self.usage_totals[key] += value
+        
+        cache_read = self.last_usage["cache_read_input_tokens"]
+        cache_write = self.last_usage["cache_creation_input_tokens"]
+        if cache_read or cache_write:
+            logger.info(
+                f"💾 Prompt cache: read={cache_read} write={cache_write} "
+                f"uncached_input={self.last_usage['input_tokens']} output={self.last_usage['output_tokens']}"
+            )
+    
     async def _wait_for_rate_limit(self, attempt: int):
         """Wait before retrying due to rate limiting"""
         wait_time = self._get_retry_wait_time(attempt)
@@ -97,9 +171,14 @@ class AIClient:
         retry=retry_if_exception_type((HTTPStatusError, httpx.ConnectError, httpx.TimeoutException)),
         before_sleep=before_sleep_log(logger, logging.INFO)
     )
-    async def generate_workflow(self, prompt: str) -> str:
-        """Call the Claude API to generate the workflow with retry logic"""
-        if not self.anthropic_api_key:
+    async def generate_workflow(self, prompt: Union[str, PromptParts], temperature: Optional[float] = None) -> str:
+        """Call the Claude API to generate the workflow with retry logic
+        
+        Args:
+            prompt: Prompt to send to Claude, either a plain string or PromptParts for prompt caching
+            temperature: Optional sampling temperature (0.0-1.0); the API default is used when None
+        """
+        if not self.anthropic_api_key and not llm_cassette.replaying:
             raise ValueError("Anthropic API key is required for Claude access")
         
         # Generate request ID for tracking
@@ -108,19 +187,36 @@ class AIClient:
         # Log LLM request
         llm_logger.log_llm_request(
             model=self.claude_model,
-            prompt=prompt,
+            prompt=prompt if isinstance(prompt, str) else prompt.to_text(),
             request_id=request_id
         )
         
+        system_blocks, messages = self._build_messages(prompt)
+        payload = {
+            "model": self.claude_model,
+            "max_tokens": 4000,
+            "messages": messages
+        }
+        if system_blocks:
+            payload["system"] = system_blocks
+        if temperature is not None:
+            payload["temperature"] = temperature
+        
+        # Replay mode: serve the recorded response, skipping rate limiting and the network
+        if llm_cassette.replaying:
+            result = await llm_cassette.replay("anthropic", payload)
+            self._record_usage(result.get("usage", {}))
+            return result["content"][0]["text"]
+        
         # Wait for rate limiter token before making request
         await wait_for_claude_token()
         
-        # Check local rate limiting
-        current_time = time.time()
-        if current_time - self.last_request_time < 1.0:  # Minimum 1 second between requests
-            wait_time = 1.0 - (current_time - self.last_request_time)
-            logger.debug(f"Local rate limiting: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+        # Hold estimated input tokens and max_tokens against the ITPM/OTPM quotas
+        token_reservation = await reserve_claude_tokens(
+            self._estimate_input_tokens(system_blocks, messages),
+            payload["max_tokens"]
+        )
+        reconciled = False
         
         headers = {
             "Content-Type": "application/json",
@@ -128,18 +224,14 @@ class AIClient:
             "anthropic-version": "2023-06-01"
         }
         
-        payload = {
-            "model": self.claude_model,
-            "max_tokens": 4000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-        
         try:
+            # Check local rate limiting
+            current_time = time.time()
+            if current_time - self.last_request_time < 1.0:  # Minimum 1 second between requests
+                wait_time = 1.0 - (current_time - self.last_request_time)
+                logger.debug(f"Local rate limiting: waiting {wait_time:.2f}s")
+                await asyncio.sleep(wait_time)
+            
             # Update request tracking
             self.last_request_time = time.time()
             self.request_count += 1
@@ -183,6 +275,10 @@ class AIClient:
                 
                 result = response.json()
                 response_text = result["content"][0]["text"]
+                self._record_usage(result.get("usage", {}))
+                reconcile_claude_tokens(token_reservation, self.last_usage)
+                reconciled = True
+                llm_cassette.record("anthropic", payload, result, response_time_ms)
                 
                 # Log LLM response
                 llm_logger.log_llm_response(
@@ -216,8 +312,12 @@ class AIClient:
             )
             logger.error(f"Unexpected error calling Claude API: {e}")
             raise RuntimeError(f"Failed to call Claude API: {e}")
+        finally:
+            # Failed or cancelled requests release their token reservation
+            if not reconciled:
+                reconcile_claude_tokens(token_reservation, {})
     
-    async def generate_workflow_with_fallback(self, prompt: str) -> str:
+    async def generate_workflow_with_fallback(self, prompt: Union[str, PromptParts]) -> str:
         """Generate workflow with fallback to simpler prompts if rate limited"""
         try:
             return await self.generate_workflow(prompt)
@@ -227,9 +327,12 @@ class AIClient:
             simplified_prompt = self._simplify_prompt(prompt)
             return await self.generate_workflow(simplified_prompt)
     
-    def _simplify_prompt(self, prompt: str) -> str:
+    def _simplify_prompt(self, prompt: Union[str, PromptParts]) -> str:
         """Simplify the prompt to reduce token usage and increase success rate"""
         # Basic prompt simplification - you can enhance this based on your needs
+        if isinstance(prompt, PromptParts):
+            # Drop the (large) static prefix and tool context, keep just the request
+            prompt = prompt.request
         lines = prompt.split('\n')
         if len(lines) > 3:
             # Keep only the first few lines to reduce complexity
@@ -240,7 +343,7 @@ class AIClient:
     
     def is_configured(self) -> bool:
         """Check if the AI client is properly configured"""
-        return bool(self.anthropic_api_key)
+        return bool(self.anthropic_api_key) or llm_cassette.replaying
     
     def get_model_info(self) -> dict:
         """Get information about the current model configuration"""
@@ -277,6 +380,16 @@ class AIClient:
         
         logger.info(f"Rate limiting updated: base_delay={self.base_delay}s, max_delay={self.max_delay}s, max_retries={self.max_retries}")
     
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Get token usage totals, including prompt cache reads and writes"""
+        totals = self.usage_totals
+        total_input = totals["input_tokens"] + totals["cache_creation_input_tokens"] + totals["cache_read_input_tokens"]
+        return {
+            "last_request": dict(self.last_usage),
+            "totals": dict(totals),
+            "cache_hit_ratio": totals["cache_read_input_tokens"] / total_input if total_input else 0.0
+        }
+    
     def get_rate_limiting_stats(self) -> Dict[str, Any]:
         """Get current rate limiting statistics"""
         current_time = time.time()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark for DSLGeneratorService.
+
+Drives the benchmark/eval prompt sets through the real generation pipeline
+with Claude and Groq served from LLM cassettes, and reports per-stage timings
+so our own CPU overhead can be tracked (and regressions caught in CI).
+
+Usage:
+    # 1. Record cassettes once (needs API keys and network)
+    python services/dsl_generator/benchmark.py --mode record
+
+    # 2. Replay offline, optionally comparing against a previous report
+    python services/dsl_generator/benchmark.py --out bench.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Ensure project root is on sys.path when running as a script
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.dsl_generator.cassette import configure_cassette
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.models import GenerationRequest
+
+DEFAULT_DATASETS = [
+    ROOT / "services" / "dsl_generator" / "benchmarks" / "examples.json",
+    ROOT / "evals" / "eval_prompts.json",
+]
+
+# (stage name, owner attribute path, method name)
+STAGES = [
+    ("vagueness", "", "_detect_vagueness"),
+    ("retrieval", "", "_retrieve_relevant_tools"),
+    ("semantic_search", "semantic_search", "search"),
+    ("groq", "", "_call_groq_api"),
+    ("context_packing", "", "_limit_tools_for_context"),
+    ("prompt_build", "", "_build_robust_claude_prompt"),
+    ("claude", "ai_client", "generate_workflow"),
+    ("parse", "response_parser", "parse_response"),
+    ("hallucination_check", "", "_check_tool_hallucinations"),
+    ("validation", "", "_validate_generated_workflow"),
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values_sorted = sorted(values)
+    k = max(0, min(len(values_sorted) - 1, int(round((p / 100.0) * (len(values_sorted) - 1)))))
+    return values_sorted[k]
+
+
+class StageTimer:
+    """Wraps generator methods on the instance and records call durations (ms)"""
+
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+
+    def _wrap(self, stage: str, method: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed_async(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    self.timings[stage].append((time.perf_counter() - start) * 1000)
+            return timed_async
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.timings[stage].append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def instrument(self, generator: DSLGeneratorService) -> None:
+        for stage, owner_path, method_name in STAGES:
+            owner = getattr(generator, owner_path) if owner_path else generator
+            method = getattr(owner, method_name, None)
+            if method is not None:
+                setattr(owner, method_name, self._wrap(stage, method))
+
+    def drain(self) -> Dict[str, float]:
+        """Return per-stage totals (ms) since the last drain and reset"""
+        totals = {stage: round(sum(values), 2) for stage, values in self.timings.items()}
+        self.timings = defaultdict(list)
+        return totals
+
+
+def load_cases(paths: List[Path], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    cases = []
+    for path in paths:
+        for i, case in enumerate(json.loads(Path(path).read_text())):
+            cases.append({
+                "id": case.get("id") or f"{Path(path).stem}_{i + 1:03d}",
+                "prompt": case["prompt"],
+                "selected_apps": case.get("selected_apps"),
+                "workflow_type": case.get("workflow_type", "template"),
+                "complexity": case.get("complexity", "medium"),
+            })
+    return cases[:limit] if limit else cases
+
+
+async def run_benchmark(
+    datasets: List[Path],
+    mode: str,
+    cassette_dir: Optional[str],
+    latency: float,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    cassette = configure_cassette(mode=mode, directory=cassette_dir, replay_latency=latency)
+    cases = load_cases(datasets, limit)
+
+    generator = DSLGeneratorService()
+    await generator.initialize()
+    timer = StageTimer()
+    timer.instrument(generator)
+
+    results = []
+    for i, case in enumerate(cases, 1):
+        request = GenerationRequest(
+            user_prompt=case["prompt"],
+            selected_apps=case["selected_apps"],
+            workflow_type=case["workflow_type"],
+            complexity=case["complexity"],
+        )
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            response = await generator.generate_workflow(request)
+            success, error = response.success, response.error_message
+        except Exception as e:
+            success, error = False, str(e)
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.process_time() - cpu_start) * 1000
+
+        results.append({
+            "id": case["id"],
+            "success": success,
+            "error_message": error,
+            "wall_ms": round(wall_ms, 2),
+            "cpu_ms": round(cpu_ms, 2),
+            "stages_ms": timer.drain(),
+        })
+        print(f"[{i}/{len(cases)}] {case['id']}: {'✅' if success else '❌'} {wall_ms:.0f}ms wall, {cpu_ms:.0f}ms cpu")
+
+    stage_names = [stage for stage, _, _ in STAGES]
+    stage_summary = {}
+    for stage in stage_names:
+        values = [r["stages_ms"][stage] for r in results if stage in r["stages_ms"]]
+        if values:
+            stage_summary[stage] = {
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "mean_ms": round(sum(values) / len(values), 2),
+            }
+
+    walls = [r["wall_ms"] for r in results]
+    cpus = [r["cpu_ms"] for r in results]
+    return {
+        "run": {
+            "timestamp": datetime.now().isoformat(),
+            "mode": mode,
+            "replay_latency": latency,
+            "datasets": [str(p) for p in datasets],
+            "cassettes": cassette.get_stats(),
+        },
+        "aggregate": {
+            "count": len(results),
+            "success_rate": sum(1 for r in results if r["success"]) / max(1, len(results)),
+            "p50_wall_ms": round(percentile(walls, 50), 2),
+            "p95_wall_ms": round(percentile(walls, 95), 2),
+            "p50_cpu_ms": round(percentile(cpus, 50), 2),
+            "p95_cpu_ms": round(percentile(cpus, 95), 2),
+            "stages": stage_summary,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List p50 regressions beyond ``tolerance`` (fraction) versus a baseline report"""
+    regressions = []
+    current, previous = report["aggregate"], baseline.get("aggregate", {})
+    checks = [("p50_cpu_ms", current.get("p50_cpu_ms"), previous.get("p50_cpu_ms"))]
+    for stage, summary in current.get("stages", {}).items():
+        checks.append((f"{stage}.p50_ms", summary["p50_ms"], previous.get("stages", {}).get(stage, {}).get("p50_ms")))
+    for name, now, before in checks:
+        # Ignore sub-millisecond stages, they are dominated by noise
+        if now is not None and before and before >= 1.0 and now > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.2f}ms -> {now:.2f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline DSL generation pipeline benchmark")
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+    parser.add_argument("--dataset", action="append", type=Path, help="Prompt dataset JSON (repeatable)")
+    parser.add_argument("--cassette-dir", default=None, help="Cassette directory (defaults to settings)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated replay latency in seconds (-1 = recorded)")
+    parser.add_argument("--limit", type=int, default=None, help="Only run the first N cases")
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 regression vs baseline (fraction)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(
+        datasets=args.dataset or DEFAULT_DATASETS,
+        mode=args.mode,
+        cassette_dir=args.cassette_dir,
+        latency=args.latency,
+        limit=args.limit,
+    ))
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text)
+        print(f"📊 Report written to {args.out}")
+    print(json.dumps(report["aggregate"], indent=2))
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("❌ Performance regressions:\n  " + "\n  ".join(regressions))
+            raise SystemExit(1)
+        print("✅ No regressions versus baseline")
+
+
+if __name__ == "__main__":
+    main()
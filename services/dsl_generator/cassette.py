@@ -0,0 +1,158 @@
+"""
+LLM Cassettes for DSL Generator
+
+Record/replay layer for the Claude and Groq HTTP calls. In ``record`` mode every
+successful response is written to a cassette file keyed by a hash of the
+provider and request payload; in ``replay`` mode responses are served from the
+cassettes (with optional simulated latency) and no network call is made. This
+lets the whole generation pipeline run offline and deterministically for
+benchmarks and CI.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when no cassette matches a request"""
+    pass
+
+
+class LLMCassette:
+    """
+    Request-hash-keyed store of recorded LLM responses.
+
+    Each interaction is one JSON file ``<provider>_<hash>.json`` holding the
+    request payload, the response body and the recorded latency, so cassettes
+    can be reviewed and committed individually.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        directory: Union[str, Path] = "data/cassettes",
+        replay_latency: float = 0.0
+    ):
+        """
+        Args:
+            mode: "off", "record" or "replay"
+            directory: Directory holding cassette files
+            replay_latency: Simulated latency in seconds for replayed calls;
+                a negative value replays each call's recorded latency
+        """
+        if mode not in CASSETTE_MODES:
+            logger.warning(f"Unknown cassette mode '{mode}', disabling cassettes")
+            mode = "off"
+        self.mode = mode
+        self.directory = Path(directory)
+        self.replay_latency = replay_latency
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def request_key(provider: str, payload: Dict[str, Any]) -> str:
+        """Stable hash of a request payload (key order independent)"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(f"{provider}:{canonical}".encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, provider: str, key: str) -> Path:
+        return self.directory / f"{provider}_{key}.json"
+
+    def record(self, provider: str, payload: Dict[str, Any], response: Dict[str, Any], latency_ms: float) -> None:
+        """Write a successful interaction to its cassette (no-op unless recording)"""
+        if not self.recording:
+            return
+        key = self.request_key(provider, payload)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self._path(provider, key), "w") as f:
+                json.dump({
+                    "provider": provider,
+                    "key": key,
+                    "recorded_at": time.time(),
+                    "latency_ms": round(latency_ms, 1),
+                    "request": payload,
+                    "response": response
+                }, f, indent=2, ensure_ascii=False)
+            self.stats["recorded"] += 1
+            logger.info(f"📼 Recorded {provider} cassette {key}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record {provider} cassette: {e}")
+
+    async def replay(self, provider: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serve the recorded response body for a request.
+
+        Raises:
+            CassetteMissError: If no cassette exists for the request
+        """
+        key = self.request_key(provider, payload)
+        path = self._path(provider, key)
+        try:
+            with open(path) as f:
+                cassette = json.load(f)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            raise CassetteMissError(f"No {provider} cassette for request {key} in {self.directory}")
+
+        delay = self.replay_latency
+        if delay < 0:
+            delay = cassette.get("latency_ms", 0.0) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self.stats["replayed"] += 1
+        logger.debug(f"📼 Replayed {provider} cassette {key}")
+        return cassette["response"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "directory": str(self.directory), **self.stats}
+
+
+def _from_settings() -> LLMCassette:
+    directory = Path(settings.llm_cassette_dir)
+    if not directory.is_absolute():
+        directory = Path(__file__).parent.parent.parent / directory
+    return LLMCassette(
+        mode=settings.llm_cassette_mode,
+        directory=directory,
+        replay_latency=settings.llm_cassette_latency
+    )
+
+
+# Shared cassette used by AIClient and the Groq tool-selection call
+llm_cassette = _from_settings()
+
+
+def configure_cassette(
+    mode: Optional[str] = None,
+    directory: Optional[Union[str, Path]] = None,
+    replay_latency: Optional[float] = None
+) -> LLMCassette:
+    """Reconfigure the shared cassette in place (e.g. from a benchmark runner)"""
+    if mode is not None:
+        llm_cassette.mode = mode if mode in CASSETTE_MODES else "off"
+    if directory is not None:
+        llm_cassette.directory = Path(directory)
+    if replay_latency is not None:
+        llm_cassette.replay_latency = replay_latency
+    logger.info(f"📼 LLM cassette mode={llm_cassette.mode}, dir={llm_cassette.directory}")
+    return llm_cassette
@@ -3,18 +3,76 @@ Catalog Manager for DSL Generator
 
 Handles catalog data management, caching, validation, and provides
 catalog context for workflow generation.
+
+Installing a new catalog snapshot (here or in the global cache service)
+also rebuilds the catalog-derived indexes shared by every generator, once
+per snapshot version and in a worker thread.
 """
 
+import asyncio
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from core.catalog import DatabaseCatalogService
 from core.catalog.redis_client import RedisClientFactory
 from core.catalog.cache import RedisCacheStore
+from core.catalog.snapshot import CatalogSnapshot
 from core.config import settings
+from .prompt_cards import prompt_card_index
+from .template_matcher import template_matcher
 
 logger = logging.getLogger(__name__)
 
+# (snapshot version, task) of the latest catalog index build
+_index_build: Optional[Tuple[str, asyncio.Task]] = None
+
+
+def _catalog_indexes_current(version: str) -> bool:
+    return prompt_card_index.version == version and template_matcher.version == version
+
+
+def load_catalog_indexes(snapshot: CatalogSnapshot) -> None:
+    """Build the prompt cards and template fast path tools for a snapshot (blocking; run it in a worker thread)"""
+    if _index_build is not None and _index_build[0] != snapshot.version:
+        return  # a newer snapshot was installed while this build waited
+    prompt_card_index.load_snapshot(snapshot)
+    template_matcher.load_snapshot(snapshot)
+
+
+def _log_index_build_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"❌ Failed to build catalog indexes: {task.exception()}")
+
+
+def schedule_catalog_index_build(snapshot: CatalogSnapshot) -> Optional[asyncio.Task]:
+    """
+    Rebuild the catalog indexes for a newly installed snapshot.
+
+    Skipped when the snapshot is empty or its version is already built or
+    being built. Runs in a worker thread when an event loop is running,
+    inline otherwise.
+    
+    Returns:
+        The build task, or None if nothing was scheduled
+    """
+    global _index_build
+    if not snapshot or _catalog_indexes_current(snapshot.version):
+        return None
+    if _index_build is not None and _index_build[0] == snapshot.version and not _index_build[1].done():
+        return _index_build[1]
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _index_build = None
+        load_catalog_indexes(snapshot)
+        return None
+    
+    task = loop.create_task(asyncio.to_thread(load_catalog_indexes, snapshot))
+    task.add_done_callback(_log_index_build_error)
+    _index_build = (snapshot.version, task)
+    return task
+
 
 class CatalogManager:
     """
@@ -32,8 +90,10 @@ class CatalogManager:
         self.catalog_service = None
         self.redis_cache = None
         
-        # In-memory cache for catalog data
-        self._catalog_cache = {}
+        # In-memory cache for catalog data: a shared, read-only snapshot and
+        # its {slug: provider} view
+        self._catalog_snapshot = CatalogSnapshot.empty()
+        self._catalog_cache = self._catalog_snapshot.providers
         self._catalog_cache_timestamp = None
         self._catalog_cache_ttl = 3600  # 1 hour cache TTL
     
@@ -69,14 +129,32 @@ class CatalogManager:
             self.redis_cache = None
             self.catalog_service = None
     
-    def set_global_cache(self, catalog_cache: Dict[str, Any]):
-        """Set the catalog cache from the global cache service"""
-        if catalog_cache:
-            self._catalog_cache = catalog_cache.copy()
-            self._catalog_cache_timestamp = time.time()
-            logger.info(f"✅ Catalog manager loaded with {len(catalog_cache)} providers from global cache")
-        else:
+    def _use_snapshot(self, snapshot: CatalogSnapshot, timestamp: Optional[float] = None):
+        self._catalog_snapshot = snapshot
+        self._catalog_cache = snapshot.providers
+        self._catalog_cache_timestamp = timestamp
+        schedule_catalog_index_build(snapshot)
+    
+    def set_global_cache(self, catalog_cache: Any):
+        """
+        Set the catalog cache from the global cache service.
+        
+        Accepts a CatalogSnapshot, which is kept by reference, or a plain
+        {slug: provider} mapping, which is turned into a snapshot once.
+        """
+        if not catalog_cache:
             logger.warning("⚠️  No catalog cache provided to catalog manager")
+            return
+        if catalog_cache is self._catalog_snapshot or catalog_cache is self._catalog_cache:
+            return
+        
+        snapshot = catalog_cache if isinstance(catalog_cache, CatalogSnapshot) else CatalogSnapshot.build(catalog_cache)
+        self._use_snapshot(snapshot, time.time())
+        logger.info(f"✅ Catalog manager loaded with {len(snapshot)} providers from global cache (version {snapshot.version})")
+    
+    def get_catalog_snapshot(self) -> CatalogSnapshot:
+        """Get the catalog snapshot currently in use"""
+        return self._catalog_snapshot
     
     async def get_catalog_data(self) -> Dict[str, Any]:
         """Get catalog data from cache or fetch if needed"""
@@ -95,18 +173,11 @@ class CatalogManager:
             try:
                 logger.info("Cache MISS: Fetching fresh catalog data from service")
                 catalog_data = await self.catalog_service.get_catalog()
-                providers = catalog_data.get('providers', {})
-                
-                # Handle case where providers might be a list or dict
-                if isinstance(providers, list):
-                    providers_dict = {p.get('slug', f'provider_{i}'): p for i, p in enumerate(providers)}
-                    providers = providers_dict
-                elif not isinstance(providers, dict):
-                    providers = {}
+                snapshot = CatalogSnapshot.build(catalog_data.get('providers', {}))
+                providers = snapshot.providers
                 
                 # Cache the data
-                self._catalog_cache = providers
-                self._catalog_cache_timestamp = current_time
+                self._use_snapshot(snapshot, current_time)
                 
                 logger.info(f"Cache UPDATED: Cached catalog data with {len(providers)} providers (TTL: {self._catalog_cache_ttl}s)")
                 return providers
@@ -123,18 +194,11 @@ class CatalogManager:
         try:
             logger.info("Preloading catalog cache...")
             catalog_data = await self.catalog_service.get_catalog()
-            providers = catalog_data.get('providers', {})
-            
-            # Handle case where providers might be a list or dict
-            if isinstance(providers, list):
-                providers_dict = {p.get('slug', f'provider_{i}'): p for i, p in enumerate(providers)}
-                providers = providers_dict
-            elif not isinstance(providers, dict):
-                providers = {}
+            snapshot = CatalogSnapshot.build(catalog_data.get('providers', {}))
+            providers = snapshot.providers
             
             # Cache the data
-            self._catalog_cache = providers
-            self._catalog_cache_timestamp = time.time()
+            self._use_snapshot(snapshot, time.time())
             
             logger.info(f"✅ Catalog cache preloaded with {len(providers)} providers")
             
@@ -152,13 +216,11 @@ class CatalogManager:
             
         except Exception as e:
             logger.error(f"Failed to preload catalog cache: {e}")
-            self._catalog_cache = {}
-            self._catalog_cache_timestamp = None
+            self._use_snapshot(CatalogSnapshot.empty())
     
     def clear_catalog_cache(self):
         """Clear the in-memory catalog cache"""
-        self._catalog_cache = {}
-        self._catalog_cache_timestamp = None
+        self._use_snapshot(CatalogSnapshot.empty())
         logger.info("In-memory catalog cache cleared")
     
     async def refresh_catalog_cache(self, force: bool = False):
@@ -11,6 +11,12 @@ import logging
 from typing import Dict, Any, List, Optional, Tuple
 from base import BaseCompiler, CompilerReport
 
+try:
+    from core.catalog.lookup import ToolLookupIndex
+    from core.catalog.snapshot import ACTION, TRIGGER
+except ImportError:  # compilers can run standalone, without the project root on sys.path
+    ToolLookupIndex = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -224,11 +230,26 @@ class TemplateMaterializer(BaseCompiler):
                     f"Failed to resolve action: {str(e)}"
                 )
     
+    def _lookup_index(self, catalog: Dict[str, Any]):
+        """Lookup index for the catalog, built once per catalog object"""
+        if ToolLookupIndex is None:
+            return None
+        cached = getattr(self, "_catalog_index", None)
+        if cached is None or cached[0] is not catalog:
+            cached = (catalog, ToolLookupIndex.for_catalog(catalog))
+            self._catalog_index = cached
+        return cached[1]
+    
     def _lookup_trigger(self, catalog: Dict[str, Any], trigger: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Lookup trigger in catalog"""
         toolkit_slug = trigger.get("toolkit_slug")
         trigger_id = trigger.get("trigger_id") or trigger.get("slug")
         
+        index = self._lookup_index(catalog)
+        if index is not None:
+            record = index.get(toolkit_slug, trigger_id, TRIGGER)
+            return {**record.data, "provider": record.provider_slug} if record else None
+        
         # Search through catalog for matching trigger
         for provider in catalog.get("providers", []):
             for toolkit in provider.get("toolkits", []):
@@ -244,6 +265,11 @@ class TemplateMaterializer(BaseCompiler):
         toolkit_slug = action.get("toolkit_slug")
         action_id = action.get("action_id") or action.get("slug")
         
+        index = self._lookup_index(catalog)
+        if index is not None:
+            record = index.get(toolkit_slug, action_id, ACTION)
+            return {**record.data, "provider": record.provider_slug} if record else None
+        
         # Search through catalog for matching action
         for provider in catalog.get("providers", []):
             for toolkit in provider.get("toolkits", []):
@@ -0,0 +1,166 @@
+"""
+Context Packer for DSL Generator
+
+Fits the retrieved tools into a Claude input-token budget. Tools are ranked by
+retrieval relevance (semantic similarity, golden-toolkit boost and Groq
+selection order), each tool's precompiled prompt card supplies its token cost, and when the
+budget is exceeded parameter schemas and long descriptions are trimmed before any
+tool is dropped.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .prompt_cards import (
+    PromptCardIndex,
+    prompt_card_index,
+    extract_parameters,
+    TRIM_FULL,
+    TRIM_REQUIRED_PARAMS,
+    TRIM_NO_PARAMS,
+    SHORT_DESCRIPTION_CHARS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ContextPacker:
+    """
+    Packs triggers and actions into a token budget.
+
+    Responsibilities:
+    - Ranking tools by retrieval relevance
+    - Estimating tokens per tool card
+    - Trimming parameter schemas/descriptions before dropping tools
+    - Keeping pinned system tools (e.g. SCHEDULE_BASED) and count caps
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        max_triggers: Optional[int] = None,
+        max_actions: Optional[int] = None,
+        max_providers: Optional[int] = None,
+        min_actions: int = 3,
+        cards: Optional[PromptCardIndex] = None
+    ):
+        self.token_budget = token_budget
+        self.cards = cards or prompt_card_index
+        self.max_triggers = max_triggers
+        self.max_actions = max_actions
+        self.max_providers = max_providers
+        self.min_actions = min_actions
+
+    @staticmethod
+    def _relevance(tool: Dict[str, Any], position: int) -> float:
+        """Retrieval score, with the incoming (Groq/semantic) order as tie-breaker"""
+        score = tool.get('boosted_score', tool.get('similarity_score'))
+        if score is None:
+            score = 0.0
+        return float(score) - position * 1e-6
+
+    @staticmethod
+    def _is_pinned(tool: Dict[str, Any]) -> bool:
+        return tool.get('toolkit_slug') == 'system' or bool((tool.get('metadata') or {}).get('essential'))
+
+    def _rank(self, tools: List[Dict[str, Any]], cap: Optional[int]) -> List[Dict[str, Any]]:
+        ranked = sorted(
+            enumerate(tools),
+            key=lambda item: (not self._is_pinned(item[1]), -self._relevance(item[1], item[0]))
+        )
+        ordered = [tool for _, tool in ranked]
+        return ordered[:cap] if cap is not None else ordered
+
+    def pack(self, pruned_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pack the pruned context into the token budget.
+
+        Returns:
+            New context dict (``triggers``, ``actions``, ``providers``) plus a
+            ``packing`` summary; input tool dicts are not mutated.
+        """
+        triggers = self._rank(pruned_context.get('triggers', []), self.max_triggers)
+        actions = self._rank(pruned_context.get('actions', []), self.max_actions)
+
+        entries = [("trigger", t) for t in triggers] + [("action", a) for a in actions]
+        costs = [self.cards.tool_card(tool, kind).tokens for kind, tool in entries]
+
+        def total_tokens(level: int) -> int:
+            return sum(cost[level] for cost in costs)
+
+        trim_level = TRIM_FULL
+        used = total_tokens(trim_level)
+        while used > self.token_budget and trim_level < TRIM_NO_PARAMS:
+            trim_level += 1
+            used = total_tokens(trim_level)
+
+        # Still over budget: drop least relevant non-pinned tools, keeping a minimum set
+        dropped = 0
+        while used > self.token_budget:
+            victim = self._pick_drop_candidate(entries)
+            if victim is None:
+                break
+            entries.pop(victim)
+            used -= costs.pop(victim)[trim_level]
+            dropped += 1
+
+        packed_triggers = [self._trimmed(tool, trim_level) for kind, tool in entries if kind == "trigger"]
+        packed_actions = [self._trimmed(tool, trim_level) for kind, tool in entries if kind == "action"]
+
+        providers = pruned_context.get('providers', {})
+        used_provider_slugs = []
+        for tool in packed_triggers + packed_actions:
+            slug = tool.get('toolkit_slug', '')
+            if slug in providers and slug not in used_provider_slugs:
+                used_provider_slugs.append(slug)
+        if self.max_providers is not None:
+            used_provider_slugs = used_provider_slugs[:self.max_providers]
+
+        logger.info(
+            f"📦 Packed context: {len(packed_triggers)} triggers, {len(packed_actions)} actions, "
+            f"~{used}/{self.token_budget} tokens (trim level {trim_level}, dropped {dropped})"
+        )
+
+        return {
+            'triggers': packed_triggers,
+            'actions': packed_actions,
+            'providers': {slug: providers[slug] for slug in used_provider_slugs},
+            'packing': {
+                'estimated_tokens': used,
+                'token_budget': self.token_budget,
+                'trim_level': trim_level,
+                'dropped_tools': dropped
+            }
+        }
+
+    def _pick_drop_candidate(self, entries) -> Optional[int]:
+        """Index of the least relevant droppable entry (entries are in relevance order per kind)"""
+        action_count = sum(1 for kind, _ in entries if kind == "action")
+        trigger_count = len(entries) - action_count
+        for index in range(len(entries) - 1, -1, -1):
+            kind, tool = entries[index]
+            if self._is_pinned(tool):
+                continue
+            if kind == "action" and action_count <= self.min_actions:
+                continue
+            if kind == "trigger" and trigger_count <= 1:
+                continue
+            return index
+        return None
+
+    @staticmethod
+    def _trimmed(tool: Dict[str, Any], trim_level: int) -> Dict[str, Any]:
+        """Shallow copy of a tool with parameters/description trimmed to the level"""
+        trimmed = dict(tool)
+        trimmed['prompt_trim_level'] = trim_level
+        parameters = extract_parameters(tool)
+        if trim_level == TRIM_FULL:
+            trimmed['parameters'] = parameters
+        elif trim_level == TRIM_REQUIRED_PARAMS:
+            trimmed['parameters'] = [p for p in parameters if p.get('required')]
+        else:
+            trimmed['parameters'] = []
+            description = trimmed.get('description') or ''
+            if len(description) > SHORT_DESCRIPTION_CHARS:
+                trimmed['description'] = description[:SHORT_DESCRIPTION_CHARS].rstrip() + "..."
+        return trimmed
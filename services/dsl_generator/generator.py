@@ -10,15 +10,28 @@ import logging
 import json
 import httpx
 import asyncio
-from typing import Dict, Any, Optional, List
-from .models import GenerationRequest, GenerationResponse, GenerationContext, CatalogContext
+import time
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Optional, List, Tuple
+from .models import GenerationRequest, GenerationResponse, GenerationContext, CatalogContext, PromptParts
 from .catalog_manager import CatalogManager
 from .context_builder import ContextBuilder
 from .prompt_builder import PromptBuilder
 from .ai_client import AIClient
 from .response_parser import ResponseParser
 from .workflow_validator import WorkflowValidator
-
+from .rate_limiter import claude_tokens_available
+from .slug_resolver import SlugResolver, SlugRepair
+from .context_packer import ContextPacker
+from .prompt_cards import prompt_card_index
+from .template_matcher import SYSTEM_TOOLKIT, WorkflowTemplate, template_matcher
+from .vagueness import vagueness_classifier
+from .cassette import llm_cassette
+from .templates.base_templates import ROBUST_GENERATION_SYSTEM_PROMPT, ROBUST_GENERATION_FINAL_INSTRUCTION
+
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import ACTION, TRIGGER
 from core.config import settings
 from core.semantic_search.search_service import SemanticSearchService
 
@@ -94,6 +107,9 @@ class DSLGeneratorService:
         "splitwise", "ynab", "foursquare", "surveymonkey", "listennotes"
     }
     
+    # Sampling temperatures used to diversify variations in generate_multiple_workflows
+    VARIATION_TEMPERATURES = [0.3, 0.6, 0.8, 0.9, 1.0]
+    
     def __init__(self, anthropic_api_key: Optional[str] = None):
         """
         Initialize the DSL generator service.
@@ -114,17 +130,29 @@ class DSLGeneratorService:
         project_root = Path(__file__).parent.parent.parent
         index_path = project_root / "data" / "semantic_index"
         self.semantic_search = SemanticSearchService(index_path=index_path)
+        
+        # Template fast path for canonical prompts (served without any LLM call);
+        # its catalog tools are loaded when a catalog snapshot is installed
+        self.template_fast_path_enabled = settings.template_fast_path_enabled
+        template_matcher.threshold = settings.template_match_threshold
+        template_matcher.margin = settings.template_match_margin
+        
+        # Embedding-based vagueness detection (heuristics are the fallback)
+        self.vagueness_classifier_enabled = settings.vagueness_classifier_enabled
+        vagueness_classifier.config.threshold = settings.vagueness_threshold
+        vagueness_classifier.config.threshold_with_apps = settings.vagueness_threshold_with_apps
 
         
         # Groq configuration for tool retrieval (from config)
         self.groq_api_key = settings.groq_api_key
-        self.groq_base_url = "https://api.groq.com/openai/v1"
+        self.groq_base_url = settings.groq_base_url
         self.groq_model = "llama-3.1-8b-instant"  # Current fast model for tool retrieval
         
         # Tool selection limits to keep context concise
         self.max_triggers = settings.max_triggers
         self.max_actions = settings.max_actions
         self.max_providers = settings.max_providers
+        self.context_token_budget = settings.claude_context_token_budget
         
         # Maximum regeneration attempts to prevent infinite loops
         self.max_regeneration_attempts = 3
@@ -132,6 +160,11 @@ class DSLGeneratorService:
         # Rate limiting for Claude API calls
         self.claude_rate_limit_delay = settings.claude_rate_limit_delay
         self.max_rate_limit_delay = settings.max_rate_limit_delay
+        
+        # Hedged generation attempts ("off", "delayed" or "parallel")
+        self.hedge_mode = settings.generation_hedge_mode
+        self.hedge_delay = settings.generation_hedge_delay
+        self.hedge_min_spare_tokens = settings.generation_hedge_min_spare_tokens
     
     def set_global_cache(self, processed_catalog: Dict[str, Any]):
         """Set the catalog cache from the global cache service"""
@@ -146,6 +179,10 @@ class DSLGeneratorService:
             # Preload catalog cache
             await self.catalog_manager.preload_catalog_cache()
             
+            # Train the vagueness classifier off the event loop
+            if self.vagueness_classifier_enabled:
+                vagueness_classifier.start_training(self.semantic_search.embedding_service.embed_texts)
+            
             logger.info("DSL Generator service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize DSL Generator service: {e}")
@@ -164,39 +201,10 @@ class DSLGeneratorService:
         log_function_entry("generate_workflow", request=request)
         
         try:
-            # Check for vagueness and return exemplar workflows if detected
-            is_vague = await self._detect_vagueness(request.user_prompt)
-            if is_vague:
-                logger.info(f"🔍 Vague prompt detected. Returning exemplar workflows for '{is_vague['reason']}'.")
-                return self._get_exemplar_workflows(is_vague['reason'])
-            
-            # Ensure service is initialized
-            if not self.catalog_manager.catalog_service:
-                logger.info("🔧 Service not initialized, initializing now...")
-                await self.initialize()
-            
-            # Step 1: Tool Retrieval - Get relevant tools from catalog
-            logger.info("🔍 Step 1: Performing tool retrieval...")
-            pruned_catalog_context = await self._retrieve_relevant_tools(request)
-            
-            if not pruned_catalog_context:
-                logger.error("❌ Tool retrieval failed - no context returned")
-                result = GenerationResponse(
-                    success=False,
-                    error_message="Failed to retrieve relevant tools from catalog",
-                    missing_fields=[],
-                    confidence=0.0
-                )
-                log_function_exit("generate_workflow", result, success=False)
-                return result
-            
-            logger.info(f"✅ Tool retrieval complete. Found {len(pruned_catalog_context.get('triggers', []))} triggers and {len(pruned_catalog_context.get('actions', []))} actions")
-            log_json_pretty(pruned_catalog_context, "📋 Retrieved catalog context:")
-            
-            # Limit tools to keep context concise and prevent Claude API size limits
-            logger.info("🔧 Limiting tools for Claude context...")
-            limited_catalog_context = self._limit_tools_for_context(pruned_catalog_context)
-            log_json_pretty(limited_catalog_context, "📋 Limited catalog context:")
+            limited_catalog_context, early_response = await self._prepare_generation_context(request)
+            if early_response is not None:
+                log_function_exit("generate_workflow", early_response, success=early_response.success)
+                return early_response
             
             # Step 2: Focused Generation - Generate workflow with targeted tools
             logger.info("🤖 Step 2: Performing focused generation...")
@@ -215,10 +223,88 @@ class DSLGeneratorService:
             log_function_exit("generate_workflow", result, success=False)
             return result
 
+    async def _prepare_generation_context(
+        self, request: GenerationRequest
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[GenerationResponse]]:
+        """
+        Run everything that happens before the Claude call: vagueness detection,
+        tool retrieval and context limiting.
+        
+        Args:
+            request: Generation request with user prompt and context
+            
+        Returns:
+            Tuple of (limited catalog context, early response). When the early
+            response is set (vague prompt, template fast path hit or failed
+            retrieval) it should be returned to the caller as-is and the
+            context is None.
+        """
+        # Embed the prompt once (off the event loop): shared by the vagueness
+        # classifier, the template matcher and semantic search
+        query_embedding = None
+        try:
+            query_embedding = await asyncio.to_thread(
+                self.semantic_search.embedding_service.embed_text, request.user_prompt
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to embed prompt up front: {e}")
+        
+        # Check for vagueness and return exemplar workflows if detected
+        is_vague = await self._detect_vagueness(
+            request.user_prompt, query_embedding=query_embedding, selected_apps=request.selected_apps
+        )
+        if is_vague:
+            logger.info(f"🔍 Vague prompt detected. Returning exemplar workflows for '{is_vague['reason']}'.")
+            return None, self._get_exemplar_workflows(is_vague['reason'])
+        
+        # Ensure service is initialized (templates are validated against its catalog)
+        if not self.catalog_manager.catalog_service:
+            logger.info("🔧 Service not initialized, initializing now...")
+            await self.initialize()
+        
+        if self.template_fast_path_enabled:
+            template_response = await template_matcher.try_generate(
+                request,
+                query_embedding=query_embedding,
+                embed_texts=self.semantic_search.embedding_service.embed_texts,
+                validate_structure=self.response_parser._validate_dsl_structure,
+                validate_workflow=self._validate_template_dsl
+            )
+            if template_response is not None:
+                return None, template_response
+        
+        # Step 1: Tool Retrieval - Get relevant tools from catalog
+        logger.info("🔍 Step 1: Performing tool retrieval...")
+        pruned_catalog_context = await self._retrieve_relevant_tools(request, query_embedding=query_embedding)
+        
+        if not pruned_catalog_context:
+            logger.error("❌ Tool retrieval failed - no context returned")
+            return None, GenerationResponse(
+                success=False,
+                error_message="Failed to retrieve relevant tools from catalog",
+                missing_fields=[],
+                confidence=0.0
+            )
+        
+        logger.info(f"✅ Tool retrieval complete. Found {len(pruned_catalog_context.get('triggers', []))} triggers and {len(pruned_catalog_context.get('actions', []))} actions")
+        log_json_pretty(pruned_catalog_context, "📋 Retrieved catalog context:")
+        
+        # Limit tools to keep context concise and prevent Claude API size limits
+        logger.info("🔧 Limiting tools for Claude context...")
+        limited_catalog_context = self._limit_tools_for_context(pruned_catalog_context)
+        log_json_pretty(limited_catalog_context, "📋 Limited catalog context:")
+        
+        return limited_catalog_context, None
+
     async def generate_multiple_workflows(self, request: GenerationRequest, num_workflows: int = 1) -> List[GenerationResponse]:
         """
         Generate multiple workflow DSL templates in parallel.
         
+        Retrieval (vagueness check, semantic search, Groq selection and context
+        limiting) runs once and the resulting catalog context is shared by all
+        variations. Only the Claude generation + validation loop fans out, with
+        each variation sampled at a different temperature for diversity.
+        
         Args:
             request: Generation request with user prompt and context
             num_workflows: Number of workflows to generate (1-5)
@@ -234,25 +320,31 @@ class DSLGeneratorService:
             response = await self.generate_workflow(request)
             return [response]
         
-        logger.info(f"Generating {num_workflows} workflows in parallel...")
+        logger.info(f"Generating {num_workflows} workflows in parallel from a shared retrieval...")
+        
+        try:
+            limited_catalog_context, early_response = await self._prepare_generation_context(request)
+        except Exception as e:
+            logger.error(f"❌ Shared retrieval failed: {e}")
+            early_response = GenerationResponse(
+                success=False,
+                error_message=str(e),
+                missing_fields=[],
+                confidence=0.0
+            )
+        
+        if early_response is not None:
+            # Vague prompt, template match or failed retrieval - every variation would get the same answer
+            return [early_response.model_copy(deep=True) for _ in range(num_workflows)]
         
-        # Create tasks for parallel generation
+        # Create tasks for parallel generation over the shared context
         tasks = []
         for i in range(num_workflows):
-            # Create a slightly modified request for each generation to add variety
-            modified_request = GenerationRequest(
-                user_prompt=request.user_prompt,
-                selected_apps=request.selected_apps,
-                user_id=request.user_id,
-                workflow_type=request.workflow_type,
-                complexity=request.complexity
+            temperature = self.VARIATION_TEMPERATURES[i % len(self.VARIATION_TEMPERATURES)]
+            logger.info(f"🎲 Variation {i+1}: temperature={temperature}")
+            task = self._generate_with_validation_loop(
+                request, limited_catalog_context, temperature=temperature
             )
-            
-            # Add a small variation to the prompt to encourage diversity
-            if i > 0:
-                modified_request.user_prompt = f"{request.user_prompt} (variation {i+1})"
-            
-            task = self.generate_workflow(modified_request)
             tasks.append(task)
         
         # Execute all generations in parallel
@@ -284,7 +376,93 @@ class DSLGeneratorService:
             fallback_response = await self.generate_workflow(request)
             return [fallback_response]
     
-    async def _retrieve_relevant_tools(self, request: GenerationRequest) -> Optional[Dict[str, Any]]:
+    async def iter_multiple_workflows(
+        self,
+        request: GenerationRequest,
+        num_workflows: int = 1,
+        on_stage: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+    ) -> AsyncIterator[Tuple[int, GenerationResponse]]:
+        """
+        Generate workflow variations, yielding each one as soon as it finishes.
+        
+        Same pipeline as generate_multiple_workflows (shared retrieval, one
+        generation loop per variation), but results arrive in completion
+        order so callers can stream them. Pending generations are cancelled
+        if the consumer stops iterating.
+        
+        Args:
+            request: Generation request with user prompt and context
+            num_workflows: Number of workflows to generate (1-5)
+            on_stage: Optional coroutine called with (stage, detail) as the pipeline progresses
+            
+        Yields:
+            Tuples of (variation index, GenerationResponse)
+        """
+        if num_workflows < 1 or num_workflows > 5:
+            raise ValueError("num_workflows must be between 1 and 5")
+        
+        async def notify(stage: str, **detail: Any) -> None:
+            if on_stage is None:
+                return
+            try:
+                await on_stage(stage, detail)
+            except Exception as e:
+                logger.warning(f"⚠️ Stage callback failed for '{stage}': {e}")
+        
+        await notify("retrieval")
+        try:
+            limited_catalog_context, early_response = await self._prepare_generation_context(request)
+        except Exception as e:
+            logger.error(f"❌ Shared retrieval failed: {e}")
+            limited_catalog_context, early_response = None, GenerationResponse(
+                success=False,
+                error_message=str(e),
+                missing_fields=[],
+                confidence=0.0
+            )
+        
+        if early_response is not None:
+            # Vague prompt, template match or failed retrieval - every variation gets the same answer
+            metadata = early_response.generation_metadata or {}
+            source = "template" if metadata.get("template_fast_path") else "exemplar" if early_response.is_exemplar else "error"
+            await notify("early_response", source=source)
+            for i in range(num_workflows):
+                yield i, early_response.model_copy(deep=True)
+            return
+        
+        await notify("generation", variations=num_workflows)
+        tasks = {}
+        for i in range(num_workflows):
+            temperature = self.VARIATION_TEMPERATURES[i % len(self.VARIATION_TEMPERATURES)] if num_workflows > 1 else None
+            task = asyncio.create_task(self._generate_with_validation_loop(
+                request, limited_catalog_context, temperature=temperature
+            ))
+            tasks[task] = i
+        
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: tasks[t]):
+                    index = tasks[task]
+                    if task.exception() is not None:
+                        logger.warning(f"Generation {index+1} failed: {task.exception()}")
+                        response = GenerationResponse(
+                            success=False,
+                            error_message=f"Generation failed: {str(task.exception())}",
+                            missing_fields=[],
+                            confidence=0.0
+                        )
+                    else:
+                        response = task.result()
+                    yield index, response
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled calls finish their cleanup (e.g. token release) now
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _retrieve_relevant_tools(self, request: GenerationRequest, query_embedding: Optional[Any] = None) -> Optional[Dict[str, Any]]:
         """
         Step 1: Intelligently retrieve relevant tools using semantic search + Groq LLM analysis.
         
@@ -295,6 +473,7 @@ class DSLGeneratorService:
         
         Args:
             request: Generation request with user prompt and context
+            query_embedding: Precomputed prompt embedding (avoids a second encoder pass)
             
         Returns:
             Pruned catalog context with only relevant tools, or None if failed
@@ -315,7 +494,8 @@ class DSLGeneratorService:
                 query=request.user_prompt,
                 k=100,  # Get more results for Groq to analyze
                 filter_types=["action", "trigger"],  # Only get tools, not providers
-                filter_providers=request.selected_apps if request.selected_apps else None
+                filter_providers=request.selected_apps if request.selected_apps else None,
+                query_embedding=query_embedding
             )
             
             if not search_results:
@@ -349,7 +529,7 @@ class DSLGeneratorService:
             # Step 2: Use Groq LLM to analyze and select the best tools for the specific task
             # ALWAYS use semantic search results for Groq analysis, regardless of selected_apps
             # This prevents prompt bloat and maintains efficiency
-            if self.groq_api_key:
+            if self.groq_api_key or llm_cassette.replaying:
                 logger.info("🤖 Using Groq LLM to analyze and select best tools from semantic results")
                 pruned_context = await self._groq_analyze_semantic_results(request.user_prompt, semantic_context)
             else:
@@ -939,6 +1119,12 @@ IMPORTANT: Use the exact tool names and toolkit names as shown in the list above
                 "response_format": {"type": "json_object"}
             }
             
+            # Replay mode: serve the recorded response without a network call
+            if llm_cassette.replaying:
+                result = await llm_cassette.replay("groq", payload)
+                return result["choices"][0]["message"]["content"]
+            
+            start_time = time.time()
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
                     f"{self.groq_base_url}/chat/completions",
@@ -949,6 +1135,7 @@ IMPORTANT: Use the exact tool names and toolkit names as shown in the list above
                 if response.status_code == 200:
                     result = response.json()
                     response_content = result["choices"][0]["message"]["content"]
+                    llm_cassette.record("groq", payload, result, (time.time() - start_time) * 1000)
                     
                     # Log the output response for debugging
                     logger.info(f"Groq API call - Response length: {len(response_content)} characters")
@@ -1454,103 +1641,36 @@ Now, analyze the user request provided at the top and generate the JSON response
     
     def _limit_tools_for_context(self, pruned_context: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Intelligently limit the number of tools to keep the context concise.
+        Pack the retrieved tools into the Claude input-token budget.
+        
+        Tools are ranked by retrieval/Groq relevance, parameter schemas and long
+        descriptions are trimmed first, and only then are the least relevant tools
+        dropped. ``max_triggers``/``max_actions``/``max_providers`` remain hard caps.
         
         Args:
             pruned_context: Full pruned catalog context
             
         Returns:
-            Limited catalog context with reasonable number of tools
+            Limited catalog context that fits the token budget
         """
         logger.info(f"Limiting tools: {len(pruned_context.get('triggers', []))} triggers, {len(pruned_context.get('actions', []))} actions")
         
-        limited_context = {
-            'triggers': [],
-            'actions': [],
-            'providers': {}
-        }
-        
-        # Limit triggers (keep most relevant ones)
-        triggers = pruned_context.get('triggers', [])
-        if len(triggers) > self.max_triggers:
-            # Sort by relevance (prioritize those with meaningful slugs and better descriptions)
-            def trigger_relevance_score(trigger):
-                score = 0
-                # Prioritize meaningful slugs
-                if not trigger.get('trigger_slug', '').startswith('unknown'):
-                    score += 100
-                # Bonus for descriptive names
-                if trigger.get('name') and len(trigger.get('name', '')) > 3:
-                    score += 50
-                # Bonus for descriptions
-                if trigger.get('description') and len(trigger.get('description', '')) > 10:
-                    score += 25
-                # Prefer shorter, cleaner slugs
-                slug = trigger.get('trigger_slug', '')
-                if slug and '_' in slug:
-                    score += 10
-                return score
-            
-            sorted_triggers = sorted(triggers, key=trigger_relevance_score, reverse=True)
-            limited_context['triggers'] = sorted_triggers[:self.max_triggers]
-            logger.info(f"Limited triggers from {len(triggers)} to {len(limited_context['triggers'])}")
-        else:
-            limited_context['triggers'] = triggers
-        
-        # Limit actions (keep most relevant ones)
-        actions = pruned_context.get('actions', [])
-        if len(actions) > self.max_actions:
-            # Sort by relevance (prioritize those with meaningful slugs and better descriptions)
-            def action_relevance_score(action):
-                score = 0
-                # Prioritize meaningful slugs
-                if not action.get('action_slug', '').startswith('unknown'):
-                    score += 100
-                # Bonus for descriptive names
-                if action.get('name') and len(action.get('name', '')) > 3:
-                    score += 50
-                # Bonus for descriptions
-                if action.get('description') and len(action.get('description', '')) > 10:
-                    score += 25
-                # Prefer shorter, cleaner slugs
-                slug = action.get('action_slug', '')
-                if slug and '_' in slug:
-                    score += 10
-                return score
-            
-            sorted_actions = sorted(actions, key=action_relevance_score, reverse=True)
-            limited_context['actions'] = sorted_actions[:self.max_actions]
-            logger.info(f"Limited actions from {len(actions)} to {len(limited_context['actions'])}")
-        else:
-            limited_context['actions'] = actions
-        
-        # Limit providers (keep only those that have tools selected)
-        selected_provider_slugs = set()
-        for trigger in limited_context['triggers']:
-            selected_provider_slugs.add(trigger.get('toolkit_slug', ''))
-        for action in limited_context['actions']:
-            selected_provider_slugs.add(action.get('toolkit_slug', ''))
-        
-        providers = pruned_context.get('providers', {})
-        limited_providers = {}
-        count = 0
-        for slug in selected_provider_slugs:
-            if slug in providers and count < self.max_providers:
-                limited_providers[slug] = providers[slug]
-                count += 1
-        
-        limited_context['providers'] = limited_providers
-        logger.info(f"Limited providers to {len(limited_context['providers'])} relevant ones")
+        packer = ContextPacker(
+            token_budget=self.context_token_budget,
+            max_triggers=self.max_triggers,
+            max_actions=self.max_actions,
+            max_providers=self.max_providers
+        )
+        limited_context = packer.pack(pruned_context)
         
         # Log final counts and sample tools
         logger.info(f"Final context: {len(limited_context['triggers'])} triggers, {len(limited_context['actions'])} actions, {len(limited_context['providers'])} providers")
         
-        # Log sample of selected tools
         if limited_context['triggers']:
-            sample_triggers = [t.get('trigger_slug', 'unknown') for t in limited_context['triggers'][:3]]
+            sample_triggers = [t.get('slug') or t.get('trigger_slug', 'unknown') for t in limited_context['triggers'][:3]]
             logger.info(f"Selected triggers: {sample_triggers}")
         if limited_context['actions']:
-            sample_actions = [a.get('action_slug', 'unknown') for a in limited_context['actions'][:3]]
+            sample_actions = [a.get('slug') or a.get('action_slug', 'unknown') for a in limited_context['actions'][:3]]
             logger.info(f"Selected actions: {sample_actions}")
         
         return limited_context
@@ -2076,6 +2196,19 @@ Now, analyze the user request provided at the top and generate the JSON response
                 example_action = data["actions"][0] if data["actions"] else None
                 break
         
+        if not example_toolkit:
+            # Flat structure: triggers/actions lists tagged with toolkit_slug
+            first_actions = {}
+            for action in catalog_context.get("actions", []):
+                first_actions.setdefault(action.get("toolkit_slug"), action)
+            for trigger in catalog_context.get("triggers", []):
+                toolkit_slug = trigger.get("toolkit_slug")
+                if toolkit_slug and toolkit_slug != "system" and toolkit_slug in first_actions:
+                    example_toolkit = toolkit_slug
+                    example_trigger = trigger
+                    example_action = first_actions[toolkit_slug]
+                    break
+        
         if not example_toolkit or not example_trigger or not example_action:
             # Fallback to a generic example
             return self._get_fallback_example()
@@ -2084,6 +2217,12 @@ Now, analyze the user request provided at the top and generate the JSON response
         trigger_slug = example_trigger.get('slug') or example_trigger.get('name') or "EXAMPLE_TRIGGER"
         action_name = example_action.get('slug') or example_action.get('name') or "EXAMPLE_ACTION"
         
+        return self._render_dynamic_example(example_toolkit, trigger_slug, action_name)
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _render_dynamic_example(example_toolkit: str, trigger_slug: str, action_name: str) -> str:
+        """Render (and memoize) the example workflows for a toolkit/trigger/action triple."""
         # Generate both event-based and schedule-based examples
         examples = f"""**Example 1 (Event-Based):**
 {{
@@ -2216,27 +2355,10 @@ Now, analyze the user request provided at the top and generate the JSON response
         """
         errors = []
         
-        # Build sets of available tools from catalog context
-        # The catalog context has triggers and actions as separate lists
-        available_triggers = set()
-        available_actions = set()
-
-        # Check the triggers and actions lists directly (for the new format)
-        for trigger in catalog_context.get("triggers", []):
-            toolkit_slug = trigger.get("toolkit_slug", "")
-            trigger_slug = trigger.get("trigger_slug", "") or trigger.get("slug", "")
-            if toolkit_slug and trigger_slug:
-                # Store both the individual trigger slug and the toolkit.trigger combination
-                available_triggers.add(trigger_slug)
-                available_triggers.add(f"{toolkit_slug}.{trigger_slug}")
-
-        for action in catalog_context.get("actions", []):
-            toolkit_slug = action.get("toolkit_slug", "")
-            action_slug = action.get("action_slug", "") or action.get("slug", "") or action.get("action_name", "")
-            if toolkit_slug and action_slug:
-                # Store both the individual action slug and the toolkit.action combination
-                available_actions.add(action_slug)
-                available_actions.add(f"{toolkit_slug}.{action_slug}")
+        # One pass over the context, then O(1) per referenced tool. References
+        # may use the tool's slug, name or an alias, and a bare slug from
+        # another toolkit in the context is accepted as before.
+        lookup = ToolLookupIndex.from_context(catalog_context)
 
         workflow = dsl.get("workflow", {})
         
@@ -2245,17 +2367,9 @@ Now, analyze the user request provided at the top and generate the JSON response
             toolkit_slug = trigger.get("toolkit_slug", "")
             trigger_slug = trigger.get("composio_trigger_slug", "")
             if toolkit_slug and trigger_slug:
-                # Check if the trigger exists in the available triggers
-                # We check both the individual trigger slug and the toolkit.trigger combination
                 trigger_exists = (
-                    trigger_slug in available_triggers or 
-                    f"{toolkit_slug}.{trigger_slug}" in available_triggers or
-                    # Also check if the individual components exist in the catalog
-                    any(
-                        t.get("toolkit_slug") == toolkit_slug and 
-                        (t.get("slug") == trigger_slug or t.get("name") == trigger_slug or t.get("trigger_slug") == trigger_slug)
-                        for t in catalog_context.get("triggers", [])
-                    )
+                    lookup.contains(toolkit_slug, trigger_slug, TRIGGER) or
+                    lookup.find(trigger_slug, TRIGGER) is not None
                 )
                 if not trigger_exists:
                     errors.append(f"Invalid trigger: '{toolkit_slug}.{trigger_slug}'. It is not in the available triggers list.")
@@ -2265,47 +2379,53 @@ Now, analyze the user request provided at the top and generate the JSON response
             toolkit_slug = action.get("toolkit_slug", "")
             action_name = action.get("action_name", "")
             if toolkit_slug and action_name:
-                # Check if the action exists in the available actions
-                # We check both the individual action name and the toolkit.action combination
                 action_exists = (
-                    action_name in available_actions or 
-                    f"{toolkit_slug}.{action_name}" in available_actions or
-                    # Also check if the individual components exist in the catalog
-                    any(
-                        a.get("toolkit_slug") == toolkit_slug and 
-                        (a.get("slug") == action_name or a.get("name") == action_name or a.get("action_name") == action_name)
-                        for a in catalog_context.get("actions", [])
-                    )
+                    lookup.contains(toolkit_slug, action_name, ACTION) or
+                    lookup.find(action_name, ACTION) is not None
                 )
                 if not action_exists:
                     errors.append(f"Invalid action: '{toolkit_slug}.{action_name}'. It is not in the available actions list.")
             
         return errors
 
-    def _build_robust_claude_prompt(self, request: GenerationRequest, catalog_context: Dict[str, Any], previous_errors: List[str]) -> str:
-        """Builds an aggressive, explicit prompt for Claude with clear tool context and strict validation rules."""
+    async def _repair_tool_hallucinations(self, dsl: Dict[str, Any], catalog_context: Dict[str, Any]) -> List[SlugRepair]:
+        """
+        Rewrite near-miss trigger/action slugs in ``dsl`` (in place) to the closest
+        tool from the catalog context when the match is unambiguous.
+        Returns the applied repairs; unresolved slugs are left for re-prompting.
+        Runs in a worker thread, since fuzzy matching may embed slugs.
+        """
+        embed_texts = None
+        embedding_service = getattr(getattr(self, 'semantic_search', None), 'embedding_service', None)
+        if embedding_service is not None:
+            embed_texts = embedding_service.embed_texts
         
-        # Create comprehensive toolkit mapping
-        toolkit_mapping = self._create_toolkit_mapping(catalog_context)
+        try:
+            repairs = await asyncio.to_thread(
+                lambda: SlugResolver(catalog_context, embed_texts=embed_texts).repair_workflow(dsl)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Local slug repair failed, falling back to re-prompting: {e}")
+            return []
+        
+        for repair in repairs:
+            logger.info(
+                f"🔧 Repaired {repair.kind} '{repair.original_toolkit}.{repair.original_slug}' -> "
+                f"'{repair.toolkit_slug}.{repair.slug}' (confidence {repair.confidence})"
+            )
+        return repairs
+
+    def _build_robust_claude_prompt(self, request: GenerationRequest, catalog_context: Dict[str, Any], previous_errors: List[str]) -> PromptParts:
+        """Builds an aggressive, explicit prompt for Claude with clear tool context and strict validation rules.
+        
+        The static instructions go into the system part so they are served from the
+        prompt cache; the tool list and dynamic example are cached per request so
+        retries only pay for the user request and feedback.
+        """
         
         # --- IMPROVEMENT 1: Simplify the tool context ---
-        tool_list_str = ""
-        has_triggers = False
-        for slug, data in toolkit_mapping.items():
-            tool_list_str += f"\n--- Toolkit: {slug} ---\n"
-            if data.get("triggers"):
-                has_triggers = True
-                tool_list_str += "Triggers:\n"
-                for trigger_slug, trigger_data in data["triggers"].items():
-                    tool_list_str += f"  - composio_trigger_slug: {trigger_slug}\n"
-                    if trigger_data.get("description"):
-                        tool_list_str += f"    Description: {trigger_data['description']}\n"
-            if data.get("actions"):
-                tool_list_str += "Actions:\n"
-                for action_name, action_data in data["actions"].items():
-                    tool_list_str += f"  - action_name: {action_name}\n"
-                    if action_data.get("description"):
-                        tool_list_str += f"    Description: {action_data['description']}\n"
+        # Join the precompiled per-tool cards (grouped by toolkit)
+        tool_list_str, has_triggers = prompt_card_index.render_tool_list(catalog_context)
         
         # Add explicit warning if no triggers are available
         if not has_triggers:
@@ -2314,92 +2434,22 @@ Now, analyze the user request provided at the top and generate the JSON response
         # Generate a dynamic example based on available tools
         dynamic_example = self._generate_dynamic_example(catalog_context)
 
-        prompt = f"""<user_request>
-{request.user_prompt}
-</user_request>
-
-<available_tools>
+        context = f"""<available_tools>
 {tool_list_str}
 </available_tools>
 
-**IMPORTANT: Understanding Trigger Types**
-There are two kinds of trigger available:
-
-1. **event_based**: These are triggers from the <available_tools> list (e.g.; "SALESFORCE_NEW_LEAD_TRIGGER"). Use one of these when the user wants to start a workflow based on an event in a specific application.
-2. **schedule_based**: This is a generic trigger for time-based workflows. You MUST use the exact slug "SCHEDULE_BASED" for the `composio_trigger_slug` if the user's request mentions a schedule, like "every morning", "at 8 PM", "on Fridays", "weekly", or any other time-based interval.
-
-<instructions>
-1. **Analyze the Request:** Read the <user_request> carefully.
-
-2. **Create a Step-by-Step Plan:** Before writing any JSON, think through the sequence of operations needed. For example: "First, the workflow needs to start when a new payment is made in Stripe. Second, I need to add that customer's details to a Google Sheet. Third, I need to send a message to Slack."
-
-3. **Select Tools for Each Step:** Based on your plan, find the best trigger and action from the <available_tools> for each step.
-
-4. **Construct the Final JSON:** Now, build the complete workflow in the specified JSON format, making sure to include an action for every step in your plan.
-
-5. **Trigger Type Analysis:** Analyze the <user_request> to determine the trigger type. Is it **event_based** (starts when something happens in an app) or **schedule_based** (starts at a specific time or interval like "every day")?
-
-6. Design a logical, multi-step workflow.
-7. Your output MUST conform to the `template` schema.
-8. Every object in `required_inputs` MUST have a "name", "source", and "type" key.
-9. Populate the `missing_information` array for any user inputs needed.
-10. Your response MUST be a single, valid JSON object and nothing else.
-11. NEVER invent or modify toolkit_slug, composio_trigger_slug, or action_name values.
-12. ONLY use the exact values from the <available_tools> section above.
-13. ⚠️  CRITICAL: Use triggers ONLY in the "triggers" array and actions ONLY in the "actions" array. NEVER use a trigger as an action or vice versa.
-14. If you're unsure about a value, use the first available option from the list.
-15. Every parameter MUST have a "type" field - this is CRITICAL for validation.
-16. Use "string", "number", "boolean", or "array" as type values.
-17. COPY AND PASTE the exact slug/name values - do not modify them.
-18. Your JSON MUST be parseable by Python's json.loads().
-19. ⚠️  CRITICAL: If no triggers are listed in <available_tools>, use this exact format: "triggers": [{{"id": "manual_trigger", "type": "manual"}}]
-20. ⚠️  CRITICAL: NEVER use "trigger_type" - always use "triggers" array format as shown above.
-
-**Rules for Trigger Selection:**
-- ⚠️  **GOLDEN RULE:** If the user's request contains ANY time-based words (e.g., "every morning", "at 8 PM", "daily", "weekly", "on Fridays", "monthly", "hourly", "at 9 AM", "every day", "every week", "every month"), you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`. This rule overrides all other keywords or application names mentioned in the prompt.
-- ⚠️  **CRITICAL:** If your analysis in Step 1 identifies a schedule, you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`. No exceptions.
-- If the request is time-based, you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`.
-- For `event_based` triggers, the `composio_trigger_slug` in your response MUST be an EXACT match to a slug from the **Triggers** section of `<available_tools>`.
-- Action names in your response MUST be an EXACT match to a slug from the **Actions** section of `<available_tools>`.
-- ⚠️  CRITICAL: NEVER use a trigger slug as an action name or vice versa. Triggers and actions are completely separate.
-- ⚠️  CRITICAL: You MUST use the EXACT slug names as they appear in the <available_tools> section. Do not modify, abbreviate, or guess action names.
-</instructions>
-
 <dynamic_example>
 {dynamic_example}
 </dynamic_example>
+"""
 
-<validation_rules>
-CRITICAL: Your JSON MUST pass these validation rules:
-- All required_inputs objects MUST have: name, source, type
-- All toolkit_slug values MUST exist in the available_tools
-- All composio_trigger_slug values MUST exist in the available_tools  
-- All action_name values MUST exist in the available_tools
-- ⚠️  If no triggers are available, use: "triggers": [{{"id": "manual_trigger", "type": "manual"}}]
-- ⚠️  NEVER use "trigger_type" - always use "triggers" array format
-- ⚠️  **SCHEDULE DETECTION:** If the user request contains time-based words, you MUST use "SCHEDULE_BASED" as composio_trigger_slug
-- ⚠️  **SCHEDULE DETECTION:** Time-based words include: "every morning", "at 8 PM", "daily", "weekly", "on Fridays", "monthly", "hourly", "at 9 AM", "every day", "every week", "every month"
-- No markdown formatting or code blocks
-- Pure JSON only
-- Every field must be properly quoted
-- No trailing commas
-</validation_rules>
-
-<error_prevention>
-COMMON MISTAKES TO AVOID:
-- Do NOT add markdown formatting like ```json
-- Do NOT add explanatory text before or after the JSON
-- Do NOT use placeholder values like "UNKNOWN_ACTION_NAME"
-- Do NOT invent new toolkit slugs or action names
-- Do NOT forget the "type" field in required_inputs
-- Do NOT use unquoted strings in JSON
-- ⚠️  **CRITICAL:** Do NOT miss time-based words in the user request - if you see "every", "daily", "weekly", "at [time]", "on [day]", you MUST use "SCHEDULE_BASED"
-- ⚠️  **CRITICAL:** Do NOT use event-based triggers when the user clearly wants a scheduled workflow
-</error_prevention>
+        request_text = f"""<user_request>
+{request.user_prompt}
+</user_request>
 """
         if previous_errors:
             errors_str = "\n".join(f"- {e}" for e in previous_errors)
-            prompt += f"""
+            request_text += f"""
 <feedback>
 Your previous attempt failed. You MUST fix these errors:
 {errors_str}
@@ -2408,132 +2458,206 @@ IMPORTANT: Read the error messages carefully and fix each one before generating
 </feedback>
 """
         # --- IMPROVEMENT 2: The Golden Rule at the end ---
-        prompt += """
-
-**CRITICAL FINAL INSTRUCTION:** 
-1. You MUST only use the exact `composio_trigger_slug` and `action_name` values from the `<available_tools>` list.
-2. Do not invent or modify them.
-3. Copy the values exactly as they appear.
-4. Generate ONLY the JSON response - no other text.
-5. Ensure your JSON is valid and parseable.
-
-Now, generate the complete JSON for the user's request."""
+        request_text += f"\n\n{ROBUST_GENERATION_FINAL_INSTRUCTION}"
         
-        return prompt
+        return PromptParts(
+            system=ROBUST_GENERATION_SYSTEM_PROMPT,
+            context=context,
+            request=request_text
+        )
     
-    async def _generate_with_validation_loop(self, request: GenerationRequest, catalog_context: Dict[str, Any]) -> GenerationResponse:
-        """Manages the generation, validation, and retry loop."""
+    async def _generate_with_validation_loop(
+        self,
+        request: GenerationRequest,
+        catalog_context: Dict[str, Any],
+        temperature: Optional[float] = None
+    ) -> GenerationResponse:
+        """Manages the generation, validation, and retry loop.
+        
+        ``temperature`` is forwarded to Claude; None keeps the API default.
+        When hedging is enabled the attempts are raced instead of run strictly
+        in sequence (see ``_generate_with_hedging``).
+        """
+        if self.hedge_mode in ("delayed", "parallel"):
+            return await self._generate_with_hedging(request, catalog_context, temperature)
+        
         previous_errors = []
         for attempt in range(self.max_regeneration_attempts):
-            logger.info(f"Generation attempt {attempt + 1}/{self.max_regeneration_attempts}...")
-            
-            prompt = self._build_robust_claude_prompt(request, catalog_context, previous_errors)
-            
-            try:
-                raw_response = await self.ai_client.generate_workflow(prompt)
+            response, errors = await self._run_generation_attempt(
+                request, catalog_context, previous_errors, attempt + 1, temperature
+            )
+            if response is not None:
+                return response
+            previous_errors.extend(errors)
+
+        return self._failed_generation_response(previous_errors)
+    
+    async def _generate_with_hedging(
+        self,
+        request: GenerationRequest,
+        catalog_context: Dict[str, Any],
+        temperature: Optional[float] = None
+    ) -> GenerationResponse:
+        """
+        Hedged variant of the generation loop.
+        
+        In "parallel" mode two attempts start together; in "delayed" mode a
+        second attempt starts when the first has not finished after
+        ``hedge_delay`` seconds. The first attempt that passes parsing, the
+        hallucination check and validation wins and the others are cancelled.
+        A failed attempt immediately frees its slot for a retry that carries
+        the accumulated error feedback. The total number of attempts is still
+        bounded by ``max_regeneration_attempts``, and a hedge is only started
+        when the Claude rate limiter has spare tokens.
+        """
+        previous_errors: List[str] = []
+        pending = set()
+        attempts_started = 0
+        
+        def start_attempt() -> None:
+            nonlocal attempts_started
+            attempts_started += 1
+            pending.add(asyncio.create_task(self._run_generation_attempt(
+                request, catalog_context, list(previous_errors), attempts_started, temperature
+            )))
+        
+        start_attempt()
+        if self.hedge_mode == "parallel" and self._can_start_hedge(attempts_started):
+            logger.info("🏁 Hedged generation: starting a parallel attempt")
+            start_attempt()
+        
+        try:
+            while pending:
+                # Only the delayed mode waits with a timeout, to decide when to hedge
+                wait_timeout = None
+                if self.hedge_mode == "delayed" and len(pending) == 1 and attempts_started < self.max_regeneration_attempts:
+                    wait_timeout = self.hedge_delay
                 
-                # Load schema definition for GenerationContext
-                schema_definition = self.context_builder._load_schema_definition()
+                done, _ = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
                 
-                # Convert dictionary catalog_context to CatalogContext object
-                # Add system toolkit to the context for response parsing as well
-                providers_list_for_parsing = list(catalog_context.get('providers', {}).values())
-                triggers_list_for_parsing = catalog_context.get('triggers', []).copy()
+                if not done:
+                    if self._can_start_hedge(attempts_started):
+                        logger.info(f"🏁 Hedged generation: no result after {self.hedge_delay}s, starting attempt {attempts_started + 1}")
+                        start_attempt()
+                    continue
                 
-                # Add system provider if not already present
-                system_provider_for_parsing = {
-                    'slug': 'system',
-                    'name': 'System',
-                    'description': 'System-level tools for scheduling and core logic.',
-                    'triggers': [{
-                        'slug': 'SCHEDULE_BASED',
-                        'name': 'Schedule Based Trigger',
-                        'description': 'A trigger that runs on a schedule.'
-                    }],
-                    'actions': []
-                }
-                if not any(p.get('slug') == 'system' for p in providers_list_for_parsing):
-                    providers_list_for_parsing.append(system_provider_for_parsing)
+                for task in done:
+                    pending.discard(task)
+                    response, errors = task.result()
+                    if response is not None:
+                        logger.info(f"🏁 Hedged generation: accepted result, cancelling {len(pending)} in-flight attempt(s)")
+                        return response
+                    previous_errors.extend(errors)
                 
-                # Add system trigger if not already present
-                system_trigger_for_parsing = {
+                # Refill freed slots with retries that see the new feedback
+                if not pending and attempts_started < self.max_regeneration_attempts:
+                    start_attempt()
+                if self.hedge_mode == "parallel" and len(pending) < 2 and self._can_start_hedge(attempts_started):
+                    start_attempt()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled calls finish their cleanup (e.g. token release) now
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return self._failed_generation_response(previous_errors)
+    
+    def _can_start_hedge(self, attempts_started: int) -> bool:
+        """Whether an extra (speculative) attempt fits the attempt and rate-limit budget"""
+        if attempts_started >= self.max_regeneration_attempts:
+            return False
+        if not claude_tokens_available(self.hedge_min_spare_tokens):
+            logger.info("⏭️ Skipping hedged attempt - Claude rate limiter has no spare tokens")
+            return False
+        return True
+    
+    def _failed_generation_response(self, previous_errors: List[str]) -> GenerationResponse:
+        """Response returned when every generation attempt failed"""
+        logger.error("Failed to generate a valid workflow after all attempts.")
+        return GenerationResponse(
+            success=False,
+            error_message=f"Failed to generate a valid workflow after {self.max_regeneration_attempts} attempts. Last errors: {previous_errors}"
+        )
+    
+    async def _run_generation_attempt(
+        self,
+        request: GenerationRequest,
+        catalog_context: Dict[str, Any],
+        previous_errors: List[str],
+        attempt_number: int,
+        temperature: Optional[float] = None
+    ) -> Tuple[Optional[GenerationResponse], List[str]]:
+        """
+        Run a single generate -> parse -> check -> validate attempt.
+        
+        Returns:
+            (response, []) when the workflow passed validation, otherwise
+            (None, errors) with feedback for the next attempt
+        """
+        logger.info(f"Generation attempt {attempt_number}/{self.max_regeneration_attempts}...")
+        
+        prompt = self._build_robust_claude_prompt(request, catalog_context, previous_errors)
+        
+        try:
+            raw_response = await self.ai_client.generate_workflow(prompt, temperature=temperature)
+
+            # Load schema definition for GenerationContext
+            schema_definition = self.context_builder._load_schema_definition()
+
+            # Convert dictionary catalog_context to CatalogContext object
+            # Add system toolkit to the context for response parsing as well
+            providers_list_for_parsing = list(catalog_context.get('providers', {}).values())
+            triggers_list_for_parsing = catalog_context.get('triggers', []).copy()
+
+            # Add system provider if not already present
+            system_provider_for_parsing = {
+                'slug': 'system',
+                'name': 'System',
+                'description': 'System-level tools for scheduling and core logic.',
+                'triggers': [{
                     'slug': 'SCHEDULE_BASED',
                     'name': 'Schedule Based Trigger',
-                    'description': 'A trigger that runs on a schedule.',
-                    'toolkit_slug': 'system'
-                }
-                if not any(t.get('slug') == 'SCHEDULE_BASED' for t in triggers_list_for_parsing):
-                    triggers_list_for_parsing.append(system_trigger_for_parsing)
-                
-                catalog_context_obj = CatalogContext(
-                    available_providers=providers_list_for_parsing,
-                    available_triggers=triggers_list_for_parsing,
-                    available_actions=catalog_context.get('actions', []),
-                    provider_categories=[]  # Not used in this context
-                )
-                
-                parsed_response = await self.response_parser.parse_response(
-                    raw_response, 
-                    GenerationContext(
-                        request=request,
-                        catalog=catalog_context_obj, 
-                        schema_definition=schema_definition
-                    )
-                )
+                    'description': 'A trigger that runs on a schedule.'
+                }],
+                'actions': []
+            }
+            if not any(p.get('slug') == 'system' for p in providers_list_for_parsing):
+                providers_list_for_parsing.append(system_provider_for_parsing)
+
+            # Add system trigger if not already present
+            system_trigger_for_parsing = {
+                'slug': 'SCHEDULE_BASED',
+                'name': 'Schedule Based Trigger',
+                'description': 'A trigger that runs on a schedule.',
+                'toolkit_slug': 'system'
+            }
+            if not any(t.get('slug') == 'SCHEDULE_BASED' for t in triggers_list_for_parsing):
+                triggers_list_for_parsing.append(system_trigger_for_parsing)
+
+            catalog_context_obj = CatalogContext(
+                available_providers=providers_list_for_parsing,
+                available_triggers=triggers_list_for_parsing,
+                available_actions=catalog_context.get('actions', []),
+                provider_categories=[]  # Not used in this context
+            )
 
-                if not parsed_response.success or not parsed_response.dsl_template:
-                    error_msg = parsed_response.error_message or "Failed to parse valid JSON from LLM response."
-                    previous_errors.append(error_msg)
-                    logger.warning(f"Attempt {attempt + 1} failed during parsing: {error_msg}")
-                    continue
+            parsed_response = await self.response_parser.parse_response(
+                raw_response, 
+                GenerationContext(
+                    request=request,
+                    catalog=catalog_context_obj, 
+                    schema_definition=schema_definition
+                )
+            )
 
-                # --- NEW: AGGRESSIVE PRE-VALIDATION CHECK ---
-                if parsed_response.dsl_template:
-                    # Convert DSL template to dict for checking
-                    dsl_dict = parsed_response.dsl_template
-                    if hasattr(dsl_dict, 'dict'):
-                        dsl_dict = dsl_dict.dict()
-                    elif hasattr(dsl_dict, 'workflow'):
-                        dsl_dict = {'workflow': dsl_dict.workflow}
-                        if hasattr(dsl_dict['workflow'], 'dict'):
-                            dsl_dict['workflow'] = dsl_dict['workflow'].dict()
-                    
-                    tool_errors = self._check_tool_hallucinations(dsl_dict, catalog_context)
-                    if tool_errors:
-                        logger.warning(f"Tool Hallucination Detected: {tool_errors}")
-                        previous_errors.extend(tool_errors)
-                        continue  # Force a retry with this specific feedback
-                # ---------------------------------------------
-
-                # Perform custom validation against available tools
-                if parsed_response.dsl_template and hasattr(parsed_response.dsl_template, 'workflow'):
-                    workflow_data = parsed_response.dsl_template.workflow
-                    if isinstance(workflow_data, dict):
-                        # Convert to dict if it's a Pydantic model
-                        if hasattr(workflow_data, 'dict'):
-                            workflow_dict = workflow_data.dict()
-                        else:
-                            workflow_dict = workflow_data
-                        
-                        # Validate against available tools
-                        validation_errors = self._validate_generated_workflow(workflow_dict, catalog_context)
-                        
-                        if validation_errors:
-                            logger.warning(f"Custom validation failed with {len(validation_errors)} errors: {validation_errors}")
-                            previous_errors.extend(validation_errors)
-                            continue
-                        else:
-                            logger.info("Custom validation passed - workflow uses valid tools")
-                    else:
-                        logger.warning("Generated workflow is not in expected format")
-                        previous_errors.append("Generated workflow format is invalid")
-                        continue
+            if not parsed_response.success or not parsed_response.dsl_template:
+                error_msg = parsed_response.error_message or "Failed to parse valid JSON from LLM response."
+                logger.warning(f"Attempt {attempt_number} failed during parsing: {error_msg}")
+                return None, [error_msg]
 
-                # --- THIS IS THE FIX ---
-                # ALWAYS validate the generated DSL against the catalog context
-                logger.info("Validating generated workflow against catalog context...")
-                
-                # Convert DSL template to dict for validation
+            # --- NEW: AGGRESSIVE PRE-VALIDATION CHECK ---
+            if parsed_response.dsl_template:
+                # Convert DSL template to dict for checking
                 dsl_dict = parsed_response.dsl_template
                 if hasattr(dsl_dict, 'dict'):
                     dsl_dict = dsl_dict.dict()
@@ -2541,131 +2665,217 @@ Now, generate the complete JSON for the user's request."""
                     dsl_dict = {'workflow': dsl_dict.workflow}
                     if hasattr(dsl_dict['workflow'], 'dict'):
                         dsl_dict['workflow'] = dsl_dict['workflow'].dict()
-                
-                # Check for tool hallucinations first (fast check)
+
                 tool_errors = self._check_tool_hallucinations(dsl_dict, catalog_context)
-                
-                # Perform comprehensive validation using WorkflowValidator
-                try:
-                    # --- THIS IS THE FIX ---
-                    # Create the validation context from the LOCAL catalog_context
-                    # that was passed into this function, NOT the global catalog.
-                    # This ensures both Claude and the validator use the same pruned context.
-                    
-                    schema_definition = self.context_builder._load_schema_definition()
-                    
-                    # --- THIS IS THE FIX ---
-                    # The Pydantic model expects a LIST of provider objects, not a dictionary.
-                    # We must convert the dictionary's values into a list, but we need to preserve the slug.
-                    # The validator also expects actions and triggers to be embedded within each provider.
-                    
-                    providers_dict_for_validation = catalog_context.get('providers', {})
-                    triggers_list = catalog_context.get('triggers', [])
-                    actions_list = catalog_context.get('actions', [])
-                    
-                    # --- ADD THIS BLOCK ---
-                    # Create a definition for the virtual "system" toolkit
-                    system_provider = {
-                        'slug': 'system',
-                        'name': 'System',
-                        'description': 'System-level tools for scheduling and core logic.',
-                        'triggers': [{
-                            'slug': 'SCHEDULE_BASED',
-                            'name': 'Schedule Based Trigger',
-                            'description': 'A trigger that runs on a schedule.'
-                        }],
-                        'actions': []  # System provider has no actions
-                    }
-                    # --- END OF BLOCK ---
-                    
-                    providers_list_for_validation = []
-                    for slug, provider_data in providers_dict_for_validation.items():
-                        # Ensure each provider object has a 'slug' field for the validator
-                        provider_with_slug = provider_data.copy()
-                        provider_with_slug['slug'] = slug
-                        
-                        # Embed the triggers and actions for this provider
-                        provider_triggers = [t for t in triggers_list if t.get('toolkit_slug') == slug]
-                        provider_actions = [a for a in actions_list if a.get('toolkit_slug') == slug]
-                        
-                        provider_with_slug['triggers'] = provider_triggers
-                        provider_with_slug['actions'] = provider_actions
-                        
-                        providers_list_for_validation.append(provider_with_slug)
-                    
-                    # Add the system provider to the list of providers for the validator
-                    if not any(p['slug'] == 'system' for p in providers_list_for_validation):
-                        providers_list_for_validation.append(system_provider)
-
-                    # Add system trigger to the triggers list for validation
-                    triggers_list_for_validation = catalog_context.get('triggers', []).copy()
-                    system_trigger = {
-                        'slug': 'SCHEDULE_BASED',
-                        'name': 'Schedule Based Trigger',
-                        'description': 'A trigger that runs on a schedule.',
-                        'toolkit_slug': 'system'
-                    }
-                    if not any(t.get('slug') == 'SCHEDULE_BASED' for t in triggers_list_for_validation):
-                        triggers_list_for_validation.append(system_trigger)
-
-                    catalog_context_for_validation = CatalogContext(
-                        available_providers=providers_list_for_validation,  # Pass the list here
-                        available_triggers=triggers_list_for_validation,
-                        available_actions=catalog_context.get('actions', []),
-                        provider_categories=[]
-                    )
-                    
-                    generation_context_for_validation = GenerationContext(
-                        request=request,
-                        catalog=catalog_context_for_validation,
-                        schema_definition=schema_definition
-                    )
-                    
-                    # Use this new, correct context for validation.
-                    validation_result = await self.workflow_validator.validate_generated_workflow(
-                        dsl_dict, 
-                        generation_context_for_validation, 
-                        "template"  # Assuming template workflow type
-                    )
-                    
-                    # Extract validation errors from the result
-                    validation_errors = validation_result.get('validation_errors', [])
-                    lint_errors = validation_result.get('lint_errors', [])
-                    
-                    # Combine all validation errors
-                    all_errors = tool_errors + validation_errors + lint_errors
-                    
-                    if not all_errors:
-                        logger.info("Generated workflow passed comprehensive validation successfully!")
-                        return parsed_response
+                if tool_errors:
+                    logger.warning(f"Tool Hallucination Detected: {tool_errors}")
+                    # Try to fix near-miss slugs locally before paying for another Claude call
+                    repairs = await self._repair_tool_hallucinations(dsl_dict, catalog_context)
+                    if repairs:
+                        tool_errors = self._check_tool_hallucinations(dsl_dict, catalog_context)
+                        parsed_response.generation_metadata = {
+                            **(parsed_response.generation_metadata or {}),
+                            "slug_repairs": [asdict(repair) for repair in repairs]
+                        }
+                if tool_errors:
+                    return None, tool_errors  # Force a retry with this specific feedback
+            # ---------------------------------------------
+
+            # Perform custom validation against available tools
+            if parsed_response.dsl_template and hasattr(parsed_response.dsl_template, 'workflow'):
+                workflow_data = parsed_response.dsl_template.workflow
+                if isinstance(workflow_data, dict):
+                    # Convert to dict if it's a Pydantic model
+                    if hasattr(workflow_data, 'dict'):
+                        workflow_dict = workflow_data.dict()
                     else:
-                        logger.warning(f"Validation failed with {len(all_errors)} errors: {all_errors}")
-                        previous_errors.extend(all_errors)
-                        # The loop will continue to the next attempt with specific feedback
-                        
-                except Exception as validation_exception:
-                    logger.error(f"Error during comprehensive validation: {validation_exception}")
-                    # Fall back to basic validation if WorkflowValidator fails
-                    basic_validation_errors = self._validate_generated_workflow(dsl_dict, catalog_context)
-                    all_errors = tool_errors + basic_validation_errors
-                    
-                    if not all_errors:
-                        logger.info("Generated workflow passed basic validation successfully!")
-                        return parsed_response
+                        workflow_dict = workflow_data
+
+                    # Validate against available tools
+                    validation_errors = self._validate_generated_workflow(workflow_dict, catalog_context)
+
+                    if validation_errors:
+                        logger.warning(f"Custom validation failed with {len(validation_errors)} errors: {validation_errors}")
+                        return None, validation_errors
                     else:
-                        logger.warning(f"Basic validation failed with {len(all_errors)} errors: {all_errors}")
-                        previous_errors.extend(all_errors)
-                        # The loop will continue to the next attempt with specific feedback
+                        logger.info("Custom validation passed - workflow uses valid tools")
+                else:
+                    logger.warning("Generated workflow is not in expected format")
+                    return None, ["Generated workflow format is invalid"]
 
-            except Exception as e:
-                logger.exception(f"An unexpected exception occurred on attempt {attempt + 1}.")
-                previous_errors.append(f"An unexpected error occurred: {str(e)}")
+            # --- THIS IS THE FIX ---
+            # ALWAYS validate the generated DSL against the catalog context
+            logger.info("Validating generated workflow against catalog context...")
 
-        logger.error("Failed to generate a valid workflow after all attempts.")
-        return GenerationResponse(
-            success=False,
-            error_message=f"Failed to generate a valid workflow after {self.max_regeneration_attempts} attempts. Last errors: {previous_errors}"
-        )
+            # Convert DSL template to dict for validation
+            dsl_dict = parsed_response.dsl_template
+            if hasattr(dsl_dict, 'dict'):
+                dsl_dict = dsl_dict.dict()
+            elif hasattr(dsl_dict, 'workflow'):
+                dsl_dict = {'workflow': dsl_dict.workflow}
+                if hasattr(dsl_dict['workflow'], 'dict'):
+                    dsl_dict['workflow'] = dsl_dict['workflow'].dict()
+
+            all_errors = await self._validate_workflow_dsl(request, dsl_dict, catalog_context)
+            if all_errors:
+                # The caller will retry with this specific feedback
+                return None, all_errors
+            return parsed_response, []
+
+
+        except Exception as e:
+            logger.exception(f"An unexpected exception occurred on attempt {attempt_number}.")
+            return None, [f"An unexpected error occurred: {str(e)}"]
+    
+    async def _validate_workflow_dsl(
+        self,
+        request: GenerationRequest,
+        dsl_dict: Dict[str, Any],
+        catalog_context: Dict[str, Any]
+    ) -> List[str]:
+        """Validate a DSL dict against a catalog context: tool hallucination check plus
+        WorkflowValidator schema and lint checks (basic checks if the validator fails).
+        
+        Returns the validation errors; an empty list means the DSL can be served.
+        """
+        # Check for tool hallucinations first (fast check)
+        tool_errors = self._check_tool_hallucinations(dsl_dict, catalog_context)
+
+        # Perform comprehensive validation using WorkflowValidator
+        try:
+            # --- THIS IS THE FIX ---
+            # Create the validation context from the LOCAL catalog_context
+            # that was passed into this function, NOT the global catalog.
+            # This ensures both Claude and the validator use the same pruned context.
+
+            schema_definition = self.context_builder._load_schema_definition()
+
+            # --- THIS IS THE FIX ---
+            # The Pydantic model expects a LIST of provider objects, not a dictionary.
+            # We must convert the dictionary's values into a list, but we need to preserve the slug.
+            # The validator also expects actions and triggers to be embedded within each provider.
+
+            providers_dict_for_validation = catalog_context.get('providers', {})
+            triggers_list = catalog_context.get('triggers', [])
+            actions_list = catalog_context.get('actions', [])
+
+            # --- ADD THIS BLOCK ---
+            # Create a definition for the virtual "system" toolkit
+            system_provider = {
+                'slug': 'system',
+                'name': 'System',
+                'description': 'System-level tools for scheduling and core logic.',
+                'triggers': [{
+                    'slug': 'SCHEDULE_BASED',
+                    'name': 'Schedule Based Trigger',
+                    'description': 'A trigger that runs on a schedule.'
+                }],
+                'actions': []  # System provider has no actions
+            }
+            # --- END OF BLOCK ---
+
+            providers_list_for_validation = []
+            for slug, provider_data in providers_dict_for_validation.items():
+                # Ensure each provider object has a 'slug' field for the validator
+                provider_with_slug = provider_data.copy()
+                provider_with_slug['slug'] = slug
+
+                # Embed the triggers and actions for this provider
+                provider_triggers = [t for t in triggers_list if t.get('toolkit_slug') == slug]
+                provider_actions = [a for a in actions_list if a.get('toolkit_slug') == slug]
+
+                provider_with_slug['triggers'] = provider_triggers
+                provider_with_slug['actions'] = provider_actions
+
+                providers_list_for_validation.append(provider_with_slug)
+
+            # Add the system provider to the list of providers for the validator
+            if not any(p['slug'] == 'system' for p in providers_list_for_validation):
+                providers_list_for_validation.append(system_provider)
+
+            # Add system trigger to the triggers list for validation
+            triggers_list_for_validation = catalog_context.get('triggers', []).copy()
+            system_trigger = {
+                'slug': 'SCHEDULE_BASED',
+                'name': 'Schedule Based Trigger',
+                'description': 'A trigger that runs on a schedule.',
+                'toolkit_slug': 'system'
+            }
+            if not any(t.get('slug') == 'SCHEDULE_BASED' for t in triggers_list_for_validation):
+                triggers_list_for_validation.append(system_trigger)
+
+            catalog_context_for_validation = CatalogContext(
+                available_providers=providers_list_for_validation,  # Pass the list here
+                available_triggers=triggers_list_for_validation,
+                available_actions=catalog_context.get('actions', []),
+                provider_categories=[]
+            )
+
+            generation_context_for_validation = GenerationContext(
+                request=request,
+                catalog=catalog_context_for_validation,
+                schema_definition=schema_definition
+            )
+
+            # Use this new, correct context for validation.
+            validation_result = await self.workflow_validator.validate_generated_workflow(
+                dsl_dict, 
+                generation_context_for_validation, 
+                "template"  # Assuming template workflow type
+            )
+
+            # Extract validation errors from the result
+            validation_errors = validation_result.get('validation_errors', [])
+            lint_errors = validation_result.get('lint_errors', [])
+
+            # Combine all validation errors
+            all_errors = tool_errors + validation_errors + lint_errors
+
+            if not all_errors:
+                logger.info("Generated workflow passed comprehensive validation successfully!")
+            else:
+                logger.warning(f"Validation failed with {len(all_errors)} errors: {all_errors}")
+            return all_errors
+
+        except Exception as validation_exception:
+            logger.error(f"Error during comprehensive validation: {validation_exception}")
+            # Fall back to basic validation if WorkflowValidator fails
+            basic_validation_errors = self._validate_generated_workflow(dsl_dict, catalog_context)
+            all_errors = tool_errors + basic_validation_errors
+
+            if not all_errors:
+                logger.info("Generated workflow passed basic validation successfully!")
+            else:
+                logger.warning(f"Basic validation failed with {len(all_errors)} errors: {all_errors}")
+            return all_errors
+    
+    def _template_catalog_context(self, template: WorkflowTemplate) -> Optional[Dict[str, Any]]:
+        """Catalog context holding a template's tools, taken from the loaded catalog snapshot.
+        
+        Returns None when a tool is missing from the snapshot.
+        """
+        snapshot = self.catalog_manager.get_catalog_snapshot()
+        context = {"providers": {}, "triggers": [], "actions": []}
+        for kind, toolkit_slug, slug in template.tools:
+            if toolkit_slug == SYSTEM_TOOLKIT:
+                continue
+            toolkit = snapshot.get_toolkit(toolkit_slug)
+            record = snapshot.lookup.get(toolkit_slug, slug, kind) if toolkit else None
+            if record is None:
+                return None
+            context["providers"][toolkit_slug] = toolkit.data
+            tools = context["triggers"] if kind == TRIGGER else context["actions"]
+            tools.append({**record.data, "toolkit_slug": toolkit_slug})
+        self._add_essential_system_tools(context)
+        return context
+    
+    async def _validate_template_dsl(self, request: GenerationRequest, dsl: Dict[str, Any], template: WorkflowTemplate) -> List[str]:
+        """Validate a rendered template the same way as generated workflows (see _run_generation_attempt)"""
+        catalog_context = self._template_catalog_context(template)
+        if catalog_context is None:
+            return [f"Template '{template.template_id}' uses tools missing from the loaded catalog"]
+        errors = self._validate_generated_workflow(dsl, catalog_context)
+        return errors + await self._validate_workflow_dsl(request, dsl, catalog_context)
     
     # Configuration and utility methods
     def update_groq_api_key(self, new_api_key: str):
@@ -2682,8 +2892,10 @@ Now, generate the complete JSON for the user's request."""
             "status": "configured" if self.groq_api_key else "not_configured"
         }
     
-    def update_tool_limits(self, max_triggers: Optional[int] = None, max_actions: Optional[int] = None, max_providers: Optional[int] = None):
+    def update_tool_limits(self, max_triggers: Optional[int] = None, max_actions: Optional[int] = None, max_providers: Optional[int] = None, context_token_budget: Optional[int] = None):
         """Update the tool limits for context management"""
+        if context_token_budget is not None:
+            self.context_token_budget = context_token_budget
         if max_triggers is not None:
             self.max_triggers = max_triggers
         if max_actions is not None:
@@ -2691,7 +2903,7 @@ Now, generate the complete JSON for the user's request."""
         if max_providers is not None:
             self.max_providers = max_providers
         
-        logger.info(f"Tool limits updated: triggers={self.max_triggers}, actions={self.max_actions}, providers={self.max_providers}")
+        logger.info(f"Tool limits updated: triggers={self.max_triggers}, actions={self.max_actions}, providers={self.max_providers}, token_budget={self.context_token_budget}")
     
     def get_tool_limits(self) -> Dict[str, Any]:
         """Get current tool limits configuration"""
@@ -2699,6 +2911,7 @@ Now, generate the complete JSON for the user's request."""
             "max_triggers": self.max_triggers,
             "max_actions": self.max_actions,
             "max_providers": self.max_providers,
+            "context_token_budget": self.context_token_budget,
             "estimated_context_size": f"~{self.max_triggers * 2 + self.max_actions * 3 + self.max_providers * 2}KB"
         }
     
@@ -2711,6 +2924,28 @@ Now, generate the complete JSON for the user's request."""
         
         logger.info(f"Rate limiting updated: base_delay={self.claude_rate_limit_delay}s, max_delay={self.max_rate_limit_delay}s")
     
+    def update_hedging(self, mode: Optional[str] = None, delay: Optional[float] = None, min_spare_tokens: Optional[int] = None):
+        """Update hedged generation configuration"""
+        if mode is not None:
+            if mode not in ("off", "delayed", "parallel"):
+                raise ValueError("hedge mode must be one of: off, delayed, parallel")
+            self.hedge_mode = mode
+        if delay is not None:
+            self.hedge_delay = delay
+        if min_spare_tokens is not None:
+            self.hedge_min_spare_tokens = min_spare_tokens
+        
+        logger.info(f"Hedging updated: mode={self.hedge_mode}, delay={self.hedge_delay}s, min_spare_tokens={self.hedge_min_spare_tokens}")
+    
+    def get_hedging_config(self) -> Dict[str, Any]:
+        """Get current hedged generation configuration"""
+        return {
+            "mode": self.hedge_mode,
+            "delay": self.hedge_delay,
+            "min_spare_tokens": self.hedge_min_spare_tokens,
+            "max_attempts": self.max_regeneration_attempts
+        }
+    
     def get_rate_limiting_config(self) -> Dict[str, Any]:
         """Get current rate limiting configuration"""
         return {
@@ -2798,6 +3033,14 @@ Now, generate the complete JSON for the user's request."""
         """Get information about the AI client configuration"""
         return self.ai_client.get_model_info()
     
+    def get_ai_usage_stats(self) -> Dict[str, Any]:
+        """Get Claude token usage, including prompt cache reads and writes"""
+        return self.ai_client.get_usage_stats()
+    
+    def get_prompt_card_stats(self) -> Dict[str, Any]:
+        """Get precompiled prompt card counts and lookup hit ratio"""
+        return prompt_card_index.get_stats()
+    
     def update_ai_api_key(self, new_api_key: str):
         """Update the AI client API key"""
         self.ai_client.update_api_key(new_api_key)
@@ -2806,10 +3049,43 @@ Now, generate the complete JSON for the user's request."""
         """Update the AI client model"""
         self.ai_client.update_model(new_model)
     
-    async def _detect_vagueness(self, user_prompt: str) -> Optional[Dict[str, str]]:
+    async def _detect_vagueness(
+        self,
+        user_prompt: str,
+        query_embedding: Optional[Any] = None,
+        selected_apps: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Detect if a user prompt is too vague and return the reason.
         
+        Uses the embedding classifier on the prompt embedding shared with
+        semantic search, falling back to keyword heuristics when the
+        classifier or the embedding is unavailable, or while the classifier
+        is still training in the background.
+        
+        Args:
+            user_prompt: The user's natural language prompt
+            query_embedding: Precomputed prompt embedding
+            selected_apps: Apps selected by the user (make short prompts answerable)
+            
+        Returns:
+            Dict with 'reason' key if vague, None if specific enough
+        """
+        if self.vagueness_classifier_enabled and query_embedding is not None:
+            if vagueness_classifier.trained:
+                try:
+                    return vagueness_classifier.classify(user_prompt, query_embedding, bool(selected_apps))
+                except Exception as e:
+                    logger.warning(f"⚠️ Vagueness classifier failed, using heuristics: {e}")
+            else:
+                vagueness_classifier.start_training(self.semantic_search.embedding_service.embed_texts)
+        
+        return self._detect_vagueness_heuristic(user_prompt)
+    
+    def _detect_vagueness_heuristic(self, user_prompt: str) -> Optional[Dict[str, str]]:
+        """
+        Keyword-based vagueness detection (fallback for the embedding classifier).
+        
         Args:
             user_prompt: The user's natural language prompt
             
@@ -123,3 +123,24 @@ class GenerationContext(BaseModel):
     schema_definition: Dict[str, Any]
     user_preferences: Optional[Dict[str, Any]] = None
     workflow_templates: Optional[List[Dict[str, Any]]] = None
+
+
+class PromptParts(BaseModel):
+    """
+    Claude prompt split by how often each part changes.
+    
+    The system part is identical for every request and the context part is
+    identical across retries of one request, so both are sent with
+    ``cache_control`` breakpoints and served from Anthropic's prompt cache.
+    """
+    
+    system: str = Field(..., description="Static instructions shared by every request")
+    context: str = Field(
+        default="",
+        description="Per-request tool context, stable across retry attempts"
+    )
+    request: str = Field(..., description="User request plus any retry feedback")
+    
+    def to_text(self) -> str:
+        """Flatten into a single prompt string (logging and legacy callers)"""
+        return "\n\n".join(part for part in (self.system, self.context, self.request) if part)
@@ -7,14 +7,15 @@ complexity levels, and includes catalog validation instructions.
 
 import json
 import logging
-from typing import Dict, Any, List
-from .models import GenerationContext
+from typing import Dict, Any, List, Tuple
+from .models import GenerationContext, PromptParts
+from .prompt_cards import prompt_card_index
 from .templates.base_templates import (
     EXECUTABLE_PROMPT,
     DAG_PROMPT,
     COMPLEXITY_GUIDANCE,
     # XML prompt system and helpers
-    render_template_prompt,
+    render_template_prompt_parts,
     CATALOG_VALIDATION_STRICT_XML,
     render_feedback_retry,
     render_final_attempt,
@@ -79,8 +80,16 @@ class PromptBuilder:
         }
     
     def build_prompt(self, context: GenerationContext, attempt: int = 1, previous_errors: List[str] = None, selected_plan: str = "{}") -> str:
-        """Build the Claude prompt for workflow generation"""
-        log_function_entry("build_prompt", context=context, attempt=attempt, previous_errors=previous_errors, selected_plan=selected_plan)
+        """Build the Claude prompt for workflow generation as a single string"""
+        return self.build_prompt_parts(context, attempt, previous_errors, selected_plan).to_text()
+
+    def build_prompt_parts(self, context: GenerationContext, attempt: int = 1, previous_errors: List[str] = None, selected_plan: str = "{}") -> PromptParts:
+        """
+        Build the Claude prompt for workflow generation, split into a static system
+        prefix, the per-request catalog context and the user request so the first
+        two can be served from Anthropic's prompt cache on every attempt.
+        """
+        log_function_entry("build_prompt_parts", context=context, attempt=attempt, previous_errors=previous_errors, selected_plan=selected_plan)
         logger.info(f"[LINE 46] Context request workflow_type: {context.request.workflow_type}")
         logger.info(f"[LINE 47] Context request complexity: {context.request.complexity}")
         logger.info(f"[LINE 48] Selected plan: {selected_plan}")
@@ -97,14 +106,14 @@ class PromptBuilder:
         # Build prompt depending on workflow type; template supports selected_plan injection
         if workflow_type == "template":
             logger.info(f"[LINE 57] Using template prompt builder with selected_plan")
-            base_prompt = self._build_template_prompt(context, complexity, selected_plan)
+            system_prompt, catalog_prompt, request_prompt = self._build_template_prompt_parts(context, complexity, selected_plan)
         else:
+            # Executable/DAG templates interleave catalog and request; send them uncached
             logger.info(f"[LINE 59] Using {workflow_type} prompt template")
             prompt_template = self.generation_templates.get(workflow_type, self._build_template_prompt)
-            base_prompt = prompt_template(context, complexity)
+            system_prompt, catalog_prompt, request_prompt = "", "", prompt_template(context, complexity)
         
-        logger.info(f"[LINE 62] Base prompt length: {len(base_prompt)} chars")
-        logger.debug(f"[LINE 63] Base prompt preview: {base_prompt[:500]}...")
+        logger.info(f"[LINE 62] Base prompt length: system={len(system_prompt)}, catalog={len(catalog_prompt)}, request={len(request_prompt)} chars")
         
         # Add additional validation instructions if we have catalog data
         catalog_providers = getattr(context.catalog, 'available_providers', None)
@@ -113,8 +122,11 @@ class PromptBuilder:
         
         if catalog_providers:
             logger.info(f"[LINE 69] Adding catalog validation instructions...")
-            # Append strict XML guardrails for catalog validation
-            base_prompt += f"\n\n{CATALOG_VALIDATION_STRICT_XML}"
+            # Strict XML guardrails are static, so they belong to the cached system prefix
+            if system_prompt:
+                system_prompt += f"\n\n{CATALOG_VALIDATION_STRICT_XML}"
+            else:
+                request_prompt += f"\n\n{CATALOG_VALIDATION_STRICT_XML}"
             logger.info(f"[LINE 71] Added CATALOG_VALIDATION_STRICT_XML (length: {len(CATALOG_VALIDATION_STRICT_XML)} chars)")
         else:
             logger.warning(f"[LINE 73] No catalog providers available, skipping validation instructions")
@@ -123,25 +135,23 @@ class PromptBuilder:
         if attempt > 1 and previous_errors:
             logger.info(f"[LINE 76] Adding feedback section for retry attempt {attempt}...")
             feedback_section = self._get_feedback_section(attempt, previous_errors)
-            base_prompt += f"\n\n{feedback_section}"
+            request_prompt += f"\n\n{feedback_section}"
             logger.info(f"[LINE 78] Added feedback section (length: {len(feedback_section)} chars)")
             logger.debug(f"[LINE 79] Feedback section: {feedback_section}")
         else:
             logger.info(f"[LINE 81] No feedback section needed (attempt: {attempt}, previous_errors: {len(previous_errors) if previous_errors else 0})")
         
-        final_prompt_length = len(base_prompt)
-        logger.info(f"✅ Final prompt length: {final_prompt_length} chars")
-        logger.info(f"📝 Final prompt preview: {base_prompt[:1000]}...")
+        parts = PromptParts(system=system_prompt, context=catalog_prompt, request=request_prompt)
+        
+        final_prompt_length = len(system_prompt) + len(catalog_prompt) + len(request_prompt)
+        logger.info(f"✅ Final prompt length: {final_prompt_length} chars ({len(system_prompt)} cacheable system)")
         
         # Log the available tools section for debugging
-        if "<available_tools>" in base_prompt:
-            tools_start = base_prompt.find("<available_tools>")
-            tools_end = base_prompt.find("</available_tools>") + len("</available_tools>")
-            tools_section = base_prompt[tools_start:tools_end]
-            logger.info(f"🔧 Available tools section:\n{tools_section}")
-        
-        log_function_exit("build_prompt", base_prompt, success=True)
-        return base_prompt
+        if catalog_prompt:
+            logger.info(f"🔧 Catalog section:\n{catalog_prompt}")
+        
+        log_function_exit("build_prompt_parts", f"PromptParts({final_prompt_length} chars)", success=True)
+        return parts
 
     def build_planning_prompt(self, context: GenerationContext) -> str:
         """Build the planning prompt to select relevant toolkits/triggers/actions"""
@@ -175,7 +185,11 @@ class PromptBuilder:
     
     def _build_template_prompt(self, context: GenerationContext, complexity: str, selected_plan: str = "{}") -> str:
         """Build prompt for template workflow type using XML-styled prompt"""
-        logger.info(f"[LINE 111] _build_template_prompt called")
+        return "".join(self._build_template_prompt_parts(context, complexity, selected_plan))
+    
+    def _build_template_prompt_parts(self, context: GenerationContext, complexity: str, selected_plan: str = "{}") -> Tuple[str, str, str]:
+        """Build (system, catalog, request) parts for the template workflow type"""
+        logger.info(f"[LINE 111] _build_template_prompt_parts called")
         logger.info(f"[LINE 112] Complexity: '{complexity}'")
         logger.info(f"[LINE 113] Selected plan: '{selected_plan}'")
         
@@ -188,26 +202,19 @@ class PromptBuilder:
         logger.info(f"[LINE 120] Formatted triggers count: {len(available_triggers) if isinstance(available_triggers, list) else 'N/A'}")
         logger.info(f"[LINE 121] Formatted actions count: {len(available_actions) if isinstance(available_actions, list) else 'N/A'}")
         
-        logger.debug(f"[LINE 123] Formatted toolkits preview: {available_toolkits[:3] if isinstance(available_toolkits, list) and len(available_toolkits) > 3 else available_toolkits}")
-        logger.debug(f"[LINE 124] Formatted triggers preview: {available_triggers[:3] if isinstance(available_triggers, list) and len(available_triggers) > 3 else available_triggers}")
-        logger.debug(f"[LINE 125] Formatted actions preview: {available_actions[:3] if isinstance(available_actions, list) and len(available_actions) > 3 else available_actions}")
-        
-        template_prompt = render_template_prompt(
+        # Prefer the embedded DSL v2 schema default; optionally could pass context schema
+        # schema_definition=json.dumps(context.schema_definition, indent=2),
+        system_prompt, catalog_prompt, request_prompt = render_template_prompt_parts(
             user_prompt=context.request.user_prompt,
-            complexity="",  # deprecated; not used by XML template
             available_toolkits=self._format_toolkits_for_prompt(available_toolkits),
             available_triggers=self._format_triggers_for_prompt(available_triggers),
             available_actions=self._format_actions_for_prompt(available_actions),
-            # Prefer the embedded DSL v2 schema default; optionally could pass context schema
-            # schema_definition=json.dumps(context.schema_definition, indent=2),
-            complexity_guidance="",  # deprecated; not used by XML template
             selected_plan=selected_plan,
         )
         
-        logger.info(f"[LINE 135] Template prompt generated (length: {len(template_prompt)} chars)")
-        logger.debug(f"[LINE 136] Template prompt preview: {template_prompt[:500]}...")
+        logger.info(f"[LINE 135] Template prompt generated (system={len(system_prompt)}, catalog={len(catalog_prompt)}, request={len(request_prompt)} chars)")
         
-        return template_prompt
+        return system_prompt, catalog_prompt, request_prompt
     
     def _build_executable_prompt(self, context: GenerationContext, complexity: str) -> str:
         """Build prompt for executable workflow type using external template"""
@@ -243,7 +250,7 @@ class PromptBuilder:
         
         # Debug: log first few toolkits to see structure
         logger.debug(f"Formatting {len(toolkits)} toolkits")
-        if toolkits:
+        if toolkits and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"First toolkit data: {toolkits[0]}")
             for i, toolkit in enumerate(toolkits[:3]):
                 logger.debug(f"Toolkit {i}: keys={list(toolkit.keys())}, name={toolkit.get('name')}, slug={toolkit.get('slug')}")
@@ -253,15 +260,12 @@ class PromptBuilder:
         total_toolkits = len(toolkits[:20])  # Limit to first 20
         
         for toolkit in toolkits[:20]:  # Limit to first 20
-            name = toolkit.get('name', 'Unknown')
             slug = toolkit.get('slug', 'unknown')
             
             # Only include toolkits that have a valid slug
             if slug and slug != 'unknown':
                 meaningful_slugs += 1
-                formatted.append(f"- {name} (slug: {slug})")
-                if toolkit.get('description'):
-                    formatted.append(f"  Description: {toolkit['description']}")
+                formatted.append(prompt_card_index.toolkit_card(slug, toolkit).listing)
         
         logger.info(f"Toolkits with meaningful slugs: {meaningful_slugs}/{total_toolkits}")
         
@@ -290,7 +294,7 @@ class PromptBuilder:
         
         # Debug: log first few triggers to see structure
         logger.debug(f"Formatting {len(triggers)} triggers")
-        if triggers:
+        if triggers and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"First trigger data: {triggers[0]}")
             for i, trigger in enumerate(triggers[:3]):
                 logger.debug(f"Trigger {i}: keys={list(trigger.keys())}, id={trigger.get('id')}, name={trigger.get('name')}, slug={trigger.get('slug')}")
@@ -302,15 +306,11 @@ class PromptBuilder:
         for trigger in triggers[:15]:  # Limit to first 15
             # Use slug as the primary identifier (matches database structure)
             trigger_slug = trigger.get('slug', 'unknown_trigger')
-            toolkit_slug = trigger.get('toolkit_slug', 'unknown_toolkit')
-            name = trigger.get('name', 'Unknown')
             
             # Only include triggers that have a valid slug
             if trigger_slug and trigger_slug != 'unknown_trigger':
                 meaningful_slugs += 1
-                formatted.append(f"- trigger_slug: {trigger_slug} (toolkit_slug: {toolkit_slug}) — {name}")
-                if trigger.get('description'):
-                    formatted.append(f"  Description: {trigger['description']}")
+                formatted.append(prompt_card_index.tool_card(trigger, "trigger").listing)
         
         logger.info(f"Triggers with meaningful slugs: {meaningful_slugs}/{total_triggers}")
         
@@ -339,7 +339,7 @@ class PromptBuilder:
         
         # Debug: log first few actions to see structure
         logger.debug(f"Formatting {len(actions)} actions")
-        if actions:
+        if actions and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"First action data: {actions[0]}")
             for i, action in enumerate(actions[:3]):
                 logger.debug(f"Action {i}: keys={list(action.keys())}, action_name={action.get('action_name')}, name={action.get('name')}, id={action.get('id')}, slug={action.get('slug')}")
@@ -351,20 +351,11 @@ class PromptBuilder:
         for action in actions[:100]:  # Limit to first 100
             # Use slug as the primary identifier (matches database structure)
             action_slug = action.get('slug', 'unknown_action')
-            toolkit_slug = action.get('toolkit_slug', 'unknown_toolkit')
-            name = action.get('name', 'Unknown')
             
-            # Only include actions that have a valid slug
+            # Only include actions that have a valid slug (card includes required inputs)
             if action_slug and action_slug != 'unknown_action':
                 meaningful_slugs += 1
-                formatted.append(f"- action_slug: {action_slug} (toolkit_slug: {toolkit_slug}) — {name}")
-                if action.get('description'):
-                    formatted.append(f"  Description: {action['description']}")
-                if action.get('parameters'):
-                    # Include a short list of required parameter names to guide correctness
-                    required_params = [p.get('name') for p in action['parameters'] if p.get('required')]
-                    if required_params:
-                        formatted.append(f"  Required inputs: {', '.join(required_params)}")
+                formatted.append(prompt_card_index.tool_card(action, "action").listing)
         
         logger.info(f"Actions with meaningful slugs: {meaningful_slugs}/{total_actions}")
         
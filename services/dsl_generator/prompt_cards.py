@@ -0,0 +1,319 @@
+"""
+Prompt Cards for DSL Generator
+
+Precompiled, immutable prompt fragments for every tool and toolkit in the
+catalog. Cards are built once when the catalog snapshot loads (or the first
+time an unseen tool is formatted) and carry cached token estimates, so prompt
+assembly is a join over prebuilt strings instead of a walk over tool dicts.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English/slug-heavy prompt text
+CHARS_PER_TOKEN = 4
+
+# Trim levels applied in order before tools are dropped
+TRIM_FULL = 0             # description + all parameters
+TRIM_REQUIRED_PARAMS = 1  # description + required parameters only
+TRIM_NO_PARAMS = 2        # short description, no parameters
+SHORT_DESCRIPTION_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting (no tokenizer dependency)"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _schema_parameters(schema: Any) -> Optional[List[Dict[str, Any]]]:
+    properties = schema.get('properties') if isinstance(schema, dict) else None
+    if not isinstance(properties, dict):
+        return None
+    required = set(schema.get('required') or [])
+    return [
+        {
+            'name': name,
+            'type': spec.get('type', 'string') if isinstance(spec, dict) else 'string',
+            'required': name in required
+        }
+        for name, spec in properties.items()
+    ]
+
+
+def extract_parameters(tool: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Get a tool's parameters as [{name, type, required}], from ``parameters`` or,
+    for semantic search results, from the raw tool's ``input_schema``.
+    """
+    parameters = tool.get('parameters')
+    if isinstance(parameters, list):
+        # Already extracted (and possibly trimmed) by an earlier packing pass
+        return [p for p in parameters if isinstance(p, dict) and p.get('name')]
+
+    metadata = tool.get('metadata') or {}
+    return _schema_parameters(tool.get('input_schema') or metadata.get('input_schema')) or []
+
+
+def _short_description(description: str) -> str:
+    if len(description) > SHORT_DESCRIPTION_CHARS:
+        return description[:SHORT_DESCRIPTION_CHARS].rstrip() + "..."
+    return description
+
+
+def render_tool_card(tool: Dict[str, Any], kind: str, trim_level: int = TRIM_FULL) -> str:
+    """Render the generation prompt text for a single tool at a given trim level"""
+    slug = tool.get('slug') or tool.get('name', '')
+    slug_label = "composio_trigger_slug" if kind == "trigger" else "action_name"
+    lines = [f"  - {slug_label}: {slug}"]
+
+    description = tool.get('description') or ''
+    if trim_level >= TRIM_NO_PARAMS:
+        description = _short_description(description)
+    if description:
+        lines.append(f"    Description: {description}")
+
+    if trim_level < TRIM_NO_PARAMS:
+        parameters = extract_parameters(tool)
+        if trim_level == TRIM_REQUIRED_PARAMS:
+            parameters = [p for p in parameters if p.get('required')]
+        if parameters:
+            rendered = ", ".join(
+                f"{p['name']} ({p.get('type', 'string')}{', required' if p.get('required') else ''})"
+                for p in parameters
+            )
+            lines.append(f"    Inputs: {rendered}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _render_tool_listing(tool: Dict[str, Any], kind: str) -> str:
+    """Render the PromptBuilder catalog listing line(s) for a tool"""
+    slug = tool.get('slug', '')
+    toolkit_slug = tool.get('toolkit_slug', 'unknown_toolkit')
+    name = tool.get('name', 'Unknown')
+    label = "trigger_slug" if kind == "trigger" else "action_slug"
+
+    lines = [f"- {label}: {slug} (toolkit_slug: {toolkit_slug}) — {name}"]
+    if tool.get('description'):
+        lines.append(f"  Description: {tool['description']}")
+    if kind == "action":
+        # Include a short list of required parameter names to guide correctness
+        required_params = [p.get('name') for p in extract_parameters(tool) if p.get('required')]
+        if required_params:
+            lines.append(f"  Required inputs: {', '.join(required_params)}")
+    return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class ToolCard:
+    """Prebuilt prompt fragments for one trigger or action"""
+    kind: str
+    toolkit_slug: str
+    slug: str
+    texts: Tuple[str, str, str]   # generation prompt text per trim level
+    tokens: Tuple[int, int, int]  # token estimate per trim level
+    listing: str                  # PromptBuilder catalog listing
+    listing_tokens: int
+
+
+@dataclass(frozen=True)
+class ToolkitCard:
+    """Prebuilt prompt fragments for one toolkit"""
+    slug: str
+    name: str
+    header: str   # generation prompt section header
+    listing: str  # PromptBuilder catalog listing
+    tokens: int
+
+
+class PromptCardIndex:
+    """
+    Catalog-wide store of immutable tool and toolkit prompt cards.
+
+    Cards are keyed by (kind, toolkit_slug, slug). Loading a catalog swaps in a
+    fresh mapping, so readers never see a half-built snapshot; tools missing
+    from the snapshot get a card built on first use. ``version`` is the
+    catalog snapshot version the cards were built from.
+    """
+
+    def __init__(self):
+        self._tools: Dict[Tuple[str, str, str], ToolCard] = {}
+        self._toolkits: Dict[str, ToolkitCard] = {}
+        self._load_lock = threading.Lock()
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _build_tool_card(tool: Dict[str, Any], kind: str) -> ToolCard:
+        metadata = tool.get('metadata') or {}
+        # Build from the untrimmed source so a packed copy never poisons the cache
+        source = dict(tool)
+        source['description'] = metadata.get('description') or tool.get('description') or ''
+        schema_parameters = _schema_parameters(tool.get('input_schema') or metadata.get('input_schema'))
+        if schema_parameters is not None:
+            source['parameters'] = schema_parameters
+
+        texts = tuple(render_tool_card(source, kind, level) for level in (TRIM_FULL, TRIM_REQUIRED_PARAMS, TRIM_NO_PARAMS))
+        listing = _render_tool_listing(source, kind)
+        return ToolCard(
+            kind=kind,
+            toolkit_slug=tool.get('toolkit_slug', ''),
+            slug=tool.get('slug') or tool.get('name', ''),
+            texts=texts,
+            tokens=tuple(estimate_tokens(text) for text in texts),
+            listing=listing,
+            listing_tokens=estimate_tokens(listing)
+        )
+
+    @staticmethod
+    def _build_toolkit_card(slug: str, toolkit: Dict[str, Any]) -> ToolkitCard:
+        name = toolkit.get('name') or slug
+        listing = f"- {name} (slug: {slug})"
+        if toolkit.get('description'):
+            listing += f"\n  Description: {toolkit['description']}"
+        header = f"\n--- Toolkit: {slug} ---\n"
+        return ToolkitCard(slug=slug, name=name, header=header, listing=listing, tokens=estimate_tokens(listing))
+
+    def load_catalog_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """
+        Build cards for a catalog snapshot (semantic index metadata items).
+
+        Args:
+            items: Items with ``type`` (provider/trigger/action), ``provider_id`` and ``slug``
+        """
+        tools: Dict[Tuple[str, str, str], ToolCard] = {}
+        toolkits: Dict[str, ToolkitCard] = {}
+
+        for item in items:
+            item_type = item.get('type', '')
+            provider_id = item.get('provider_id', '')
+            try:
+                if item_type == 'provider':
+                    slug = item.get('slug') or provider_id
+                    if slug:
+                        toolkits[slug] = self._build_toolkit_card(slug, item)
+                elif item_type in ('trigger', 'action') and provider_id and item.get('slug'):
+                    tool = dict(item, toolkit_slug=provider_id)
+                    tools[(item_type, provider_id, item['slug'])] = self._build_tool_card(tool, item_type)
+            except Exception as e:
+                logger.warning(f"Skipping prompt card for {item_type} '{item.get('slug')}': {e}")
+
+        with self._load_lock:
+            self._install(tools, toolkits, None)
+
+    def load_snapshot(self, snapshot: Any) -> bool:
+        """
+        Build cards for every tool and toolkit in a ``CatalogSnapshot``.
+
+        Loading the version the cards were already built from is a no-op.
+        Safe to call from a worker thread.
+
+        Returns:
+            Whether cards were built
+        """
+        with self._load_lock:
+            if snapshot.version == self.version:
+                return False
+
+            tools: Dict[Tuple[str, str, str], ToolCard] = {}
+            toolkits: Dict[str, ToolkitCard] = {}
+            for toolkit in snapshot.toolkits.values():
+                try:
+                    toolkits[toolkit.slug] = self._build_toolkit_card(toolkit.slug, toolkit.data)
+                except Exception as e:
+                    logger.warning(f"Skipping prompt card for toolkit '{toolkit.slug}': {e}")
+                for tool in toolkit.tools:
+                    try:
+                        source = dict(tool.data, toolkit_slug=toolkit.slug)
+                        tools[(tool.tool_type, toolkit.slug, tool.slug)] = self._build_tool_card(source, tool.tool_type)
+                    except Exception as e:
+                        logger.warning(f"Skipping prompt card for {tool.tool_type} '{tool.slug}': {e}")
+
+            self._install(tools, toolkits, snapshot.version)
+            return True
+
+    def _install(self, tools: Dict[Tuple[str, str, str], ToolCard], toolkits: Dict[str, ToolkitCard],
+                 version: Optional[str]) -> None:
+        self._tools = tools
+        self._toolkits = toolkits
+        self.version = version
+        logger.info(f"🃏 Built prompt cards for {len(tools)} tools and {len(toolkits)} toolkits"
+                    + (f" (catalog version {version})" if version else ""))
+
+    def tool_card(self, tool: Dict[str, Any], kind: str) -> ToolCard:
+        """Get the card for a tool dict, building and caching it on a miss"""
+        key = (kind, tool.get('toolkit_slug', ''), tool.get('slug') or tool.get('name', ''))
+        card = self._tools.get(key)
+        if card is not None:
+            self.hits += 1
+            return card
+        self.misses += 1
+        card = self._build_tool_card(tool, kind)
+        self._tools[key] = card
+        return card
+
+    def toolkit_card(self, slug: str, toolkit: Optional[Dict[str, Any]] = None) -> ToolkitCard:
+        """Get the card for a toolkit, building and caching it on a miss"""
+        card = self._toolkits.get(slug)
+        if card is None:
+            card = self._build_toolkit_card(slug, toolkit or {})
+            self._toolkits[slug] = card
+        return card
+
+    def render_tool_list(self, catalog_context: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Join the cards for a (packed) catalog context, grouped by toolkit.
+
+        Returns:
+            (tool list text, whether any triggers were rendered)
+        """
+        providers = catalog_context.get('providers', {})
+        sections: Dict[str, Dict[str, List[str]]] = {}
+        seen = set()
+
+        for kind, tools in (("trigger", catalog_context.get('triggers', [])), ("action", catalog_context.get('actions', []))):
+            for tool in tools:
+                toolkit_slug = tool.get('toolkit_slug')
+                slug = tool.get('slug') or tool.get('name')
+                if not toolkit_slug or not slug or (kind, toolkit_slug, slug) in seen:
+                    continue
+                seen.add((kind, toolkit_slug, slug))
+                card = self.tool_card(tool, kind)
+                level = tool.get('prompt_trim_level', TRIM_FULL)
+                sections.setdefault(toolkit_slug, {"trigger": [], "action": []})[kind].append(card.texts[level])
+
+        parts = []
+        has_triggers = False
+        for toolkit_slug, section in sections.items():
+            parts.append(self.toolkit_card(toolkit_slug, providers.get(toolkit_slug)).header)
+            if section["trigger"]:
+                has_triggers = True
+                parts.append("Triggers:\n")
+                parts.extend(section["trigger"])
+            if section["action"]:
+                parts.append("Actions:\n")
+                parts.extend(section["action"])
+        return "".join(parts), has_triggers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Card counts and lookup hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "tool_cards": len(self._tools),
+            "toolkit_cards": len(self._toolkits),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+# Shared card index, rebuilt when a new catalog snapshot is installed
+prompt_card_index = PromptCardIndex()
@@ -3,6 +3,10 @@ Rate Limiter for Claude API Calls
 
 Provides centralized rate limiting to prevent overwhelming the Claude API
 and ensure fair usage across all components of the system.
+
+The global limiter is backed by Redis (an atomic Lua token bucket shared by
+every worker and host) and falls back to the in-process limiter whenever
+Redis is unavailable.
 """
 
 import asyncio
@@ -24,6 +28,16 @@ class RateLimitConfig:
     base_delay: float = 2.0  # Base delay between requests
     max_delay: float = 30.0  # Maximum delay between requests
     jitter_factor: float = 0.25  # ±25% random variation
+    input_tokens_per_minute: int = 0  # ITPM quota for uncached input tokens (0 = not enforced)
+    output_tokens_per_minute: int = 0  # OTPM quota for output tokens (0 = not enforced)
+
+
+@dataclass
+class TokenReservation:
+    """Input/output tokens held against the per-minute quotas for one call"""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    reconciled: bool = False
 
 
 class TokenBucketRateLimiter:
@@ -38,7 +52,7 @@ class TokenBucketRateLimiter:
         self.config = config
         self.tokens = config.burst_limit
         self.last_refill = time.time()
-        self.request_times = deque(maxlen=config.requests_per_minute)
+        self.request_times = deque(maxlen=max(1, int(config.requests_per_minute)))
         self.lock = asyncio.Lock()
         
         # Rate limiting state
@@ -111,6 +125,11 @@ class TokenBucketRateLimiter:
         
         return 0.0
     
+    def available_tokens(self) -> float:
+        """Tokens available right now (after refill), without consuming any"""
+        self._refill_tokens(time.time())
+        return self.tokens
+    
     async def wait_for_token(self) -> None:
         """Wait until a token is available"""
         await self.acquire_token(wait=True)
@@ -140,6 +159,119 @@ class TokenBucketRateLimiter:
         }
 
 
+class TokenBudgetLimiter:
+    """
+    Input/output token-per-minute limiter for Claude calls.
+    
+    Mirrors how Anthropic enforces ITPM/OTPM: each call reserves its
+    estimated input tokens and its ``max_tokens`` up front, and the
+    difference is settled once the response reports actual usage. Buckets
+    refill continuously at quota/60 per second up to one minute of quota,
+    and may go negative when a call used more than it reserved.
+    """
+    
+    def __init__(self, config: RateLimitConfig):
+        self.capacity = {
+            "input": float(config.input_tokens_per_minute or 0),
+            "output": float(config.output_tokens_per_minute or 0)
+        }
+        self.available = dict(self.capacity)
+        self.last_refill = time.time()
+        self.lock = asyncio.Lock()
+        
+        self.reserved_totals = {"input": 0, "output": 0}
+        self.used_totals = {"input": 0, "output": 0}
+        self.waits = 0
+        self.total_wait_time = 0.0
+    
+    @property
+    def enabled(self) -> bool:
+        return any(capacity > 0 for capacity in self.capacity.values())
+    
+    def clamp(self, input_tokens: int, output_tokens: int) -> TokenReservation:
+        """Reservation for a call, limited to what a full bucket could ever hold"""
+        amounts = {"input": input_tokens, "output": output_tokens}
+        for kind, capacity in self.capacity.items():
+            amounts[kind] = int(min(amounts[kind], capacity)) if capacity > 0 else 0
+        return TokenReservation(input_tokens=amounts["input"], output_tokens=amounts["output"])
+    
+    def _refill(self, current_time: float):
+        elapsed = max(0.0, current_time - self.last_refill)
+        for kind, capacity in self.capacity.items():
+            if capacity > 0:
+                self.available[kind] = min(capacity, self.available[kind] + elapsed * capacity / 60.0)
+        self.last_refill = current_time
+    
+    def _wait_time(self, reservation: TokenReservation) -> float:
+        wait_time = 0.0
+        for kind, amount in (("input", reservation.input_tokens), ("output", reservation.output_tokens)):
+            capacity = self.capacity[kind]
+            if capacity > 0 and self.available[kind] < amount:
+                wait_time = max(wait_time, (amount - self.available[kind]) * 60.0 / capacity)
+        return wait_time
+    
+    async def reserve(self, input_tokens: int, output_tokens: int, wait: bool = True) -> Optional[TokenReservation]:
+        """
+        Reserve tokens against both quotas.
+        
+        Waiters are served in order (the lock is held while sleeping) so
+        large prompts are not starved by small ones.
+        
+        Returns:
+            The reservation, or None if tokens are short and wait=False
+        """
+        reservation = self.clamp(input_tokens, output_tokens)
+        if not self.enabled:
+            return reservation
+        
+        async with self.lock:
+            while True:
+                self._refill(time.time())
+                wait_time = self._wait_time(reservation)
+                if wait_time <= 0:
+                    self.available["input"] -= reservation.input_tokens
+                    self.available["output"] -= reservation.output_tokens
+                    self.reserved_totals["input"] += reservation.input_tokens
+                    self.reserved_totals["output"] += reservation.output_tokens
+                    return reservation
+                if not wait:
+                    return None
+                
+                self.waits += 1
+                self.total_wait_time += wait_time
+                logger.info(f"Token quota exhausted, waiting {wait_time:.2f}s "
+                            f"(need in={reservation.input_tokens} out={reservation.output_tokens})")
+                await asyncio.sleep(wait_time)
+    
+    def reconcile(self, reservation: TokenReservation, actual_input: int, actual_output: int):
+        """Return unused reserved tokens (or charge overruns) once actual usage is known"""
+        if reservation.reconciled or not self.enabled:
+            return
+        reservation.reconciled = True
+        self._refill(time.time())
+        for kind, reserved, actual in (
+            ("input", reservation.input_tokens, actual_input),
+            ("output", reservation.output_tokens, actual_output)
+        ):
+            if self.capacity[kind] > 0:
+                self.available[kind] = min(self.capacity[kind], self.available[kind] + reserved - actual)
+                self.used_totals[kind] += actual
+    
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill(time.time())
+        return {
+            "enabled": self.enabled,
+            "input_tokens_per_minute": self.capacity["input"],
+            "output_tokens_per_minute": self.capacity["output"],
+            "available_input_tokens": round(self.available["input"]),
+            "available_output_tokens": round(self.available["output"]),
+            "reserved_totals": dict(self.reserved_totals),
+            "used_totals": dict(self.used_totals),
+            "waits": self.waits,
+            "total_wait_time": round(self.total_wait_time, 2)
+        }
+
+
 class AdaptiveRateLimiter:
     """
     Adaptive rate limiter that adjusts limits based on API response patterns.
@@ -155,10 +287,13 @@ class AdaptiveRateLimiter:
             burst_limit=initial_config.burst_limit,
             base_delay=initial_config.base_delay,
             max_delay=initial_config.max_delay,
-            jitter_factor=initial_config.jitter_factor
+            jitter_factor=initial_config.jitter_factor,
+            input_tokens_per_minute=initial_config.input_tokens_per_minute,
+            output_tokens_per_minute=initial_config.output_tokens_per_minute
         )
         
         self.rate_limiter = TokenBucketRateLimiter(self.current_config)
+        self.token_budget = TokenBudgetLimiter(self.current_config)
         
         # Adaptive learning state
         self.rate_limit_history = deque(maxlen=100)
@@ -169,6 +304,18 @@ class AdaptiveRateLimiter:
         """Acquire a token with adaptive rate limiting"""
         return await self.rate_limiter.acquire_token(wait)
     
+    def available_tokens(self) -> float:
+        """Tokens available right now, without consuming any"""
+        return self.rate_limiter.available_tokens()
+    
+    async def reserve_tokens(self, input_tokens: int, output_tokens: int, wait: bool = True) -> Optional[TokenReservation]:
+        """Reserve input/output tokens against the per-minute token quotas"""
+        return await self.token_budget.reserve(input_tokens, output_tokens, wait)
+    
+    def reconcile_tokens(self, reservation: TokenReservation, actual_input: int, actual_output: int):
+        """Settle a reservation against the usage reported by the API"""
+        self.token_budget.reconcile(reservation, actual_input, actual_output)
+    
     def record_rate_limit(self, timestamp: float = None):
         """Record when a rate limit was hit"""
         if timestamp is None:
@@ -243,22 +390,324 @@ class AdaptiveRateLimiter:
                 "success_history_count": len(self.success_history)
             }
         }
+        base_stats["token_budget"] = self.token_budget.get_stats()
         return base_stats
 
 
+# Token bucket refill and take, using Redis server time so hosts share one clock.
+# KEYS: bucket hash. ARGV: base rpm, burst, tokens requested.
+# Returns {allowed, wait_seconds, tokens_left, rpm} (numbers as strings, Lua would truncate them).
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rpm')
+local rpm = tonumber(data[3]) or tonumber(ARGV[1])
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rpm / 60)
+local allowed = 0
+local wait = 0
+if tokens >= requested then
+  allowed = 1
+  tokens = tokens - requested
+  redis.call('HINCRBY', KEYS[1], 'total_requests', 1)
+else
+  wait = (requested - tokens) * 60 / rpm
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rpm', rpm)
+redis.call('EXPIRE', KEYS[1], 3600)
+return {allowed, tostring(wait), tostring(tokens), tostring(rpm)}
+"""
+
+# Input/output token-per-minute buckets. KEYS: token hash.
+# ARGV: ITPM, OTPM, input tokens, output tokens, force (1 = apply without checking, used to settle).
+# Returns {allowed, wait_seconds}.
+_TOKEN_BUDGET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local caps = {tonumber(ARGV[1]), tonumber(ARGV[2])}
+local amounts = {tonumber(ARGV[3]), tonumber(ARGV[4])}
+local data = redis.call('HMGET', KEYS[1], 'input', 'output', 'ts')
+local ts = tonumber(data[3]) or now
+local levels = {}
+local wait = 0
+for i = 1, 2 do
+  levels[i] = tonumber(data[i]) or caps[i]
+  if caps[i] > 0 then
+    levels[i] = math.min(caps[i], levels[i] + math.max(0, now - ts) * caps[i] / 60)
+    if levels[i] < amounts[i] then
+      wait = math.max(wait, (amounts[i] - levels[i]) * 60 / caps[i])
+    end
+  end
+end
+local allowed = 0
+if wait == 0 or ARGV[5] == '1' then
+  allowed = 1
+  wait = 0
+  for i = 1, 2 do
+    if caps[i] > 0 then levels[i] = math.min(caps[i], levels[i] - amounts[i]) end
+  end
+end
+redis.call('HSET', KEYS[1], 'input', levels[1], 'output', levels[2], 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return {allowed, tostring(wait)}
+"""
+
+# Shared adaptive backoff on a 429. KEYS: bucket hash. ARGV: base rpm, decrease factor, min rpm.
+_RATE_LIMIT_SCRIPT = """
+local t = redis.call('TIME')
+local rpm = tonumber(redis.call('HGET', KEYS[1], 'rpm')) or tonumber(ARGV[1])
+rpm = math.max(tonumber(ARGV[3]), rpm * tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'rpm', rpm, 'last_rate_limit', t[1])
+redis.call('HINCRBY', KEYS[1], 'rate_limited_requests', 1)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(rpm)
+"""
+
+# Shared adaptive recovery on success. KEYS: bucket hash, recent successes zset.
+# ARGV: base rpm, increase factor, successes needed in the last 5 minutes, unique member.
+_SUCCESS_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZADD', KEYS[2], now, ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - 300)
+redis.call('EXPIRE', KEYS[2], 600)
+local base = tonumber(ARGV[1])
+local rpm = tonumber(redis.call('HGET', KEYS[1], 'rpm')) or base
+if redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[3]) and rpm < base then
+  rpm = math.min(base, rpm * tonumber(ARGV[2]))
+  redis.call('HSET', KEYS[1], 'rpm', rpm)
+end
+return tostring(rpm)
+"""
+
+
+class DistributedRateLimiter(AdaptiveRateLimiter):
+    """
+    Adaptive token bucket shared across workers and hosts through Redis.
+    
+    Token accounting and the adaptive rate live in a Redis hash updated by
+    Lua scripts, so N workers together respect ``requests_per_minute`` and a
+    429 seen by one worker slows all of them down. The inherited in-process
+    limiter keeps running as a fallback and is used whenever Redis fails,
+    with Redis retried after ``redis_retry_interval`` seconds.
+    """
+    
+    def __init__(self, initial_config: RateLimitConfig, key_prefix: str = "ratelimit:claude",
+                 redis_retry_interval: float = 30.0):
+        super().__init__(initial_config)
+        self.key_prefix = key_prefix
+        self.bucket_key = f"{key_prefix}:bucket"
+        self.token_budget_key = f"{key_prefix}:token_budget"
+        self.successes_key = f"{key_prefix}:successes"
+        self.redis_retry_interval = redis_retry_interval
+        self.min_requests_per_minute = 5
+        
+        self._scripts: Optional[Dict[str, Any]] = None
+        self._redis_down_until = 0.0
+        self._shared_state: Dict[str, float] = {}
+        self._pending_tasks = set()
+        self._success_counter = 0
+    
+    async def _get_scripts(self) -> Optional[Dict[str, Any]]:
+        if self._scripts is None:
+            from core.catalog.redis_client import RedisClientFactory
+            client = await RedisClientFactory.get_client()
+            self._scripts = {
+                "acquire": client.register_script(_ACQUIRE_SCRIPT),
+                "rate_limit": client.register_script(_RATE_LIMIT_SCRIPT),
+                "success": client.register_script(_SUCCESS_SCRIPT),
+                "token_budget": client.register_script(_TOKEN_BUDGET_SCRIPT)
+            }
+        return self._scripts
+    
+    @property
+    def redis_available(self) -> bool:
+        return time.time() >= self._redis_down_until
+    
+    async def _run_script(self, name: str, keys: list, args: list) -> Optional[Any]:
+        """Run a Lua script, returning None (and using the local fallback) if Redis fails"""
+        if not self.redis_available:
+            return None
+        try:
+            scripts = await self._get_scripts()
+            return await scripts[name](keys=keys, args=args)
+        except Exception as e:
+            self._scripts = None
+            self._redis_down_until = time.time() + self.redis_retry_interval
+            logger.warning(
+                f"⚠️ Redis rate limiter unavailable, using local limiter for {self.redis_retry_interval:.0f}s: {e}"
+            )
+            return None
+    
+    def _schedule(self, name: str, keys: list, args: list) -> None:
+        """Fire-and-forget a script from the synchronous record_* hooks"""
+        if not self.redis_available:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._run_script(name, keys, args))
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+    
+    def _base_rpm(self) -> float:
+        return self.base_config.requests_per_minute
+    
+    async def acquire_token(self, wait: bool = True) -> bool:
+        """Take a token from the shared bucket, waiting for a refill if asked to"""
+        while True:
+            result = await self._run_script(
+                "acquire",
+                keys=[self.bucket_key],
+                args=[self._base_rpm(), self.current_config.burst_limit, 1]
+            )
+            if result is None:
+                return await super().acquire_token(wait)
+            
+            allowed, wait_time, tokens, rpm = int(result[0]), float(result[1]), float(result[2]), float(result[3])
+            self._shared_state = {"tokens": tokens, "rpm": rpm, "burst": self.current_config.burst_limit,
+                                  "updated_at": time.time()}
+            if allowed:
+                self.rate_limiter.total_requests += 1
+                return True
+            if not wait:
+                return False
+            
+            # Add jitter to prevent thundering herd across workers
+            jitter_factor = self.current_config.jitter_factor
+            jitter = random.uniform(1 - jitter_factor, 1 + jitter_factor)
+            wait_time *= jitter
+            logger.info(f"Shared rate limit hit, waiting {wait_time:.2f}s for next token")
+            await asyncio.sleep(wait_time)
+    
+    def available_tokens(self) -> float:
+        """Tokens available right now, projected from the last shared bucket snapshot"""
+        state = self._shared_state
+        if not self.redis_available or not state:
+            return super().available_tokens()
+        elapsed = time.time() - state["updated_at"]
+        return min(state["burst"], state["tokens"] + elapsed * state["rpm"] / 60.0)
+    
+    def _token_budget_args(self, input_tokens: int, output_tokens: int, force: bool) -> list:
+        capacity = self.token_budget.capacity
+        return [capacity["input"], capacity["output"], input_tokens, output_tokens, 1 if force else 0]
+    
+    async def reserve_tokens(self, input_tokens: int, output_tokens: int, wait: bool = True) -> Optional[TokenReservation]:
+        """Reserve input/output tokens against the shared per-minute token quotas"""
+        reservation = self.token_budget.clamp(input_tokens, output_tokens)
+        if not self.token_budget.enabled:
+            return reservation
+        while True:
+            result = await self._run_script(
+                "token_budget",
+                keys=[self.token_budget_key],
+                args=self._token_budget_args(reservation.input_tokens, reservation.output_tokens, force=False)
+            )
+            if result is None:
+                return await super().reserve_tokens(input_tokens, output_tokens, wait)
+            if int(result[0]):
+                self.token_budget.reserved_totals["input"] += reservation.input_tokens
+                self.token_budget.reserved_totals["output"] += reservation.output_tokens
+                return reservation
+            if not wait:
+                return None
+            
+            wait_time = float(result[1]) * random.uniform(1.0, 1.0 + self.current_config.jitter_factor)
+            self.token_budget.waits += 1
+            self.token_budget.total_wait_time += wait_time
+            logger.info(f"Shared token quota exhausted, waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+    
+    def reconcile_tokens(self, reservation: TokenReservation, actual_input: int, actual_output: int):
+        """Settle a reservation in the shared token buckets"""
+        if reservation.reconciled or not self.token_budget.enabled:
+            return
+        if not self.redis_available:
+            # Reserved from the local fallback buckets
+            return super().reconcile_tokens(reservation, actual_input, actual_output)
+        reservation.reconciled = True
+        self.token_budget.used_totals["input"] += actual_input
+        self.token_budget.used_totals["output"] += actual_output
+        self._schedule(
+            "token_budget",
+            keys=[self.token_budget_key],
+            args=self._token_budget_args(
+                actual_input - reservation.input_tokens, actual_output - reservation.output_tokens, force=True
+            )
+        )
+    
+    def record_rate_limit(self, timestamp: float = None):
+        """Record a 429 locally and slow down every worker sharing the bucket"""
+        super().record_rate_limit(timestamp)
+        self._schedule(
+            "rate_limit",
+            keys=[self.bucket_key],
+            args=[self._base_rpm(), 1 - self.learning_rate, self.min_requests_per_minute]
+        )
+    
+    def record_success(self, timestamp: float = None):
+        """Record a success locally and let the shared rate recover"""
+        super().record_success(timestamp)
+        self._success_counter += 1
+        self._schedule(
+            "success",
+            keys=[self.bucket_key, self.successes_key],
+            args=[self._base_rpm(), 1 + self.learning_rate * 0.5, 8, f"{id(self)}:{self._success_counter}:{time.time()}"]
+        )
+    
+    async def reset_shared_state(self) -> bool:
+        """Drop the shared bucket so it restarts from the current configuration"""
+        try:
+            from core.catalog.redis_client import RedisClientFactory
+            client = await RedisClientFactory.get_client()
+            await client.delete(self.bucket_key, self.successes_key, self.token_budget_key)
+            self._shared_state = {}
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to reset shared rate limiter state: {e}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local statistics plus the shared bucket snapshot"""
+        stats = super().get_stats()
+        stats["distributed"] = {
+            "backend": "redis" if self.redis_available else "local_fallback",
+            "key_prefix": self.key_prefix,
+            "shared_requests_per_minute": self._shared_state.get("rpm"),
+            "shared_available_tokens": round(self.available_tokens(), 2) if self._shared_state else None,
+            "redis_retry_in": max(0.0, self._redis_down_until - time.time()) or None
+        }
+        return stats
+
+
 # Global rate limiter instance
 _global_rate_limiter: Optional[AdaptiveRateLimiter] = None
 
 
+def _create_global_rate_limiter(config: RateLimitConfig) -> AdaptiveRateLimiter:
+    from core.config import settings
+    if settings.claude_rate_limit_backend == "redis":
+        return DistributedRateLimiter(config, key_prefix=settings.claude_rate_limit_key_prefix)
+    return AdaptiveRateLimiter(config)
+
+
 def get_global_rate_limiter() -> AdaptiveRateLimiter:
     """Get the global rate limiter instance"""
     global _global_rate_limiter
     
     if _global_rate_limiter is None:
-        # Create with default configuration
-        config = RateLimitConfig()
-        _global_rate_limiter = AdaptiveRateLimiter(config)
-        logger.info("Global rate limiter initialized with default configuration")
+        # Create with default configuration and the configured token quotas
+        from core.config import settings
+        config = RateLimitConfig(
+            input_tokens_per_minute=settings.claude_input_tokens_per_minute,
+            output_tokens_per_minute=settings.claude_output_tokens_per_minute
+        )
+        _global_rate_limiter = _create_global_rate_limiter(config)
+        logger.info(f"Global rate limiter initialized with default configuration ({type(_global_rate_limiter).__name__})")
     
     return _global_rate_limiter
 
@@ -268,11 +717,19 @@ def set_global_rate_limiter_config(config: RateLimitConfig):
     global _global_rate_limiter
     
     if _global_rate_limiter is None:
-        _global_rate_limiter = AdaptiveRateLimiter(config)
+        _global_rate_limiter = _create_global_rate_limiter(config)
     else:
         _global_rate_limiter.base_config = config
         _global_rate_limiter.current_config = config
         _global_rate_limiter.rate_limiter = TokenBucketRateLimiter(config)
+        _global_rate_limiter.token_budget = TokenBudgetLimiter(config)
+        if isinstance(_global_rate_limiter, DistributedRateLimiter):
+            try:
+                task = asyncio.get_running_loop().create_task(_global_rate_limiter.reset_shared_state())
+                _global_rate_limiter._pending_tasks.add(task)
+                task.add_done_callback(_global_rate_limiter._pending_tasks.discard)
+            except RuntimeError:
+                pass
     
     logger.info(f"Global rate limiter configuration updated: {config}")
 
@@ -283,6 +740,33 @@ async def wait_for_claude_token():
     await rate_limiter.acquire_token(wait=True)
 
 
+def claude_tokens_available(min_tokens: int = 1) -> bool:
+    """Check whether at least ``min_tokens`` Claude tokens are available without waiting"""
+    rate_limiter = get_global_rate_limiter()
+    return rate_limiter.available_tokens() >= min_tokens
+
+
+async def reserve_claude_tokens(input_tokens: int, output_tokens: int) -> TokenReservation:
+    """Wait until the estimated input tokens and max output tokens fit the token quotas"""
+    rate_limiter = get_global_rate_limiter()
+    return await rate_limiter.reserve_tokens(input_tokens, output_tokens, wait=True)
+
+
+def reconcile_claude_tokens(reservation: Optional[TokenReservation], usage: Dict[str, int]):
+    """
+    Settle a reservation with the usage reported by the API.
+    
+    Uncached input and cache writes count towards ITPM; cache reads do not.
+    An empty usage dict refunds the whole reservation (request not processed).
+    """
+    if reservation is None:
+        return
+    rate_limiter = get_global_rate_limiter()
+    actual_input = int(usage.get("input_tokens") or 0) + int(usage.get("cache_creation_input_tokens") or 0)
+    actual_output = int(usage.get("output_tokens") or 0)
+    rate_limiter.reconcile_tokens(reservation, actual_input, actual_output)
+
+
 def record_claude_rate_limit():
     """Record when a Claude API rate limit was hit"""
     rate_limiter = get_global_rate_limiter()
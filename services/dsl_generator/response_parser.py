@@ -9,6 +9,8 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, List
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import ACTION, TRIGGER
 from .models import GenerationResponse, MissingField, GenerationContext
 
 logger = logging.getLogger(__name__)
@@ -371,6 +373,7 @@ class ResponseParser:
         if not catalog_data:
             return {"valid": False, "error": "No catalog data available"}
         
+        lookup = ToolLookupIndex.for_catalog(catalog_data)
         validation_results = {
             "valid": True,
             "errors": [],
@@ -384,12 +387,11 @@ class ResponseParser:
                 provider = trigger.get('provider')
                 trigger_name = trigger.get('name')
                 if provider and trigger_name:
-                    if provider not in catalog_data:
+                    if not lookup.has_toolkit(provider):
                         validation_results["errors"].append(f"Unknown provider: {provider}")
                         validation_results["valid"] = False
                     else:
-                        available_triggers = self._get_provider_triggers(catalog_data, provider)
-                        if trigger_name not in available_triggers:
+                        if not lookup.contains(provider, trigger_name, TRIGGER):
                             validation_results["errors"].append(f"Unknown trigger '{trigger_name}' for provider '{provider}'")
                             validation_results["valid"] = False
                         else:
@@ -401,12 +403,11 @@ class ResponseParser:
                 provider = action.get('provider')
                 action_name = action.get('name')
                 if provider and action_name:
-                    if provider not in catalog_data:
+                    if not lookup.has_toolkit(provider):
                         validation_results["errors"].append(f"Unknown provider: {provider}")
                         validation_results["valid"] = False
                     else:
-                        available_actions = self._get_provider_actions(catalog_data, provider)
-                        if action_name not in available_actions:
+                        if not lookup.contains(provider, action_name, ACTION):
                             validation_results["errors"].append(f"Unknown action '{action_name}' for provider '{provider}'")
                             validation_results["valid"] = False
                         else:
@@ -414,22 +415,6 @@ class ResponseParser:
         
         return validation_results
     
-    def _get_provider_actions(self, catalog_data: Dict[str, Any], provider_slug: str) -> List[str]:
-        """Get list of available actions for a specific provider"""
-        if provider_slug not in catalog_data:
-            return []
-        
-        provider = catalog_data[provider_slug]
-        return [action.get('name', 'Unknown') for action in provider.get('actions', [])]
-    
-    def _get_provider_triggers(self, catalog_data: Dict[str, Any], provider_slug: str) -> List[str]:
-        """Get list of available triggers for a specific provider"""
-        if provider_slug not in catalog_data:
-            return []
-        
-        provider = catalog_data[provider_slug]
-        return [trigger.get('name', 'Unknown') for trigger in provider.get('triggers', [])]
-    
     def verify_catalog_compliance(
         self,
         dsl_template: Dict[str, Any],
@@ -448,22 +433,13 @@ class ResponseParser:
         errors = []
         
         try:
-            # Extract available toolkits, triggers, and actions
-            available_toolkits = set(catalog_data.keys())
-            available_triggers = set()
-            available_actions = set()
-            
-            # Collect all available actions and triggers from all providers
-            for provider in catalog_data.values():
-                for action in provider.get('actions', []):
-                    available_actions.add(action.get('action_name', ''))
-                for trigger in provider.get('triggers', []):
-                    available_triggers.add(trigger.get('id', ''))
+            # Toolkits and tools (by slug, name or alias) from the shared lookup index
+            lookup = ToolLookupIndex.for_catalog(catalog_data)
             
             # Check toolkit references
             if 'toolkit' in dsl_template and 'slug' in dsl_template['toolkit']:
                 toolkit_slug = dsl_template['toolkit']['slug']
-                if toolkit_slug not in available_toolkits:
+                if not lookup.has_toolkit(toolkit_slug):
                     errors.append(f"Unknown toolkit: {toolkit_slug}")
             
             # Check workflow triggers and actions
@@ -475,12 +451,12 @@ class ResponseParser:
                     for trigger in workflow['triggers']:
                         if 'toolkit_slug' in trigger:
                             toolkit_slug = trigger['toolkit_slug']
-                            if toolkit_slug not in available_toolkits:
+                            if not lookup.has_toolkit(toolkit_slug):
                                 errors.append(f"Unknown toolkit in trigger: {toolkit_slug}")
                         
                         if 'trigger_id' in trigger:
                             trigger_id = trigger['trigger_id']
-                            if trigger_id not in available_triggers:
+                            if lookup.find(trigger_id, TRIGGER) is None:
                                 errors.append(f"Unknown trigger: {trigger_id}")
                 
                 # Check actions
@@ -488,12 +464,12 @@ class ResponseParser:
                     for action in workflow['actions']:
                         if 'toolkit_slug' in action:
                             toolkit_slug = action['toolkit_slug']
-                            if toolkit_slug not in available_toolkits:
+                            if not lookup.has_toolkit(toolkit_slug):
                                 errors.append(f"Unknown toolkit in action: {toolkit_slug}")
                         
                         if 'action_name' in action:
                             action_name = action['action_name']
-                            if action_name not in available_actions:
+                            if lookup.find(action_name, ACTION) is None:
                                 errors.append(f"Unknown action: {action_name}")
             
             # Check connections (for executable workflows)
@@ -501,7 +477,7 @@ class ResponseParser:
                 for connection in dsl_template['connections']:
                     if 'toolkit_slug' in connection:
                         toolkit_slug = connection['toolkit_slug']
-                        if toolkit_slug not in available_toolkits:
+                        if not lookup.has_toolkit(toolkit_slug):
                             errors.append(f"Unknown toolkit in connection: {toolkit_slug}")
             
             # Check nodes (for DAG workflows)
@@ -509,20 +485,20 @@ class ResponseParser:
                 for node in dsl_template['nodes']:
                     if 'data' in node and 'toolkit_slug' in node['data']:
                         toolkit_slug = node['data']['toolkit_slug']
-                        if toolkit_slug not in available_toolkits:
+                        if not lookup.has_toolkit(toolkit_slug):
                             errors.append(f"Unknown toolkit in node: {toolkit_slug}")
                     
                     if 'data' in node and 'action_name' in node['data']:
                         action_name = node['data']['action_name']
-                        if action_name not in available_actions:
+                        if lookup.find(action_name, ACTION) is None:
                             errors.append(f"Unknown action in node: {action_name}")
             
             return {
                 'is_compliant': len(errors) == 0,
                 'errors': errors,
-                'available_toolkits_count': len(available_toolkits),
-                'available_triggers_count': len(available_triggers),
-                'available_actions_count': len(available_actions)
+                'available_toolkits_count': lookup.toolkit_count,
+                'available_triggers_count': lookup.count(TRIGGER),
+                'available_actions_count': lookup.count(ACTION)
             }
             
         except Exception as e:
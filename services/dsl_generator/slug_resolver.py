@@ -0,0 +1,230 @@
+"""
+Slug Resolver for DSL Generator
+
+Repairs near-miss trigger/action slugs in a parsed DSL locally, so a typo such
+as ``SLACK_SEND_MESAGE`` or a wrong ``toolkit_slug`` does not cost a whole new
+Claude call. Matching is lexical (character trigrams + edit distance) with an
+optional embedding similarity, restricted to the tools that were actually in
+the generation context.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlugRepair:
+    """A single rewrite applied to the DSL"""
+    kind: str  # "trigger" or "action"
+    step_id: str
+    original_toolkit: str
+    original_slug: str
+    toolkit_slug: str
+    slug: str
+    confidence: float
+
+
+def _normalize(slug: str) -> str:
+    return (slug or "").strip().upper().replace("-", "_").replace(" ", "_")
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of character trigrams (0.0 - 1.0)"""
+    ta, tb = _trigrams(a), _trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """1 - normalized Levenshtein distance (0.0 - 1.0)"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        previous = current
+    return 1.0 - previous[-1] / max(len(a), len(b))
+
+
+class SlugResolver:
+    """
+    Fuzzy resolver for trigger and action slugs against a catalog context.
+
+    A candidate is only accepted when its score clears ``min_confidence`` and
+    beats the runner-up by ``min_margin``; anything ambiguous is left for the
+    re-prompt path.
+    """
+
+    def __init__(
+        self,
+        catalog_context: Dict[str, Any],
+        embed_texts: Optional[Callable[[List[str]], np.ndarray]] = None,
+        min_confidence: float = 0.82,
+        min_margin: float = 0.05
+    ):
+        """
+        Args:
+            catalog_context: Pruned context with flat ``triggers``/``actions`` lists
+            embed_texts: Optional batch embedding function (e.g. EmbeddingService.embed_texts)
+            min_confidence: Minimum combined score for a rewrite
+            min_margin: Minimum lead over the second-best candidate
+        """
+        self.embed_texts = embed_texts
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+        self._tools: Dict[str, List[Tuple[str, str]]] = {
+            "trigger": self._collect(catalog_context.get("triggers", []), ("trigger_slug", "slug")),
+            "action": self._collect(catalog_context.get("actions", []), ("action_slug", "slug", "action_name")),
+        }
+        # Pairs the hallucination check already accepts (slugs and display names)
+        self._known = {
+            kind: set(pairs) | {
+                (tool.get("toolkit_slug", ""), tool.get("name", ""))
+                for tool in catalog_context.get(f"{kind}s", [])
+                if tool.get("name")
+            }
+            for kind, pairs in self._tools.items()
+        }
+        self._embedding_cache: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _collect(tools: Sequence[Dict[str, Any]], slug_keys: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        collected = []
+        for tool in tools:
+            toolkit_slug = tool.get("toolkit_slug", "")
+            slug = next((tool.get(key) for key in slug_keys if tool.get(key)), "")
+            if toolkit_slug and slug:
+                collected.append((toolkit_slug, slug))
+        return collected
+
+    def resolve(self, kind: str, toolkit_slug: str, slug: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Resolve a (toolkit_slug, slug) pair that is not in the catalog context.
+
+        Returns:
+            (toolkit_slug, slug, confidence) for a confident match, otherwise None
+        """
+        candidates = self._tools.get(kind, [])
+        if not candidates or not slug:
+            return None
+
+        wanted = _normalize(slug)
+
+        # Exact slug under a different toolkit: the toolkit_slug is what is wrong
+        exact = [c for c in candidates if _normalize(c[1]) == wanted]
+        if len(exact) == 1:
+            return exact[0][0], exact[0][1], 1.0
+
+        # Prefer the toolkit the model asked for; fall back to every tool of this kind
+        pool = [c for c in candidates if c[0] == toolkit_slug] or candidates
+        scored = sorted(
+            ((self._score(wanted, c[1]), c) for c in pool),
+            key=lambda item: item[0],
+            reverse=True
+        )
+        if not scored:
+            return None
+
+        if self.embed_texts is not None:
+            scored = self._blend_embeddings(wanted, scored[:5]) + scored[5:]
+
+        best_score, best = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+        if best_score >= self.min_confidence and best_score - runner_up >= self.min_margin:
+            return best[0], best[1], round(best_score, 3)
+
+        logger.debug(f"No confident match for {kind} '{toolkit_slug}.{slug}' (best={best_score:.2f}, runner_up={runner_up:.2f})")
+        return None
+
+    def _score(self, wanted: str, candidate: str) -> float:
+        normalized = _normalize(candidate)
+        return 0.5 * trigram_similarity(wanted, normalized) + 0.5 * edit_similarity(wanted, normalized)
+
+    def _blend_embeddings(
+        self, wanted: str, scored: List[Tuple[float, Tuple[str, str]]]
+    ) -> List[Tuple[float, Tuple[str, str]]]:
+        """Re-rank the top lexical candidates with embedding similarity"""
+        try:
+            texts = [wanted] + [c[1] for _, c in scored]
+            missing = [t for t in texts if t not in self._embedding_cache]
+            if missing:
+                vectors = self.embed_texts([t.replace("_", " ").lower() for t in missing])
+                for text, vector in zip(missing, vectors):
+                    norm = np.linalg.norm(vector)
+                    self._embedding_cache[text] = vector / norm if norm else vector
+            query = self._embedding_cache[wanted]
+            blended = [
+                (0.6 * lexical + 0.4 * float(np.dot(query, self._embedding_cache[c[1]])), c)
+                for lexical, c in scored
+            ]
+            return sorted(blended, key=lambda item: item[0], reverse=True)
+        except Exception as e:
+            logger.warning(f"Embedding similarity unavailable, using lexical scores only: {e}")
+            return scored
+
+    def repair_workflow(self, dsl: Dict[str, Any]) -> List[SlugRepair]:
+        """
+        Rewrite near-miss trigger/action slugs in ``dsl`` in place.
+
+        Only steps whose (toolkit_slug, slug) pair is not in the catalog
+        context are touched.
+
+        Returns:
+            List of repairs that were applied
+        """
+        repairs: List[SlugRepair] = []
+        workflow = dsl.get("workflow", {}) if isinstance(dsl, dict) else {}
+
+        for kind, steps, slug_field in (
+            ("trigger", workflow.get("triggers", []), "composio_trigger_slug"),
+            ("action", workflow.get("actions", []), "action_name"),
+        ):
+            known = self._known.get(kind, set())
+            for step in steps:
+                if not isinstance(step, dict):
+                    continue
+                toolkit_slug = step.get("toolkit_slug", "")
+                slug = step.get(slug_field, "")
+                if not toolkit_slug or not slug or (toolkit_slug, slug) in known:
+                    continue
+                # System schedule trigger is injected separately and is always valid
+                if kind == "trigger" and slug == "SCHEDULE_BASED":
+                    continue
+
+                match = self.resolve(kind, toolkit_slug, slug)
+                if match is None:
+                    continue
+
+                new_toolkit, new_slug, confidence = match
+                step["toolkit_slug"] = new_toolkit
+                step[slug_field] = new_slug
+                repairs.append(SlugRepair(
+                    kind=kind,
+                    step_id=str(step.get("id", "")),
+                    original_toolkit=toolkit_slug,
+                    original_slug=slug,
+                    toolkit_slug=new_toolkit,
+                    slug=new_slug,
+                    confidence=confidence
+                ))
+
+        return repairs
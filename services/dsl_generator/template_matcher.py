@@ -0,0 +1,696 @@
+"""
+Template Fast Path for Canonical Workflow Prompts
+
+A large share of generation traffic is the same handful of patterns
+("new Gmail email -> Slack message", "every morning -> send a report").
+This module keeps a small library of parameterized, hand-written DSL
+templates and serves confident matches without any LLM call.
+
+Templates are indexed by the set of apps they need and by the embeddings
+of a few example phrasings. A prompt is matched by:
+
+1. Looking up templates whose app set equals the requested apps (the
+   ``selected_apps`` or, without them, the apps named in the prompt)
+2. Scoring them by cosine similarity against the example phrasings
+3. Accepting the best one only when it clears the score threshold and
+   beats the runner-up by a margin
+
+Slots (Slack channel, schedule, email recipient) are
+extracted from the prompt with regexes. Slots that cannot be filled become
+``{{inputs.<slot>}}`` references plus a ``missing_information`` entry, the
+same contract the LLM path uses.
+"""
+
+import copy
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .models import GenerationRequest, GenerationResponse, MissingField
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_TOOLKIT = "system"
+
+# Keywords that identify an app in a prompt, by toolkit slug
+APP_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "gmail": ("gmail", "email", "e-mail", "inbox", "mail"),
+    "slack": ("slack",),
+    "github": ("github", "pull request", "repo", "repository"),
+    "notion": ("notion",),
+    "googlesheets": ("google sheets", "spreadsheet", "sheet"),
+    "googlecalendar": ("google calendar", "calendar"),
+    "googledrive": ("google drive", "drive"),
+    "trello": ("trello",),
+    "asana": ("asana",),
+    "jira": ("jira",),
+    "discord": ("discord",),
+    "airtable": ("airtable",),
+    "hubspot": ("hubspot",),
+    "outlook": ("outlook",),
+    "microsoft_teams": ("microsoft teams", "teams"),
+    "telegram": ("telegram",),
+    "todoist": ("todoist",),
+}
+
+_SLOT_PATTERN = re.compile(r"\{slot:([a-z_]+)\}")
+_WEEKDAYS = {
+    "sunday": 0, "monday": 1, "tuesday": 2, "wednesday": 3,
+    "thursday": 4, "friday": 5, "saturday": 6
+}
+
+
+@dataclass
+class SlotSpec:
+    """A parameter of a template that is filled from the prompt"""
+    name: str
+    kind: str  # channel, schedule or email
+    prompt: str  # Question to ask when the slot cannot be extracted
+    type: str = "string"
+
+
+@dataclass
+class WorkflowTemplate:
+    """A parameterized DSL template for a canonical workflow pattern"""
+    template_id: str
+    name: str
+    description: str
+    examples: List[str]
+    apps: FrozenSet[str]
+    tools: List[Tuple[str, str, str]]  # (kind, toolkit_slug, slug)
+    workflow: Dict[str, Any]  # DSL "workflow" with {slot:<name>} placeholders
+    slots: List[SlotSpec] = field(default_factory=list)
+    missing_information: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class TemplateMatch:
+    """A confident template match with its extracted slot values"""
+    template: WorkflowTemplate
+    score: float
+    runner_up_score: float
+    slots: Dict[str, str]
+
+
+# (request, rendered DSL, template) -> validation errors; empty when the DSL can be served
+WorkflowCheck = Callable[[GenerationRequest, Dict[str, Any], WorkflowTemplate], Awaitable[List[str]]]
+
+
+def _schedule_trigger(trigger_id: str) -> Dict[str, Any]:
+    return {
+        "id": trigger_id,
+        "type": "schedule_based",
+        "toolkit_slug": SYSTEM_TOOLKIT,
+        "composio_trigger_slug": "SCHEDULE_BASED",
+        "requires_auth": False,
+        "schedule": {"cron_expr": "{slot:schedule}", "timezone": "UTC"}
+    }
+
+
+def _event_trigger(trigger_id: str, toolkit_slug: str, slug: str, **configuration: Any) -> Dict[str, Any]:
+    trigger = {
+        "id": trigger_id,
+        "type": "event_based",
+        "toolkit_slug": toolkit_slug,
+        "composio_trigger_slug": slug
+    }
+    if configuration:
+        trigger["configuration"] = configuration
+    return trigger
+
+
+def _action(action_id: str, toolkit_slug: str, action_name: str, inputs: List[Tuple[str, str, str]],
+            depends_on: List[str]) -> Dict[str, Any]:
+    return {
+        "id": action_id,
+        "toolkit_slug": toolkit_slug,
+        "action_name": action_name,
+        "required_inputs": [
+            {"name": name, "source": source, "type": input_type}
+            for name, source, input_type in inputs
+        ],
+        "depends_on": depends_on
+    }
+
+
+_CHANNEL_SLOT = SlotSpec("channel", "channel", "Which Slack channel should receive the message?")
+_SCHEDULE_SLOT = SlotSpec("schedule", "schedule", "How often should this workflow run?", type="cron")
+_RECIPIENT_SLOT = SlotSpec("recipient", "email", "Who should receive the email?", type="email")
+
+
+DEFAULT_TEMPLATES: List[WorkflowTemplate] = [
+    WorkflowTemplate(
+        template_id="gmail_new_email_to_slack",
+        name="Gmail to Slack Notifications",
+        description="Post a Slack message whenever a new email arrives in Gmail",
+        examples=[
+            "When I get a new email in Gmail, send a message to Slack",
+            "Post new Gmail emails to a Slack channel",
+            "Notify me on Slack when a new email arrives in my inbox",
+            "When a new email arrives in my Gmail inbox, post the subject to the #general channel in Slack",
+        ],
+        apps=frozenset({"gmail", "slack"}),
+        tools=[("trigger", "gmail", "GMAIL_NEW_GMAIL_MESSAGE"), ("action", "slack", "SLACK_SEND_MESSAGE")],
+        workflow={
+            "name": "Gmail to Slack Notifications",
+            "description": "Post a Slack message whenever a new email arrives in Gmail",
+            "triggers": [_event_trigger("new_email", "gmail", "GMAIL_NEW_GMAIL_MESSAGE")],
+            "actions": [_action("notify_slack", "slack", "SLACK_SEND_MESSAGE", [
+                ("channel", "{slot:channel}", "string"),
+                ("text", "New email from {{trigger.sender}}: {{trigger.subject}}", "string"),
+            ], ["new_email"])]
+        },
+        slots=[_CHANNEL_SLOT]
+    ),
+    WorkflowTemplate(
+        template_id="gmail_new_email_add_label",
+        name="Auto-label Incoming Gmail",
+        description="Apply a Gmail label to every new incoming email",
+        examples=[
+            "Add a label to new emails in Gmail",
+            "Automatically label incoming Gmail messages",
+            "When a new email arrives, tag it with the 'Inbox Review' label",
+        ],
+        apps=frozenset({"gmail"}),
+        tools=[("trigger", "gmail", "GMAIL_NEW_GMAIL_MESSAGE"), ("action", "gmail", "GMAIL_ADD_LABEL_TO_EMAIL")],
+        workflow={
+            "name": "Auto-label Incoming Gmail",
+            "description": "Apply a Gmail label to every new incoming email",
+            "triggers": [_event_trigger("new_email", "gmail", "GMAIL_NEW_GMAIL_MESSAGE")],
+            "actions": [_action("add_label", "gmail", "GMAIL_ADD_LABEL_TO_EMAIL", [
+                ("message_id", "{{trigger.message_id}}", "string"),
+                ("add_label_ids", "{{inputs.label_ids}}", "array"),
+            ], ["new_email"])]
+        },
+        # add_label_ids takes label IDs, not the label names a prompt mentions
+        missing_information=[
+            {"field": "inputs.label_ids", "prompt": "Which Gmail labels should be applied?", "type": "array", "required": True}
+        ]
+    ),
+    WorkflowTemplate(
+        template_id="schedule_slack_message",
+        name="Scheduled Slack Message",
+        description="Post a message to a Slack channel on a schedule",
+        examples=[
+            "Every morning at 9am post a message to Slack",
+            "Send a daily reminder to the #team channel on Slack",
+            "Post a weekly update to a Slack channel every Monday",
+        ],
+        apps=frozenset({"slack"}),
+        tools=[("action", "slack", "SLACK_SEND_MESSAGE")],
+        workflow={
+            "name": "Scheduled Slack Message",
+            "description": "Post a message to a Slack channel on a schedule",
+            "triggers": [_schedule_trigger("schedule")],
+            "actions": [_action("post_message", "slack", "SLACK_SEND_MESSAGE", [
+                ("channel", "{slot:channel}", "string"),
+                ("text", "{{inputs.message}}", "string"),
+            ], ["schedule"])]
+        },
+        slots=[_SCHEDULE_SLOT, _CHANNEL_SLOT],
+        missing_information=[
+            {"field": "inputs.message", "prompt": "What message should be posted?", "type": "string", "required": True}
+        ]
+    ),
+    WorkflowTemplate(
+        template_id="schedule_email_report",
+        name="Scheduled Email Report",
+        description="Send a report by email on a schedule",
+        examples=[
+            "Send me a weekly report by email every Monday",
+            "Email a daily summary report to my manager",
+            "Every Friday at 5pm send a status report email",
+        ],
+        apps=frozenset({"gmail"}),
+        tools=[("action", "gmail", "GMAIL_SEND_EMAIL")],
+        workflow={
+            "name": "Scheduled Email Report",
+            "description": "Send a report by email on a schedule",
+            "triggers": [_schedule_trigger("schedule")],
+            "actions": [_action("send_report", "gmail", "GMAIL_SEND_EMAIL", [
+                ("to", "{slot:recipient}", "string"),
+                ("subject", "{{inputs.subject}}", "string"),
+                ("body", "{{inputs.body}}", "string"),
+            ], ["schedule"])]
+        },
+        slots=[_SCHEDULE_SLOT, _RECIPIENT_SLOT],
+        missing_information=[
+            {"field": "inputs.subject", "prompt": "What should the report subject be?", "type": "string", "required": True},
+            {"field": "inputs.body", "prompt": "What should the report contain?", "type": "string", "required": True}
+        ]
+    ),
+    WorkflowTemplate(
+        template_id="github_issue_to_slack",
+        name="GitHub Issues to Slack",
+        description="Post a Slack message when a new GitHub issue is opened",
+        examples=[
+            "When a new issue is created on GitHub, post it to Slack",
+            "Notify the #dev channel on Slack about new GitHub issues",
+            "Send a Slack message whenever someone opens an issue in my GitHub repo",
+        ],
+        apps=frozenset({"github", "slack"}),
+        tools=[("trigger", "github", "GITHUB_ISSUE_ADDED_EVENT"), ("action", "slack", "SLACK_SEND_MESSAGE")],
+        workflow={
+            "name": "GitHub Issues to Slack",
+            "description": "Post a Slack message when a new GitHub issue is opened",
+            "triggers": [_event_trigger(
+                "new_issue", "github", "GITHUB_ISSUE_ADDED_EVENT",
+                owner="{{inputs.github_owner}}", repo="{{inputs.github_repo}}"
+            )],
+            "actions": [_action("notify_slack", "slack", "SLACK_SEND_MESSAGE", [
+                ("channel", "{slot:channel}", "string"),
+                ("text", "New GitHub issue: {{trigger.title}} {{trigger.url}}", "string"),
+            ], ["new_issue"])]
+        },
+        slots=[_CHANNEL_SLOT],
+        missing_information=[
+            {"field": "inputs.github_owner", "prompt": "Which GitHub account or organization owns the repository?", "type": "string", "required": True},
+            {"field": "inputs.github_repo", "prompt": "Which GitHub repository should be watched?", "type": "string", "required": True}
+        ]
+    ),
+    WorkflowTemplate(
+        template_id="github_issue_to_notion",
+        name="GitHub Issues to Notion",
+        description="Create a Notion page for every new GitHub issue",
+        examples=[
+            "When a new GitHub issue is opened, create a page in Notion",
+            "Track new GitHub issues in Notion",
+            "Add every new issue from my GitHub repo to my Notion workspace",
+        ],
+        apps=frozenset({"github", "notion"}),
+        tools=[("trigger", "github", "GITHUB_ISSUE_ADDED_EVENT"), ("action", "notion", "NOTION_CREATE_NOTION_PAGE")],
+        workflow={
+            "name": "GitHub Issues to Notion",
+            "description": "Create a Notion page for every new GitHub issue",
+            "triggers": [_event_trigger(
+                "new_issue", "github", "GITHUB_ISSUE_ADDED_EVENT",
+                owner="{{inputs.github_owner}}", repo="{{inputs.github_repo}}"
+            )],
+            "actions": [_action("create_page", "notion", "NOTION_CREATE_NOTION_PAGE", [
+                ("parent_id", "{{inputs.notion_parent_id}}", "string"),
+                ("title", "{{trigger.title}}", "string"),
+            ], ["new_issue"])]
+        },
+        missing_information=[
+            {"field": "inputs.github_owner", "prompt": "Which GitHub account or organization owns the repository?", "type": "string", "required": True},
+            {"field": "inputs.github_repo", "prompt": "Which GitHub repository should be watched?", "type": "string", "required": True},
+            {"field": "inputs.notion_parent_id", "prompt": "Which Notion page or database should the issues go into?", "type": "string", "required": True}
+        ]
+    ),
+]
+
+
+class SlotExtractor:
+    """Regex-based extraction of template slot values from a prompt"""
+
+    _CHANNEL_RE = re.compile(r"(?<![\w&])#([a-z0-9][a-z0-9_\-]{0,79})", re.IGNORECASE)
+    _NAMED_CHANNEL_RE = re.compile(r"\b([a-z0-9][a-z0-9_\-]{1,79})\s+channel\b", re.IGNORECASE)
+    _EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b")
+    _TIME_RE = re.compile(r"\bat\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\b", re.IGNORECASE)
+    _EVERY_N_RE = re.compile(r"\bevery\s+(\d{1,2})\s+(minute|hour)s?\b", re.IGNORECASE)
+
+    # Words before "channel" that are not channel names
+    _STOPWORDS = {
+        "a", "an", "the", "to", "it", "them", "as", "with", "on", "in", "for", "and", "my", "our",
+        "this", "that", "slack", "each", "every", "new", "any", "some"
+    }
+
+    def extract(self, kind: str, prompt: str) -> Optional[str]:
+        """Extract a slot value of the given kind, or None if not found"""
+        extractor = getattr(self, f"_extract_{kind}", None)
+        if extractor is None:
+            return None
+        try:
+            return extractor(prompt)
+        except Exception as e:
+            logger.warning(f"⚠️ Slot extraction failed for {kind}: {e}")
+            return None
+
+    def _extract_channel(self, prompt: str) -> Optional[str]:
+        match = self._CHANNEL_RE.search(prompt)
+        if match:
+            return f"#{match.group(1).lower()}"
+        for match in self._NAMED_CHANNEL_RE.finditer(prompt):
+            name = match.group(1).lower()
+            if name not in self._STOPWORDS:
+                return f"#{name}"
+        return None
+
+    def _extract_email(self, prompt: str) -> Optional[str]:
+        match = self._EMAIL_RE.search(prompt)
+        return match.group(0) if match else None
+
+    def _extract_schedule(self, prompt: str) -> Optional[str]:
+        """Map a natural-language schedule to a 5-field cron expression"""
+        text = prompt.lower()
+
+        every_n = self._EVERY_N_RE.search(text)
+        if every_n:
+            n, unit = int(every_n.group(1)), every_n.group(2)
+            if unit == "minute" and 1 <= n <= 59:
+                return f"*/{n} * * * *"
+            if unit == "hour" and 1 <= n <= 23:
+                return f"0 */{n} * * *"
+
+        if re.search(r"\b(hourly|every hour)\b", text):
+            return "0 * * * *"
+
+        hour, minute = 9, 0
+        time_match = self._TIME_RE.search(text)
+        if time_match:
+            hour = int(time_match.group(1))
+            minute = int(time_match.group(2) or 0)
+            meridiem = time_match.group(3)
+            if meridiem == "pm" and hour < 12:
+                hour += 12
+            elif meridiem == "am" and hour == 12:
+                hour = 0
+            if hour > 23 or minute > 59:
+                hour, minute = 9, 0
+        elif "evening" in text:
+            hour = 18
+
+        if re.search(r"\b(weekday|weekdays|every business day)\b", text):
+            return f"{minute} {hour} * * 1-5"
+        for day, number in _WEEKDAYS.items():
+            if re.search(rf"\b(every|on)\s+{day}s?\b|\b{day}s\b", text):
+                return f"{minute} {hour} * * {number}"
+        if re.search(r"\b(weekly|every week)\b", text):
+            return f"{minute} {hour} * * 1"
+        if re.search(r"\b(monthly|every month)\b", text):
+            return f"{minute} {hour} 1 * *"
+        if re.search(r"\b(daily|every day|each day|every morning|every evening|every night|nightly)\b", text) or time_match:
+            return f"{minute} {hour} * * *"
+        return None
+
+
+class TemplateMatcher:
+    """
+    Matches prompts against the template library and renders validated DSL.
+
+    Example embeddings are computed lazily with the same embedding model the
+    semantic search uses, so a caller that already embedded the prompt can
+    pass the vector in and the fast path costs a few dot products.
+    """
+
+    def __init__(self, templates: Optional[List[WorkflowTemplate]] = None,
+                 threshold: float = 0.78, margin: float = 0.04):
+        self.templates = list(templates if templates is not None else DEFAULT_TEMPLATES)
+        self.threshold = threshold
+        self.margin = margin
+        self.slot_extractor = SlotExtractor()
+
+        # App set -> templates needing exactly those apps
+        self._by_apps: Dict[FrozenSet[str], List[WorkflowTemplate]] = {}
+        for template in self.templates:
+            self._by_apps.setdefault(template.apps, []).append(template)
+
+        # (kind, toolkit_slug, slug) of every tool in the loaded catalog snapshot
+        self._catalog_tools: Optional[Set[Tuple[str, str, str]]] = None
+        self._available: Set[str] = set()
+        self._load_lock = threading.Lock()
+        self.version: Optional[str] = None
+
+        self._example_matrix: Optional[np.ndarray] = None
+        self._example_owner: List[str] = []
+
+        self.stats = {"lookups": 0, "hits": 0, "no_candidates": 0, "low_score": 0, "ambiguous": 0, "invalid": 0}
+
+    def load_catalog_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """
+        Record which templates can be served from a list of catalog tools.
+
+        Args:
+            items: Semantic index metadata items with ``type``, ``provider_id`` and ``slug``
+        """
+        tools = {
+            (item.get('type', ''), item.get('provider_id', ''), item.get('slug', ''))
+            for item in items
+            if item.get('type') in ('trigger', 'action')
+        }
+        with self._load_lock:
+            self._install(tools, None)
+
+    def load_snapshot(self, snapshot: Any) -> bool:
+        """
+        Record which templates can be served from a ``CatalogSnapshot``.
+
+        Loading the version already recorded is a no-op. Safe to call from a
+        worker thread.
+
+        Returns:
+            Whether the available templates were recomputed
+        """
+        with self._load_lock:
+            if snapshot.version == self.version:
+                return False
+            tools = {
+                (tool.tool_type, toolkit.slug, tool.slug)
+                for toolkit in snapshot.toolkits.values()
+                for tool in toolkit.tools
+            }
+            self._install(tools, snapshot.version)
+            return True
+
+    def _install(self, tools: Set[Tuple[str, str, str]], version: Optional[str]) -> None:
+        self._catalog_tools = tools
+        self._available = {t.template_id for t in self.templates if self._tools_available(t)}
+        self.version = version
+        skipped = len(self.templates) - len(self._available)
+        logger.info(f"⚡ Template fast path: {len(self._available)} templates available"
+                    + (f", {skipped} skipped (tools missing from catalog)" if skipped else "")
+                    + (f" (catalog version {version})" if version else ""))
+
+    def _tools_available(self, template: WorkflowTemplate) -> bool:
+        if self._catalog_tools is None:
+            return False
+        return all(
+            toolkit == SYSTEM_TOOLKIT or (kind, toolkit, slug) in self._catalog_tools
+            for kind, toolkit, slug in template.tools
+        )
+
+    @staticmethod
+    def _normalize_app(app: str) -> str:
+        return app.strip().lower().replace(" ", "").replace("-", "").replace("_", "") if app else ""
+
+    def requested_apps(self, prompt: str, selected_apps: Optional[List[str]] = None) -> FrozenSet[str]:
+        """The apps a request asks for: the selected apps, or the apps named in the prompt"""
+        if selected_apps:
+            known = {self._normalize_app(slug): slug for slug in APP_ALIASES}
+            return frozenset(
+                known.get(self._normalize_app(app), app.strip().lower())
+                for app in selected_apps
+                if app and self._normalize_app(app) != SYSTEM_TOOLKIT
+            )
+
+        text = prompt.lower()
+        apps = set()
+        for slug, aliases in APP_ALIASES.items():
+            if any(re.search(rf"\b{re.escape(alias)}\b", text) for alias in aliases):
+                apps.add(slug)
+        return frozenset(apps)
+
+    def _ensure_example_embeddings(self, embed_texts: Callable[[List[str]], np.ndarray]) -> bool:
+        if self._example_matrix is not None:
+            return True
+        texts, owners = [], []
+        for template in self.templates:
+            for example in template.examples:
+                texts.append(example)
+                owners.append(template.template_id)
+        try:
+            matrix = np.asarray(embed_texts(texts), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to embed template examples: {e}")
+            return False
+        if matrix.ndim != 2 or matrix.shape[0] != len(texts):
+            logger.warning("⚠️ Unexpected template example embedding shape, fast path disabled")
+            return False
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._example_matrix = matrix / np.where(norms == 0, 1.0, norms)
+        self._example_owner = owners
+        logger.info(f"⚡ Embedded {len(texts)} template example phrasings")
+        return True
+
+    def match(
+        self,
+        prompt: str,
+        selected_apps: Optional[List[str]] = None,
+        query_embedding: Optional[np.ndarray] = None,
+        embed_texts: Optional[Callable[[List[str]], np.ndarray]] = None
+    ) -> Optional[TemplateMatch]:
+        """
+        Find a confident template match for a prompt.
+
+        Args:
+            prompt: User prompt
+            selected_apps: Apps the user selected, if any
+            query_embedding: Precomputed prompt embedding (same model as the examples)
+            embed_texts: Batch embedding function, used for the examples and,
+                without ``query_embedding``, for the prompt
+
+        Returns:
+            TemplateMatch, or None if no template matches confidently
+        """
+        self.stats["lookups"] += 1
+        if not prompt or not prompt.strip() or embed_texts is None:
+            return None
+
+        apps = self.requested_apps(prompt, selected_apps)
+        candidates = [t for t in self._by_apps.get(apps, []) if t.template_id in self._available]
+        if not candidates:
+            self.stats["no_candidates"] += 1
+            return None
+
+        if not self._ensure_example_embeddings(embed_texts):
+            return None
+
+        if query_embedding is None:
+            query_embedding = np.asarray(embed_texts([prompt]))[0]
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != self._example_matrix.shape[1]:
+            return None
+        similarities = self._example_matrix @ (query / norm)
+
+        # Best example per template; runner-up over every template, so a prompt
+        # that is equally close to a template for other apps is not served
+        best: Dict[str, float] = {}
+        for owner, score in zip(self._example_owner, similarities):
+            best[owner] = max(best.get(owner, -1.0), float(score))
+        candidate_ids = {t.template_id for t in candidates}
+        ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+        top_id, top_score = next(((tid, s) for tid, s in ranked if tid in candidate_ids))
+        runner_up = max((s for tid, s in ranked if tid != top_id), default=0.0)
+
+        if top_score < self.threshold:
+            self.stats["low_score"] += 1
+            logger.info(f"⚡ Template fast path miss: best '{top_id}' scored {top_score:.3f}")
+            return None
+        if top_score - runner_up < self.margin:
+            self.stats["ambiguous"] += 1
+            logger.info(f"⚡ Template fast path ambiguous: '{top_id}' {top_score:.3f} vs runner-up {runner_up:.3f}")
+            return None
+
+        template = next(t for t in candidates if t.template_id == top_id)
+        slots = {}
+        for slot in template.slots:
+            value = self.slot_extractor.extract(slot.kind, prompt)
+            if value:
+                slots[slot.name] = value
+
+        self.stats["hits"] += 1
+        return TemplateMatch(template=template, score=top_score, runner_up_score=runner_up, slots=slots)
+
+    def render(self, match: TemplateMatch) -> Dict[str, Any]:
+        """Render the template DSL, filling slots or turning them into user inputs"""
+        template = match.template
+        missing_information = [dict(info) for info in template.missing_information]
+        for slot in template.slots:
+            if slot.name not in match.slots:
+                missing_information.append({
+                    "field": f"inputs.{slot.name}",
+                    "prompt": slot.prompt,
+                    "type": slot.type,
+                    "required": True
+                })
+
+        def fill(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {k: fill(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [fill(v) for v in value]
+            if isinstance(value, str):
+                return _SLOT_PATTERN.sub(
+                    lambda m: match.slots.get(m.group(1), "{{inputs.%s}}" % m.group(1)), value
+                )
+            return value
+
+        return {
+            "schema_type": "template",
+            "workflow": fill(copy.deepcopy(template.workflow)),
+            "missing_information": missing_information,
+            "confidence": max(1, min(100, int(round(match.score * 100))))
+        }
+
+    async def try_generate(
+        self,
+        request: GenerationRequest,
+        query_embedding: Optional[np.ndarray] = None,
+        embed_texts: Optional[Callable[[List[str]], np.ndarray]] = None,
+        validate_structure: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        validate_workflow: Optional[WorkflowCheck] = None
+    ) -> Optional[GenerationResponse]:
+        """
+        Serve a request from a template if one matches confidently.
+
+        Args:
+            request: Generation request
+            query_embedding: Precomputed prompt embedding
+            embed_texts: Batch embedding function
+            validate_structure: DSL structure check (e.g. ResponseParser._validate_dsl_structure)
+            validate_workflow: Full catalog/schema validation returning error messages
+                (the LLM path's validation, e.g. DSLGeneratorService._validate_template_dsl)
+
+        Returns:
+            GenerationResponse, or None to fall through to the LLM path
+        """
+        if request.workflow_type not in (None, "template"):
+            return None
+
+        try:
+            match = self.match(request.user_prompt, request.selected_apps, query_embedding, embed_texts)
+            if match is None:
+                return None
+
+            dsl = self.render(match)
+            if validate_structure is not None and not validate_structure(dsl):
+                logger.warning(f"⚠️ Template '{match.template.template_id}' rendered invalid DSL, falling back")
+                return None
+            if validate_workflow is not None:
+                errors = await validate_workflow(request, dsl, match.template)
+                if errors:
+                    self.stats["invalid"] += 1
+                    logger.warning(f"⚠️ Template '{match.template.template_id}' failed validation, "
+                                   f"falling back: {errors}")
+                    return None
+        except Exception as e:
+            logger.warning(f"⚠️ Template fast path failed, falling back to generation: {e}")
+            return None
+
+        logger.info(f"⚡ Serving '{match.template.template_id}' from template fast path "
+                    f"(score={match.score:.3f}, slots={match.slots})")
+        return GenerationResponse(
+            success=True,
+            dsl_template=dsl,
+            missing_fields=[MissingField(**info) for info in dsl["missing_information"]],
+            confidence=round(match.score, 3),
+            reasoning=f"Matched the '{match.template.name}' template",
+            suggested_apps=sorted(match.template.apps),
+            generation_metadata={
+                "template_fast_path": True,
+                "template_id": match.template.template_id,
+                "score": round(match.score, 4),
+                "runner_up_score": round(match.runner_up_score, 4),
+                "filled_slots": sorted(match.slots)
+            }
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fast path hit/miss counters and library state"""
+        return {
+            "templates": len(self.templates),
+            "available_templates": sorted(self._available),
+            "version": self.version,
+            "threshold": self.threshold,
+            "margin": self.margin,
+            "counters": dict(self.stats)
+        }
+
+
+# Global template matcher instance
+template_matcher = TemplateMatcher()
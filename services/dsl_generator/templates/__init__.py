@@ -8,20 +8,26 @@ from .base_templates import (
     EXECUTABLE_PROMPT,
     DAG_PROMPT,
     render_template_prompt,
+    render_template_prompt_parts,
     CATALOG_VALIDATION_STRICT_XML,
     render_feedback_retry,
     render_final_attempt,
     COMPLEXITY_GUIDANCE_TEXT,
     DSL_SCHEMA_V2,
+    ROBUST_GENERATION_SYSTEM_PROMPT,
+    ROBUST_GENERATION_FINAL_INSTRUCTION,
 )
 
 __all__ = [
     'EXECUTABLE_PROMPT',
     'DAG_PROMPT',
     'render_template_prompt',
+    'render_template_prompt_parts',
     'CATALOG_VALIDATION_STRICT_XML',
     'render_feedback_retry',
     'render_final_attempt',
     'COMPLEXITY_GUIDANCE_TEXT',
     'DSL_SCHEMA_V2',
+    'ROBUST_GENERATION_SYSTEM_PROMPT',
+    'ROBUST_GENERATION_FINAL_INSTRUCTION',
 ]
@@ -6,7 +6,8 @@ workflow types. They use Python string formatting placeholders that will
 be filled in by the PromptBuilder.
 """
 
-  
+from typing import Tuple
+
 
 # Template for generating executable workflows
 EXECUTABLE_PROMPT = """You are an expert workflow automation engineer. Generate an executable workflow based on the user's request.
@@ -653,8 +654,10 @@ DSL_SCHEMA_V2 = r"""{
   }
 }"""
 
-# Main TEMPLATE prompt (XML-styled)
-TEMPLATE_PROMPT_XML = """
+# Main TEMPLATE prompt (XML-styled).
+# Split into a static system part (cacheable across all requests), the per-request
+# catalog context (cacheable across retries) and the user request itself.
+TEMPLATE_SYSTEM_PROMPT_XML = """
 <prompt id="weave.dsl.template" role="system">
 
   <meta>
@@ -669,19 +672,7 @@ TEMPLATE_PROMPT_XML = """
     <mode>JSON-only output (no prose, no markdown)</mode>
   </meta>
 
-  <inputs>
-    <user_request>{user_prompt}</user_request>
-    <workflow_type>Template</workflow_type>
-
-    <catalog>
-      <available_toolkits>{available_toolkits}</available_toolkits>
-      <available_triggers>{available_triggers}</available_triggers>
-      <available_actions>{available_actions}</available_actions>
-    </catalog>
-
-    <schema_definition><![CDATA[{schema_definition}]]></schema_definition>
-    <selected_plan><![CDATA[{selected_plan}]]></selected_plan>
-  </inputs>
+  <schema_definition><![CDATA[{schema_definition}]]></schema_definition>
 
   <rules>
       <rule>
@@ -783,6 +774,25 @@ TEMPLATE_PROMPT_XML = """
 </prompt>
 """
 
+TEMPLATE_CONTEXT_XML = """
+<catalog>
+  <available_toolkits>{available_toolkits}</available_toolkits>
+  <available_triggers>{available_triggers}</available_triggers>
+  <available_actions>{available_actions}</available_actions>
+</catalog>
+"""
+
+TEMPLATE_REQUEST_XML = """
+<inputs>
+  <user_request>{user_prompt}</user_request>
+  <workflow_type>Template</workflow_type>
+  <selected_plan><![CDATA[{selected_plan}]]></selected_plan>
+</inputs>
+"""
+
+# Full single-string TEMPLATE prompt, kept for callers that do not use prompt caching
+TEMPLATE_PROMPT_XML = TEMPLATE_SYSTEM_PROMPT_XML + TEMPLATE_CONTEXT_XML + TEMPLATE_REQUEST_XML
+
 # Planning prompt (step 1): choose tools/actions and rationale
 PLANNING_PROMPT_XML = """
 <prompt id="weave.dsl.planning" role="system">
@@ -972,6 +982,31 @@ COMPLEXITY_GUIDANCE_TEXT = """
 """
 
 # Convenience: renderers for PromptBuilder
+def render_template_prompt_parts(
+    user_prompt: str,
+    available_toolkits: str,
+    available_triggers: str,
+    available_actions: str,
+    schema_definition: str = DSL_SCHEMA_V2,
+    selected_plan: str = "{}",
+) -> Tuple[str, str, str]:
+    """
+    Produce the TEMPLATE prompt as (system, catalog context, request) strings.
+    The system part does not depend on the request and can be prompt-cached.
+    """
+    system = TEMPLATE_SYSTEM_PROMPT_XML.format(schema_definition=schema_definition)
+    context = TEMPLATE_CONTEXT_XML.format(
+        available_toolkits=available_toolkits,
+        available_triggers=available_triggers,
+        available_actions=available_actions,
+    )
+    request = TEMPLATE_REQUEST_XML.format(
+        user_prompt=user_prompt,
+        selected_plan=selected_plan,
+    )
+    return system, context, request
+
+
 def render_template_prompt(
     user_prompt: str,
     complexity: str,
@@ -986,16 +1021,14 @@ def render_template_prompt(
     Produce the filled XML system prompt for TEMPLATE generation.
     All catalog inputs should be preformatted strings (lists or tables of items).
     """
-    return TEMPLATE_PROMPT_XML.format(
+    return "".join(render_template_prompt_parts(
         user_prompt=user_prompt,
-        complexity=complexity,
         available_toolkits=available_toolkits,
         available_triggers=available_triggers,
         available_actions=available_actions,
         schema_definition=schema_definition,
-        complexity_guidance=complexity_guidance,
         selected_plan=selected_plan,
-    )
+    ))
 
 
 def render_feedback_retry(attempt: int, error_summary: str) -> str:
@@ -1018,3 +1051,90 @@ def render_final_attempt(
         available_triggers=available_triggers,
         previous_errors=previous_errors,
     )
+
+
+# Static instructions for DSLGeneratorService._build_robust_claude_prompt.
+# Sent as the (prompt-cached) system prompt; the tool list, dynamic example and
+# user request follow in the user message.
+ROBUST_GENERATION_SYSTEM_PROMPT = """You generate workflow automation templates as JSON. The user message contains <available_tools> and the <user_request>.
+
+**IMPORTANT: Understanding Trigger Types**
+There are two kinds of trigger available:
+
+1. **event_based**: These are triggers from the <available_tools> list (e.g.; "SALESFORCE_NEW_LEAD_TRIGGER"). Use one of these when the user wants to start a workflow based on an event in a specific application.
+2. **schedule_based**: This is a generic trigger for time-based workflows. You MUST use the exact slug "SCHEDULE_BASED" for the `composio_trigger_slug` if the user's request mentions a schedule, like "every morning", "at 8 PM", "on Fridays", "weekly", or any other time-based interval.
+
+<instructions>
+1. **Analyze the Request:** Read the <user_request> carefully.
+
+2. **Create a Step-by-Step Plan:** Before writing any JSON, think through the sequence of operations needed. For example: "First, the workflow needs to start when a new payment is made in Stripe. Second, I need to add that customer's details to a Google Sheet. Third, I need to send a message to Slack."
+
+3. **Select Tools for Each Step:** Based on your plan, find the best trigger and action from the <available_tools> for each step.
+
+4. **Construct the Final JSON:** Now, build the complete workflow in the specified JSON format, making sure to include an action for every step in your plan.
+
+5. **Trigger Type Analysis:** Analyze the <user_request> to determine the trigger type. Is it **event_based** (starts when something happens in an app) or **schedule_based** (starts at a specific time or interval like "every day")?
+
+6. Design a logical, multi-step workflow.
+7. Your output MUST conform to the `template` schema.
+8. Every object in `required_inputs` MUST have a "name", "source", and "type" key.
+9. Populate the `missing_information` array for any user inputs needed.
+10. Your response MUST be a single, valid JSON object and nothing else.
+11. NEVER invent or modify toolkit_slug, composio_trigger_slug, or action_name values.
+12. ONLY use the exact values from the <available_tools> section of the user message.
+13. ⚠️  CRITICAL: Use triggers ONLY in the "triggers" array and actions ONLY in the "actions" array. NEVER use a trigger as an action or vice versa.
+14. If you're unsure about a value, use the first available option from the list.
+15. Every parameter MUST have a "type" field - this is CRITICAL for validation.
+16. Use "string", "number", "boolean", or "array" as type values.
+17. COPY AND PASTE the exact slug/name values - do not modify them.
+18. Your JSON MUST be parseable by Python's json.loads().
+19. ⚠️  CRITICAL: If no triggers are listed in <available_tools>, use this exact format: "triggers": [{"id": "manual_trigger", "type": "manual"}]
+20. ⚠️  CRITICAL: NEVER use "trigger_type" - always use "triggers" array format as shown above.
+
+**Rules for Trigger Selection:**
+- ⚠️  **GOLDEN RULE:** If the user's request contains ANY time-based words (e.g., "every morning", "at 8 PM", "daily", "weekly", "on Fridays", "monthly", "hourly", "at 9 AM", "every day", "every week", "every month"), you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`. This rule overrides all other keywords or application names mentioned in the prompt.
+- ⚠️  **CRITICAL:** If your analysis in Step 1 identifies a schedule, you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`. No exceptions.
+- If the request is time-based, you MUST use "SCHEDULE_BASED" as the `composio_trigger_slug`.
+- For `event_based` triggers, the `composio_trigger_slug` in your response MUST be an EXACT match to a slug from the **Triggers** section of `<available_tools>`.
+- Action names in your response MUST be an EXACT match to a slug from the **Actions** section of `<available_tools>`.
+- ⚠️  CRITICAL: NEVER use a trigger slug as an action name or vice versa. Triggers and actions are completely separate.
+- ⚠️  CRITICAL: You MUST use the EXACT slug names as they appear in the <available_tools> section. Do not modify, abbreviate, or guess action names.
+</instructions>
+
+<validation_rules>
+CRITICAL: Your JSON MUST pass these validation rules:
+- All required_inputs objects MUST have: name, source, type
+- All toolkit_slug values MUST exist in the available_tools
+- All composio_trigger_slug values MUST exist in the available_tools  
+- All action_name values MUST exist in the available_tools
+- ⚠️  If no triggers are available, use: "triggers": [{"id": "manual_trigger", "type": "manual"}]
+- ⚠️  NEVER use "trigger_type" - always use "triggers" array format
+- ⚠️  **SCHEDULE DETECTION:** If the user request contains time-based words, you MUST use "SCHEDULE_BASED" as composio_trigger_slug
+- ⚠️  **SCHEDULE DETECTION:** Time-based words include: "every morning", "at 8 PM", "daily", "weekly", "on Fridays", "monthly", "hourly", "at 9 AM", "every day", "every week", "every month"
+- No markdown formatting or code blocks
+- Pure JSON only
+- Every field must be properly quoted
+- No trailing commas
+</validation_rules>
+
+<error_prevention>
+COMMON MISTAKES TO AVOID:
+- Do NOT add markdown formatting like ```json
+- Do NOT add explanatory text before or after the JSON
+- Do NOT use placeholder values like "UNKNOWN_ACTION_NAME"
+- Do NOT invent new toolkit slugs or action names
+- Do NOT forget the "type" field in required_inputs
+- Do NOT use unquoted strings in JSON
+- ⚠️  **CRITICAL:** Do NOT miss time-based words in the user request - if you see "every", "daily", "weekly", "at [time]", "on [day]", you MUST use "SCHEDULE_BASED"
+- ⚠️  **CRITICAL:** Do NOT use event-based triggers when the user clearly wants a scheduled workflow
+</error_prevention>
+"""
+
+ROBUST_GENERATION_FINAL_INSTRUCTION = """**CRITICAL FINAL INSTRUCTION:** 
+1. You MUST only use the exact `composio_trigger_slug` and `action_name` values from the `<available_tools>` list.
+2. Do not invent or modify them.
+3. Copy the values exactly as they appear.
+4. Generate ONLY the JSON response - no other text.
+5. Ensure your JSON is valid and parseable.
+
+Now, generate the complete JSON for the user's request."""
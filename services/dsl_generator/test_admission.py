@@ -0,0 +1,98 @@
+"""
+Test script for generation admission control.
+
+Checks the concurrency bound, priority and per-user round-robin ordering of
+waiters, and queue-time based shedding with a Retry-After hint.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator.admission import (
+    AdmissionConfig, AdmissionController, AdmissionRejected, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+)
+
+
+def test_priority_and_user_fairness():
+    """Interactive waiters go first, and users take turns within a priority"""
+    print("🧪 Testing admission ordering...")
+
+    async def run():
+        controller = AdmissionController(AdmissionConfig(
+            max_concurrency=1, max_queue=10, max_queue_time=5.0, initial_service_time=0.01
+        ))
+        order = []
+
+        async def job(user_id, priority, tag):
+            async with controller.admit(user_id, priority):
+                order.append(tag)
+                await asyncio.sleep(0.01)
+
+        blocker = asyncio.create_task(job("x", PRIORITY_INTERACTIVE, "first"))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(job("batch", PRIORITY_BATCH, "batch")),
+            asyncio.create_task(job("a", PRIORITY_INTERACTIVE, "a1")),
+            asyncio.create_task(job("a", PRIORITY_INTERACTIVE, "a2")),
+            asyncio.create_task(job("b", PRIORITY_INTERACTIVE, "b1")),
+        ]
+        await asyncio.sleep(0)
+        assert controller.get_stats()["current_state"]["queued"] == 4
+        await asyncio.gather(blocker, *tasks)
+        assert controller.in_flight == 0
+        return order
+
+    assert asyncio.run(run()) == ["first", "a1", "b1", "a2", "batch"]
+    print("✅ Ordering test passed!")
+
+
+def test_shedding_with_retry_after():
+    """Full queues, per-user limits and queue timeouts reject with Retry-After"""
+    print("🧪 Testing load shedding...")
+
+    async def run():
+        controller = AdmissionController(AdmissionConfig(
+            max_concurrency=1, max_queue=2, max_queue_time=0.05, max_queued_per_user=1, initial_service_time=0.01
+        ))
+        await controller.acquire("holder")
+
+        waiter = asyncio.create_task(controller.acquire("a"))
+        await asyncio.sleep(0)
+        try:
+            await controller.acquire("a")
+            assert False, "expected per-user rejection"
+        except AdmissionRejected as e:
+            assert e.reason == "user_limit"
+            assert e.retry_after >= 1
+
+        try:
+            await waiter
+            assert False, "expected queue timeout"
+        except AdmissionRejected as e:
+            assert e.reason == "queue_timeout"
+
+        controller.release()
+        stats = controller.get_stats()
+        assert stats["current_state"]["in_flight"] == 0
+        assert stats["current_state"]["queued"] == 0
+        assert stats["counters"]["rejected_user_limit"] == 1
+        assert stats["counters"]["rejected_queue_timeout"] == 1
+
+    asyncio.run(run())
+    print("✅ Load shedding test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing admission control\n")
+    test_priority_and_user_fairness()
+    test_shedding_with_retry_after()
+    print("\n🎉 All admission control tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Test script for DatabaseCatalogService query batching.
+
+Runs the service against an in-memory stand-in for the Motor database that
+counts queries, and checks that loading the catalog costs one toolkits and
+one tools query no matter how many toolkits there are, and that tool
+searches resolve their toolkits with one batched query.
+"""
+
+import asyncio
+import os
+import re
+import sys
+
+from bson import ObjectId
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.database_service import DatabaseCatalogService
+
+
+def _matches(doc, query):
+    for field, condition in (query or {}).items():
+        if field == "$or":
+            if not any(_matches(doc, option) for option in condition):
+                return False
+            continue
+        value = doc.get(field)
+        if isinstance(condition, dict) and "$regex" in condition:
+            if not re.search(condition["$regex"], value or "", re.IGNORECASE):
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def sort(self, field, direction=1):
+        self.docs.sort(key=lambda doc: doc.get(field), reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count] if count else self.docs
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+    def __aiter__(self):
+        return self._iterate()
+
+
+class _FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query=None, projection=None):
+        self.queries.append(query)
+        docs = [doc for doc in self.docs if _matches(doc, query)]
+        if projection:
+            docs = [{k: v for k, v in doc.items() if k == "_id" or k in projection} for doc in docs]
+        return _FakeCursor(docs)
+
+    async def find_one(self, query=None, projection=None):
+        self.queries.append(query)
+        return next((doc for doc in self.docs if _matches(doc, query)), None)
+
+
+class _FakeDatabase:
+    def __init__(self, toolkits, tools):
+        self.toolkits = _FakeCollection(toolkits)
+        self.tools = _FakeCollection(tools)
+
+
+def _database(toolkit_count=40, tools_per_toolkit=5):
+    toolkits, tools = [], []
+    for index in range(toolkit_count):
+        toolkit_id = ObjectId()
+        slug = f"app{index}"
+        toolkits.append({
+            "_id": toolkit_id, "slug": slug, "name": f"App {index}", "category": "productivity",
+            "is_deprecated": False, "raw_sync_payload": "x" * 100
+        })
+        for tool_index in reversed(range(tools_per_toolkit)):
+            tool_type = "trigger" if tool_index == 0 else "action"
+            tools.append({
+                "_id": ObjectId(), "toolkit_id": str(toolkit_id), "slug": f"{slug.upper()}_{tool_index}",
+                "name": f"{slug}_tool_{tool_index}", "tool_type": tool_type, "is_deprecated": False,
+                "input_schema": {"type": "object"}, "raw_sync_payload": "x" * 100
+            })
+    tools.append({"_id": ObjectId(), "toolkit_id": str(toolkits[0]["_id"]), "slug": "OLD", "name": "old",
+                  "tool_type": "action", "is_deprecated": True})
+    return _FakeDatabase(toolkits, tools)
+
+
+def _service(database):
+    service = DatabaseCatalogService(database_url="mongodb://unused", redis_cache=None)
+    service.client = object()  # skip connecting and index creation
+    service.database = database
+    return service
+
+
+def test_catalog_load_is_two_queries():
+    """A full catalog load is one toolkits query plus one tools query"""
+    print("🧪 Testing batched catalog load...")
+    database = _database()
+    service = _service(database)
+
+    providers = asyncio.run(service._get_providers_from_database())
+    assert len(database.toolkits.queries) == 1 and len(database.tools.queries) == 1
+    assert len(providers) == 40
+
+    app = providers["app0"]
+    assert [tool["name"] for tool in app["tools"]] == [f"app0_tool_{i}" for i in range(5)]
+    assert app["action_count"] == 4 and app["trigger_count"] == 1 and app["tool_count"] == 5
+    assert [tool["slug"] for tool in app["triggers"]] == ["APP0_0"]
+    assert "raw_sync_payload" not in app["tools"][0]
+    print("✅ Batched catalog load test passed!")
+
+
+def test_filtered_load_matches_single_toolkit_query():
+    """Filtered loads keep their filters and match the per-toolkit tool query"""
+    print("🧪 Testing filtered catalog load...")
+    database = _database(toolkit_count=5)
+    service = _service(database)
+
+    async def run():
+        providers = await service._get_providers_from_database(providers=["app1", "app3"], has_triggers=True)
+        single = await service._get_tools_for_provider(providers["app3"]["id"])
+        return providers, single
+
+    providers, single = asyncio.run(run())
+    assert sorted(providers) == ["app1", "app3"]
+    assert providers["app3"]["tools"] == single
+    assert asyncio.run(service._get_tools_for_providers([])) == {}
+    print("✅ Filtered catalog load test passed!")
+
+
+def test_failed_tools_query_keeps_last_good_catalog():
+    """A tools query error fails the load instead of storing toolkits without tools"""
+    print("🧪 Testing failed tools query...")
+    database = _database(toolkit_count=5)
+    service = _service(database)
+
+    async def run():
+        loaded = await service._load_catalog()
+
+        def failing_find(query=None, projection=None):
+            raise RuntimeError("tools query timed out")
+
+        database.tools.find = failing_find
+        providers = await service._get_providers_from_database()
+        reloaded = await service._load_catalog()
+        return loaded, providers, reloaded
+
+    loaded, providers, reloaded = asyncio.run(run())
+    assert providers == [] and reloaded is None
+    assert service._last_good[1] is loaded and all(p["tools"] for p in loaded.values())
+    print("✅ Failed tools query test passed!")
+
+
+def test_search_tools_resolves_toolkits_once():
+    """A 50-tool search costs one tools query and one toolkits query"""
+    print("🧪 Testing batched tool search...")
+    database = _database(toolkit_count=20)
+    database.toolkits.docs[1]["is_deprecated"] = True
+    service = _service(database)
+
+    result = asyncio.run(service.search_tools(query="tool", limit=50))
+    assert len(database.tools.queries) == 1 and len(database.toolkits.queries) == 1
+    assert result["total_tools"] == 45 and result["total_providers"] == 9
+    assert "app1" not in [group["provider"]["slug"] for group in result["results"]]
+    assert result["results"][0]["provider"] == {"slug": "app0", "name": "App 0"}
+    print("✅ Batched tool search test passed!")
+
+
+def test_get_tool_by_slug_across_providers():
+    """A provider-less tool lookup resolves every matching toolkit with one query"""
+    print("🧪 Testing provider-less tool lookups...")
+    database = _database(toolkit_count=6)
+    for tool in database.tools.docs[:15]:
+        tool["slug"] = "SHARED_SEND"
+    service = _service(database)
+
+    async def run():
+        by_slug = await service.get_tool_by_slug("SHARED_SEND")
+        by_name = await service.get_tool("app4_tool_2")
+        return by_slug, by_name
+
+    by_slug, by_name = asyncio.run(run())
+    assert len(database.tools.queries) == 2 and len(database.toolkits.queries) == 2
+    assert [entry["provider"]["slug"] for entry in by_slug["providers"]] == ["app0", "app1", "app2"]
+    assert by_name["providers"][0]["tool"]["slug"] == "APP4_2"
+    print("✅ Provider-less tool lookup test passed!")
+
+
+def test_object_id_toolkit_ids_resolve():
+    """Tools whose toolkit_id is stored as an ObjectId still resolve their toolkit"""
+    print("🧪 Testing ObjectId toolkit_ids...")
+    database = _database(toolkit_count=3)
+    for tool in database.tools.docs:
+        tool["toolkit_id"] = ObjectId(tool["toolkit_id"])
+    database.tools.docs[0]["slug"] = database.tools.docs[5]["slug"] = "SHARED_SEND"
+    service = _service(database)
+
+    async def run():
+        search = await service.search_tools(query="tool", limit=50)
+        by_slug = await service.get_tool_by_slug("SHARED_SEND")
+        by_name = await service.get_tool("app2_tool_2")
+        return search, by_slug, by_name
+
+    search, by_slug, by_name = asyncio.run(run())
+    assert search["total_tools"] == 15 and search["total_providers"] == 3
+    assert [entry["provider"]["slug"] for entry in by_slug["providers"]] == ["app0", "app1"]
+    assert by_name["providers"][0]["provider"]["slug"] == "app2"
+    print("✅ ObjectId toolkit_id test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog database queries\n")
+    test_catalog_load_is_two_queries()
+    test_filtered_load_matches_single_toolkit_query()
+    test_failed_tools_query_keeps_last_good_catalog()
+    test_search_tools_resolves_toolkits_once()
+    test_get_tool_by_slug_across_providers()
+    test_object_id_toolkit_ids_resolve()
+    print("\n🎉 All catalog database query tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Test script for the (toolkit, tool) lookup index.
+
+Checks lookups by slug, name and alias, case-insensitive resolution, the
+nested compiler catalog format, index reuse for catalog snapshots, and that
+the hallucination check and catalog validator answer from the index.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import CatalogSnapshot
+from core.validator.catalog_validator import CatalogValidator
+from core.validator.models import LintContext
+from services.dsl_generator.generator import DSLGeneratorService
+
+
+def _providers():
+    return {
+        "gmail": {
+            "name": "Gmail",
+            "actions": [{"slug": "GMAIL_SEND_EMAIL", "name": "Send email", "action_name": "gmail_send"}],
+            "triggers": [{"slug": "GMAIL_NEW_GMAIL_MESSAGE", "name": "New message"}]
+        },
+        "slack": {
+            "name": "Slack",
+            "actions": [{"slug": "SLACK_SENDS_A_MESSAGE", "name": "Send message", "aliases": ["slack_post"]}],
+            "triggers": []
+        },
+        "empty_toolkit": {"name": "Nothing yet"}
+    }
+
+
+def test_lookups():
+    """Tools resolve by slug, name or alias; types are kept apart"""
+    print("🧪 Testing lookup index...")
+    index = ToolLookupIndex.from_providers(_providers())
+
+    assert index.get("gmail", "GMAIL_SEND_EMAIL").slug == "GMAIL_SEND_EMAIL"
+    assert index.get("gmail", "Send email", "action").slug == "GMAIL_SEND_EMAIL"
+    assert index.get("gmail", "gmail_send").slug == "GMAIL_SEND_EMAIL"
+    assert index.contains("slack", "slack_post", "action")
+    assert not index.contains("gmail", "GMAIL_SEND_EMAIL", "trigger")
+    assert not index.contains("slack", "GMAIL_SEND_EMAIL")
+
+    assert index.get("Gmail", "gmail_send_email") is None
+    assert index.resolve("Gmail", "gmail_send_email").slug == "GMAIL_SEND_EMAIL"
+    assert index.resolve_toolkit("SLACK") == "slack"
+    assert index.find("New message", "trigger").toolkit_slug == "gmail"
+
+    assert index.has_toolkit("empty_toolkit") and index.tools_for("empty_toolkit") == ()
+    assert (index.toolkit_count, len(index), index.count("action"), index.count("trigger")) == (3, 3, 2, 1)
+    print("✅ Lookup test passed!")
+
+
+def test_catalog_shapes():
+    """Nested compiler catalogs and snapshots share the same lookups"""
+    print("🧪 Testing catalog shapes...")
+    compiler_catalog = {"providers": [{
+        "slug": "google",
+        "toolkits": [{"slug": "gmail", "actions": [{"slug": "GMAIL_SEND_EMAIL"}], "triggers": []}]
+    }]}
+    record = ToolLookupIndex.for_catalog(compiler_catalog).get("gmail", "GMAIL_SEND_EMAIL")
+    assert (record.toolkit_slug, record.provider_slug) == ("gmail", "google")
+
+    # Snapshots (and their providers view) reuse the index built with them
+    snapshot = CatalogSnapshot.build(_providers())
+    assert ToolLookupIndex.for_catalog(snapshot) is snapshot.lookup
+    assert ToolLookupIndex.for_catalog(snapshot.providers) is snapshot.lookup
+    assert ToolLookupIndex.for_catalog({"providers": snapshot.providers}) is snapshot.lookup
+    assert snapshot.lookup.get("slack", "slack_post").data is snapshot.providers["slack"]["actions"][0]
+    print("✅ Catalog shape test passed!")
+
+
+def test_hallucination_check():
+    """The generator's hallucination check accepts aliases and rejects unknown tools"""
+    print("🧪 Testing hallucination check...")
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+    context = {
+        "triggers": [{"slug": "GMAIL_NEW_GMAIL_MESSAGE", "toolkit_slug": "gmail"}],
+        "actions": [{"slug": "SLACK_SENDS_A_MESSAGE", "name": "Send message", "toolkit_slug": "slack"}]
+    }
+
+    def dsl(trigger, action):
+        return {"workflow": {
+            "triggers": [{"toolkit_slug": "gmail", "composio_trigger_slug": trigger}],
+            "actions": [{"toolkit_slug": "slack", "action_name": action}]
+        }}
+
+    assert generator._check_tool_hallucinations(dsl("GMAIL_NEW_GMAIL_MESSAGE", "Send message"), context) == []
+    errors = generator._check_tool_hallucinations(dsl("GMAIL_NEW_EMAIL", "SLACK_SEND"), context)
+    assert len(errors) == 2 and "gmail.GMAIL_NEW_EMAIL" in errors[0]
+    print("✅ Hallucination check test passed!")
+
+
+def test_catalog_validator():
+    """The catalog validator answers from the index for dict catalogs"""
+    print("🧪 Testing catalog validator...")
+    validator = CatalogValidator()
+    doc = {"workflow": {
+        "triggers": [{"toolkit_slug": "gmail", "composio_trigger_slug": "GMAIL_NEW_GMAIL_MESSAGE"}],
+        "actions": [
+            {"toolkit_slug": "gmail", "action_name": "gmail_send"},
+            {"toolkit_slug": "slack", "action_name": "SLACK_DELETE_CHANNEL"}
+        ]
+    }}
+
+    findings = asyncio.run(validator.validate_toolkit_references(doc, LintContext(catalog=_providers())))
+    assert [f.message for f in findings] == ["Unknown action 'SLACK_DELETE_CHANNEL' in toolkit 'slack'"]
+    print("✅ Catalog validator test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog lookup index\n")
+    test_lookups()
+    test_catalog_shapes()
+    test_hallucination_check()
+    test_catalog_validator()
+    print("\n🎉 All catalog lookup tests passed!")
+
+
+if __name__ == "__main__":
+    main()
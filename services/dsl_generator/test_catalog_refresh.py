@@ -0,0 +1,222 @@
+"""
+Test script for stale-while-revalidate catalog refreshes.
+
+Checks that DatabaseCatalogService.get_catalog answers from Redis or from
+the last good catalog without waiting on MongoDB, tags results with their
+age, and moves stale toolkit handling into a background refresh.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core import json_codec
+from core.catalog.chunked_store import ChunkedCatalogStore
+from core.catalog.database_service import DatabaseCatalogService
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def expire(self, key, ttl):
+        return key in self.data
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _catalog(*slugs):
+    return {slug: {"slug": slug, "category": "communication", "has_actions": True, "has_triggers": False,
+                   "actions": [{"slug": f"{slug.upper()}_SEND"}], "triggers": []} for slug in slugs}
+
+
+def _service(database_delay=0.0):
+    """Service with a fake Redis store and a fake MongoDB that records its calls"""
+    service = DatabaseCatalogService(database_url="mongodb://unused", redis_cache=None)
+    service.catalog_store = ChunkedCatalogStore(_FakeRedis())
+    service.refresh_jitter = 0
+    calls = {"providers": 0, "stale": 0, "refreshed": []}
+    database = {"catalog": _catalog("gmail", "slack"), "stale": ["toolkit-1"]}
+
+    async def providers_from_database(**filters):
+        await asyncio.sleep(database_delay)
+        calls["providers"] += 1
+        return database["catalog"]
+
+    async def stale_toolkits():
+        calls["stale"] += 1
+        return database["stale"]
+
+    async def refresh_stale_toolkits(toolkit_ids):
+        calls["refreshed"].extend(toolkit_ids)
+        return True
+
+    service._get_providers_from_database = providers_from_database
+    service._get_stale_toolkits = stale_toolkits
+    service._refresh_stale_toolkits = refresh_stale_toolkits
+    return service, calls, database
+
+
+async def _age_manifest(store, seconds):
+    manifest = await store.get_manifest()
+    manifest["saved_at"] -= seconds
+    await store.redis.set(store.manifest_key, json_codec.dumps(manifest))
+
+
+def test_cold_start_skips_stale_toolkits():
+    """A cold load queries MongoDB once and leaves stale toolkits to the background"""
+    print("🧪 Testing cold start...")
+    service, calls, _ = _service()
+
+    async def run():
+        first = await service.get_catalog()
+        second = await service.get_catalog(providers=["slack"])
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["source"] == "mongodb" and not first["stale"] and first["age_seconds"] < 1
+    assert second["source"] == "redis_cache" and list(second["providers"]) == ["slack"]
+    assert calls == {"providers": 1, "stale": 0, "refreshed": []}
+    print("✅ Cold start test passed!")
+
+
+def test_stale_catalog_served_then_refreshed():
+    """An old catalog is returned at once, tagged with its age, and refreshed in the background"""
+    print("🧪 Testing stale-while-revalidate...")
+    service, calls, database = _service(database_delay=0.2)
+    refreshed = []
+
+    async def listener(providers):
+        refreshed.append(sorted(providers))
+
+    service.add_refresh_listener(listener)
+
+    async def run():
+        await service.get_catalog()
+        await _age_manifest(service.catalog_store, service.refresh_after + 60)
+        database["catalog"] = _catalog("gmail", "slack", "notion")
+
+        start = time.perf_counter()
+        stale = await service.get_catalog()
+        elapsed = time.perf_counter() - start
+        await service.get_catalog()  # a second stale read does not start another refresh
+        await service._refresh_task
+        fresh = await service.get_catalog()
+        return stale, elapsed, fresh
+
+    stale, elapsed, fresh = asyncio.run(run())
+    assert stale["source"] == "redis_cache" and stale["stale"]
+    assert stale["age_seconds"] >= service.refresh_after and elapsed < 0.1
+    assert "notion" not in stale["providers"]
+    assert calls["providers"] == 2 and calls["stale"] == 1 and calls["refreshed"] == ["toolkit-1"]
+    assert not fresh["stale"] and "notion" in fresh["providers"]
+    assert refreshed == [["gmail", "notion", "slack"]]
+    print(f"✅ Stale-while-revalidate test passed (stale read {elapsed * 1000:.1f} ms)!")
+
+
+def test_unchanged_refresh_marks_catalog_fresh():
+    """A refresh that reloads an identical catalog resets its age"""
+    print("🧪 Testing refresh of an unchanged catalog...")
+    service, calls, _ = _service()
+
+    async def run():
+        await service.get_catalog()
+        await _age_manifest(service.catalog_store, service.refresh_after + 60)
+        stale = await service.get_catalog()
+        await service._refresh_task
+        reads = [await service.get_catalog() for _ in range(3)]
+        return stale, reads
+
+    stale, reads = asyncio.run(run())
+    assert stale["stale"]
+    assert all(not read["stale"] and read["age_seconds"] < 1 for read in reads)
+    assert calls["providers"] == 2 and calls["stale"] == 1
+    assert service.catalog_store.get_stats()["writes"] == 1  # chunks were not rewritten
+    print("✅ Unchanged refresh test passed!")
+
+
+def test_redis_loss_served_from_memory():
+    """Without the Redis catalog the last good catalog is served and Redis rebuilt"""
+    print("🧪 Testing last good catalog fallback...")
+    service, calls, _ = _service()
+
+    async def run():
+        await service.get_catalog()
+        await service.catalog_store.clear()
+        from_memory = await service.get_catalog(providers=["gmail"])
+        await service._refresh_task
+        from_redis = await service.get_catalog()
+        return from_memory, from_redis
+
+    from_memory, from_redis = asyncio.run(run())
+    assert from_memory["source"] == "memory" and list(from_memory["providers"]) == ["gmail"]
+    assert from_redis["source"] == "redis_cache"
+    assert calls["providers"] == 2
+    print("✅ Last good catalog test passed!")
+
+
+def test_failed_refresh_keeps_last_good():
+    """A failed MongoDB load never replaces the catalog being served"""
+    print("🧪 Testing failed refresh...")
+    service, calls, database = _service()
+
+    async def run():
+        await service.get_catalog()
+        database["catalog"] = []  # what _get_providers_from_database returns on errors
+        forced = await service.get_catalog(force_refresh=True)
+        await service.catalog_store.clear()
+        served = await service.get_catalog()
+        await service.stop_background_refresh()
+        return forced, served
+
+    forced, served = asyncio.run(run())
+    assert forced["source"] == "memory" and set(forced["providers"]) == {"gmail", "slack"}
+    assert served["source"] == "memory" and set(served["providers"]) == {"gmail", "slack"}
+    print("✅ Failed refresh test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog background refresh\n")
+    test_cold_start_skips_stale_toolkits()
+    test_stale_catalog_served_then_refreshed()
+    test_unchanged_refresh_marks_catalog_fresh()
+    test_redis_loss_served_from_memory()
+    test_failed_refresh_keeps_last_good()
+    print("\n🎉 All catalog refresh tests passed!")
+
+
+if __name__ == "__main__":
+    main()
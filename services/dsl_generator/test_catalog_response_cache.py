@@ -0,0 +1,112 @@
+"""
+Test script for the pre-serialized catalog response cache.
+
+Checks that responses are serialized once per (endpoint, params, catalog
+version), that ETags are stable across processes and change with the
+catalog, that a matching If-None-Match is answered with 304 without
+building the response, and that the cache stays within its byte budget.
+"""
+
+import json
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from api.catalog_response_cache import CatalogResponseCache, etag_matches
+from core.catalog.snapshot import CatalogSnapshot
+
+
+class _Request:
+    def __init__(self, if_none_match=None):
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+
+def _snapshot(name="Gmail"):
+    return CatalogSnapshot.build({
+        "gmail": {"name": name, "actions": [{"slug": "GMAIL_SEND_EMAIL", "name": "Send email"}], "triggers": []}
+    })
+
+
+def test_serialized_once_per_version():
+    """A page is built once per catalog version and params"""
+    print("🧪 Testing response reuse...")
+    cache = CatalogResponseCache(max_entries=4, max_age=30)
+    snapshot = _snapshot()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"items": list(snapshot.providers), "provider": snapshot.providers["gmail"]}
+
+    first = cache.respond(_Request(), snapshot, "catalog", {"limit": 20, "search": None}, build)
+    second = cache.respond(_Request(), snapshot, "catalog", {"search": None, "limit": 20}, build)
+    assert len(builds) == 1 and first.body == second.body
+    assert json.loads(first.body)["provider"]["actions"][0]["slug"] == "GMAIL_SEND_EMAIL"
+    assert first.headers["cache-control"] == "public, max-age=30"
+    assert first.headers["etag"] == second.headers["etag"]
+
+    # Different params and a new catalog version are separate entries
+    cache.respond(_Request(), snapshot, "catalog", {"limit": 50}, build)
+    changed = _snapshot("Google Mail")
+    third = cache.respond(_Request(), changed, "catalog", {"limit": 20}, build)
+    assert len(builds) == 3 and third.headers["etag"] != first.headers["etag"]
+    assert cache.get_stats()["entries"] == 1  # older version dropped
+    print("✅ Response reuse test passed!")
+
+
+def test_not_modified():
+    """A matching If-None-Match gets a 304 without building the page"""
+    print("🧪 Testing conditional requests...")
+    snapshot = _snapshot()
+    etag = CatalogResponseCache().respond(_Request(), snapshot, "catalog.tools", {"limit": 100}, lambda: {}).headers["etag"]
+
+    # A fresh cache (another worker) derives the same ETag without building anything
+    cache = CatalogResponseCache()
+
+    def build():
+        raise AssertionError("page should not be built")
+
+    response = cache.respond(_Request(f"W/{etag}, \"other\""), snapshot, "catalog.tools", {"limit": 100}, build)
+    assert response.status_code == 304 and response.body == b""
+    assert response.headers["etag"] == etag
+    assert cache.get_stats()["not_modified"] == 1
+
+    assert etag_matches("*", etag) and not etag_matches('"stale"', etag) and not etag_matches(None, etag)
+    print("✅ Conditional request test passed!")
+
+
+def test_byte_budget():
+    """Large pages evict older ones to stay under max_bytes; oversized ones are not kept"""
+    print("🧪 Testing the byte budget...")
+    cache = CatalogResponseCache(max_entries=100, max_bytes=3000)
+    snapshot = _snapshot()
+
+    for query in ("a", "b", "c", "d"):
+        cache.respond(_Request(), snapshot, "catalog.tools", {"search": query}, lambda: {"items": ["x" * 1000]})
+    stats = cache.get_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 2 and stats["bytes"] <= 3000
+
+    # The most recent pages are the ones kept
+    builds = []
+    cache.respond(_Request(), snapshot, "catalog.tools", {"search": "d"}, lambda: builds.append(1))
+    assert builds == []
+
+    huge = cache.respond(_Request(), snapshot, "catalog", {}, lambda: {"items": ["x" * 5000]})
+    assert len(huge.body) > 5000
+    assert cache.get_stats()["too_large"] == 1 and cache.get_stats()["entries"] == 2
+    print("✅ Byte budget test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog response cache\n")
+    test_serialized_once_per_version()
+    test_not_modified()
+    test_byte_budget()
+    print("\n🎉 All catalog response cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Test script for the immutable catalog snapshot.
+
+Checks that the snapshot indexes tools by slug, toolkit, type and category,
+that shared data rejects mutation, that the version follows content, and
+that the catalog manager keeps the snapshot by reference.
+"""
+
+import datetime
+import json
+import os
+import sys
+
+from bson import ObjectId
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.chunked_store import ChunkCodec
+from core.catalog.snapshot import CatalogSnapshot, FrozenDict
+from services.dsl_generator.catalog_manager import CatalogManager
+
+
+def _providers():
+    return {
+        "gmail": {
+            "name": "Gmail",
+            "category": "communication",
+            "actions": [{"slug": "GMAIL_SEND_EMAIL", "name": "Send email", "tool_type": "action",
+                         "input_schema": {"type": "object"}}],
+            "triggers": [{"slug": "GMAIL_NEW_GMAIL_MESSAGE", "name": "New message", "tool_type": "trigger"}]
+        },
+        "slack": {
+            "name": "Slack",
+            "category": "communication",
+            "actions": [{"slug": "SLACK_SENDS_A_MESSAGE", "name": "Send message", "tool_type": "action"}],
+            "triggers": []
+        },
+        "notion": {
+            "name": "Notion",
+            "category": "productivity",
+            "actions": [{"slug": "NOTION_CREATE_PAGE", "name": "Create page", "tool_type": "action"}]
+        }
+    }
+
+
+def test_indexes():
+    """Tools and toolkits are reachable through the precomputed indexes"""
+    print("🧪 Testing snapshot indexes...")
+    snapshot = CatalogSnapshot.build(_providers())
+
+    assert len(snapshot) == 3 and "gmail" in snapshot
+    tool = snapshot.get_tool("GMAIL_SEND_EMAIL")
+    assert (tool.toolkit_slug, tool.tool_type, tool.name) == ("gmail", "action", "Send email")
+    assert [t.slug for t in snapshot.tools_by_toolkit["gmail"]] == ["GMAIL_SEND_EMAIL", "GMAIL_NEW_GMAIL_MESSAGE"]
+    assert len(snapshot.tools_of_type("action")) == 3
+    assert [t.slug for t in snapshot.tools_of_type("trigger")] == ["GMAIL_NEW_GMAIL_MESSAGE"]
+    assert [t.slug for t in snapshot.toolkits_in_category("communication")] == ["gmail", "slack"]
+    assert snapshot.get_stats()["tools"] == 4
+
+    # List-shaped providers are keyed by slug
+    listed = CatalogSnapshot.build([{"slug": "gmail", **_providers()["gmail"]}])
+    assert list(listed.providers) == ["gmail"]
+    print("✅ Index test passed!")
+
+
+def test_read_only_and_versioned():
+    """Shared data rejects writes; equal content gives equal versions"""
+    print("🧪 Testing immutability and versions...")
+    source = _providers()
+    snapshot = CatalogSnapshot.build(source)
+    provider = snapshot.providers["gmail"]
+    action = provider["actions"][0]
+
+    for mutate in (lambda: provider.update(name="x"),
+                   lambda: action.__setitem__("toolkit", {}),
+                   lambda: snapshot.providers.pop("gmail")):
+        try:
+            mutate()
+            assert False, "expected TypeError"
+        except TypeError:
+            pass
+    try:
+        snapshot.version = "other"
+        assert False, "expected AttributeError"
+    except AttributeError:
+        pass
+
+    # Still plain dicts to json, isinstance checks and callers that copy
+    assert isinstance(provider, dict) and json.loads(json.dumps(snapshot.providers))["slack"]["name"] == "Slack"
+    copied = provider.copy()
+    copied["name"] = "Changed"
+    assert provider["name"] == "Gmail"
+    assert {**action, "toolkit": {"slug": "gmail"}}["toolkit"] == {"slug": "gmail"}
+
+    assert CatalogSnapshot.build(_providers()).version == snapshot.version
+
+    # A provider's combined tool list shares the frozen action and trigger records
+    with_tools = _providers()
+    with_tools["gmail"]["tools"] = with_tools["gmail"]["triggers"] + with_tools["gmail"]["actions"]
+    gmail = CatalogSnapshot.build(with_tools).providers["gmail"]
+    assert isinstance(gmail["tools"], tuple) and len(gmail["tools"]) == 2
+    assert all(any(tool is record for record in gmail["actions"] + gmail["triggers"]) for tool in gmail["tools"])
+    source["slack"]["actions"].append({"slug": "SLACK_CREATE_CHANNEL", "name": "Create channel"})
+    assert CatalogSnapshot.build(source).version != snapshot.version
+    assert CatalogSnapshot.empty().version == "empty" and not CatalogSnapshot.empty()
+    print("✅ Immutability test passed!")
+
+
+def test_catalog_manager_shares_snapshot():
+    """The catalog manager keeps the global snapshot by reference"""
+    print("🧪 Testing snapshot sharing...")
+    snapshot = CatalogSnapshot.build(_providers())
+    manager = CatalogManager()
+    manager.set_global_cache(snapshot)
+    assert manager.get_catalog_snapshot() is snapshot
+    assert manager._catalog_cache is snapshot.providers
+    assert manager.get_provider_actions("gmail") == ["Send email"]
+
+    # Plain mappings are converted once
+    manager.set_global_cache(_providers())
+    assert isinstance(manager._catalog_cache, FrozenDict)
+    assert manager.get_catalog_snapshot().version == snapshot.version
+    print("✅ Snapshot sharing test passed!")
+
+
+def test_version_matches_redis_copy():
+    """A catalog from MongoDB and its copy read back from Redis chunks get the same version"""
+    print("🧪 Testing versions across catalog sources...")
+    from_database = _providers()
+    from_database["gmail"]["id"] = ObjectId("65a1b2c3d4e5f60718293a4b")
+    from_database["gmail"]["updated_at"] = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    from_database["gmail"]["actions"][0]["last_synced"] = datetime.datetime(2024, 1, 1, 12, 0, 0, 123456)
+
+    codec = ChunkCodec()
+    from_redis = {slug: codec.decode(codec.encode(provider)) for slug, provider in reversed(from_database.items())}
+    assert from_redis["gmail"]["updated_at"] == "2024-01-01T12:00:00"
+
+    assert CatalogSnapshot.build(from_database).version == CatalogSnapshot.build(from_redis).version
+    print("✅ Cross-source version test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog snapshot\n")
+    test_indexes()
+    test_read_only_and_versioned()
+    test_catalog_manager_shares_snapshot()
+    test_version_matches_redis_copy()
+    print("\n🎉 All catalog snapshot tests passed!")
+
+
+if __name__ == "__main__":
+    main()
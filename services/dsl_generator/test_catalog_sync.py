@@ -0,0 +1,215 @@
+"""
+Test script for cross-worker catalog sync.
+
+Runs several GlobalCacheService instances ("workers") against one fake
+Redis and checks that only one of them loads MongoDB, that a refresh on one
+worker reaches the others through pub/sub, and that a missed message is
+caught up through the generation counter.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from api.cache_service import GlobalCacheService
+from core.catalog.sync import CatalogSync
+from core.config import settings
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def unsubscribe(self, channel):
+        self.redis.subscribers[channel].remove(self.queue)
+
+    async def aclose(self):
+        pass
+
+
+class _FakeRedis:
+    """Strings, INCR, SET NX, the lock release script and pub/sub"""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+        return len(self.subscribers.get(channel, []))
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+
+class _FakeCatalogService:
+    """get_catalog() as DatabaseCatalogService does it: Redis chunks first, MongoDB on a miss"""
+
+    def __init__(self, shared):
+        self.shared = shared
+
+    async def get_catalog(self, force_refresh=False):
+        if not force_refresh and self.shared.get("redis") is not None:
+            return {"providers": self.shared["redis"], "source": "redis_cache"}
+        await asyncio.sleep(0.05)
+        self.shared["database_loads"] += 1
+        self.shared["redis"] = dict(self.shared["database"])
+        return {"providers": self.shared["redis"], "source": "mongodb"}
+
+    async def stop_background_refresh(self):
+        pass
+
+
+def _catalog(*slugs):
+    return {slug: {"name": slug.title(), "actions": [{"slug": f"{slug.upper()}_SEND"}]} for slug in slugs}
+
+
+def _workers(count):
+    redis = _FakeRedis()
+    shared = {"database": _catalog("gmail", "slack"), "redis": None, "database_loads": 0}
+    workers = []
+    for index in range(count):
+        worker = GlobalCacheService()
+        worker._catalog_service = _FakeCatalogService(shared)
+        worker._catalog_sync = CatalogSync(redis, worker_id=f"worker-{index}")
+        worker._initialized = True
+        workers.append(worker)
+    return redis, shared, workers
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for catalog sync"
+        await asyncio.sleep(0.01)
+
+
+def test_startup_loads_database_once():
+    """Workers starting together share one MongoDB load"""
+    print("🧪 Testing startup with several workers...")
+    redis, shared, workers = _workers(3)
+
+    async def run():
+        await asyncio.gather(*(worker._preload_catalog_cache() for worker in workers))
+
+    asyncio.run(run())
+    versions = {worker.get_catalog_snapshot().version for worker in workers}
+    assert shared["database_loads"] == 1
+    assert len(versions) == 1 and set(workers[0].get_catalog_cache()) == {"gmail", "slack"}
+    assert all(worker.get_cache_status()["catalog_generation"] == 1 for worker in workers)
+    assert "catalog_sync:refresh_lock" not in redis.data
+    print("✅ Startup test passed!")
+
+
+def test_refresh_reaches_other_workers():
+    """A refresh on one worker is published and pulled by the others"""
+    print("🧪 Testing refresh propagation...")
+    redis, shared, workers = _workers(3)
+    settings.catalog_sync_poll_interval = 0.05
+
+    async def run():
+        for worker in workers:
+            await worker._preload_catalog_cache()
+        for worker in workers[1:]:
+            worker.start_catalog_sync()
+        old_snapshot = workers[1].get_catalog_snapshot()
+
+        shared["database"] = _catalog("gmail", "slack", "notion")
+        await workers[0].refresh_cache(force=True)
+        new_version = workers[0].get_catalog_snapshot().version
+        await _wait_for(lambda: all(w.get_catalog_snapshot().version == new_version for w in workers))
+
+        for worker in workers:
+            await worker.shutdown()
+        return old_snapshot, new_version
+
+    old_snapshot, new_version = asyncio.run(run())
+    assert old_snapshot.version != new_version
+    assert shared["database_loads"] == 2
+    assert all("notion" in worker.get_catalog_cache() for worker in workers)
+    assert workers[2].get_cache_status()["catalog_generation"] == 2
+    print("✅ Refresh propagation test passed!")
+
+
+def test_missed_message_caught_up_by_counter():
+    """A worker that was not subscribed catches up from the generation counter"""
+    print("🧪 Testing missed update catch-up...")
+    redis, shared, workers = _workers(2)
+    settings.catalog_sync_poll_interval = 0.05
+
+    async def run():
+        for worker in workers:
+            await worker._preload_catalog_cache()
+        shared["database"] = _catalog("notion")
+        await workers[0].refresh_cache(force=True)  # nobody is listening yet
+
+        workers[1].start_catalog_sync()
+        await _wait_for(lambda: "notion" in workers[1].get_catalog_cache())
+        await workers[1].shutdown()
+
+    asyncio.run(run())
+    assert set(workers[1].get_catalog_cache()) == {"notion"}
+    print("✅ Missed update test passed!")
+
+
+def test_refresh_lock_allows_one_worker():
+    """Concurrent refreshes run only on the worker holding the lock"""
+    print("🧪 Testing refresh lock...")
+    redis, shared, workers = _workers(2)
+
+    async def run():
+        for worker in workers:
+            await worker._preload_catalog_cache()
+        return await asyncio.gather(*(worker._refresh_from_database() for worker in workers))
+
+    refreshed = asyncio.run(run())
+    assert refreshed == [True, False]
+    assert shared["database_loads"] == 2
+    print("✅ Refresh lock test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing cross-worker catalog sync\n")
+    test_startup_loads_database_once()
+    test_refresh_reaches_other_workers()
+    test_missed_message_caught_up_by_counter()
+    test_refresh_lock_allows_one_worker()
+    print("\n🎉 All catalog sync tests passed!")
+
+
+if __name__ == "__main__":
+    main()
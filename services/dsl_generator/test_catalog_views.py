@@ -0,0 +1,117 @@
+"""
+Test script for the precomputed catalog listing views.
+
+Checks that every filter combination of the toolkit and tool views returns
+exactly what the old scan-filter-sort listing did, including substring
+searches the token index has to narrow correctly.
+"""
+
+import itertools
+import os
+import random
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.snapshot import CatalogSnapshot
+
+WORDS = ["send", "email", "gmail", "slack", "message", "create", "page", "sheet", "row", "new", "Update", "file"]
+
+
+def _providers(seed=7):
+    rng = random.Random(seed)
+    providers = {}
+    for i in range(40):
+        slug = f"toolkit_{i:02d}"
+        providers[slug] = {
+            "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+            "description": " ".join(rng.sample(WORDS, 3)) + ".",
+            "category": rng.choice(["communication", "productivity", "storage", None]),
+            "actions": [{"slug": f"{slug.upper()}_A{j}", "name": f"{rng.choice(WORDS)}-{rng.choice(WORDS)}",
+                         "description": " ".join(rng.sample(WORDS, 2))} for j in range(rng.randint(0, 4))],
+            "triggers": [{"slug": f"{slug.upper()}_T{j}", "name": f"On {rng.choice(WORDS)}"}
+                         for j in range(rng.randint(0, 2))]
+        }
+    return providers
+
+
+def _old_toolkits(snapshot, category, has_actions, has_triggers, search):
+    """The listing as GET /catalog used to compute it"""
+    items = []
+    toolkits = snapshot.toolkits_in_category(category) if category else snapshot.toolkits.values()
+    for toolkit in toolkits:
+        data = toolkit.data
+        if search and (search.lower() not in (data.get('name') or '').lower() and
+                       search.lower() not in (data.get('description') or '').lower()):
+            continue
+        if has_actions is not None and bool(data['actions']) != has_actions:
+            continue
+        if has_triggers is not None and bool(data['triggers']) != has_triggers:
+            continue
+        items.append(toolkit)
+    return [t.slug for t in sorted(items, key=lambda t: t.name)]
+
+
+def _old_tools(snapshot, provider, tool_type, search):
+    """The listing as GET /catalog/tools used to compute it"""
+    toolkits = [snapshot.get_toolkit(provider)] if provider else list(snapshot.toolkits.values())
+    matched = [
+        tool for toolkit in toolkits if toolkit for tool in toolkit.tools
+        if (not tool_type or tool.tool_type == tool_type)
+        and (not search or search.lower() in tool.name.lower() or search.lower() in tool.description.lower())
+    ]
+    matched.sort(key=lambda t: (t.toolkit_slug, t.tool_type, t.name))
+    return [t.slug for t in matched]
+
+
+SEARCHES = [None, "", "mail", "GMAIL", "send email", "nd em", "-", "e-s", "zzz", "update 1", "."]
+
+
+def test_toolkit_views():
+    """Toolkit views match the scan for every filter combination"""
+    print("🧪 Testing toolkit views...")
+    snapshot = CatalogSnapshot.build(_providers())
+    for category, has_actions, has_triggers, search in itertools.product(
+            [None, "communication", "storage", "missing"], [None, True, False], [None, True, False], SEARCHES):
+        got = [t.slug for t in snapshot.views.toolkits(category, has_actions, has_triggers, search)]
+        assert got == _old_toolkits(snapshot, category, has_actions, has_triggers, search), \
+            (category, has_actions, has_triggers, search)
+
+    # Unfiltered listings are shared tuples, so pagination is a slice
+    assert snapshot.views.toolkits() is snapshot.views.toolkits()
+    assert len(snapshot.views.toolkits()) == 40
+    print("✅ Toolkit view test passed!")
+
+
+def test_tool_views():
+    """Tool views match the scan for every filter combination"""
+    print("🧪 Testing tool views...")
+    snapshot = CatalogSnapshot.build(_providers())
+    for provider, tool_type, search in itertools.product(
+            [None, "toolkit_03", "toolkit_17", "missing"], [None, "action", "trigger", "other"], SEARCHES):
+        got = [t.slug for t in snapshot.views.tools(provider, tool_type, search)]
+        assert got == _old_tools(snapshot, provider, tool_type, search), (provider, tool_type, search)
+    assert snapshot.get_stats()["search_tokens"] > 0
+    print("✅ Tool view test passed!")
+
+
+def test_empty_snapshot():
+    """An empty catalog lists nothing"""
+    print("🧪 Testing empty snapshot views...")
+    views = CatalogSnapshot.empty().views
+    assert views.toolkits() == () and views.tools() == () and views.tools(search="mail") == ()
+    print("✅ Empty snapshot test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing catalog listing views\n")
+    test_toolkit_views()
+    test_tool_views()
+    test_empty_snapshot()
+    print("\n🎉 All catalog view tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Test script for the chunked Redis catalog store.
+
+Checks that the catalog is stored one compressed chunk per provider behind
+a manifest, that filtered reads fetch only the providers they need, that an
+incomplete version is a cache miss, and that DatabaseCatalogService serves
+every filter from one cached full catalog.
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+import zlib
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.chunked_store import ChunkCodec, ChunkedCatalogStore, filter_providers
+from core.catalog.database_service import DatabaseCatalogService
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for the store, with a read log"""
+
+    def __init__(self):
+        self.data = {}
+        self.reads = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+
+    async def mget(self, keys):
+        self.reads.extend(keys)
+        return [self.data.get(key) for key in keys]
+
+    async def expire(self, key, ttl):
+        return key in self.data
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _providers():
+    def provider(slug, category, actions, triggers):
+        action_list = [{"slug": f"{slug.upper()}_A{i}", "tool_type": "action"} for i in range(actions)]
+        trigger_list = [{"slug": f"{slug.upper()}_T{i}", "tool_type": "trigger"} for i in range(triggers)]
+        return {
+            "slug": slug, "name": slug.title(), "category": category,
+            "created_at": datetime.datetime(2025, 8, 22, tzinfo=datetime.timezone.utc),
+            "has_actions": actions > 0, "has_triggers": triggers > 0,
+            "tools": action_list + trigger_list, "actions": action_list, "triggers": trigger_list
+        }
+    return {
+        "gmail": provider("gmail", "communication", 3, 1),
+        "slack": provider("slack", "communication", 2, 0),
+        "notion": provider("notion", "productivity", 0, 1),
+    }
+
+
+def test_codec_round_trip():
+    """Chunks carry a format header and decode to the cached JSON shape"""
+    print("🧪 Testing chunk codec...")
+    codec = ChunkCodec()
+    blob = codec.encode(_providers()["gmail"])
+    assert blob[:1] in (b"m", b"j") and blob[1:2] in (b"z", b"d")
+    decoded = codec.decode(blob)
+    assert decoded["created_at"] == "2025-08-22T00:00:00+00:00"
+    assert decoded["actions"][0]["slug"] == "GMAIL_A0"
+
+    # A JSON+zlib chunk written by a worker without the optional libraries is readable everywhere
+    fallback = ChunkCodec(use_msgpack=False, use_zstd=False)
+    assert fallback.name == "json+zlib"
+    assert codec.decode(fallback.encode({"a": 1})) == {"a": 1}
+    assert zlib.decompress(fallback.encode({"a": 1})[2:]) == b'{"a":1}'
+    print(f"✅ Codec test passed ({codec.name})!")
+
+
+def test_filtered_reads_fetch_only_needed_chunks():
+    """Full and filtered reads use the manifest and pipelined MGETs"""
+    print("🧪 Testing chunked reads...")
+    redis = _FakeRedis()
+    store = ChunkedCatalogStore(redis, batch_size=2)
+
+    async def run():
+        version = await store.save(_providers())
+        assert await store.save(_providers()) == version  # unchanged catalog is not rewritten
+
+        full = await store.load()
+        redis.reads.clear()
+        only_slack = await store.load(providers=["slack", "missing"])
+        slack_reads = list(redis.reads)
+        with_triggers = await store.load(categories=["communication"], has_triggers=True)
+        nothing = await store.load(categories=["finance"])
+        return version, full, only_slack, slack_reads, with_triggers, nothing
+
+    version, full, only_slack, slack_reads, with_triggers, nothing = asyncio.run(run())
+    assert list(full) == ["gmail", "slack", "notion"]
+    assert full["gmail"]["triggers"][0]["slug"] == "GMAIL_T0"
+    assert list(only_slack) == ["slack"] and slack_reads == [f"catalog_store:{version}:p:slack"]
+    assert list(with_triggers) == ["gmail"] and nothing == {}
+    assert store.get_stats()["writes"] == 1
+    print("✅ Chunked read test passed!")
+
+
+def test_incomplete_version_is_a_miss():
+    """A missing chunk makes the read a miss instead of returning partial data"""
+    print("🧪 Testing incomplete versions...")
+    redis = _FakeRedis()
+    store = ChunkedCatalogStore(redis)
+
+    async def run():
+        version = await store.save(_providers())
+        del redis.data[f"catalog_store:{version}:p:notion"]
+        missing_full, gmail_only = await store.load(), await store.load(providers=["gmail"])
+        await store.save(_providers())  # same version, but the missing chunk is written again
+        return missing_full, gmail_only, await store.load()
+
+    missing_full, gmail_only, repaired = asyncio.run(run())
+    assert missing_full is None and list(gmail_only) == ["gmail"]
+    assert list(repaired) == ["gmail", "slack", "notion"]
+    print("✅ Incomplete version test passed!")
+
+
+def test_database_service_serves_filters_from_one_load():
+    """One full database load is cached; later filtered calls read from Redis"""
+    print("🧪 Testing DatabaseCatalogService with chunked cache...")
+    service = DatabaseCatalogService(database_url="mongodb://unused", redis_cache=None)
+    service.catalog_store = ChunkedCatalogStore(_FakeRedis())
+    database_calls = []
+
+    async def providers_from_database(providers=None, categories=None, tags=None, has_actions=None, has_triggers=None):
+        database_calls.append((providers, categories, has_actions, has_triggers))
+        return _providers()
+
+    async def no_stale_toolkits():
+        return []
+
+    service._get_providers_from_database = providers_from_database
+    service._get_stale_toolkits = no_stale_toolkits
+
+    async def run():
+        first = await service.get_catalog(providers=["notion"])
+        second = await service.get_catalog(has_actions=True)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["source"] == "mongodb" and list(first["providers"]) == ["notion"]
+    assert second["source"] == "redis_cache" and list(second["providers"]) == ["gmail", "slack"]
+    assert database_calls == [(None, None, None, None)]
+    assert filter_providers(_providers(), has_triggers=False).keys() == {"slack"}
+    print("✅ DatabaseCatalogService test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing chunked catalog store\n")
+    test_codec_round_trip()
+    test_filtered_reads_fetch_only_needed_chunks()
+    test_incomplete_version_is_a_miss()
+    test_database_service_serves_filters_from_one_load()
+    print("\n🎉 All chunked catalog store tests passed!")
+
+
+if __name__ == "__main__":
+    main()
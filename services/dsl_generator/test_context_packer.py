@@ -0,0 +1,94 @@
+"""
+Test script for the token-budget context packer.
+
+Checks that tools are ranked by retrieval relevance, that parameter schemas are
+trimmed before tools are dropped, and that pinned tools survive packing.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator.context_packer import (
+    ContextPacker, TRIM_FULL, TRIM_REQUIRED_PARAMS, TRIM_NO_PARAMS
+)
+
+
+def _tool(slug, toolkit, score, n_params=4, description="Does something useful"):
+    properties = {f"param_{i}": {"type": "string"} for i in range(n_params)}
+    return {
+        "slug": slug,
+        "name": slug,
+        "toolkit_slug": toolkit,
+        "description": description,
+        "similarity_score": score,
+        "metadata": {"input_schema": {"properties": properties, "required": ["param_0"]}}
+    }
+
+
+def _context(n_actions=10):
+    return {
+        "triggers": [
+            _tool("SCHEDULE_BASED", "system", 1.0, n_params=0) | {"metadata": {"essential": True}},
+            _tool("GMAIL_NEW_GMAIL_MESSAGE", "gmail", 0.7),
+        ],
+        "actions": [_tool(f"SLACK_ACTION_{i}", "slack", 0.9 - i * 0.05) for i in range(n_actions)],
+        "providers": {"gmail": {"name": "Gmail"}, "slack": {"name": "Slack"}, "system": {"name": "System"}},
+    }
+
+
+def test_large_budget_keeps_full_cards_in_relevance_order():
+    """With room to spare nothing is trimmed and actions are ordered by score"""
+    print("🧪 Testing full cards...")
+    context = _context()
+    context["actions"].reverse()
+    packed = ContextPacker(token_budget=100_000).pack(context)
+
+    assert packed["packing"]["trim_level"] == TRIM_FULL
+    assert [a["slug"] for a in packed["actions"]][:2] == ["SLACK_ACTION_0", "SLACK_ACTION_1"]
+    assert len(packed["actions"][0]["parameters"]) == 4
+    assert "system" in packed["providers"]
+    print("✅ Full cards test passed!")
+
+
+def test_trims_parameters_before_dropping_tools():
+    """A moderate budget keeps every tool but only required parameters"""
+    print("🧪 Testing parameter trimming...")
+    full = ContextPacker(token_budget=100_000).pack(_context())
+    budget = full["packing"]["estimated_tokens"] - 10
+    packed = ContextPacker(token_budget=budget).pack(_context())
+
+    assert packed["packing"]["trim_level"] in (TRIM_REQUIRED_PARAMS, TRIM_NO_PARAMS)
+    assert packed["packing"]["dropped_tools"] == 0
+    assert len(packed["actions"]) == 10
+    assert all(len(a["parameters"]) <= 1 for a in packed["actions"])
+    print("✅ Parameter trimming test passed!")
+
+
+def test_tiny_budget_drops_least_relevant_but_keeps_pinned():
+    """Dropping removes low-relevance tools and never the pinned schedule trigger"""
+    print("🧪 Testing tool dropping...")
+    packed = ContextPacker(token_budget=50, max_actions=8).pack(_context())
+
+    trigger_slugs = [t["slug"] for t in packed["triggers"]]
+    action_slugs = [a["slug"] for a in packed["actions"]]
+    assert "SCHEDULE_BASED" in trigger_slugs
+    assert len(action_slugs) == 3
+    assert action_slugs == ["SLACK_ACTION_0", "SLACK_ACTION_1", "SLACK_ACTION_2"]
+    assert packed["packing"]["dropped_tools"] > 0
+    print("✅ Tool dropping test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing context packer\n")
+    test_large_budget_keeps_full_cards_in_relevance_order()
+    test_trims_parameters_before_dropping_tools()
+    test_tiny_budget_drops_least_relevant_but_keeps_pinned()
+    print("\n🎉 All context packer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
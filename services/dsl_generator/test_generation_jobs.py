@@ -0,0 +1,211 @@
+"""
+Test script for background generation jobs.
+
+Checks that variations are yielded in completion order, and that a job
+queued with the job manager reports stage progress and suggestions through
+both the stored record and the event stream.
+"""
+
+import asyncio
+import copy
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from api.generation_jobs import GenerationJobManager, GenerationJobStore, JobQueueFull, format_sse
+from core import json_codec
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.models import GenerationRequest, GenerationResponse
+
+
+def _fake_generator(delays):
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+
+    async def prepare(request):
+        return {"triggers": [], "actions": []}, None
+
+    async def generate(request, context, temperature=None):
+        index = [0.3, 0.6, 0.8, 0.9, 1.0].index(temperature)
+        await asyncio.sleep(delays[index])
+        if delays[index] < 0:
+            raise RuntimeError("boom")
+        return GenerationResponse(success=True, reasoning=f"variation {index}")
+
+    generator._prepare_generation_context = prepare
+    generator._generate_with_validation_loop = generate
+    return generator
+
+
+def test_variations_yielded_in_completion_order():
+    """The fastest variation arrives first; failures become error responses"""
+    print("🧪 Testing completion-order generation...")
+    generator = _fake_generator([0.06, 0.01, 0.03])
+    stages = []
+
+    async def on_stage(stage, detail):
+        stages.append(stage)
+
+    async def run():
+        request = GenerationRequest(user_prompt="Post new Gmail emails to Slack")
+        return [(i, r.success) async for i, r in generator.iter_multiple_workflows(request, 3, on_stage=on_stage)]
+
+    assert asyncio.run(run()) == [(1, True), (2, True), (0, True)]
+    assert stages == ["retrieval", "generation"]
+    print("✅ Completion order test passed!")
+
+
+def _memory_store():
+    store = GenerationJobStore(ttl=60)
+    store._redis_down_until = float("inf")  # no Redis in tests
+    return store
+
+
+def test_job_lifecycle_and_events():
+    """A job moves queued -> running -> completed, streaming stages and suggestions"""
+    print("🧪 Testing job lifecycle...")
+
+    async def runner(job, payload):
+        await job.stage("generation", {"variations": 2})
+        for i in range(payload):
+            await asyncio.sleep(0.01)
+            await job.add_suggestion({"suggestion_id": f"s{i}"})
+
+    async def run():
+        manager = GenerationJobManager(_memory_store(), workers=1, max_queue=1)
+        record = await manager.submit(2, runner, user_id="u1")
+        events = [(event, data) async for event, data in manager.events(record["job_id"])]
+        final = await manager.get(record["job_id"])
+        await manager.shutdown()
+        return events, final, manager.get_stats()
+
+    events, final, stats = asyncio.run(run())
+    names = [event for event, _ in events]
+    assert names[0] == "stage" and names[-1] == "completed"
+    assert [d["suggestion"]["suggestion_id"] for e, d in events if e == "suggestion"] == ["s0", "s1"]
+    assert [d["stage"] for e, d in events if e == "stage"] == ["queued", "running", "generation", "completed"]
+    assert final["status"] == "completed" and len(final["suggestions"]) == 2
+    assert stats["counters"]["completed"] == 1
+    assert format_sse("stage", {"a": 1}) == 'event: stage\ndata: {"a":1}\n\n'
+    # Same codec as NDJSON streams and the job store
+    at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert format_sse("stage", {"at": at}) == f"event: stage\ndata: {json_codec.dumps_str({'at': at})}\n\n"
+    print("✅ Job lifecycle test passed!")
+
+
+def test_failed_job_and_full_queue():
+    """Runner errors fail the job; a full queue rejects new jobs"""
+    print("🧪 Testing job failure and queue limit...")
+
+    async def failing(job, payload):
+        raise RuntimeError("generator unavailable")
+
+    async def blocked(job, payload):
+        await asyncio.sleep(10)
+
+    async def run():
+        manager = GenerationJobManager(_memory_store(), workers=1, max_queue=1)
+        record = await manager.submit(None, failing)
+        events = [(event, data) async for event, data in manager.events(record["job_id"])]
+
+        await manager.submit(None, blocked)
+        await asyncio.sleep(0.01)  # the worker picks it up
+        await manager.submit(None, blocked)  # fills the queue
+        try:
+            await manager.submit(None, blocked)
+            assert False, "expected JobQueueFull"
+        except JobQueueFull:
+            pass
+        await manager.shutdown()
+        return events
+
+    events = asyncio.run(run())
+    assert events[-1][0] == "failed"
+    assert events[-1][1]["error"] == "generator unavailable"
+    print("✅ Failure test passed!")
+
+
+def test_memory_copy_is_bounded():
+    """Saves prune expired records and cap the memory copy, even with Redis up"""
+    print("🧪 Testing the job store memory bound...")
+    store = GenerationJobStore(ttl=60, max_memory_records=3)
+
+    class _Redis:
+        def __init__(self):
+            self.data = {}
+
+        async def set(self, key, value, ex=None):
+            self.data[key] = value
+
+    redis = _Redis()
+
+    async def client():
+        return redis
+
+    store._client = client
+
+    async def run():
+        for index in range(5):
+            await store.save({"job_id": f"j{index}"})
+        await store.save({"job_id": "j2"})  # a rewrite counts as the newest
+        assert list(store._memory) == ["j3", "j4", "j2"]
+
+        for job_id, (_, record) in list(store._memory.items())[:2]:
+            store._memory[job_id] = (0.0, record)  # past their TTL
+        await store.save({"job_id": "j5"})
+
+    asyncio.run(run())
+    assert list(store._memory) == ["j2", "j5"] and len(redis.data) == 6
+    print("✅ Memory bound test passed!")
+
+
+def test_update_during_read_wakes_stream():
+    """An update landing while the stream reads the store is not waited out"""
+    print("🧪 Testing updates during a store read...")
+    store = _memory_store()
+    read = store.get
+
+    async def slow_get(job_id):
+        record = copy.deepcopy(await read(job_id))
+        await asyncio.sleep(0.05)  # reply latency: the record is already stale when it arrives
+        return record
+
+    store.get = slow_get
+    release = asyncio.Event()
+
+    async def runner(job, payload):
+        await asyncio.sleep(0.02)
+        await job.add_suggestion({"suggestion_id": "s0"})
+        await release.wait()  # nothing else changes until the stream has the suggestion
+
+    async def run():
+        manager = GenerationJobManager(store, workers=1, max_queue=1)
+        record = await manager.submit(None, runner)
+        events = []
+        async for event, data in manager.events(record["job_id"], heartbeat_interval=30):
+            events.append(event)
+            if event == "suggestion":
+                release.set()
+        await manager.shutdown()
+        return events
+
+    events = asyncio.run(asyncio.wait_for(run(), 2))
+    assert "suggestion" in events and events[-1] == "completed" and "heartbeat" not in events
+    print("✅ Update during read test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing background generation jobs\n")
+    test_variations_yielded_in_completion_order()
+    test_job_lifecycle_and_events()
+    test_failed_job_and_full_queue()
+    test_memory_copy_is_bounded()
+    test_update_during_read_wakes_stream()
+    print("\n🎉 All generation job tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Test script for hedged generation attempts.
+
+Exercises DSLGeneratorService._generate_with_validation_loop with a stubbed
+single-attempt runner, so no Claude/Groq calls are made.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.models import GenerationRequest, GenerationResponse
+
+
+def _make_generator(mode: str, attempt_plan, delay: float = 0.05, max_attempts: int = 3):
+    """Build a generator whose attempts follow ``attempt_plan`` [(sleep_seconds, succeed), ...]"""
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+    generator.max_regeneration_attempts = max_attempts
+    generator.hedge_mode = mode
+    generator.hedge_delay = delay
+    generator.hedge_min_spare_tokens = 1
+    generator.started = []
+    generator.cancelled = []
+    generator.feedback_seen = []
+
+    async def fake_attempt(request, catalog_context, previous_errors, attempt_number, temperature=None):
+        generator.started.append(attempt_number)
+        generator.feedback_seen.append(list(previous_errors))
+        sleep_for, succeed = attempt_plan[attempt_number - 1]
+        try:
+            await asyncio.sleep(sleep_for)
+        except asyncio.CancelledError:
+            generator.cancelled.append(attempt_number)
+            raise
+        if succeed:
+            return GenerationResponse(success=True, reasoning=f"attempt {attempt_number}"), []
+        return None, [f"error from attempt {attempt_number}"]
+
+    generator._run_generation_attempt = fake_attempt
+    return generator
+
+
+def _run(generator):
+    request = GenerationRequest(user_prompt="Send a Slack message when a new email arrives")
+    with patch('services.dsl_generator.generator.claude_tokens_available', return_value=True):
+        return asyncio.run(generator._generate_with_validation_loop(request, {}))
+
+
+def test_sequential_mode_retries_with_feedback():
+    """Default mode keeps the strict retry-with-feedback behaviour"""
+    print("🧪 Testing sequential mode...")
+    generator = _make_generator("off", [(0, False), (0, True), (0, True)])
+    response = _run(generator)
+
+    assert response.success
+    assert generator.started == [1, 2]
+    assert generator.feedback_seen[1] == ["error from attempt 1"]
+    print("✅ Sequential mode test passed!")
+
+
+def test_delayed_hedge_wins_when_primary_is_slow():
+    """A slow first attempt is hedged after the delay and then cancelled"""
+    print("🧪 Testing delayed hedge...")
+    generator = _make_generator("delayed", [(5.0, True), (0.01, True), (0, True)], delay=0.05)
+    response = _run(generator)
+
+    assert response.success
+    assert response.reasoning == "attempt 2"
+    assert generator.started == [1, 2]
+    assert generator.cancelled == [1]
+    print("✅ Delayed hedge test passed!")
+
+
+def test_parallel_failure_triggers_retry_with_feedback():
+    """In parallel mode a failed attempt frees its slot for a retry that sees the errors"""
+    print("🧪 Testing parallel mode retry...")
+    generator = _make_generator("parallel", [(0, False), (5.0, False), (0.01, True)])
+    response = _run(generator)
+
+    assert response.success
+    assert response.reasoning == "attempt 3"
+    assert generator.started == [1, 2, 3]
+    assert generator.feedback_seen[2] == ["error from attempt 1"]
+    assert generator.cancelled == [2]
+    print("✅ Parallel mode retry test passed!")
+
+
+def test_hedge_respects_attempt_budget():
+    """All attempts failing returns a failed response without exceeding the budget"""
+    print("🧪 Testing attempt budget...")
+    generator = _make_generator("parallel", [(0, False), (0, False), (0, False)])
+    response = _run(generator)
+
+    assert not response.success
+    assert sorted(generator.started) == [1, 2, 3]
+    print("✅ Attempt budget test passed!")
+
+
+def test_no_hedge_without_spare_rate_limit_tokens():
+    """Hedges are skipped when the Claude rate limiter has no spare tokens"""
+    print("🧪 Testing rate limiter budget...")
+    generator = _make_generator("parallel", [(0.01, True), (0, True), (0, True)])
+    request = GenerationRequest(user_prompt="Send a Slack message when a new email arrives")
+    with patch('services.dsl_generator.generator.claude_tokens_available', return_value=False):
+        response = asyncio.run(generator._generate_with_validation_loop(request, {}))
+
+    assert response.success
+    assert generator.started == [1]
+    print("✅ Rate limiter budget test passed!")
+
+
+def test_losing_attempts_finish_before_return():
+    """Cancelled attempts have finished their cleanup when the winner is returned"""
+    print("🧪 Testing cleanup of cancelled attempts...")
+    generator = _make_generator("parallel", [(0.01, True), (5.0, True), (0, True)])
+    request = GenerationRequest(user_prompt="Send a Slack message when a new email arrives")
+
+    async def run():
+        response = await generator._generate_with_hedging(request, {})
+        return response, list(generator.cancelled)
+
+    with patch('services.dsl_generator.generator.claude_tokens_available', return_value=True):
+        response, cancelled = asyncio.run(run())
+    assert response.reasoning == "attempt 1"
+    assert cancelled == [2]
+    print("✅ Cancelled attempt cleanup test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing hedged generation\n")
+    tests = [
+        test_sequential_mode_retries_with_feedback,
+        test_delayed_hedge_wins_when_primary_is_slow,
+        test_parallel_failure_triggers_retry_with_feedback,
+        test_hedge_respects_attempt_budget,
+        test_no_hedge_without_spare_rate_limit_tokens,
+        test_losing_attempts_finish_before_return,
+    ]
+    for test in tests:
+        test()
+    print("\n🎉 All hedged generation tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Test script for the shared JSON codec.
+
+Checks that orjson and the stdlib fallback produce the same JSON for the
+extra types the caches see (datetimes, numpy values, snapshot data), and
+that RedisCacheStore round-trips values through the codec.
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core import json_codec
+from core.catalog.cache import RedisCacheStore
+from core.catalog.snapshot import CatalogSnapshot
+
+
+def _value():
+    snapshot = CatalogSnapshot.build({"gmail": {"name": "Gmail", "actions": [{"slug": "GMAIL_SEND_EMAIL"}]}})
+    return {
+        "created_at": datetime.datetime(2025, 8, 22, 15, 3, 17, 948720, tzinfo=datetime.timezone.utc),
+        "day": datetime.date(2025, 8, 22),
+        "ttl": datetime.timedelta(minutes=2),
+        "score": np.float32(0.75),
+        "embedding": np.array([1.5, 2.0]),
+        "apps": {"gmail"},
+        "providers": snapshot.providers,
+        "name": "Café ✉️",
+        7: "non-string key"
+    }
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def get(self, key):
+        return self.data.get(key)
+
+
+def test_backends_agree():
+    """orjson and the stdlib fallback encode the same way"""
+    print(f"🧪 Testing codec backends (active: {json_codec.JSON_BACKEND})...")
+    encoded = json_codec.dumps(_value())
+    fallback = json_codec._stdlib_dumps(_value())
+    assert json_codec.loads(encoded) == json_codec.loads(fallback)
+
+    decoded = json_codec.loads(encoded)
+    assert decoded["created_at"] == "2025-08-22T15:03:17.948720+00:00"
+    assert decoded["day"] == "2025-08-22" and decoded["ttl"] == 120.0
+    assert decoded["score"] == 0.75 and decoded["embedding"] == [1.5, 2.0]
+    assert decoded["providers"]["gmail"]["actions"] == [{"slug": "GMAIL_SEND_EMAIL"}]
+    assert decoded["name"] == "Café ✉️" and decoded["7"] == "non-string key"
+    assert json_codec.dumps_str({"a": 1}) == '{"a":1}'
+    print("✅ Backend test passed!")
+
+
+def test_redis_cache_store_round_trip():
+    """RedisCacheStore stores codec bytes and reads them back"""
+    print("🧪 Testing RedisCacheStore round trip...")
+    redis = _FakeRedis()
+    store = RedisCacheStore(redis)
+
+    async def run():
+        assert await store.set("catalog", _value())
+        return await store.get("catalog")
+
+    cached = asyncio.run(run())
+    assert isinstance(redis.data["catalog_cache:catalog"], bytes)
+    assert cached["providers"]["gmail"]["name"] == "Gmail"
+    assert cached["ttl"] == 120.0
+    print("✅ RedisCacheStore test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing JSON codec\n")
+    test_backends_agree()
+    test_redis_cache_store_round_trip()
+    print("\n🎉 All JSON codec tests passed!")
+
+
+if __name__ == "__main__":
+    main()
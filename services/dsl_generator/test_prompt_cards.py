@@ -0,0 +1,159 @@
+"""
+Test script for precompiled prompt cards.
+
+Checks that cards are built from catalog snapshot items, that packed (trimmed)
+tool copies reuse the untrimmed card, that the tool list is a join over
+cards grouped by toolkit, and that installing a catalog snapshot builds the
+shared cards (and template fast path tools) once per version in a worker
+thread.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from api.cache_service import GlobalCacheService
+from core.catalog.snapshot import CatalogSnapshot
+from services.dsl_generator import catalog_manager as catalog_manager_module
+from services.dsl_generator.catalog_manager import CatalogManager
+from services.dsl_generator.prompt_cards import PromptCardIndex, TRIM_FULL, TRIM_NO_PARAMS
+from services.dsl_generator.template_matcher import TemplateMatcher
+
+
+CATALOG_ITEMS = [
+    {"type": "provider", "slug": "slack", "name": "Slack", "description": "Team chat", "provider_id": "slack"},
+    {
+        "type": "action", "slug": "SLACK_SEND_MESSAGE", "name": "Send Message", "provider_id": "slack",
+        "description": "Send a message to a channel",
+        "metadata": {
+            "description": "Send a message to a channel",
+            "input_schema": {"properties": {"channel": {"type": "string"}, "text": {"type": "string"}}, "required": ["channel"]}
+        }
+    },
+    {"type": "trigger", "slug": "SLACK_RECEIVE_MESSAGE", "name": "Receive Message", "provider_id": "slack",
+     "description": "New message in a channel", "metadata": {}},
+]
+
+
+def test_cards_built_at_load_and_reused_for_trimmed_copies():
+    """A packed copy with trimmed parameters still maps to the full card"""
+    print("🧪 Testing card reuse...")
+    cards = PromptCardIndex()
+    cards.load_catalog_items(CATALOG_ITEMS)
+    assert cards.get_stats()["tool_cards"] == 2
+
+    packed_copy = {"slug": "SLACK_SEND_MESSAGE", "toolkit_slug": "slack", "parameters": [], "description": "Send..."}
+    card = cards.tool_card(packed_copy, "action")
+
+    assert "channel (string, required)" in card.texts[TRIM_FULL]
+    assert "Inputs" not in card.texts[TRIM_NO_PARAMS]
+    assert card.tokens[TRIM_FULL] > card.tokens[TRIM_NO_PARAMS]
+    assert "Required inputs: channel" in card.listing
+    assert cards.get_stats()["misses"] == 0
+    print("✅ Card reuse test passed!")
+
+
+def test_render_tool_list_groups_by_toolkit():
+    """The tool list joins cards per toolkit with triggers before actions"""
+    print("🧪 Testing tool list rendering...")
+    cards = PromptCardIndex()
+    cards.load_catalog_items(CATALOG_ITEMS)
+    context = {
+        "triggers": [{"slug": "SLACK_RECEIVE_MESSAGE", "toolkit_slug": "slack"}],
+        "actions": [{"slug": "SLACK_SEND_MESSAGE", "toolkit_slug": "slack", "prompt_trim_level": TRIM_NO_PARAMS}],
+        "providers": {},
+    }
+    text, has_triggers = cards.render_tool_list(context)
+
+    assert has_triggers
+    assert text.startswith("\n--- Toolkit: slack ---\nTriggers:\n  - composio_trigger_slug: SLACK_RECEIVE_MESSAGE")
+    assert "Actions:\n  - action_name: SLACK_SEND_MESSAGE" in text
+    assert "Inputs" not in text
+    print("✅ Tool list rendering test passed!")
+
+
+def _providers(*action_slugs):
+    return {"slack": {
+        "slug": "slack", "name": "Slack", "description": "Team chat",
+        "actions": [{"slug": slug, "name": slug.title(), "description": "Send a message",
+                     "input_schema": {"properties": {"channel": {"type": "string"}}, "required": ["channel"]}}
+                    for slug in action_slugs],
+        "triggers": [{"slug": "SLACK_RECEIVE_MESSAGE", "name": "Receive Message"}]
+    }}
+
+
+def test_cards_built_from_snapshot_once_per_version():
+    """A snapshot builds cards for all its tools; the same version is not rebuilt"""
+    print("🧪 Testing snapshot card builds...")
+    cards = PromptCardIndex()
+    snapshot = CatalogSnapshot.build(_providers("SLACK_SEND_MESSAGE"))
+
+    assert cards.load_snapshot(snapshot)
+    assert not cards.load_snapshot(CatalogSnapshot.build(_providers("SLACK_SEND_MESSAGE")))
+    assert cards.get_stats()["version"] == snapshot.version and cards.get_stats()["tool_cards"] == 2
+
+    card = cards.tool_card({"slug": "SLACK_SEND_MESSAGE", "toolkit_slug": "slack"}, "action")
+    assert "channel (string, required)" in card.texts[TRIM_FULL] and cards.get_stats()["misses"] == 0
+
+    assert cards.load_snapshot(CatalogSnapshot.build(_providers("SLACK_SEND_MESSAGE", "SLACK_CREATE_CHANNEL")))
+    assert cards.get_stats()["tool_cards"] == 3
+    print("✅ Snapshot card build test passed!")
+
+
+def test_snapshot_install_builds_cards_off_loop():
+    """Installing a snapshot builds the shared cards in a worker thread, once per version"""
+    print("🧪 Testing card builds on snapshot install...")
+    cards = PromptCardIndex()
+    build_threads = []
+    load_snapshot = cards.load_snapshot
+
+    def recording_load(snapshot):
+        built = load_snapshot(snapshot)
+        if built:
+            build_threads.append(threading.get_ident())
+        return built
+
+    cards.load_snapshot = recording_load
+
+    async def run():
+        cache = GlobalCacheService()
+        snapshot = cache._install_snapshot({"providers": _providers("SLACK_SEND_MESSAGE")}, 1)
+        await catalog_manager_module._index_build[1]
+
+        # Per-request generators adopt the same snapshot, and a reload yields the same version
+        for _ in range(3):
+            CatalogManager().set_global_cache(cache.get_catalog_snapshot())
+        cache._install_snapshot({"providers": _providers("SLACK_SEND_MESSAGE")}, 1)
+        await asyncio.sleep(0.05)
+        return snapshot
+
+    matcher = TemplateMatcher()
+    previous = (catalog_manager_module.prompt_card_index, catalog_manager_module.template_matcher)
+    catalog_manager_module.prompt_card_index, catalog_manager_module.template_matcher = cards, matcher
+    try:
+        snapshot = asyncio.run(run())
+    finally:
+        catalog_manager_module.prompt_card_index, catalog_manager_module.template_matcher = previous
+
+    assert cards.version == snapshot.version and cards.get_stats()["tool_cards"] == 2
+    assert matcher.version == snapshot.version
+    assert len(build_threads) == 1 and build_threads[0] != threading.get_ident()
+    print("✅ Snapshot install test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing prompt cards\n")
+    test_cards_built_at_load_and_reused_for_trimmed_copies()
+    test_render_tool_list_groups_by_toolkit()
+    test_cards_built_from_snapshot_once_per_version()
+    test_snapshot_install_builds_cards_off_loop()
+    print("\n🎉 All prompt card tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Test script for the local slug resolver.
+
+Checks that near-miss trigger/action slugs are repaired in place, that
+ambiguous or unrelated slugs are left for re-prompting, and that the
+generator runs repairs (and their embedding calls) off the event loop.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.slug_resolver import SlugResolver
+
+
+CATALOG_CONTEXT = {
+    "triggers": [
+        {"slug": "GMAIL_NEW_GMAIL_MESSAGE", "toolkit_slug": "gmail", "name": "New Gmail Message"},
+        {"slug": "GITHUB_ISSUE_ADDED_EVENT", "toolkit_slug": "github", "name": "Issue Added"},
+    ],
+    "actions": [
+        {"slug": "SLACK_SEND_MESSAGE", "toolkit_slug": "slack", "name": "Send Message"},
+        {"slug": "SLACK_CREATE_CHANNEL", "toolkit_slug": "slack", "name": "Create Channel"},
+        {"slug": "NOTION_CREATE_PAGE_V1", "toolkit_slug": "notion", "name": "Create Page V1"},
+        {"slug": "NOTION_CREATE_PAGE_V2", "toolkit_slug": "notion", "name": "Create Page V2"},
+    ],
+}
+
+
+def _dsl(trigger, actions):
+    return {"workflow": {"triggers": [trigger], "actions": actions}}
+
+
+def test_repairs_typo_in_action_name():
+    """A one-letter typo is rewritten to the real slug"""
+    print("🧪 Testing typo repair...")
+    dsl = _dsl(
+        {"id": "t1", "toolkit_slug": "gmail", "composio_trigger_slug": "GMAIL_NEW_GMAIL_MESSAGE"},
+        [{"id": "a1", "toolkit_slug": "slack", "action_name": "SLACK_SEND_MESAGE"}]
+    )
+    repairs = SlugResolver(CATALOG_CONTEXT).repair_workflow(dsl)
+
+    assert len(repairs) == 1
+    assert dsl["workflow"]["actions"][0]["action_name"] == "SLACK_SEND_MESSAGE"
+    assert repairs[0].original_slug == "SLACK_SEND_MESAGE"
+    print("✅ Typo repair test passed!")
+
+
+def test_repairs_wrong_toolkit_for_exact_slug():
+    """An exact slug under the wrong toolkit only gets its toolkit_slug fixed"""
+    print("🧪 Testing toolkit repair...")
+    dsl = _dsl(
+        {"id": "t1", "toolkit_slug": "google_mail", "composio_trigger_slug": "GMAIL_NEW_GMAIL_MESSAGE"},
+        []
+    )
+    repairs = SlugResolver(CATALOG_CONTEXT).repair_workflow(dsl)
+
+    assert len(repairs) == 1
+    assert dsl["workflow"]["triggers"][0]["toolkit_slug"] == "gmail"
+    assert repairs[0].confidence == 1.0
+    print("✅ Toolkit repair test passed!")
+
+
+def test_leaves_unrelated_and_ambiguous_slugs():
+    """Unrelated or ambiguous slugs are not rewritten"""
+    print("🧪 Testing unresolved slugs...")
+    dsl = _dsl(
+        {"id": "t1", "toolkit_slug": "gmail", "composio_trigger_slug": "SCHEDULE_BASED"},
+        [
+            {"id": "a1", "toolkit_slug": "slack", "action_name": "SLACK_ARCHIVE_EVERYTHING"},
+            {"id": "a2", "toolkit_slug": "notion", "action_name": "NOTION_CREATE_PAGE_V3"},
+        ]
+    )
+    repairs = SlugResolver(CATALOG_CONTEXT).repair_workflow(dsl)
+
+    assert repairs == []
+    assert dsl["workflow"]["actions"][0]["action_name"] == "SLACK_ARCHIVE_EVERYTHING"
+    assert dsl["workflow"]["actions"][1]["action_name"] == "NOTION_CREATE_PAGE_V3"
+    print("✅ Unresolved slugs test passed!")
+
+
+def test_generator_repairs_off_event_loop():
+    """The generator's repair step embeds slugs in a worker thread"""
+    print("🧪 Testing repairs off the event loop...")
+    embedding_threads = []
+
+    def embed_texts(texts):
+        embedding_threads.append(threading.get_ident())
+        return np.ones((len(texts), 4))
+
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+    generator.semantic_search = SimpleNamespace(embedding_service=SimpleNamespace(embed_texts=embed_texts))
+    dsl = _dsl(
+        {"id": "t1", "toolkit_slug": "gmail", "composio_trigger_slug": "GMAIL_NEW_GMAIL_MESSAGE"},
+        [{"id": "a1", "toolkit_slug": "slack", "action_name": "SLACK_SEND_MESAGE"}]
+    )
+    repairs = asyncio.run(generator._repair_tool_hallucinations(dsl, CATALOG_CONTEXT))
+
+    assert [repair.slug for repair in repairs] == ["SLACK_SEND_MESSAGE"]
+    assert embedding_threads and threading.get_ident() not in embedding_threads
+    print("✅ Off-loop repair test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing slug resolver\n")
+    test_repairs_typo_in_action_name()
+    test_repairs_wrong_toolkit_for_exact_slug()
+    test_leaves_unrelated_and_ambiguous_slugs()
+    test_generator_repairs_off_event_loop()
+    print("\n🎉 All slug resolver tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Test script for the streaming suggestions endpoint.
+
+Calls stream_suggestions with a fake generator and reads the response body:
+suggestions arrive in completion order and end with a done event, a failure
+mid-stream ends with an error event, and a client disconnect cancels the
+generations still running. Also follows the status and events URLs returned
+for a background job through the mounted API router.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import generation_jobs
+from api.generation_jobs import GenerationJobManager, GenerationJobStore, format_sse
+from api.models import PlanRequest
+from api.routes.api import api_router
+from api.routes.api import suggestions as suggestions_module
+from api.routes.api.suggestions import stream_suggestions
+from core import json_codec
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.models import GenerationResponse
+
+
+def _fake_generator(delays, cancelled=None):
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+
+    async def prepare(request):
+        return {"triggers": [], "actions": []}, None
+
+    async def generate(request, context, temperature=None):
+        index = [0.3, 0.6, 0.8, 0.9, 1.0].index(temperature) if temperature is not None else 0
+        try:
+            await asyncio.sleep(delays[index])
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(index)
+            raise
+        return GenerationResponse(success=True, reasoning=f"variation {index}")
+
+    generator._prepare_generation_context = prepare
+    generator._generate_with_validation_loop = generate
+    return generator
+
+
+def _request(num_suggestions):
+    return PlanRequest(user_id="u1", user_request="Post new Gmail emails to Slack", num_suggestions=num_suggestions)
+
+
+async def _stream(generator, num_suggestions, stream_format="ndjson"):
+    return await stream_suggestions(
+        _request(num_suggestions), stream_format=stream_format, _admission=None, generator=generator,
+        database_service=None, suggestions_service=None
+    )
+
+
+async def _read(response):
+    return [chunk async for chunk in response.body_iterator]
+
+
+def test_stream_in_completion_order():
+    """Suggestions are streamed as they finish, then a done event"""
+    print("🧪 Testing streamed completion order...")
+
+    async def run():
+        response = await _stream(_fake_generator([0.06, 0.01, 0.03]), 3)
+        return await _read(response)
+
+    events = [json_codec.loads(line) for line in asyncio.run(run())]
+    assert [event["event"] for event in events] == ["suggestion"] * 3 + ["done"]
+    assert [event["index"] for event in events[:3]] == [1, 2, 0]
+    assert all(event["suggestion"]["suggestion_id"] for event in events[:3])
+    assert events[-1]["count"] == 3
+    print("✅ Completion order test passed!")
+
+
+def test_sse_format():
+    """SSE streams use the same encoding as the job event stream"""
+    print("🧪 Testing SSE encoding...")
+
+    async def run():
+        response = await _stream(_fake_generator([0.01]), 1, stream_format="sse")
+        return response, await _read(response)
+
+    response, chunks = asyncio.run(run())
+    assert response.media_type == "text/event-stream"
+    assert [chunk.split("\n", 1)[0] for chunk in chunks] == ["event: suggestion", "event: done"]
+    done = json_codec.loads(chunks[-1].split("data: ", 1)[1])
+    assert chunks[-1] == format_sse("done", done) and done["count"] == 1
+    print("✅ SSE encoding test passed!")
+
+
+def test_failure_ends_with_error_event():
+    """A generation failure mid-stream ends the stream with an error event"""
+    print("🧪 Testing error event...")
+    generator = _fake_generator([0.01])
+
+    async def failing(request, num_variations):
+        yield 0, GenerationResponse(success=True, reasoning="variation 0")
+        raise RuntimeError("catalog unavailable")
+
+    generator.iter_multiple_workflows = failing
+
+    async def run():
+        response = await _stream(generator, 2)
+        return await _read(response)
+
+    events = [json_codec.loads(line) for line in asyncio.run(run())]
+    assert [event["event"] for event in events] == ["suggestion", "error"]
+    assert "catalog unavailable" in events[-1]["detail"]
+    print("✅ Error event test passed!")
+
+
+def test_disconnect_cancels_pending_generations():
+    """Closing the stream after the first suggestion cancels the other generations"""
+    print("🧪 Testing client disconnect...")
+
+    async def closed_after_first_event():
+        cancelled = []
+        response = await _stream(_fake_generator([0.01, 5, 5], cancelled), 3)
+        first = await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()
+        return first, sorted(cancelled)
+
+    async def cancelled_while_waiting():
+        cancelled = []
+        response = await _stream(_fake_generator([0.01, 5, 5], cancelled), 3)
+        received = []
+
+        async def consume():
+            async for chunk in response.body_iterator:
+                received.append(chunk)
+
+        task = asyncio.create_task(consume())
+        while not received:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return received, sorted(cancelled)
+
+    first, cancelled = asyncio.run(asyncio.wait_for(closed_after_first_event(), 2))
+    assert json_codec.loads(first)["index"] == 0 and cancelled == [1, 2]
+
+    received, cancelled = asyncio.run(asyncio.wait_for(cancelled_while_waiting(), 2))
+    assert len(received) == 1 and cancelled == [1, 2]
+    print("✅ Client disconnect test passed!")
+
+
+def test_job_urls_resolve():
+    """The status and events URLs returned for a job point at the mounted routes"""
+    print("🧪 Testing job URLs...")
+    store = GenerationJobStore(ttl=60)
+    store._redis_down_until = float("inf")  # no Redis in tests
+    previous = (generation_jobs._generation_job_manager, suggestions_module.run_suggestions_job)
+
+    async def runner(job, request):
+        await job.add_suggestion({"suggestion_id": "s0"})
+
+    app = FastAPI()
+    app.include_router(api_router)
+    try:
+        generation_jobs._generation_job_manager = GenerationJobManager(store, workers=1, max_queue=4)
+        suggestions_module.run_suggestions_job = runner
+        with TestClient(app) as client:
+            created = client.post("/api/suggestions/jobs", json={"user_id": "u1", "user_request": "Post new Gmail emails to Slack"})
+            status = client.get(created.json()["status_url"])
+            events = client.get(created.json()["events_url"])
+    finally:
+        generation_jobs._generation_job_manager, suggestions_module.run_suggestions_job = previous
+
+    job_id = created.json()["job_id"]
+    assert created.status_code == 202
+    assert created.json()["status_url"].endswith(f"/api/suggestions/jobs/{job_id}")
+    assert status.status_code == 200 and status.json()["job_id"] == job_id
+    assert events.status_code == 200 and "event: suggestion" in events.text and "event: completed" in events.text
+    print("✅ Job URL test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing streamed suggestions\n")
+    test_stream_in_completion_order()
+    test_sse_format()
+    test_failure_ends_with_error_event()
+    test_disconnect_cancels_pending_generations()
+    test_job_urls_resolve()
+    print("\n🎉 All suggestion stream tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Test script for the template fast path.
+
+Checks slot extraction (channels, schedules, recipients), that
+canonical prompts are matched and rendered into valid template DSL, that
+the catalog snapshot decides which templates are available, and that prompts needing other apps, unknown catalog tools or ambiguous
+matches fall through to the LLM path.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sys
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.catalog.snapshot import CatalogSnapshot
+from services.dsl_generator.catalog_manager import CatalogManager
+from services.dsl_generator.context_builder import ContextBuilder
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.models import GenerationRequest
+from services.dsl_generator.response_parser import ResponseParser
+from services.dsl_generator.template_matcher import SlotExtractor, TemplateMatcher
+from services.dsl_generator.workflow_validator import WorkflowValidator
+
+CATALOG_ITEMS = [
+    {"type": "trigger", "provider_id": "gmail", "slug": "GMAIL_NEW_GMAIL_MESSAGE"},
+    {"type": "action", "provider_id": "gmail", "slug": "GMAIL_SEND_EMAIL"},
+    {"type": "action", "provider_id": "gmail", "slug": "GMAIL_ADD_LABEL_TO_EMAIL"},
+    {"type": "action", "provider_id": "slack", "slug": "SLACK_SEND_MESSAGE"},
+    {"type": "trigger", "provider_id": "github", "slug": "GITHUB_ISSUE_ADDED_EVENT"},
+]
+
+
+def _inputs(*names):
+    return [{"name": name, "type": "array" if name.endswith("_ids") else "string"} for name in names]
+
+
+CATALOG = {
+    "gmail": {"name": "Gmail", "triggers": [{"slug": "GMAIL_NEW_GMAIL_MESSAGE"}], "actions": [
+        {"slug": "GMAIL_SEND_EMAIL", "parameters": _inputs("to", "subject", "body")},
+        {"slug": "GMAIL_ADD_LABEL_TO_EMAIL", "parameters": _inputs("message_id", "add_label_ids")},
+    ]},
+    "slack": {"name": "Slack", "actions": [{"slug": "SLACK_SEND_MESSAGE", "parameters": _inputs("channel", "text")}]},
+}
+
+
+def _generator(catalog):
+    """A DSLGeneratorService with just the parts template validation uses"""
+    service = DSLGeneratorService.__new__(DSLGeneratorService)
+    service.catalog_manager = CatalogManager.__new__(CatalogManager)
+    service.catalog_manager._catalog_snapshot = CatalogSnapshot.build(catalog)
+    service.context_builder = ContextBuilder(service.catalog_manager)
+    service.workflow_validator = WorkflowValidator()
+    return service
+
+
+def fake_embed_texts(texts, dim=256):
+    """Hashed bag-of-words vectors: prompts sharing words are similar"""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % dim] += 1.0
+    return vectors
+
+
+def _matcher(**kwargs):
+    matcher = TemplateMatcher(threshold=kwargs.pop("threshold", 0.6), margin=kwargs.pop("margin", 0.05))
+    matcher.load_catalog_items(kwargs.pop("items", CATALOG_ITEMS))
+    return matcher
+
+
+def _action_inputs(matcher, validate, prompt):
+    response = asyncio.run(matcher.try_generate(
+        GenerationRequest(user_prompt=prompt), embed_texts=fake_embed_texts, validate_workflow=validate
+    ))
+    return response.dsl_template["workflow"]["actions"][0]["required_inputs"]
+
+
+def test_slot_extraction():
+    """Channels, schedules and recipients are pulled from the prompt"""
+    print("🧪 Testing slot extraction...")
+    slots = SlotExtractor()
+    assert slots.extract("channel", "post it to #General in Slack") == "#general"
+    assert slots.extract("channel", "send it to the marketing channel") == "#marketing"
+    assert slots.extract("channel", "send it to a channel") is None
+    assert slots.extract("email", "email the report to boss@example.com") == "boss@example.com"
+    assert slots.extract("schedule", "every day at 5:30pm") == "30 17 * * *"
+    assert slots.extract("schedule", "every Monday morning") == "0 9 * * 1"
+    assert slots.extract("schedule", "every 15 minutes") == "*/15 * * * *"
+    assert slots.extract("schedule", "hourly") == "0 * * * *"
+    assert slots.extract("schedule", "when something happens") is None
+    print("✅ Slot extraction test passed!")
+
+
+def test_canonical_prompt_served_from_template():
+    """A Gmail -> Slack prompt is answered from the template, with the channel filled in"""
+    print("🧪 Testing template match and render...")
+    matcher = _matcher()
+    request = GenerationRequest(
+        user_prompt="When a new email arrives in my Gmail inbox, post the subject to the #general channel in Slack."
+    )
+    response = asyncio.run(matcher.try_generate(
+        request, embed_texts=fake_embed_texts, validate_structure=ResponseParser()._validate_dsl_structure
+    ))
+    assert response is not None and response.success
+    assert response.generation_metadata["template_id"] == "gmail_new_email_to_slack"
+    workflow = response.dsl_template["workflow"]
+    assert workflow["triggers"][0]["composio_trigger_slug"] == "GMAIL_NEW_GMAIL_MESSAGE"
+    inputs = {i["name"]: i["source"] for i in workflow["actions"][0]["required_inputs"]}
+    assert inputs["channel"] == "#general"
+    assert response.missing_fields == []
+
+    # Without a channel the slot becomes a user input
+    response = asyncio.run(matcher.try_generate(
+        GenerationRequest(user_prompt="Post new Gmail emails to Slack"), embed_texts=fake_embed_texts
+    ))
+    assert response is not None
+    inputs = {i["name"]: i["source"] for i in response.dsl_template["workflow"]["actions"][0]["required_inputs"]}
+    assert inputs["channel"] == "{{inputs.channel}}"
+    assert [f.field for f in response.missing_fields] == ["inputs.channel"]
+    print("✅ Template match test passed!")
+
+
+def test_fall_through_cases():
+    """Other apps, missing catalog tools, low scores and ambiguity skip the fast path"""
+    print("🧪 Testing fast path fall-through...")
+    matcher = _matcher()
+
+    # An extra app the template does not cover
+    assert matcher.match(
+        "When a new email arrives in Gmail, post it to Slack and add a row to a Google Sheets spreadsheet",
+        embed_texts=fake_embed_texts
+    ) is None
+    assert matcher.stats["no_candidates"] == 1
+
+    # Selected apps must match the template's apps exactly
+    assert matcher.match("Post new Gmail emails to a Slack channel", selected_apps=["gmail"],
+                         embed_texts=fake_embed_texts) is None
+    assert matcher.match("Post new Gmail emails to a Slack channel", selected_apps=["Gmail", "SLACK"],
+                         embed_texts=fake_embed_texts) is not None
+
+    # Right apps, unrelated request
+    assert matcher.match("Summarize the attachments of Gmail messages and forward them to Slack",
+                         embed_texts=fake_embed_texts) is None
+
+    # The two Gmail-only templates both score highly: ambiguous
+    strict = _matcher(threshold=0.3, margin=0.5)
+    assert strict.match("Send a Gmail email with a label", embed_texts=fake_embed_texts) is None
+    assert strict.stats["ambiguous"] == 1
+
+    # Template tools missing from the catalog snapshot
+    no_slack = _matcher(items=[i for i in CATALOG_ITEMS if i["provider_id"] != "slack"])
+    assert no_slack.match("Post new Gmail emails to a Slack channel", embed_texts=fake_embed_texts) is None
+
+    # Non-template schemas always go through generation
+    request = GenerationRequest(user_prompt="Post new Gmail emails to a Slack channel", workflow_type="dag")
+    assert asyncio.run(matcher.try_generate(request, embed_texts=fake_embed_texts)) is None
+    print("✅ Fall-through test passed!")
+
+
+def test_templates_available_from_snapshot():
+    """A catalog snapshot decides which templates are served; the same version is not reloaded"""
+    print("🧪 Testing snapshot template availability...")
+    matcher = TemplateMatcher(threshold=0.6, margin=0.05)
+    prompt = "Post new Gmail emails to a Slack channel"
+    assert matcher.match(prompt, embed_texts=fake_embed_texts) is None  # no catalog loaded yet
+
+    snapshot = CatalogSnapshot.build(CATALOG)
+    assert matcher.load_snapshot(snapshot)
+    assert not matcher.load_snapshot(CatalogSnapshot.build(CATALOG))
+    assert matcher.get_stats()["version"] == snapshot.version
+    assert matcher.match(prompt, embed_texts=fake_embed_texts) is not None
+
+    assert matcher.load_snapshot(CatalogSnapshot.build({"gmail": CATALOG["gmail"]}))
+    assert matcher.match(prompt, embed_texts=fake_embed_texts) is None
+    print("✅ Snapshot availability test passed!")
+
+
+def test_scheduled_report_template():
+    """Schedule and recipient slots are rendered into the trigger and action"""
+    print("🧪 Testing scheduled report template...")
+    matcher = _matcher()
+    response = asyncio.run(matcher.try_generate(
+        GenerationRequest(user_prompt="Every Friday at 5pm send a status report email to lead@example.com"),
+        embed_texts=fake_embed_texts
+    ))
+    assert response is not None
+    workflow = response.dsl_template["workflow"]
+    assert workflow["triggers"][0]["schedule"]["cron_expr"] == "0 17 * * 5"
+    assert workflow["actions"][0]["required_inputs"][0]["source"] == "lead@example.com"
+    assert {f.field for f in response.missing_fields} == {"inputs.subject", "inputs.body"}
+    print("✅ Scheduled report test passed!")
+
+
+def test_templates_pass_full_validation():
+    """Templates are served only after the generated-workflow validation passes"""
+    print("🧪 Testing full validation of templates...")
+    matcher = _matcher()
+    validate = _generator(CATALOG)._validate_template_dsl
+    prompts = {
+        "gmail_new_email_to_slack": "When a new email arrives in Gmail, post it to the #general channel in Slack",
+        "gmail_new_email_add_label": "When a new email arrives, tag it with the 'Inbox Review' label",
+        "schedule_slack_message": "Every morning at 9am post a message to Slack",
+        "schedule_email_report": "Every Friday at 5pm send a status report email to lead@example.com",
+    }
+    for template_id, prompt in prompts.items():
+        response = asyncio.run(matcher.try_generate(
+            GenerationRequest(user_prompt=prompt), embed_texts=fake_embed_texts, validate_workflow=validate
+        ))
+        assert response is not None and response.generation_metadata["template_id"] == template_id, template_id
+
+    # Label names are not label IDs: the IDs are asked for instead of filled from the prompt
+    inputs = {i["name"]: i for i in _action_inputs(matcher, validate, prompts["gmail_new_email_add_label"])}
+    assert inputs["add_label_ids"]["source"] == "{{inputs.label_ids}}" and inputs["add_label_ids"]["type"] == "array"
+
+    # A template tool the catalog no longer has sends the request to the LLM
+    no_label = {**CATALOG, "gmail": {**CATALOG["gmail"], "actions": CATALOG["gmail"]["actions"][:1]}}
+    request = GenerationRequest(user_prompt=prompts["gmail_new_email_add_label"])
+    response = asyncio.run(matcher.try_generate(
+        request, embed_texts=fake_embed_texts, validate_workflow=_generator(no_label)._validate_template_dsl
+    ))
+    assert response is None and matcher.stats["invalid"] == 1
+    print("✅ Template validation test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing template fast path\n")
+    test_slot_extraction()
+    test_canonical_prompt_served_from_template()
+    test_fall_through_cases()
+    test_templates_available_from_snapshot()
+    test_scheduled_report_template()
+    test_templates_pass_full_validation()
+    print("\n🎉 All template fast path tests passed!")
+
+
+if __name__ == "__main__":
+    main()
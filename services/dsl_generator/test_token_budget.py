@@ -0,0 +1,142 @@
+"""
+Test script for token-aware (ITPM/OTPM) rate limiting.
+
+Checks that reservations wait for quota to refill, that reconciling with
+actual usage refunds unused output tokens, and that AIClient reserves and
+settles tokens around a Claude call, releasing them when the call fails or
+is cancelled.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator import ai_client as ai_client_module
+from services.dsl_generator.ai_client import AIClient
+from services.dsl_generator.models import PromptParts
+from services.dsl_generator.rate_limiter import RateLimitConfig, TokenBudgetLimiter
+
+
+def test_reserve_waits_and_reconcile_refunds():
+    """Reserving max_tokens blocks further calls until actual usage is settled"""
+    print("🧪 Testing token reservation and reconciliation...")
+
+    async def run():
+        budget = TokenBudgetLimiter(RateLimitConfig(input_tokens_per_minute=6000, output_tokens_per_minute=6000))
+        first = await budget.reserve(1000, 6000)
+        assert first.output_tokens == 6000
+        assert await budget.reserve(1000, 4000, wait=False) is None
+
+        # The call only produced 500 tokens: the rest is returned to the bucket
+        budget.reconcile(first, actual_input=900, actual_output=500)
+        budget.reconcile(first, actual_input=900, actual_output=500)  # settling twice is a no-op
+        assert await budget.reserve(1000, 4000, wait=False) is not None
+
+        # Short by ~100 output tokens at 100 tokens/s: waits about a second
+        start = time.monotonic()
+        await budget.reserve(0, 1600)
+        return time.monotonic() - start, budget.get_stats()
+
+    waited, stats = asyncio.run(run())
+    assert 0.5 < waited < 2.5, waited
+    assert stats["waits"] == 1
+    assert stats["used_totals"] == {"input": 900, "output": 500}
+    print("✅ Reservation test passed!")
+
+
+def test_disabled_quota_never_blocks():
+    """Without configured quotas reservations are free"""
+    print("🧪 Testing disabled token quotas...")
+    budget = TokenBudgetLimiter(RateLimitConfig())
+    reservation = asyncio.run(budget.reserve(10 ** 6, 10 ** 6, wait=False))
+    assert reservation is not None and reservation.input_tokens == 0
+    print("✅ Disabled quota test passed!")
+
+
+def test_input_token_estimate():
+    """The ITPM reservation covers the system prefix, tool context and request"""
+    print("🧪 Testing input token estimate...")
+    client = AIClient(anthropic_api_key="test-key")
+    system_blocks, messages = client._build_messages(PromptParts(system="s" * 400, context="c" * 800, request="r" * 40))
+    assert client._estimate_input_tokens(system_blocks, messages) == 310
+    assert client._estimate_input_tokens(None, [{"role": "user", "content": "x" * 8}]) == 2
+    print("✅ Input token estimate test passed!")
+
+
+class _FailingHTTPClient:
+    """httpx.AsyncClient stand-in whose POST raises (or hangs until cancelled)"""
+
+    error = None
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def post(self, url, headers=None, json=None):
+        if self.error is None:
+            await asyncio.sleep(10)
+        raise self.error
+
+
+def test_failed_calls_release_reservation():
+    """Timeouts, unexpected errors and cancellation all release the reservation"""
+    print("🧪 Testing reservation release on failures...")
+    settled = []
+    patched = {
+        "wait_for_claude_token": lambda: asyncio.sleep(0),
+        "reserve_claude_tokens": lambda input_tokens, output_tokens: asyncio.sleep(0, result="reservation"),
+        "reconcile_claude_tokens": lambda reservation, usage: settled.append((reservation, usage))
+    }
+    previous = {name: getattr(ai_client_module, name) for name in patched}
+    previous_client = httpx.AsyncClient
+
+    async def call(error):
+        _FailingHTTPClient.error = error
+        client = AIClient(anthropic_api_key="test-key")
+        task = asyncio.create_task(client.generate_workflow("Post new Gmail emails to Slack"))
+        if error is None:
+            await asyncio.sleep(0.05)
+            task.cancel()
+        try:
+            await task
+        except (RuntimeError, asyncio.CancelledError):
+            pass
+
+    try:
+        for name, value in patched.items():
+            setattr(ai_client_module, name, value)
+        httpx.AsyncClient = _FailingHTTPClient
+        for error in (httpx.ReadTimeout("timed out"), ValueError("bad response"), None):
+            asyncio.run(call(error))
+    finally:
+        for name, value in previous.items():
+            setattr(ai_client_module, name, value)
+        httpx.AsyncClient = previous_client
+
+    assert settled == [("reservation", {})] * 3, settled
+    print("✅ Reservation release test passed!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing token-aware rate limiting\n")
+    test_reserve_waits_and_reconcile_refunds()
+    test_disabled_quota_never_blocks()
+    test_input_token_estimate()
+    test_failed_calls_release_reservation()
+    print("\n🎉 All token budget tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Test script for the embedding-based vagueness classifier.
+
+Checks that training data is assembled from the seed file and eval
+reports, that the logistic head separates vague from specific prompts and
+picks an exemplar reason, that selected apps raise the bar, that the
+generator falls back to heuristics without an embedding, and that training
+runs off the event loop.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from services.dsl_generator import generator as generator_module
+from services.dsl_generator.generator import DSLGeneratorService
+from services.dsl_generator.vagueness import SPECIFIC, VaguenessClassifier, load_training_examples
+
+
+def fake_embed_texts(texts, dim=512):
+    """Hashed bag-of-words vectors: prompts sharing words are similar"""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z#]+", text.lower()):
+            vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % dim] += 1.0
+    return vectors
+
+
+def _classify(classifier, prompt, has_selected_apps=False):
+    return classifier.classify(prompt, fake_embed_texts([prompt])[0], has_selected_apps)
+
+
+def test_training_examples():
+    """Seed prompts keep their reason and eval prompts are labelled specific"""
+    print("🧪 Testing training data assembly...")
+    examples = dict(load_training_examples())
+    assert examples["help me automate"] == "too_generic"
+    assert examples["make my life easier"] == "no_specific_apps_or_actions"
+    assert examples["Handle new customers."] == SPECIFIC  # from the eval reports
+    assert sum(1 for label in examples.values() if label == SPECIFIC) > 20
+    print("✅ Training data test passed!")
+
+
+def test_classifier_decisions():
+    """Vague prompts get an exemplar reason, specific ones pass through"""
+    print("🧪 Testing classifier decisions...")
+    classifier = VaguenessClassifier()
+    assert classifier.ensure_trained(fake_embed_texts)
+    assert classifier.get_stats()["reasons"] == ["no_specific_apps_or_actions", "too_generic"]
+
+    assert _classify(classifier, "hi")["reason"] == "too_short"
+    assert _classify(classifier, "can you help me automate something")["reason"] == "too_generic"
+    assert _classify(classifier, "please make my work life easier")["reason"] == "no_specific_apps_or_actions"
+    assert _classify(classifier, "When a new email arrives in Gmail, post the subject to #general in Slack") is None
+
+    # Selected apps raise the threshold for borderline prompts
+    borderline = "help me with my stuff"
+    probability = classifier.probability(fake_embed_texts([borderline])[0])
+    classifier.config.threshold, classifier.config.threshold_with_apps = probability - 0.01, probability + 0.01
+    assert _classify(classifier, borderline) is not None
+    assert _classify(classifier, borderline, has_selected_apps=True) is None
+
+    try:
+        classifier.classify("post new issues to slack", np.zeros(512))
+        assert False, "expected ValueError for an empty embedding"
+    except ValueError:
+        pass
+    print("✅ Classifier decision test passed!")
+
+
+def test_generator_falls_back_to_heuristics():
+    """Without a prompt embedding the keyword heuristics are used"""
+    print("🧪 Testing heuristic fallback...")
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+    generator.vagueness_classifier_enabled = True
+    assert asyncio.run(generator._detect_vagueness("automate my workflow")) == {'reason': 'too_generic'}
+    assert asyncio.run(generator._detect_vagueness("Send a Slack message when a Stripe payment succeeds")) is None
+    print("✅ Heuristic fallback test passed!")
+
+
+def test_training_does_not_block_requests():
+    """Training runs in a worker thread; heuristics answer until it finishes"""
+    print("🧪 Testing background training...")
+    training_threads = []
+
+    def slow_embed_texts(texts):
+        training_threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return fake_embed_texts(texts)
+
+    generator = DSLGeneratorService.__new__(DSLGeneratorService)
+    generator.vagueness_classifier_enabled = True
+    generator.semantic_search = SimpleNamespace(embedding_service=SimpleNamespace(embed_texts=slow_embed_texts))
+    prompt = "can you help me automate something"
+    embedding = fake_embed_texts([prompt])[0]
+
+    async def run():
+        start = time.perf_counter()
+        during = await generator._detect_vagueness(prompt, query_embedding=embedding)
+        elapsed = time.perf_counter() - start
+        task = generator_module.vagueness_classifier._training_task
+        await generator._detect_vagueness(prompt, query_embedding=embedding)  # still one training run
+        assert generator_module.vagueness_classifier._training_task is task
+        await task
+        after = await generator._detect_vagueness(prompt, query_embedding=embedding)
+        return during, elapsed, after
+
+    previous = generator_module.vagueness_classifier
+    generator_module.vagueness_classifier = VaguenessClassifier()
+    try:
+        during, elapsed, after = asyncio.run(run())
+    finally:
+        generator_module.vagueness_classifier = previous
+
+    assert elapsed < 0.1 and during == generator._detect_vagueness_heuristic(prompt)
+    assert after == {'reason': 'too_generic', 'probability': after["probability"]}  # the trained classifier
+    assert training_threads == [training_threads[0]] and training_threads[0] != threading.get_ident()
+    print(f"✅ Background training test passed (first request {elapsed * 1000:.1f} ms)!")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Testing vagueness classifier\n")
+    test_training_examples()
+    test_classifier_decisions()
+    test_generator_falls_back_to_heuristics()
+    test_training_does_not_block_requests()
+    print("\n🎉 All vagueness classifier tests passed!")
+
+
+if __name__ == "__main__":
+    main()
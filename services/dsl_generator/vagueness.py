@@ -0,0 +1,234 @@
+"""
+Embedding-based Vagueness Classifier
+
+Decides whether a prompt is too vague to generate a workflow from, using a
+logistic head on the sentence embedding the semantic search already
+computes for the prompt. The check therefore costs a dot product instead of
+a separate model pass, and is far less brittle than word counts and
+substring lists.
+
+Training data:
+- Eval report prompts (evals/api_eval_report_*.json) and benchmark prompts
+  are labelled *specific*: every one of them expects a generated workflow.
+- services/dsl_generator/benchmarks/vagueness_seed.json adds vague prompts,
+  grouped by exemplar reason, plus short-but-specific hard negatives.
+
+The head is trained in a worker thread when the generator starts (embedding
+a few hundred prompts takes seconds on CPU); keyword heuristics answer
+until it is ready. Once vagueness is decided, the vague-reason centroid
+nearest to the prompt picks which exemplar workflows to return.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_SEED_PATH = Path(__file__).parent / "benchmarks" / "vagueness_seed.json"
+SPECIFIC = "specific"
+
+
+@dataclass
+class VaguenessConfig:
+    """Configuration for the vagueness classifier"""
+    threshold: float = 0.6  # P(vague) needed to return exemplars
+    threshold_with_apps: float = 0.85  # Selected apps make short prompts answerable
+    min_words: int = 3  # Shorter prompts are always 'too_short'
+    l2: float = 0.01  # Logistic regression L2 penalty
+    epochs: int = 300
+    learning_rate: float = 0.5
+
+
+def load_training_examples(
+    seed_path: Path = DEFAULT_SEED_PATH,
+    project_root: Path = PROJECT_ROOT
+) -> List[Tuple[str, str]]:
+    """
+    Collect (prompt, label) pairs, where label is 'specific' or a vague reason.
+
+    Missing or malformed files are skipped with a warning.
+    """
+    examples: Dict[str, str] = {}
+
+    def add(prompt: Optional[str], label: str) -> None:
+        if isinstance(prompt, str) and prompt.strip():
+            examples.setdefault(prompt.strip(), label)
+
+    try:
+        with open(seed_path, "r", encoding="utf-8") as f:
+            seed = json.load(f)
+        for reason, prompts in seed.get("vague", {}).items():
+            for prompt in prompts:
+                add(prompt, reason)
+        for prompt in seed.get("specific", []):
+            add(prompt, SPECIFIC)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load vagueness seed prompts from {seed_path}: {e}")
+
+    sources = sorted(glob.glob(str(project_root / "evals" / "api_eval_report_*.json")))
+    sources += [
+        str(project_root / "evals" / "eval_prompts.json"),
+        str(project_root / "services" / "dsl_generator" / "benchmarks" / "examples.json"),
+    ]
+    for path in sources:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            records = data.get("results", []) if isinstance(data, dict) else data
+            for record in records:
+                if isinstance(record, dict):
+                    add(record.get("prompt"), SPECIFIC)
+        except Exception as e:
+            logger.warning(f"⚠️ Skipping vagueness training file {path}: {e}")
+
+    return list(examples.items())
+
+
+class VaguenessClassifier:
+    """Logistic vague/specific head plus per-reason centroids on prompt embeddings"""
+
+    def __init__(self, config: Optional[VaguenessConfig] = None,
+                 examples_loader: Callable[[], List[Tuple[str, str]]] = load_training_examples):
+        self.config = config or VaguenessConfig()
+        self._examples_loader = examples_loader
+        self.weights: Optional[np.ndarray] = None
+        self.bias: float = 0.0
+        self.reason_centroids: Dict[str, np.ndarray] = {}
+        self.training_size = 0
+        self._training_failed = False
+        self._training_task: Optional[asyncio.Task] = None
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def train(self, embeddings: np.ndarray, labels: List[str]) -> None:
+        """
+        Fit the logistic head and reason centroids.
+
+        Args:
+            embeddings: (n, dim) prompt embeddings
+            labels: 'specific' or a vague reason, per row
+        """
+        X = self._normalize(np.asarray(embeddings, dtype=np.float64))
+        y = np.array([0.0 if label == SPECIFIC else 1.0 for label in labels])
+        if X.ndim != 2 or len(y) != X.shape[0] or y.min() == y.max():
+            raise ValueError("Vagueness training needs 2D embeddings and both vague and specific examples")
+
+        # Balance classes so the small vague set is not drowned out
+        pos = y.sum()
+        sample_weight = np.where(y == 1.0, len(y) / (2 * pos), len(y) / (2 * (len(y) - pos)))
+
+        w = np.zeros(X.shape[1])
+        b = 0.0
+        for _ in range(self.config.epochs):
+            p = 1.0 / (1.0 + np.exp(-(X @ w + b)))
+            error = (p - y) * sample_weight
+            w -= self.config.learning_rate * (X.T @ error / len(y) + self.config.l2 * w)
+            b -= self.config.learning_rate * error.mean()
+
+        reason_centroids = {}
+        for reason in sorted({label for label in labels if label != SPECIFIC}):
+            rows = X[[i for i, label in enumerate(labels) if label == reason]]
+            reason_centroids[reason] = self._normalize(rows.mean(axis=0))
+
+        # Weights last: they mark the head as trained for readers on other threads
+        self.reason_centroids = reason_centroids
+        self.training_size = len(labels)
+        self.bias = float(b)
+        self.weights = w
+
+    def ensure_trained(self, embed_texts: Callable[[List[str]], np.ndarray]) -> bool:
+        """Train on first use; returns False if training is unavailable"""
+        if self.trained:
+            return True
+        if self._training_failed:
+            return False
+        try:
+            examples = self._examples_loader()
+            prompts = [prompt for prompt, _ in examples]
+            labels = [label for _, label in examples]
+            self.train(np.asarray(embed_texts(prompts)), labels)
+            logger.info(f"🧭 Vagueness classifier trained on {len(prompts)} prompts "
+                        f"({sum(1 for l in labels if l != SPECIFIC)} vague)")
+            return True
+        except Exception as e:
+            self._training_failed = True
+            logger.warning(f"⚠️ Vagueness classifier unavailable, using heuristics: {e}")
+            return False
+
+    def start_training(self, embed_texts: Callable[[List[str]], np.ndarray]) -> Optional[asyncio.Task]:
+        """
+        Train in a worker thread so the event loop keeps serving requests.
+
+        Returns the training task, or None when the head is already trained
+        or training failed. Repeated calls while training share one task.
+        """
+        if self.trained or self._training_failed:
+            return None
+        if self._training_task is None or self._training_task.done():
+            self._training_task = asyncio.create_task(asyncio.to_thread(self.ensure_trained, embed_texts))
+        return self._training_task
+
+    def probability(self, embedding: np.ndarray) -> float:
+        """P(vague) for a prompt embedding"""
+        x = self._normalize(np.asarray(embedding, dtype=np.float64).reshape(-1))
+        return float(1.0 / (1.0 + np.exp(-(x @ self.weights + self.bias))))
+
+    def classify(
+        self,
+        prompt: str,
+        embedding: Optional[np.ndarray],
+        has_selected_apps: bool = False
+    ) -> Optional[Dict[str, object]]:
+        """
+        Classify a prompt.
+
+        Returns:
+            Dict with 'reason' and 'probability' if vague, None if specific.
+            Raises ValueError if the classifier is untrained or no usable
+            embedding was given, so callers can fall back.
+        """
+        if len(prompt.split()) < self.config.min_words:
+            return {'reason': 'too_short', 'probability': 1.0}
+        if not self.trained or embedding is None or not np.any(embedding):
+            raise ValueError("Vagueness classifier needs a trained head and a prompt embedding")
+
+        probability = self.probability(embedding)
+        threshold = self.config.threshold_with_apps if has_selected_apps else self.config.threshold
+        if probability < threshold:
+            return None
+
+        x = self._normalize(np.asarray(embedding, dtype=np.float64).reshape(-1))
+        reason = max(self.reason_centroids, key=lambda r: float(x @ self.reason_centroids[r]))
+        return {'reason': reason, 'probability': round(probability, 4)}
+
+    def get_stats(self) -> Dict[str, object]:
+        """Training state and thresholds"""
+        return {
+            "trained": self.trained,
+            "training_size": self.training_size,
+            "reasons": sorted(self.reason_centroids),
+            "threshold": self.config.threshold,
+            "threshold_with_apps": self.config.threshold_with_apps
+        }
+
+
+# Global vagueness classifier instance
+vagueness_classifier = VaguenessClassifier()
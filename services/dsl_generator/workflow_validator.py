@@ -7,6 +7,8 @@ catalog data, and business rules.
 
 import logging
 from typing import Dict, Any, List
+from core.catalog.lookup import ToolLookupIndex
+from core.catalog.snapshot import ACTION, TRIGGER
 from core.validator import validate, lint, Stage, LintContext
 from .models import GenerationContext
 
@@ -74,6 +76,8 @@ class WorkflowValidator:
                 logger.info(f"[LINE 55] Provider index keys: {list(provider_index.keys())}")
                 
                 class SimpleCatalog:
+                    lookup_index = ToolLookupIndex.for_catalog(provider_index)
+                    
                     async def get_provider_by_slug(self_inner, slug):
                         logger.debug(f"[LINE 57] SimpleCatalog.get_provider_by_slug called with slug: '{slug}'")
                         result = provider_index.get(slug)
@@ -81,16 +85,8 @@ class WorkflowValidator:
                         return result
                     async def get_tool_by_slug(self_inner, action_name, toolkit_slug):
                         logger.debug(f"[LINE 60] SimpleCatalog.get_tool_by_slug called with action_name: '{action_name}', toolkit_slug: '{toolkit_slug}'")
-                        prov = provider_index.get(toolkit_slug)
-                        if not prov:
-                            logger.debug(f"[LINE 62] No provider found for toolkit_slug: '{toolkit_slug}'")
-                            return None
-                        for a in prov.get('actions', []) or []:
-                            if a.get('action_name') == action_name or a.get('name') == action_name:
-                                logger.debug(f"[LINE 65] Found action '{action_name}' in provider '{toolkit_slug}'")
-                                return a
-                        logger.debug(f"[LINE 67] Action '{action_name}' not found in provider '{toolkit_slug}'")
-                        return None
+                        record = self_inner.lookup_index.get(toolkit_slug, action_name, ACTION)
+                        return record.data if record else None
                     async def get_catalog(self_inner):
                         logger.debug(f"[LINE 69] SimpleCatalog.get_catalog called")
                         return {"providers": list(provider_index.values())}
@@ -101,6 +97,8 @@ class WorkflowValidator:
                 logger.info(f"[LINE 73] Providers is a dict, creating DictCatalog...")
                 # If a dict, expose a minimal interface
                 class DictCatalog:
+                    lookup_index = ToolLookupIndex.for_catalog(providers)
+                    
                     async def get_provider_by_slug(self_inner, slug):
                         logger.debug(f"[LINE 76] DictCatalog.get_provider_by_slug called with slug: '{slug}'")
                         result = providers.get(slug)
@@ -108,16 +106,8 @@ class WorkflowValidator:
                         return result
                     async def get_tool_by_slug(self_inner, action_name, toolkit_slug):
                         logger.debug(f"[LINE 79] DictCatalog.get_tool_by_slug called with action_name: '{action_name}', toolkit_slug: '{toolkit_slug}'")
-                        prov = providers.get(toolkit_slug)
-                        if not prov:
-                            logger.debug(f"[LINE 81] No provider found for toolkit_slug: '{toolkit_slug}'")
-                            return None
-                        for a in prov.get('actions', []) or []:
-                            if a.get('action_name') == action_name or a.get('name') == action_name:
-                                logger.debug(f"[LINE 84] Found action '{action_name}' in provider '{toolkit_slug}'")
-                                return a
-                        logger.debug(f"[LINE 86] Action '{action_name}' not found in provider '{toolkit_slug}'")
-                        return None
+                        record = self_inner.lookup_index.get(toolkit_slug, action_name, ACTION)
+                        return record.data if record else None
                     async def get_catalog(self_inner):
                         logger.debug(f"[LINE 88] DictCatalog.get_catalog called")
                         return {"providers": list(providers.values())}
@@ -209,6 +199,7 @@ class WorkflowValidator:
         if not catalog_data:
             return {"valid": False, "error": "No catalog data available"}
         
+        lookup = ToolLookupIndex.for_catalog(catalog_data)
         validation_results = {
             "valid": True,
             "errors": [],
@@ -222,12 +213,11 @@ class WorkflowValidator:
                 provider = trigger.get('provider')
                 trigger_name = trigger.get('name')
                 if provider and trigger_name:
-                    if provider not in catalog_data:
+                    if not lookup.has_toolkit(provider):
                         validation_results["errors"].append(f"Unknown provider: {provider}")
                         validation_results["valid"] = False
                     else:
-                        available_triggers = self._get_provider_triggers(catalog_data, provider)
-                        if trigger_name not in available_triggers:
+                        if not lookup.contains(provider, trigger_name, TRIGGER):
                             validation_results["errors"].append(f"Unknown trigger '{trigger_name}' for provider '{provider}'")
                             validation_results["valid"] = False
                         else:
@@ -239,12 +229,11 @@ class WorkflowValidator:
                 provider = action.get('provider')
                 action_name = action.get('name')
                 if provider and action_name:
-                    if provider not in catalog_data:
+                    if not lookup.has_toolkit(provider):
                         validation_results["errors"].append(f"Unknown provider: {provider}")
                         validation_results["valid"] = False
                     else:
-                        available_actions = self._get_provider_actions(catalog_data, provider)
-                        if action_name not in available_actions:
+                        if not lookup.contains(provider, action_name, ACTION):
                             validation_results["errors"].append(f"Unknown action '{action_name}' for provider '{provider}'")
                             validation_results["valid"] = False
                         else:
@@ -252,22 +241,6 @@ class WorkflowValidator:
         
         return validation_results
     
-    def _get_provider_actions(self, catalog_data: Dict[str, Any], provider_slug: str) -> List[str]:
-        """Get list of available actions for a specific provider"""
-        if provider_slug not in catalog_data:
-            return []
-        
-        provider = catalog_data[provider_slug]
-        return [action.get('name', 'Unknown') for action in provider.get('actions', [])]
-    
-    def _get_provider_triggers(self, catalog_data: Dict[str, Any], provider_slug: str) -> List[str]:
-        """Get list of available triggers for a specific provider"""
-        if provider_slug not in catalog_data:
-            return []
-        
-        provider = catalog_data[provider_slug]
-        return [trigger.get('name', 'Unknown') for trigger in provider.get('triggers', [])]
-    
     def verify_catalog_compliance(
         self,
         dsl_template: Dict[str, Any],
@@ -286,22 +259,13 @@ class WorkflowValidator:
         errors = []
         
         try:
-            # Extract available toolkits, triggers, and actions
-            available_toolkits = set(catalog_data.keys())
-            available_triggers = set()
-            available_actions = set()
-            
-            # Collect all available actions and triggers from all providers
-            for provider in catalog_data.values():
-                for action in provider.get('actions', []):
-                    available_actions.add(action.get('action_name', ''))
-                for trigger in provider.get('triggers', []):
-                    available_triggers.add(trigger.get('id', ''))
+            # Toolkits and tools (by slug, name or alias) from the shared lookup index
+            lookup = ToolLookupIndex.for_catalog(catalog_data)
             
             # Check toolkit references
             if 'toolkit' in dsl_template and 'slug' in dsl_template['toolkit']:
                 toolkit_slug = dsl_template['toolkit']['slug']
-                if toolkit_slug not in available_toolkits:
+                if not lookup.has_toolkit(toolkit_slug):
                     errors.append(f"Unknown toolkit: {toolkit_slug}")
             
             # Check workflow triggers and actions
@@ -313,12 +277,12 @@ class WorkflowValidator:
                     for trigger in workflow['triggers']:
                         if 'toolkit_slug' in trigger:
                             toolkit_slug = trigger['toolkit_slug']
-                            if toolkit_slug not in available_toolkits:
+                            if not lookup.has_toolkit(toolkit_slug):
                                 errors.append(f"Unknown toolkit in trigger: {toolkit_slug}")
                         
                         if 'trigger_id' in trigger:
                             trigger_id = trigger['trigger_id']
-                            if trigger_id not in available_triggers:
+                            if lookup.find(trigger_id, TRIGGER) is None:
                                 errors.append(f"Unknown trigger: {trigger_id}")
                 
                 # Check actions
@@ -326,12 +290,12 @@ class WorkflowValidator:
                     for action in workflow['actions']:
                         if 'toolkit_slug' in action:
                             toolkit_slug = action['toolkit_slug']
-                            if toolkit_slug not in available_toolkits:
+                            if not lookup.has_toolkit(toolkit_slug):
                                 errors.append(f"Unknown toolkit in action: {toolkit_slug}")
                         
                         if 'action_name' in action:
                             action_name = action['action_name']
-                            if action_name not in available_actions:
+                            if lookup.find(action_name, ACTION) is None:
                                 errors.append(f"Unknown action: {action_name}")
             
             # Check connections (for executable workflows)
@@ -339,7 +303,7 @@ class WorkflowValidator:
                 for connection in dsl_template['connections']:
                     if 'toolkit_slug' in connection:
                         toolkit_slug = connection['toolkit_slug']
-                        if toolkit_slug not in available_toolkits:
+                        if not lookup.has_toolkit(toolkit_slug):
                             errors.append(f"Unknown toolkit in connection: {toolkit_slug}")
             
             # Check nodes (for DAG workflows)
@@ -347,20 +311,20 @@ class WorkflowValidator:
                 for node in dsl_template['nodes']:
                     if 'data' in node and 'toolkit_slug' in node['data']:
                         toolkit_slug = node['data']['toolkit_slug']
-                        if toolkit_slug not in available_toolkits:
+                        if not lookup.has_toolkit(toolkit_slug):
                             errors.append(f"Unknown toolkit in node: {toolkit_slug}")
                     
                     if 'data' in node and 'action_name' in node['data']:
                         action_name = node['data']['action_name']
-                        if action_name not in available_actions:
+                        if lookup.find(action_name, ACTION) is None:
                             errors.append(f"Unknown action in node: {action_name}")
             
             return {
                 'is_compliant': len(errors) == 0,
                 'errors': errors,
-                'available_toolkits_count': len(available_toolkits),
-                'available_triggers_count': len(available_triggers),
-                'available_actions_count': len(available_actions)
+                'available_toolkits_count': lookup.toolkit_count,
+                'available_triggers_count': lookup.count(TRIGGER),
+                'available_actions_count': lookup.count(ACTION)
             }
             
         except Exception as e: